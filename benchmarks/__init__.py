@@ -0,0 +1,23 @@
+"""Reproducible performance benchmarks.
+
+Run from the project root:
+
+    python -m benchmarks                                 # all scenarios, JSON to stdout
+    python -m benchmarks --scenarios games,trades --out bench.json
+    python -m benchmarks --baseline bench.json --threshold 0.15   # exit 1 on regression
+
+Scenarios (see benchmarks.scenarios):
+
+- games:    single simulate_game calls on fixed synthetic TeamStates (games/sec)
+- season:   full regular season through sim.league_sim.advance_league_until on a temp
+            SQLite league built from the shipped roster (games/sec)
+- season_parallel: the same season with advance_league_until(parallel=True)
+- playoffs: play-in + every playoff round via playoffs.auto_advance_current_round (games/sec)
+- trades:   trades.validator.validate_deal on fixed two-team swaps (validations/sec)
+
+Every scenario is seeded and run `--repeat` times; each run produces a digest of its
+results (scores / validation outcomes), and differing digests mark the scenario as
+non-deterministic. A baseline is any earlier JSON output of this runner.
+"""
+
+from __future__ import annotations
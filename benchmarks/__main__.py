@@ -0,0 +1,133 @@
+"""CLI runner: python -m benchmarks --help"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from .scenarios import SCENARIOS, Scenario
+
+DEFAULT_SEED = 20240601
+DEFAULT_REPEAT = 2
+DEFAULT_THRESHOLD = 0.10
+
+
+def run_scenario(scenario: Scenario, *, seed: int, repeat: int, size: Optional[int]) -> Dict[str, Any]:
+    """Run one scenario `repeat` times with the same seed; report the best throughput."""
+    out: Dict[str, Any] = {"name": scenario.name, "unit": scenario.unit, "seed": seed, "size": size}
+    runs = []
+    try:
+        for _ in range(max(1, repeat)):
+            runs.append(scenario.fn(seed, size))
+    except Exception as exc:  # a broken scenario is reported, the others still run
+        out.update(status="error", error=f"{type(exc).__name__}: {exc}", traceback=traceback.format_exc())
+        return out
+
+    best = min(runs, key=lambda r: r.elapsed_sec / max(r.ops, 1))
+    digests = sorted({r.digest for r in runs})
+    out.update(
+        status="ok",
+        ops=best.ops,
+        elapsed_sec=round(best.elapsed_sec, 4),
+        throughput=round(best.ops / best.elapsed_sec, 3) if best.elapsed_sec > 0 else None,
+        runs_sec=[round(r.elapsed_sec, 4) for r in runs],
+        digest=digests[0],
+        deterministic=(len(digests) == 1) if len(runs) > 1 else None,
+        **best.extra,
+    )
+    if len(digests) > 1:
+        out["digests"] = digests
+    return out
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regression messages: throughput below baseline * (1 - threshold), or changed/non-deterministic results."""
+    problems: List[str] = []
+    base_by_name = {s["name"]: s for s in baseline.get("scenarios", [])}
+    for cur in results["scenarios"]:
+        name = cur["name"]
+        if cur.get("status") != "ok":
+            problems.append(f"{name}: {cur.get('error')}")
+            continue
+        if cur.get("deterministic") is False:
+            problems.append(f"{name}: results differ between runs with the same seed ({cur.get('digests')})")
+        base = base_by_name.get(name)
+        if not base or base.get("status") != "ok":
+            continue
+        if (base.get("seed"), base.get("size")) == (cur.get("seed"), cur.get("size")) and base.get("digest") != cur.get("digest"):
+            # Not a failure by itself (engine changes move results), but worth seeing next to the numbers.
+            cur["digest_changed"] = True
+        b_tp, c_tp = base.get("throughput"), cur.get("throughput")
+        if not b_tp or c_tp is None:
+            continue
+        ratio = c_tp / b_tp
+        cur["vs_baseline"] = round(ratio, 4)
+        if ratio < 1.0 - threshold:
+            problems.append(
+                f"{name}: {c_tp:.3f} {cur['unit']}/s vs baseline {b_tp:.3f} ({(ratio - 1.0) * 100:+.1f}%, threshold -{threshold * 100:.0f}%)"
+            )
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Seeded engine/league benchmarks.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per scenario (>1 enables the determinism check)")
+    parser.add_argument("--size", type=int, default=None, help="override scenario size (games / days / validations)")
+    parser.add_argument("--out", default=None, help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="earlier JSON output to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed throughput drop vs baseline (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scenarios": [],
+    }
+    for name in names:
+        scenario = SCENARIOS[name]
+        print(f"[bench] {name} ...", file=sys.stderr, flush=True)
+        row = run_scenario(scenario, seed=args.seed, repeat=args.repeat, size=args.size or scenario.default_size)
+        results["scenarios"].append(row)
+        if row["status"] == "ok":
+            print(f"[bench] {name}: {row['throughput']} {row['unit']}/s ({row['ops']} in {row['elapsed_sec']}s)", file=sys.stderr)
+        else:
+            print(f"[bench] {name}: {row['error']}", file=sys.stderr)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.threshold)
+        results["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "problems": problems}
+        for p in problems:
+            print(f"[bench] REGRESSION {p}", file=sys.stderr)
+        exit_code = 1 if problems else 0
+
+    payload = json.dumps(results, indent=2, ensure_ascii=False, default=str)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
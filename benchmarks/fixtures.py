@@ -0,0 +1,129 @@
+"""Fixed inputs for the benchmark scenarios.
+
+- synthetic_teams(): seeded TeamStates built like matchengine_v3/demo.py (no DB).
+- temp_league(): a throwaway SQLite league imported from the shipped roster workbook,
+  with the in-memory game state reset and pointed at it.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from matchengine_v3.demo import make_sample_player
+from matchengine_v3.models import Player, TeamState
+from matchengine_v3.tactics import TacticsConfig
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ROSTER_XLSX = PROJECT_ROOT / "완성 로스터.xlsx"
+
+DEFENSE_SCHEMES: Tuple[str, ...] = (
+    "Drop",
+    "Switch_Everything",
+    "Zone",
+    "Blitz_TrapPnR",
+    "PackLine_GapHelp",
+    "ICE_SidePnR",
+)
+_ARCHETYPES = ("PG_SHOOT", "WING_3D", "SLASH", "BIG_SKILL", "BIG_RIM", "WING_3D", "SLASH", "X", "BIG_RIM", "X")
+
+
+# -------------------------
+# Synthetic teams (engine-only scenarios)
+# -------------------------
+
+def _synthetic_lineup(rng: random.Random, prefix: str, pid_base: int) -> List[Player]:
+    lineup = []
+    for i, archetype in enumerate(_ARCHETYPES):
+        p = make_sample_player(rng, f"P{pid_base + i:06d}", f"{prefix}{i}", archetype)
+        p.derived["FAT_CAPACITY"] = 50.0 + i
+        lineup.append(p)
+    return lineup
+
+
+def _roles(lineup: List[Player]) -> dict:
+    return {
+        "ball_handler": lineup[0].pid,
+        "secondary_handler": lineup[1].pid,
+        "screener": lineup[4].pid,
+        "post": lineup[3].pid,
+        "shooter": lineup[1].pid,
+        "cutter": lineup[2].pid,
+        "rim_runner": lineup[4].pid,
+    }
+
+
+def synthetic_teams(seed: int, away_defense: str = "Switch_Everything") -> Tuple[TeamState, TeamState]:
+    """(home, away) built from `seed`; same tactics as the engine demo, away defense varies."""
+    rng = random.Random(seed)
+    home_tac = TacticsConfig(
+        offense_scheme="Spread_HeavyPnR",
+        defense_scheme="Drop",
+        scheme_weight_sharpness=1.10,
+        scheme_outcome_strength=1.05,
+        action_weight_mult={"PnR": 1.15},
+        outcome_global_mult={"SHOT_3_CS": 1.05},
+        outcome_by_action_mult={"PnR": {"PASS_SHORTROLL": 1.10}},
+        context={"PACE_MULT": 1.05},
+    )
+    away_tac = TacticsConfig(
+        offense_scheme="Drive_Kick",
+        defense_scheme=away_defense,
+        scheme_weight_sharpness=1.05,
+        scheme_outcome_strength=1.05,
+        def_scheme_weight_sharpness=1.05,
+        def_scheme_outcome_strength=1.05,
+        outcome_global_mult={"PASS_KICKOUT": 1.10},
+        context={"PACE_MULT": 1.02},
+    )
+    home_lineup = _synthetic_lineup(rng, "A", 100)
+    away_lineup = _synthetic_lineup(rng, "B", 200)
+    home = TeamState(name="AAA", lineup=home_lineup, roles=_roles(home_lineup), tactics=home_tac)
+    away = TeamState(name="BBB", lineup=away_lineup, roles=_roles(away_lineup), tactics=away_tac)
+    return home, away
+
+
+# -------------------------
+# Temp league DB (state-backed scenarios)
+# -------------------------
+
+def _write_roster_for_import(dst: Path) -> None:
+    """The shipped workbook uses Player_id/Team_id headers; import_roster_excel wants schema names."""
+    import pandas as pd
+
+    from schema import ROSTER_COL_PLAYER_ID, ROSTER_COL_TEAM_ID
+
+    df = pd.read_excel(ROSTER_XLSX)
+    df = df.rename(columns={"Player_id": ROSTER_COL_PLAYER_ID, "Team_id": ROSTER_COL_TEAM_ID})
+    df.to_excel(dst, index=False)
+
+
+@contextmanager
+def temp_league() -> Iterator[str]:
+    """Fresh league DB + reset game state for one scenario run; yields the db path."""
+    import state
+    from league_repo import LeagueRepo
+
+    workdir = Path(tempfile.mkdtemp(prefix="nba_bench_"))
+    try:
+        roster = workdir / "roster.xlsx"
+        db_path = str(workdir / "league.db")
+        _write_roster_for_import(roster)
+        with LeagueRepo(db_path) as repo:
+            repo.init_db()
+            repo.import_roster_excel(roster, mode="replace")
+
+        state.reset_state_for_dev()
+        state.set_db_path(db_path)
+        state.startup_init_state()
+        state.initialize_master_schedule_if_needed()
+        yield db_path
+    finally:
+        state.reset_state_for_dev()
+        if not os.environ.get("BENCH_KEEP_TMP"):
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,242 @@
+"""Benchmark scenarios.
+
+Each scenario is `fn(seed, size) -> ScenarioRun`: `ops` units of work done in
+`elapsed_sec`, plus a digest of the results used for the determinism check. `size`
+scales the work (games / validations); None means the scenario default.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from .fixtures import DEFENSE_SCHEMES, synthetic_teams, temp_league
+
+
+@dataclass
+class ScenarioRun:
+    ops: int
+    elapsed_sec: float
+    digest: str
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    unit: str
+    fn: Callable[[int, Optional[int]], ScenarioRun]
+    default_size: Optional[int]
+
+
+def _digest(rows: Any) -> str:
+    return hashlib.sha256(json.dumps(rows, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+# -------------------------
+# games: engine only
+# -------------------------
+
+def run_games(seed: int, size: Optional[int]) -> ScenarioRun:
+    from matchengine_v3.shot_diet import clear_style_cache
+    from matchengine_v3.sim_game import simulate_game
+
+    n = int(size or 24)
+    # Teams are built outside the timed loop (cost of the engine only).
+    matchups = [synthetic_teams(seed + i, DEFENSE_SCHEMES[i % len(DEFENSE_SCHEMES)]) for i in range(n)]
+    # shot_diet's style cache outlives a game; start every run from the same (empty) cache.
+    clear_style_cache()
+    scores: List[List[int]] = []
+    t0 = time.perf_counter()
+    for i, (home, away) in enumerate(matchups):
+        raw = simulate_game(random.Random(seed * 1000 + i), home, away)
+        teams = raw.get("teams") or {}
+        scores.append([int(teams[home.name]["PTS"]), int(teams[away.name]["PTS"])])
+    elapsed = time.perf_counter() - t0
+    return ScenarioRun(ops=n, elapsed_sec=elapsed, digest=_digest(scores))
+
+
+# -------------------------
+# season: advance_league_until over a temp league
+# -------------------------
+
+def _regular_season_end(games: List[Dict[str, Any]]) -> str:
+    dates = [str(g["date"]) for g in games if str(g.get("phase") or "regular") == "regular" and g.get("date")]
+    if not dates:
+        raise ValueError("master schedule has no regular-season games")
+    return max(dates)
+
+
+def run_season(seed: int, size: Optional[int], parallel: bool = False) -> ScenarioRun:
+    """Regular season; `size` limits it to the first N scheduled days (None = whole season).
+
+    parallel=True uses advance_league_until's day-parallel mode (same seeded results).
+    """
+    import state
+    from sim.league_sim import advance_league_until
+
+    with temp_league():
+        league = state.export_full_state_snapshot()["league"]
+        schedule = league["master_schedule"]
+        target = _regular_season_end(schedule["games"])
+        if size:
+            days = sorted(schedule.get("by_date") or {})
+            target = min(target, days[min(int(size), len(days)) - 1])
+
+        t0 = time.perf_counter()
+        simulated = advance_league_until(target, seed=seed, parallel=parallel)
+        elapsed = time.perf_counter() - t0
+
+        games = state.export_full_state_snapshot()["league"]["master_schedule"]["games"]
+        finals = sorted(
+            (g["game_id"], g.get("home_score"), g.get("away_score")) for g in games if g.get("status") == "final"
+        )
+    return ScenarioRun(
+        ops=len(simulated),
+        elapsed_sec=elapsed,
+        digest=_digest(finals),
+        extra={"target_date": target},
+    )
+
+
+# -------------------------
+# playoffs: play-in + every round
+# -------------------------
+
+def _count_postseason_games(snapshot: Dict[str, Any]) -> int:
+    n = 0
+    for conf_state in (snapshot.get("play_in") or {}).values():
+        n += sum(1 for m in (conf_state.get("matchups") or {}).values() if m and m.get("result"))
+    bracket = (snapshot.get("playoffs") or {}).get("bracket") or {}
+
+    def _walk(node: Any) -> None:
+        nonlocal n
+        if isinstance(node, dict):
+            if "best_of" in node and isinstance(node.get("games"), list):
+                n += len(node["games"])
+                return
+            for v in node.values():
+                _walk(v)
+        elif isinstance(node, list):
+            for v in node:
+                _walk(v)
+
+    _walk(bracket)
+    return n
+
+
+def run_playoffs(seed: int, size: Optional[int]) -> ScenarioRun:
+    """Random seeded field (independent of regular-season results), then auto-advance each round."""
+    import playoffs
+
+    with temp_league() as db_path:
+        from league_repo import LeagueRepo
+
+        with LeagueRepo(db_path) as repo:
+            my_team_id = sorted(repo.list_teams())[0]
+
+        # The random field draws from the module-level `random`; games use playoffs.set_game_seed.
+        random.seed(seed)
+        playoffs.set_game_seed(seed)
+        try:
+            t0 = time.perf_counter()
+            snap = playoffs.initialize_postseason(my_team_id, use_random_field=True)
+            while not snap.get("playoffs"):
+                snap = playoffs.play_my_team_play_in_game()
+            round_sec: Dict[str, float] = {}
+            while not snap.get("champion"):
+                round_name = (snap.get("playoffs") or {}).get("current_round")
+                if not round_name or round_name in round_sec:
+                    raise RuntimeError(f"playoffs did not advance (current_round={round_name!r})")
+                t_round = time.perf_counter()
+                snap = playoffs.auto_advance_current_round()
+                round_sec[round_name] = round(time.perf_counter() - t_round, 4)
+            elapsed = time.perf_counter() - t0
+        finally:
+            playoffs.set_game_seed(None)
+
+    champion = snap.get("champion")
+    return ScenarioRun(
+        ops=_count_postseason_games(snap),
+        elapsed_sec=elapsed,
+        digest=_digest({"champion": champion, "playoffs": snap.get("playoffs"), "play_in": snap.get("play_in")}),
+        extra={"round_sec": round_sec, "champion": champion.get("team_id") if isinstance(champion, dict) else champion},
+    )
+
+
+# -------------------------
+# trades: validate_deal throughput
+# -------------------------
+
+_TRADE_ROSTER_SIZE = 14
+
+
+def run_trades(seed: int, size: Optional[int]) -> ScenarioRun:
+    """Seeded one-for-one player swaps between random team pairs (valid and invalid deals alike)."""
+    import state
+    from league_repo import LeagueRepo
+    from trades.errors import TradeError
+    from trades.models import canonicalize_deal, parse_deal
+    from trades.validator import validate_deal
+
+    n = int(size or 200)
+    with temp_league() as db_path:
+        with LeagueRepo(db_path) as repo:
+            team_ids = sorted(repo.list_teams())
+            rosters = {tid: sorted(str(r["player_id"]) for r in repo.get_team_roster(tid)) for tid in team_ids}
+            # The shipped rosters run over the 15-man limit; trim them so deals reach the later
+            # rules (eligibility, salary matching) instead of all stopping at roster_limit.
+            for tid, pids in rosters.items():
+                for pid in pids[_TRADE_ROSTER_SIZE:]:
+                    repo.release_to_free_agency(pid)
+                rosters[tid] = pids[:_TRADE_ROSTER_SIZE]
+        team_ids = [tid for tid in team_ids if rosters[tid]]
+
+        rng = random.Random(seed)
+        payloads = []
+        for _ in range(n):
+            a, b = rng.sample(team_ids, 2)
+            payloads.append({
+                "teams": [a, b],
+                "legs": {
+                    a: [{"kind": "player", "player_id": rng.choice(rosters[a])}],
+                    b: [{"kind": "player", "player_id": rng.choice(rosters[b])}],
+                },
+            })
+        current_date = date.fromisoformat(str(state.get_league_context_snapshot()["season_start"]))
+
+        outcomes: List[str] = []
+        t0 = time.perf_counter()
+        for payload in payloads:
+            try:
+                validate_deal(canonicalize_deal(parse_deal(payload)), current_date=current_date)
+                outcomes.append("ok")
+            except TradeError as exc:
+                outcomes.append(str(exc.code))
+        elapsed = time.perf_counter() - t0
+
+    return ScenarioRun(
+        ops=n,
+        elapsed_sec=elapsed,
+        digest=_digest(outcomes),
+        extra={"outcomes": dict(sorted(Counter(outcomes).items()))},
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario("games", "games", run_games, 24),
+        Scenario("season", "games", run_season, None),
+        Scenario("season_parallel", "games", partial(run_season, parallel=True), None),
+        Scenario("playoffs", "games", run_playoffs, None),
+        Scenario("trades", "validations", run_trades, 200),
+    )
+}
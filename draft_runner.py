@@ -17,6 +17,7 @@ import os
 import sys
 import tempfile
 import traceback
+from copy import deepcopy
 from typing import Any, Dict, Iterable, List, Tuple
 
 
@@ -123,7 +124,8 @@ def main() -> int:
         else:
             from state import export_workflow_state
 
-            game_state = export_workflow_state()
+            # Snapshot subtrees are shared copy-on-write copies; settlement mutates its state.
+            game_state = deepcopy(export_workflow_state())
 
         _ensure_state_containers(game_state)
 
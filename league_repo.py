@@ -34,6 +34,8 @@ import json
 import logging
 import re
 import sqlite3
+import threading
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
@@ -190,6 +192,32 @@ class RosterRow:
     salary_amount: Optional[int]
 
 
+# ----------------------------
+# Roster versions
+# ----------------------------
+
+# db path -> db_uid of the file whose schema this process created/migrated (LeagueRepo.ensure_initialized)
+_INITIALIZED_DB_UIDS: Dict[str, str] = {}
+_INITIALIZED_LOCK = threading.Lock()
+
+
+def bump_roster_versions_in_cur(cur: sqlite3.Cursor, team_ids: Iterable[Any], now: Optional[str] = None) -> None:
+    """Increment roster_versions for every team in team_ids (inside the caller's transaction).
+
+    Any write that changes which players a team has (or their attributes) must call this,
+    so caches keyed by LeagueRepo.get_roster_version (sim.roster_adapter) see the change.
+    """
+    now = now or _utc_now_iso()
+    rows = sorted({str(t).upper() for t in team_ids if t})
+    cur.executemany(
+        """
+        INSERT INTO roster_versions(team_id, version, updated_at) VALUES (?, 1, ?)
+        ON CONFLICT(team_id) DO UPDATE SET version=version + 1, updated_at=excluded.updated_at;
+        """,
+        [(tid, now) for tid in rows],
+    )
+
+
 # ----------------------------
 # Repository
 # ----------------------------
@@ -381,6 +409,16 @@ class LeagueRepo:
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL
                 );
+
+                -- Roster versions (bumped by every roster move touching the team; see get_roster_version)
+                CREATE TABLE IF NOT EXISTS roster_versions (
+                    team_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+
+                -- Identifies this DB file (a recreated file at the same path gets a new uid)
+                INSERT OR IGNORE INTO meta(key, value) VALUES ('db_uid', '{uuid.uuid4().hex}');
                 """
             )
           
@@ -398,6 +436,30 @@ class LeagueRepo:
                 },
             )
 
+    def _db_uid_or_none(self) -> Optional[str]:
+        try:
+            row = self._conn.execute("SELECT value FROM meta WHERE key='db_uid';").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return str(row["value"]) if row else None
+
+    def ensure_initialized(self) -> None:
+        """init_db() once per database file per process (the DDL script is idempotent but runs on every call).
+
+        Keyed by path *and* db_uid (one indexed meta lookup per call): a file deleted and
+        recreated at the same path has no/another db_uid, so it gets the DDL again.
+        """
+        key = str(Path(self.db_path).resolve())
+        uid = self._db_uid_or_none()
+        if uid is not None and _INITIALIZED_DB_UIDS.get(key) == uid:
+            return
+        with _INITIALIZED_LOCK:
+            uid = self._db_uid_or_none()
+            if uid is not None and _INITIALIZED_DB_UIDS.get(key) == uid:
+                return
+            self.init_db()
+            _INITIALIZED_DB_UIDS[key] = self._db_uid_or_none() or ""
+
     # ------------------------
     # Draft Picks / Swaps / Fixed Assets
     # ------------------------
@@ -1309,6 +1371,7 @@ class LeagueRepo:
         self.init_db()
         with self.transaction() as cur:
 
+            prev_team_ids = [r["team_id"] for r in cur.execute("SELECT DISTINCT team_id FROM roster;").fetchall()]
             if mode == "replace":
                 cur.execute("DELETE FROM roster;")
                 cur.execute("DELETE FROM contracts;")
@@ -1349,6 +1412,7 @@ class LeagueRepo:
                 """,
                 [(r.player_id, r.team_id, r.salary_amount, now) for r in roster],
             )
+            bump_roster_versions_in_cur(cur, set(prev_team_ids) | {r.team_id for r in roster}, now)
 
         # Validate after import
         self.validate_integrity(strict_ids=strict_ids)
@@ -1421,6 +1485,32 @@ class LeagueRepo:
             out.append(d)
         return out
 
+    def get_roster_version(self, team_id: str) -> Tuple[str, int]:
+        """(db_uid, version) for team_id. Teams never touched since roster_versions existed are 0."""
+        tid = normalize_team_id(team_id, strict=True)
+        row = self._conn.execute(
+            """
+            SELECT (SELECT value FROM meta WHERE key='db_uid') AS db_uid,
+                   (SELECT version FROM roster_versions WHERE team_id=?) AS version;
+            """,
+            (str(tid),),
+        ).fetchone()
+        return str(row["db_uid"] or ""), int(row["version"] or 0)
+
+    def get_db_position(self) -> Dict[str, Any]:
+        """Where this DB stands for sim checkpoints: db_uid, every roster version, transactions_log size.
+
+        Two equal positions mean no roster move or logged transaction happened in between.
+        """
+        uid = self._conn.execute("SELECT value FROM meta WHERE key='db_uid';").fetchone()
+        versions = self._conn.execute("SELECT team_id, version FROM roster_versions ORDER BY team_id;").fetchall()
+        tx_count = self._conn.execute("SELECT COUNT(*) AS n FROM transactions_log;").fetchone()
+        return {
+            "db_uid": str(uid["value"]) if uid else "",
+            "roster_versions": {str(r["team_id"]): int(r["version"]) for r in versions},
+            "transactions": int(tx_count["n"] or 0),
+        }
+
     def get_team_id_by_player(self, player_id: str) -> str:
         pid = normalize_player_id(player_id, strict=False, allow_legacy_numeric=True)
         row = self._conn.execute(
@@ -1478,6 +1568,7 @@ class LeagueRepo:
                 "UPDATE roster SET team_id=?, updated_at=? WHERE player_id=?;",
                 (str(to_tid), now, str(pid)),
             )
+            bump_roster_versions_in_cur(cur, (exists["team_id"], to_tid), now)
             # If there's an active contract, update team_id too (optional, but helps consistency)
             cur.execute(
                 "UPDATE contracts SET team_id=?, updated_at=? WHERE player_id=? AND is_active=1;",
@@ -38,7 +38,7 @@ def _warn_limited(code: str, msg: str, *, limit: int = 5) -> None:
         logger.warning("%s %s", code, msg, exc_info=True)
     _WARN_COUNTS[code] = n + 1
 
-from league_repo import LeagueRepo
+from league_repo import LeagueRepo, bump_roster_versions_in_cur
 from schema import normalize_player_id, normalize_team_id, season_id_from_year
 
 # Contract creation helpers
@@ -291,6 +291,7 @@ class LeagueService:
             "UPDATE contracts SET team_id=?, updated_at=? WHERE player_id=? AND is_active=1;",
             (to_tid, now, pid),
         )
+        bump_roster_versions_in_cur(cur, (exists["team_id"], to_tid), now)
 
     def _set_roster_salary_in_cur(self, cur, player_id: str, salary_amount: int) -> None:
         pid = self._norm_player_id(player_id)
@@ -753,7 +753,7 @@ def adapt_matchengine_result_to_v2(
         out["replay_events"] = replay_events
 
     # Include raw only if caller asks for it.
-    # Note: state.py stores the entire game_result dict into state['game_results'].
+    # Note: state.py stores the entire game_result dict in the result store (state_result_store).
     # If you always include raw here, you'll duplicate the raw payload inside the stored v2.
     if include_raw:
         out["raw"] = raw
@@ -6,7 +6,7 @@ from collections.abc import Mapping
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from .core import apply_min_floor, apply_multipliers, apply_temperature, clamp, normalize_weights
-from .era import get_defense_meta_params
+from .era import DEFENSE_META_PARAMS
 from .tactics import TacticsConfig
 
 if TYPE_CHECKING:
@@ -30,6 +30,28 @@ def get_action_base(action: str, game_cfg: "GameConfig") -> str:
     aliases = game_cfg.action_aliases if isinstance(game_cfg.action_aliases, Mapping) else {}
     return aliases.get(action, action)
 
+# Defense scheme name canonicalization for the defense-meta tables.
+_DEFENSE_META_SCHEME_MAP: Dict[str, str] = {
+    "Switch": "Switch_Everything",
+    "SwitchEverything": "Switch_Everything",
+    "Switch_Everything": "Switch_Everything",
+    "Drop": "Drop",
+    "Hedge_ShowRecover": "Hedge_ShowRecover",
+    "Hedge": "Hedge_ShowRecover",
+    "Blitz_TrapPnR": "Blitz_TrapPnR",
+    "ICE_SidePnR": "ICE_SidePnR",
+    "ICE": "ICE_SidePnR",
+    "Zone": "Zone",
+    "Matchup_Zone": "Zone",
+    "PackLine_GapHelp": "PackLine_GapHelp",
+}
+
+
+def _defense_meta_scheme(def_tac: TacticsConfig) -> str:
+    raw = getattr(def_tac, "defense_scheme", "")
+    return _DEFENSE_META_SCHEME_MAP.get(raw, raw)
+
+
 def build_offense_action_probs(
     off_tac: TacticsConfig,
     def_tac: Optional[TacticsConfig] = None,
@@ -40,6 +62,26 @@ def build_offense_action_probs(
 
     UI rule (fixed): normalize((W_scheme[action] ^ sharpness) * off_action_mult[action] * def_opp_action_mult[action]).
     """
+    if game_cfg is None:
+        raise ValueError("build_offense_action_probs requires game_cfg")
+    probs = build_offense_action_context_probs(off_tac, def_tac, ctx=ctx, game_cfg=game_cfg)
+    if def_tac is None:
+        return probs
+    return apply_shot_diet_to_action_probs(dict(probs), ctx, game_cfg)
+
+
+def build_offense_action_context_probs(
+    off_tac: TacticsConfig,
+    def_tac: Optional[TacticsConfig] = None,
+    ctx: Optional[Dict[str, Any]] = None,
+    game_cfg: Optional["GameConfig"] = None,
+) -> Dict[str, float]:
+    """Offense action distribution BEFORE lineup (shot_diet) shaping.
+
+    Depends only on the two TacticsConfigs and the possession context
+    (is_clutch, pos_start, dead_ball_inbound), so it can be precompiled (see dist_tables).
+    When def_tac is None the result is already normalized and final.
+    """
     if game_cfg is None:
         raise ValueError("build_offense_action_probs requires game_cfg")
     scheme_weights = game_cfg.off_scheme_action_weights if isinstance(game_cfg.off_scheme_action_weights, Mapping) else {}
@@ -91,7 +133,8 @@ def build_offense_action_probs(
     if def_tac is None:
         return normalize_weights(base)
 
-    meta = get_defense_meta_params()
+    # Read-only access: get_defense_meta_params() would deep-copy the tables on every call.
+    meta = DEFENSE_META_PARAMS
     tables = meta.get("defense_meta_action_mult_tables", {})
     strength = float(meta.get("defense_meta_strength", 0.45))
     lo = float(meta.get("defense_meta_clamp_lo", 0.80))
@@ -99,34 +142,31 @@ def build_offense_action_probs(
     temp = float(meta.get("defense_meta_temperature", 1.10))
     floor = float(meta.get("defense_meta_floor", 0.03))
 
-    scheme_map = {
-        "Switch": "Switch_Everything",
-        "SwitchEverything": "Switch_Everything",
-        "Switch_Everything": "Switch_Everything",
-        "Drop": "Drop",
-        "Hedge_ShowRecover": "Hedge_ShowRecover",
-        "Hedge": "Hedge_ShowRecover",
-        "Blitz_TrapPnR": "Blitz_TrapPnR",
-        "ICE_SidePnR": "ICE_SidePnR",
-        "ICE": "ICE_SidePnR",
-        "Zone": "Zone",
-        "Matchup_Zone": "Zone",
-        "PackLine_GapHelp": "PackLine_GapHelp",
-    }
-    scheme = scheme_map.get(getattr(def_tac, "defense_scheme", ""), getattr(def_tac, "defense_scheme", ""))
-    meta_mults = tables.get(scheme, {})
+    meta_mults = tables.get(_defense_meta_scheme(def_tac), {})
     for a, mult in meta_mults.items():
         mult_final = clamp(1.0 + (float(mult) - 1.0) * strength, lo, hi)
         base[a] = base.get(a, 0.5) * mult_final
 
     probs = apply_temperature(base, temp)
-    probs = apply_min_floor(probs, floor)
+    return apply_min_floor(probs, floor)
+
+
+def apply_shot_diet_to_action_probs(
+    probs: Dict[str, float],
+    ctx: Optional[Dict[str, Any]],
+    game_cfg: "GameConfig",
+) -> Dict[str, float]:
+    """Lineup-driven (shot_diet) shaping of a context distribution; mutates+normalizes `probs`."""
     # shot_diet wiring
     if ctx is not None:
         style = ctx.get("shot_diet_style")
         tactic_name = ctx.get("tactic_name")
         if style is not None and tactic_name is not None:
-            mult_by_base = shot_diet.get_action_multipliers(style, tactic_name)
+            lineup_ctx = ctx.get("lineup_ctx")
+            if lineup_ctx is not None and lineup_ctx.matches(style, tactic_name):
+                mult_by_base = lineup_ctx.action_mult
+            else:
+                mult_by_base = shot_diet.get_action_multipliers(style, tactic_name)
             for act in list(probs.keys()):
                 base_action = get_action_base(act, game_cfg)
                 probs[act] = max(probs.get(act, 0.0) * mult_by_base.get(base_action, 1.0), 1e-6)
@@ -171,6 +211,25 @@ def build_outcome_priors(
     ctx: Optional[Dict[str, Any]] = None,
     game_cfg: Optional["GameConfig"] = None,
 ) -> Dict[str, float]:
+    if game_cfg is None:
+        raise ValueError("build_outcome_priors requires game_cfg")
+    pri = build_outcome_prior_base(action, off_tac, def_tac, tags, game_cfg=game_cfg)
+    return apply_outcome_prior_context(pri, action, def_tac, tags, ctx=ctx, game_cfg=game_cfg)
+
+
+def build_outcome_prior_base(
+    action: str,
+    off_tac: TacticsConfig,
+    def_tac: TacticsConfig,
+    tags: Dict[str, Any],
+    game_cfg: Optional["GameConfig"] = None,
+) -> Dict[str, float]:
+    """Unnormalized outcome weights from era priors + tactics only.
+
+    Depends on (action, off_tac, def_tac, tags.is_side_pnr, tags.in_transition), so it can be
+    precompiled per action (see dist_tables). Fatigue/knob/meta/shot_diet steps are applied
+    afterwards by apply_outcome_prior_context().
+    """
     if game_cfg is None:
         raise ValueError("build_outcome_priors requires game_cfg")
     base_action = get_action_base(action, game_cfg)
@@ -215,6 +274,22 @@ def build_outcome_priors(
             if o in pri:
                 pri[o] *= 0.92
 
+    return pri
+
+
+def apply_outcome_prior_context(
+    pri: Dict[str, float],
+    action: str,
+    def_tac: TacticsConfig,
+    tags: Dict[str, Any],
+    ctx: Optional[Dict[str, Any]] = None,
+    game_cfg: Optional["GameConfig"] = None,
+) -> Dict[str, float]:
+    """Apply fatigue, era knobs, defense-meta rules and shot_diet to base weights; mutates+normalizes `pri`."""
+    if game_cfg is None:
+        raise ValueError("build_outcome_priors requires game_cfg")
+    base_action = get_action_base(action, game_cfg)
+
     avg_fatigue_off = tags.get("avg_fatigue_off")
     if isinstance(avg_fatigue_off, (int, float)):
         mult = 1.0 + (1.0 - float(avg_fatigue_off)) * (float(tags.get("fatigue_bad_mult_max", 1.12)) - 1.0)
@@ -236,24 +311,8 @@ def build_outcome_priors(
             if o.startswith("FOUL_"):
                 pri[o] = pri.get(o, 0.0) * foul_base
 
-    meta = get_defense_meta_params()
-    rules = meta.get("defense_meta_priors_rules", {})
-    scheme_map = {
-        "Switch": "Switch_Everything",
-        "SwitchEverything": "Switch_Everything",
-        "Switch_Everything": "Switch_Everything",
-        "Drop": "Drop",
-        "Hedge_ShowRecover": "Hedge_ShowRecover",
-        "Hedge": "Hedge_ShowRecover",
-        "Blitz_TrapPnR": "Blitz_TrapPnR",
-        "ICE_SidePnR": "ICE_SidePnR",
-        "ICE": "ICE_SidePnR",
-        "Zone": "Zone",
-        "Matchup_Zone": "Zone",
-        "PackLine_GapHelp": "PackLine_GapHelp",
-    }
-    scheme = scheme_map.get(getattr(def_tac, "defense_scheme", ""), getattr(def_tac, "defense_scheme", ""))
-    for rule in rules.get(scheme, []):
+    rules = DEFENSE_META_PARAMS.get("defense_meta_priors_rules", {})
+    for rule in rules.get(_defense_meta_scheme(def_tac), []):
         target = rule.get("key")
         if not target:
             continue
@@ -273,7 +332,11 @@ def build_outcome_priors(
     style = context.get("shot_diet_style") if isinstance(context, Mapping) else None
     tactic_name = context.get("tactic_name") if isinstance(context, Mapping) else None
     if style is not None and tactic_name is not None:
-        out_mult = shot_diet.get_outcome_multipliers(style, tactic_name, base_action)
+        lineup_ctx = context.get("lineup_ctx")
+        if lineup_ctx is not None and lineup_ctx.matches(style, tactic_name):
+            out_mult = lineup_ctx.outcome_multipliers(base_action)
+        else:
+            out_mult = shot_diet.get_outcome_multipliers(style, tactic_name, base_action)
         for outcome in list(pri.keys()):
             pri[outcome] = max(pri.get(outcome, 0.0) * out_mult.get(outcome, 1.0), 1e-6)
 
@@ -65,6 +65,9 @@ class RoleAssignmentConfig:
     get_stat: Callable[[Any, str, float], float] = engine_get_stat
 
 
+_DEFAULT_ROLE_CONFIG = RoleAssignmentConfig()
+
+
 @dataclass
 class RoleAssignmentDetail:
     scheme: str
@@ -232,7 +235,7 @@ def get_or_build_def_role_players(
     scheme: Optional[str] = None,
     *,
     cache_key: str = "def_role_players",
-    config: RoleAssignmentConfig = RoleAssignmentConfig(),
+    config: RoleAssignmentConfig = _DEFAULT_ROLE_CONFIG,
     debug_detail_key: Optional[str] = None,
 ) -> Dict[str, Player]:
     """Lazy-build and cache role_players in ctx.
@@ -248,6 +251,18 @@ def get_or_build_def_role_players(
         # Assume mapping role->Player (possibly empty if scheme not supported).
         return cached  # type: ignore[return-value]
 
+    # Lineup-scoped assignment (see lineup_context); debug detail still takes the full build.
+    lineup_ctx = ctx.get("lineup_ctx")
+    if (
+        lineup_ctx is not None
+        and not debug_detail_key
+        and config == _DEFAULT_ROLE_CONFIG
+        and str(scheme or "") == lineup_ctx.defense_scheme
+    ):
+        role_players = lineup_ctx.def_role_players
+        ctx[cache_key] = role_players
+        return role_players
+
     if debug_detail_key:
         detail = build_def_role_players(defense, scheme, config=config, return_detail=True)
         # detail.assignment is role->pid; rebuild role->Player mapping.
@@ -263,3 +278,31 @@ def get_or_build_def_role_players(
     role_players = build_def_role_players(defense, scheme, config=config, return_detail=False)
     ctx[cache_key] = role_players
     return role_players
+
+
+def get_quality_score(
+    ctx: Dict[str, Any],
+    scheme: str,
+    base_action: str,
+    outcome: str,
+    role_players: Mapping[str, Player],
+) -> float:
+    """quality.compute_quality_score(..., get_stat=engine_get_stat) for the engine.
+
+    Reads the lineup's QualityTable when role_players is the lineup-scoped assignment from
+    get_or_build_def_role_players; otherwise computes directly. Callers that want
+    QualityDetail (ctx["debug_quality"]) call compute_quality_score(return_detail=True).
+    """
+    lineup_ctx = ctx.get("lineup_ctx")
+    table = lineup_ctx.quality_table_for(scheme, role_players) if lineup_ctx is not None else None
+    if table is not None:
+        return table.score(base_action, outcome)
+    return float(
+        quality.compute_quality_score(
+            scheme=scheme,
+            base_action=base_action,
+            outcome=outcome,
+            role_players=role_players,
+            get_stat=engine_get_stat,
+        )
+    )
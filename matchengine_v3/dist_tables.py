@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+"""Precompiled action/outcome distribution tables.
+
+The possession loop used to rebuild the offense action distribution, the defense
+action distribution and the outcome priors from scratch on every step
+(sharpening exponentials, multiplier loops, defense-meta tables, normalize),
+then sample them with a linear scan.
+
+Everything that depends only on the two TacticsConfigs and a small possession
+context key is compiled once per game and reused:
+
+- defense action distribution: fully static -> CompiledDist
+- offense action distribution: keyed by (is_clutch, pos_start, dead_ball_inbound);
+  lineup-driven shot_diet shaping is still applied per possession
+- outcome base weights: keyed by (action, is_side_pnr, in_transition);
+  fatigue / knobs / defense-meta rules / shot_diet are still applied per step
+
+Sampling
+--------
+CompiledDist stores flat key/weight/cumulative arrays plus a Walker alias table.
+
+- "cdf" (default): binary search over the cumulative array. Consumes exactly one
+  rng.random() and returns the SAME key as core.weighted_choice for the same draw,
+  so seeded games (and replay tokens) are bit-for-bit identical to the legacy path.
+- "alias": O(1) Walker/Vose alias sampling for the precompiled static tables
+  (defense actions). Also consumes exactly one rng.random() and is fully
+  reproducible under a seed, but maps draws to keys differently, so it produces
+  different (statistically equivalent) games than "cdf". Per-possession dynamic
+  weights are always sampled with the linear CDF scan.
+
+Select with rules["dist_sampler"] (see era.MVP_RULES).
+"""
+
+import random
+from bisect import bisect_left
+from typing import Any, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
+
+from .builders import (
+    apply_outcome_prior_context,
+    apply_shot_diet_to_action_probs,
+    build_defense_action_probs,
+    build_offense_action_context_probs,
+    build_outcome_prior_base,
+)
+from .core import weighted_choice
+from .tactics import TacticsConfig
+
+if TYPE_CHECKING:
+    from .game_config import GameConfig
+
+
+SAMPLER_CDF = "cdf"
+SAMPLER_ALIAS = "alias"
+SAMPLERS = (SAMPLER_CDF, SAMPLER_ALIAS)
+
+
+class CompiledDist:
+    """Immutable discrete distribution over string keys with O(log n) / O(1) samplers."""
+
+    __slots__ = ("keys", "weights", "cum", "total", "alias_prob", "alias_idx")
+
+    def __init__(self, weights: Mapping[str, float]):
+        keys = tuple(weights.keys())
+        w = tuple(max(float(v), 0.0) for v in weights.values())
+        # Same summation order as core.weighted_choice (bit-identical boundaries).
+        total = sum(max(v, 0.0) for v in weights.values())
+        cum: List[float] = []
+        upto = 0.0
+        for x in w:
+            upto += x
+            cum.append(upto)
+        self.keys: Tuple[str, ...] = keys
+        self.weights: Tuple[float, ...] = w
+        self.cum: Tuple[float, ...] = tuple(cum)
+        self.total: float = total
+        self.alias_prob, self.alias_idx = _build_alias(w, total)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.keys, self.weights))
+
+    def sample(self, rng: random.Random) -> str:
+        """Equivalent to core.weighted_choice(rng, weights) for the same RNG state."""
+        keys = self.keys
+        total = self.total
+        if total <= 1e-12:
+            return keys[0]
+        r = rng.random() * total
+        i = bisect_left(self.cum, r)
+        return keys[i] if i < len(keys) else keys[0]
+
+    def sample_alias(self, rng: random.Random) -> str:
+        """O(1) Walker alias draw (one rng.random() per call)."""
+        keys = self.keys
+        n = len(keys)
+        if self.total <= 1e-12:
+            return keys[0]
+        x = rng.random() * n
+        i = int(x)
+        if i >= n:
+            i = n - 1
+        return keys[i] if (x - i) < self.alias_prob[i] else keys[self.alias_idx[i]]
+
+
+def _build_alias(weights: Tuple[float, ...], total: float) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+    """Vose's alias method (deterministic construction order)."""
+    n = len(weights)
+    if n == 0 or total <= 1e-12:
+        return tuple(1.0 for _ in range(n)), tuple(range(n))
+    scaled = [w * n / total for w in weights]
+    prob = [0.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = (scaled[l] + scaled[s]) - 1.0
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+    for i in large + small:
+        prob[i] = 1.0
+    return tuple(prob), tuple(alias)
+
+
+def compile_dist(weights: Mapping[str, float]) -> CompiledDist:
+    return CompiledDist(weights)
+
+
+def sample_weights(rng: random.Random, weights: Mapping[str, float]) -> str:
+    """Sample a one-off (dynamic) weight dict with a linear CDF scan, whatever dist_sampler is.
+
+    Building an alias table costs O(n) plus allocations, so it only pays off for tables
+    drawn many times: only the precompiled static tables (defense actions) benefit from
+    the "alias" sampler; per-possession offense/outcome draws stay O(n).
+    """
+    return weighted_choice(rng, weights if isinstance(weights, dict) else dict(weights))
+
+
+class PossessionDistTables:
+    """Per-game compiled tables for one (offense tactics, defense tactics) pairing.
+
+    Tactics are sanitized once at game start and treated as immutable for the rest of
+    the game, so tables are filled lazily on first use of each context key.
+    """
+
+    def __init__(
+        self,
+        off_tac: TacticsConfig,
+        def_tac: TacticsConfig,
+        game_cfg: "GameConfig",
+        sampler: str = SAMPLER_CDF,
+    ) -> None:
+        if sampler not in SAMPLERS:
+            raise ValueError(f"unknown dist sampler '{sampler}' (expected one of {SAMPLERS})")
+        self.off_tac = off_tac
+        self.def_tac = def_tac
+        self.game_cfg = game_cfg
+        self.sampler = sampler
+        self.defense_dist = CompiledDist(build_defense_action_probs(def_tac, game_cfg=game_cfg))
+        self._off_ctx: Dict[Tuple[bool, str, bool], Dict[str, float]] = {}
+        self._outcome_base: Dict[Tuple[str, bool, bool], Dict[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    # ---- keys ----
+    @staticmethod
+    def offense_context_key(ctx: Optional[Mapping[str, Any]]) -> Tuple[bool, str, bool]:
+        c = ctx or {}
+        return (bool(c.get("is_clutch")), str(c.get("pos_start", "")), bool(c.get("dead_ball_inbound", False)))
+
+    @staticmethod
+    def outcome_key(action: str, tags: Mapping[str, Any]) -> Tuple[str, bool, bool]:
+        return (action, bool(tags.get("is_side_pnr", False)), bool(tags.get("in_transition", False)))
+
+    # ---- tables ----
+    def offense_action_probs(self, ctx: Optional[Dict[str, Any]]) -> Dict[str, float]:
+        """Same result as builders.build_offense_action_probs(off_tac, def_tac, ctx, game_cfg)."""
+        key = self.offense_context_key(ctx)
+        base = self._off_ctx.get(key)
+        if base is None:
+            self.misses += 1
+            base = build_offense_action_context_probs(self.off_tac, self.def_tac, ctx=ctx, game_cfg=self.game_cfg)
+            self._off_ctx[key] = base
+        else:
+            self.hits += 1
+        return apply_shot_diet_to_action_probs(dict(base), ctx, self.game_cfg)
+
+    def outcome_priors(self, action: str, tags: Dict[str, Any], ctx: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+        """Same result as builders.build_outcome_priors(action, off_tac, def_tac, tags, ctx, game_cfg)."""
+        key = self.outcome_key(action, tags)
+        base = self._outcome_base.get(key)
+        if base is None:
+            self.misses += 1
+            base = build_outcome_prior_base(action, self.off_tac, self.def_tac, tags, game_cfg=self.game_cfg)
+            self._outcome_base[key] = base
+        else:
+            self.hits += 1
+        return apply_outcome_prior_context(dict(base), action, self.def_tac, tags, ctx=ctx, game_cfg=self.game_cfg)
+
+    # ---- sampling ----
+    def sample_defense_action(self, rng: random.Random) -> str:
+        if self.sampler == SAMPLER_ALIAS:
+            return self.defense_dist.sample_alias(rng)
+        return self.defense_dist.sample(rng)
+
+    def sample(self, rng: random.Random, weights: Mapping[str, float]) -> str:
+        return sample_weights(rng, weights)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "sampler": self.sampler,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "offense_context_tables": len(self._off_ctx),
+            "outcome_tables": len(self._outcome_base),
+        }
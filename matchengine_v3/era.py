@@ -100,6 +100,15 @@ MVP_RULES = {
         "on_court_per_sec": 0.0010,  # 코트 위에 있던 선수의 휴식 회복(초당)
         "bench_per_sec": 0.0016,     # 벤치 선수의 휴식 회복(초당)
     },
+    # Distribution sampler for compiled tables (see dist_tables):
+    # "cdf" reproduces legacy weighted_choice draws exactly; "alias" is O(1) Walker alias sampling
+    # for the precompiled static tables only (per-possession draws always use the linear scan).
+    "dist_sampler": "cdf",
+    # LineupContext fatigue bucket (see lineup_context): width on each side's mean on-court energy.
+    # 0.0 keys on exact energies and reproduces legacy games exactly, so contexts are only shared
+    # within a possession (no cross-possession reuse); e.g. 0.05 trades fatigue resolution for a
+    # little reuse across possessions (substitutions limit it; see lineup_context).
+    "lineup_energy_bucket": 0.0,
     "shot_clock": 24,
     "orb_reset": 14,
     "foul_reset": 14,
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""Process-wide compiled era registry.
+
+`simulate_game` used to call `load_era_config` + `build_game_config` for every
+game: re-open and re-parse the era JSON, re-run `validate_and_fill_era_dict`,
+then deep-copy and re-freeze the whole thing. The result only depends on the
+era source, so we compile it once per (era name, file signature) and hand out
+the same immutable `GameConfig` afterwards.
+
+Cache keys:
+- era name (str): resolved file path + (mtime_ns, size) of that file
+  (or "builtin" when no file exists and built-in defaults are used)
+- era dict (custom): sha256 of the canonical JSON dump of the dict
+
+The file signature is re-checked at most once per `stat_interval_sec`, so a hit
+normally does not touch disk at all. `invalidate_era()` drops entries explicitly.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .era import _resolve_era_path, load_era_config
+from .game_config import GameConfig, build_game_config
+from .validation import AllowedSets, ValidationConfig, build_allowed_sets
+
+
+@dataclass(frozen=True)
+class CompiledEra:
+    """Immutable, pre-validated era bundle shared by every game using it."""
+    name: str
+    signature: Tuple[Any, ...]
+    game_cfg: GameConfig
+    allowed: AllowedSets
+    warnings: Tuple[str, ...]
+    errors: Tuple[str, ...]
+    # Knob clamp bounds derived from era.knobs (None -> keep ValidationConfig default)
+    mult_lo: Optional[float]
+    mult_hi: Optional[float]
+
+    def validation_config(self, strict: bool = True) -> ValidationConfig:
+        """Return a fresh ValidationConfig with this era's knob clamp bounds applied."""
+        cfg = ValidationConfig(strict=strict)
+        if self.mult_lo is not None:
+            cfg.mult_lo = self.mult_lo
+        if self.mult_hi is not None:
+            cfg.mult_hi = self.mult_hi
+        return cfg
+
+
+def _file_signature(path: Optional[str]) -> Tuple[Any, ...]:
+    if path is None:
+        return ("builtin",)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ("missing", path)
+    return ("file", path, st.st_mtime_ns, st.st_size)
+
+
+def _dict_signature(raw: Dict[str, Any]) -> Tuple[Any, ...]:
+    try:
+        blob = json.dumps(raw, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    except Exception:
+        blob = repr(raw).encode("utf-8")
+    return ("dict", hashlib.sha256(blob).hexdigest())
+
+
+def _knob_float(knobs: Any, key: str) -> Optional[float]:
+    v = knobs.get(key) if hasattr(knobs, "get") else None
+    return float(v) if isinstance(v, (int, float)) else None
+
+
+def compile_era(era: Any, signature: Optional[Tuple[Any, ...]] = None) -> CompiledEra:
+    """Load + validate + freeze an era (uncached)."""
+    era_cfg, warnings, errors = load_era_config(era)
+    game_cfg = build_game_config(era_cfg)
+    if signature is None:
+        signature = _dict_signature(era) if isinstance(era, dict) else _file_signature(_resolve_era_path(str(era or "default")))
+    return CompiledEra(
+        name=str(game_cfg.era.get("name", era if isinstance(era, str) else "custom")),
+        signature=signature,
+        game_cfg=game_cfg,
+        allowed=build_allowed_sets(game_cfg),
+        warnings=tuple(warnings),
+        errors=tuple(errors),
+        mult_lo=_knob_float(game_cfg.knobs, "mult_lo"),
+        mult_hi=_knob_float(game_cfg.knobs, "mult_hi"),
+    )
+
+
+class EraRegistry:
+    """Thread-safe cache of CompiledEra entries with hit/miss counters."""
+
+    def __init__(self, stat_interval_sec: float = 2.0) -> None:
+        self.stat_interval_sec = float(stat_interval_sec)
+        self._lock = threading.Lock()
+        # era name -> (compiled, last_stat_check_monotonic)
+        self._by_name: Dict[str, Tuple[CompiledEra, float]] = {}
+        # dict signature -> compiled
+        self._by_dict: Dict[Tuple[Any, ...], CompiledEra] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get(self, era: Any = "default") -> CompiledEra:
+        if isinstance(era, dict):
+            return self._get_dict(era)
+        return self._get_named(str(era or "default"))
+
+    def _get_dict(self, raw: Dict[str, Any]) -> CompiledEra:
+        sig = _dict_signature(raw)
+        with self._lock:
+            hit = self._by_dict.get(sig)
+            if hit is not None:
+                self._hits += 1
+                return hit
+        compiled = compile_era(raw, signature=sig)
+        with self._lock:
+            self._misses += 1
+            self._by_dict[sig] = compiled
+        return compiled
+
+    def _get_named(self, name: str) -> CompiledEra:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._by_name.get(name)
+        if entry is not None:
+            compiled, checked_at = entry
+            if now - checked_at < self.stat_interval_sec:
+                with self._lock:
+                    self._hits += 1
+                return compiled
+            sig = _file_signature(_resolve_era_path(name))
+            if sig == compiled.signature:
+                with self._lock:
+                    self._hits += 1
+                    self._by_name[name] = (compiled, now)
+                return compiled
+        else:
+            sig = _file_signature(_resolve_era_path(name))
+
+        compiled = compile_era(name, signature=sig)
+        with self._lock:
+            self._misses += 1
+            self._by_name[name] = (compiled, now)
+        return compiled
+
+    def invalidate(self, era: Optional[Any] = None) -> int:
+        """Drop one era (name or dict) or, with no argument, every entry. Returns #entries dropped."""
+        with self._lock:
+            if era is None:
+                dropped = len(self._by_name) + len(self._by_dict)
+                self._by_name.clear()
+                self._by_dict.clear()
+            elif isinstance(era, dict):
+                dropped = 1 if self._by_dict.pop(_dict_signature(era), None) is not None else 0
+            else:
+                dropped = 1 if self._by_name.pop(str(era or "default"), None) is not None else 0
+            self._invalidations += dropped
+            return dropped
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "hit_rate": (self._hits / total) if total else 0.0,
+                "entries": len(self._by_name) + len(self._by_dict),
+                "eras": sorted(self._by_name.keys()),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._invalidations = 0
+
+
+_REGISTRY = EraRegistry()
+
+
+def get_compiled_era(era: Any = "default") -> CompiledEra:
+    """Return the process-wide CompiledEra for `era` (name or dict)."""
+    return _REGISTRY.get(era)
+
+
+def invalidate_era(era: Optional[Any] = None) -> int:
+    """Explicitly invalidate one era (or all when `era` is None)."""
+    return _REGISTRY.invalidate(era)
+
+
+def era_registry_stats() -> Dict[str, Any]:
+    return _REGISTRY.stats()
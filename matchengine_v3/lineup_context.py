@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+"""Lineup-scoped possession context (on-court aggregates reused across a stint).
+
+simulate_possession used to recompute, on every possession (and team_def_snapshot on
+every resolve step):
+
+- shot_diet.compute_shot_diet_style (on-court style vector)
+- shot_diet.get_action_multipliers / get_outcome_multipliers over that style
+- def_role_players.build_def_role_players (defensive role assignment)
+- defense.team_def_snapshot
+- quality.compute_quality_score over that assignment (tabulated as a quality.QualityTable)
+
+All of them only depend on who is on the floor, the role/scheme settings and the
+players' energy, so they are bundled into a LineupContext built once per
+(offense five, defense five, fatigue bucket) and reused until a substitution or a
+fatigue bucket change produces a new key.
+
+Fatigue bucket
+--------------
+rules["lineup_energy_bucket"] (see era.MVP_RULES) is the bucket width applied to each
+side's mean on-court energy. Aggregates are computed with the energies seen when the
+context is first built (same idea as shot_diet's bucketed style cache), so a wider
+bucket trades a little fatigue resolution for more reuse. The default (0.0) keys on
+exact energies, which reproduces the uncached results bit-for-bit: the context is then
+shared by every resolve step of a possession (team_def_snapshot and the shot_diet
+multipliers used to be recomputed per step/outcome), but cross-possession reuse is OFF
+by default (reuse_rate 0.0). Energies change every possession, and the rotation
+substitutes on most dead balls, so even a bucket > 0 reuses little: on 80 seeded
+synthetic games, 0.05 -> 6%, 0.25 -> 15%, 1.0 (energy ignored) -> 19% of lookups, with
+no measurable throughput gain and box-score means within one standard error.
+
+Stats (hits/misses/reuse_rate) are reported in result["meta"]["internal_debug"]["lineup_context"].
+
+The cache is per game (created by simulate_game next to the dist tables), so results
+never depend on what another game left behind.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from . import shot_diet
+from .def_role_players import build_def_role_players, engine_get_stat
+from .defense import team_def_snapshot
+from .models import Player, TeamState
+from .quality import QualityTable, canonical_scheme
+from .shot_diet import ShotDietStyle
+
+DEFAULT_LINEUP_ENERGY_BUCKET = 0.0
+
+# A game sees a few hundred distinct keys at most; the bound only guards odd callers.
+_LINEUP_CACHE_MAX = 1024
+
+
+def _energy(p: Player) -> float:
+    return float(getattr(p, "energy", 1.0))
+
+
+class LineupContext:
+    """Aggregates for one (offense five, defense five, fatigue bucket) key."""
+
+    __slots__ = (
+        "key",
+        "tactic_name",
+        "defense_scheme",
+        "shot_diet_style",
+        "action_mult",
+        "_defense",
+        "_def_role_players",
+        "_def_snapshot",
+        "_quality_table",
+        "_outcome_mult",
+        "uses",
+    )
+
+    def __init__(
+        self,
+        key: Tuple[Any, ...],
+        offense: TeamState,
+        defense: TeamState,
+        game_state: Any = None,
+        ctx: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.key = key
+        self.tactic_name: Optional[str] = getattr(offense.tactics, "offense_scheme", None)
+        self.defense_scheme: str = str(getattr(defense.tactics, "defense_scheme", ""))
+        self.shot_diet_style: ShotDietStyle = shot_diet.compute_shot_diet_style(
+            offense, defense, game_state=game_state, ctx=ctx
+        )
+        self.action_mult: Optional[Dict[str, float]] = (
+            shot_diet.get_action_multipliers(self.shot_diet_style, self.tactic_name)
+            if self.tactic_name is not None
+            else None
+        )
+        # Defensive aggregates are filled on first use (not every possession needs them).
+        self._defense = defense
+        self._def_role_players: Optional[Dict[str, Player]] = None
+        self._def_snapshot: Optional[Dict[str, float]] = None
+        self._quality_table: Optional[QualityTable] = None
+        self._outcome_mult: Dict[str, Dict[str, float]] = {}
+        self.uses = 0
+
+    @property
+    def def_role_players(self) -> Dict[str, Player]:
+        """def_role_players.build_def_role_players for this lineup's defense scheme."""
+        if self._def_role_players is None:
+            self._def_role_players = build_def_role_players(self._defense, self.defense_scheme, return_detail=False)
+        return self._def_role_players
+
+    @property
+    def def_snapshot(self) -> Dict[str, float]:
+        """defense.team_def_snapshot for this lineup."""
+        if self._def_snapshot is None:
+            self._def_snapshot = team_def_snapshot(self._defense)
+        return self._def_snapshot
+
+    @property
+    def quality_table(self) -> QualityTable:
+        """quality.QualityTable over def_role_players (quality scores for this defensive lineup)."""
+        if self._quality_table is None:
+            self._quality_table = QualityTable(self.defense_scheme, self.def_role_players, get_stat=engine_get_stat)
+        return self._quality_table
+
+    def quality_table_for(self, scheme: str, role_players: Any) -> Optional[QualityTable]:
+        """quality_table if `role_players` is this lineup's assignment for `scheme`, else None."""
+        if self._def_role_players is None or role_players is not self._def_role_players:
+            return None
+        table = self.quality_table
+        return table if table.scheme == canonical_scheme(scheme) else None
+
+    def outcome_multipliers(self, base_action: str) -> Dict[str, float]:
+        """shot_diet.get_outcome_multipliers for this lineup's style (filled per base action)."""
+        mult = self._outcome_mult.get(base_action)
+        if mult is None:
+            mult = shot_diet.get_outcome_multipliers(self.shot_diet_style, self.tactic_name, base_action)
+            self._outcome_mult[base_action] = mult
+        return mult
+
+    def matches(self, style: Any, tactic_name: Any) -> bool:
+        """True if (style, tactic_name) read back from ctx are still the ones this context was built for."""
+        return style is self.shot_diet_style and tactic_name == self.tactic_name
+
+
+class LineupContextCache:
+    """Per-game LineupContext store with reuse counters."""
+
+    def __init__(self, energy_bucket: float = DEFAULT_LINEUP_ENERGY_BUCKET) -> None:
+        self.energy_bucket = float(energy_bucket)
+        self._contexts: "OrderedDict[Tuple[Any, ...], LineupContext]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _energy_key(self, off_players, defense: TeamState) -> Tuple[Any, ...]:
+        # team_def_snapshot reads the whole defensive lineup (bench energies included).
+        if self.energy_bucket <= 0.0:
+            return (
+                tuple(_energy(p) for p in off_players),
+                tuple(_energy(p) for p in defense.lineup),
+            )
+        bw = self.energy_bucket
+        def_players = defense.on_court_players()
+        off_mean = sum(_energy(p) for p in off_players) / max(len(off_players), 1)
+        def_mean = sum(_energy(p) for p in def_players) / max(len(def_players), 1)
+        return (int(round(off_mean / bw)), int(round(def_mean / bw)))
+
+    def lineup_key(self, offense: TeamState, defense: TeamState) -> Tuple[Any, ...]:
+        off_players = offense.on_court_players()
+        return (
+            offense.name,
+            tuple(sorted(p.pid for p in off_players)),
+            tuple(sorted(defense.on_court_pids)),
+            self._energy_key(off_players, defense),
+            getattr(offense.tactics, "offense_scheme", None),
+            getattr(defense.tactics, "defense_scheme", None),
+            # shot_diet initiators/screeners and fixed defensive roles come from team.roles.
+            tuple(sorted((offense.roles or {}).items())),
+            tuple(sorted((defense.roles or {}).items())),
+        )
+
+    def get(
+        self,
+        offense: TeamState,
+        defense: TeamState,
+        game_state: Any = None,
+        ctx: Optional[Dict[str, Any]] = None,
+    ) -> LineupContext:
+        key = self.lineup_key(offense, defense)
+        lctx = self._contexts.get(key)
+        if lctx is None:
+            self.misses += 1
+            lctx = LineupContext(key, offense, defense, game_state=game_state, ctx=ctx)
+            self._contexts[key] = lctx
+            while len(self._contexts) > _LINEUP_CACHE_MAX:
+                self._contexts.popitem(last=False)
+        else:
+            self.hits += 1
+            self._contexts.move_to_end(key)
+        lctx.uses += 1
+        return lctx
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "energy_bucket": self.energy_bucket,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reuse_rate": (self.hits / total) if total else 0.0,
+            "contexts": len(self._contexts),
+        }
@@ -39,29 +39,177 @@ class GameState:
     targets_sec_home: Dict[str, int] = field(default_factory=dict)
     targets_sec_away: Dict[str, int] = field(default_factory=dict)
 
-@dataclass
+# -------------------------
+# Derived ability vector
+# -------------------------
+# Derived keys get a process-wide fixed index on first sight, so each Player can keep its
+# derived stats as a flat float list and hot paths can look a stat up by index (O(1), no
+# dict hashing, no float() coercion). Indices are stable for the life of the process.
+
+DERIVED_KEYS: List[str] = []
+DERIVED_KEY_INDEX: Dict[str, int] = {}
+
+FATIGUE_FLOOR = 0.82  # energy=0.0 -> floor (기존 0.82 유지)
+FATIGUE_GAMMA = 1.35  # (선택) 피로가 후반에 더 급격히 체감되게 하는 커브. 원하면 1.0(선형)로.
+
+
+def derived_key_index(key: str) -> int:
+    """Index of `key` in every Player's ability vector (registered on first use)."""
+    idx = DERIVED_KEY_INDEX.get(key)
+    if idx is None:
+        idx = len(DERIVED_KEYS)
+        DERIVED_KEYS.append(key)
+        DERIVED_KEY_INDEX[key] = idx
+    return idx
+
+
+def fatigue_multiplier(energy: float) -> float:
+    """단일 피로 스케일(0..1 에너지) -> 능력치 배율. energy=1.0 -> 1.00, energy=0.0 -> FATIGUE_FLOOR."""
+    e = clamp(float(energy), 0.0, 1.0)
+    severity = (1.0 - e) ** FATIGUE_GAMMA
+    return 1.0 - severity * (1.0 - FATIGUE_FLOOR)
+
+
+class DerivedStats(dict):
+    """dict of derived stats that bumps `version` on every mutation (invalidates Player vectors)."""
+
+    version = 0
+
+    def _touch(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._touch()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._touch()
+        return self
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._touch()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._touch()
+        return super().setdefault(key, default)
+
+    def pop(self, key, *args):
+        self._touch()
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self._touch()
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self._touch()
+
+
+@dataclass(init=False, repr=False)
 class Player:
+    """One player's ratings and live energy.
+
+    `derived` and `energy` are properties over the private `_derived` / `_energy` fields:
+    assigning `derived` wraps it in DerivedStats (a plain dict is copied, not aliased: later
+    edits go through player.derived) and drops the ability vector; assigning `energy`
+    recomputes the cached fatigue multiplier only when the value actually changes (sim_game
+    syncs it from the fatigue maps that sim_fatigue updates, once per possession).
+    Equality compares pid / name / pos / derived / energy, as before.
+    """
+
     pid: str
     name: str
     pos: str = "G"
-    derived: Dict[str, float] = field(default_factory=dict)
-    energy: float = 1.0  # 1.0 fresh -> 0.0 exhausted  (단일 스케일과 동일한 의미)
+    _derived: DerivedStats = field(default_factory=DerivedStats)
+    _energy: float = 1.0  # 1.0 fresh -> 0.0 exhausted  (단일 스케일과 동일한 의미)
+    _fatigue_mult: float = field(default=1.0, compare=False)
+    _vec: Optional[List[float]] = field(default=None, compare=False)
+    _vec_version: int = field(default=-1, compare=False)
+
+    def __init__(
+        self,
+        pid: str,
+        name: str,
+        pos: str = "G",
+        derived: Optional[Dict[str, float]] = None,
+        energy: float = 1.0,
+    ) -> None:
+        self.pid = pid
+        self.name = name
+        self.pos = pos
+        self.derived = derived if derived is not None else {}
+        self.energy = energy
+
+    def __repr__(self) -> str:
+        return (
+            f"Player(pid={self.pid!r}, name={self.name!r}, pos={self.pos!r}, "
+            f"derived={dict(self._derived)!r}, energy={self._energy!r})"
+        )
+
+    @property
+    def derived(self) -> Dict[str, float]:
+        return self._derived
+
+    @derived.setter
+    def derived(self, value: Dict[str, float]) -> None:
+        self._derived = value if isinstance(value, DerivedStats) else DerivedStats(value or {})
+        self._vec = None
+
+    @property
+    def energy(self) -> float:
+        return self._energy
+
+    @energy.setter
+    def energy(self, value: float) -> None:
+        if self.__dict__.get("_energy") == value and "_fatigue_mult" in self.__dict__:
+            return
+        self._energy = value
+        self._fatigue_mult = fatigue_multiplier(value)
+
+    def _build_vec(self) -> Optional[List[float]]:
+        derived = self._derived
+        idxs = [derived_key_index(k) for k in derived]
+        vec: Optional[List[float]] = [DERIVED_DEFAULT] * len(DERIVED_KEYS)
+        try:
+            for i, v in zip(idxs, derived.values()):
+                vec[i] = float(v)
+        except (TypeError, ValueError):
+            # Unsanitized derived (non-numeric values): stay on the dict path so errors surface per key.
+            vec = None
+        self._vec = vec
+        self._vec_version = derived.version
+        return vec
+
+    def stat(self, idx: int, fatigue_sensitive: bool = True) -> float:
+        """Derived stat by ability-vector index (see derived_key_index)."""
+        vec = self._vec
+        if vec is None or self._vec_version != self._derived.version or idx >= len(vec):
+            vec = self._build_vec()
+            if vec is None or idx >= len(vec):
+                v = float(self._derived.get(DERIVED_KEYS[idx], DERIVED_DEFAULT))
+                return v * self._fatigue_mult if fatigue_sensitive else v
+        if fatigue_sensitive:
+            return vec[idx] * self._fatigue_mult
+        return vec[idx]
 
     def get(self, key: str, fatigue_sensitive: bool = True) -> float:
-        v = float(self.derived.get(key, DERIVED_DEFAULT))
-        if not fatigue_sensitive:
-            return v
-
-        # 단일 피로 스케일(0..1 에너지)을 능력치에 반영
-        e = clamp(float(getattr(self, "energy", 1.0)), 0.0, 1.0)
-
-        # energy=1.0 -> 1.00, energy=0.0 -> floor (기존 0.82 유지)
-        floor = 0.82
-        gamma = 1.35  # (선택) 피로가 후반에 더 급격히 체감되게 하는 커브. 원하면 1.0(선형)로.
+        # Thin compatibility wrapper over stat(); the common case is inlined.
+        idx = DERIVED_KEY_INDEX.get(key)
+        vec = self._vec
+        if idx is None or vec is None or self._vec_version != self._derived.version or idx >= len(vec):
+            return self.stat(derived_key_index(key), fatigue_sensitive)
+        if fatigue_sensitive:
+            return vec[idx] * self._fatigue_mult
+        return vec[idx]
 
-        severity = (1.0 - e) ** gamma
-        f = 1.0 - severity * (1.0 - floor)
-        return v * f
 
 @dataclass
 class TeamState:
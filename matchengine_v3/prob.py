@@ -19,6 +19,44 @@ if TYPE_CHECKING:
 # Probability model
 # -------------------------
 
+def logistic_sensitivity(game_cfg: "GameConfig", kind: str = "default") -> float:
+    """Per-kind logit slope for (off_score - def_score), externalized in the era file (logistic_params)."""
+    pm = game_cfg.prob_model if isinstance(game_cfg.prob_model, Mapping) else DEFAULT_PROB_MODEL
+    lp = game_cfg.logistic_params if isinstance(game_cfg.logistic_params, Mapping) else DEFAULT_LOGISTIC_PARAMS
+    spec = lp.get(kind) or lp.get("default") or {}
+    sens = spec.get("sensitivity")
+    scale = spec.get("scale")
+
+    # Back-compat fallback (older era json without logistic_params)
+    if sens is None:
+        if scale is not None and float(scale) > 1e-9:
+            sens = 1.0 / float(scale)
+        else:
+            # old single-scale knobs
+            if kind.startswith("pass"):
+                sens = 1.0 / float(pm.get("pass_scale", 20.0))
+            elif kind.startswith("rebound"):
+                sens = 1.0 / float(pm.get("rebound_scale", 22.0))
+            else:
+                sens = 1.0 / float(pm.get("shot_scale", 18.0))
+    return float(sens)
+
+
+def logit_noise_std(game_cfg: "GameConfig", kind: str = "default", variance_mult: float = 1.0) -> float:
+    """Std of the logit-space Gaussian noise for `kind` (variance knob 2-3, team multiplier clamped)."""
+    vp = game_cfg.variance_params if isinstance(game_cfg.variance_params, Mapping) else DEFAULT_VARIANCE_PARAMS
+    std = float(vp.get("logit_noise_std", 0.0))
+    kind_mult = float((vp.get("kind_mult") or {}).get(kind, 1.0)) if isinstance(vp.get("kind_mult"), Mapping) else 1.0
+    # team volatility multiplier (clamped)
+    tlo, thi = 0.70, 1.40
+    if isinstance(vp.get("team_mult_lo"), (int, float)):
+        tlo = float(vp["team_mult_lo"])
+    if isinstance(vp.get("team_mult_hi"), (int, float)):
+        thi = float(vp["team_mult_hi"])
+    vm = clamp(float(variance_mult), tlo, thi)
+    return std * kind_mult * vm
+
+
 def prob_from_scores(
     rng: Optional[random.Random],
     base_p: float,
@@ -46,41 +84,12 @@ def prob_from_scores(
     base_p = clamp(float(base_p), float(pm.get("base_p_min", 0.02)), float(pm.get("base_p_max", 0.98)))
     base_logit = math.log(base_p / (1.0 - base_p))
 
-    # ---- sensitivity (2-1, 2-2) ----
-    lp = game_cfg.logistic_params if isinstance(game_cfg.logistic_params, Mapping) else DEFAULT_LOGISTIC_PARAMS
-    spec = lp.get(kind) or lp.get("default") or {}
-    sens = spec.get("sensitivity")
-    scale = spec.get("scale")
-
-    # Back-compat fallback (older era json without logistic_params)
-    if sens is None:
-        if scale is not None and float(scale) > 1e-9:
-            sens = 1.0 / float(scale)
-        else:
-            # old single-scale knobs
-            if kind.startswith("pass"):
-                sens = 1.0 / float(pm.get("pass_scale", 20.0))
-            elif kind.startswith("rebound"):
-                sens = 1.0 / float(pm.get("rebound_scale", 22.0))
-            else:
-                sens = 1.0 / float(pm.get("shot_scale", 18.0))
-
-    gap = (float(off_score) - float(def_score)) * float(sens)
+    gap = (float(off_score) - float(def_score)) * logistic_sensitivity(game_cfg, kind)
 
     # ---- variance knob (2-3) ----
     noise = 0.0
     if rng is not None:
-        vp = game_cfg.variance_params if isinstance(game_cfg.variance_params, Mapping) else DEFAULT_VARIANCE_PARAMS
-        std = float(vp.get("logit_noise_std", 0.0))
-        kind_mult = float((vp.get("kind_mult") or {}).get(kind, 1.0)) if isinstance(vp.get("kind_mult"), Mapping) else 1.0
-        # team volatility multiplier (clamped)
-        tlo, thi = 0.70, 1.40
-        if isinstance(vp.get("team_mult_lo"), (int, float)):
-            tlo = float(vp["team_mult_lo"])
-        if isinstance(vp.get("team_mult_hi"), (int, float)):
-            thi = float(vp["team_mult_hi"])
-        vm = clamp(float(variance_mult), tlo, thi)
-        std = std * kind_mult * vm
+        std = logit_noise_std(game_cfg, kind, variance_mult)
         if std > 1e-9:
             noise = rng.gauss(0.0, std)
 
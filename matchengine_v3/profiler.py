@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+"""Opt-in hot-path profiler for the match engine.
+
+Disabled by default. When disabled, new_profile() returns None and every instrumented
+call site is a single `if prof is not None` check, so seeded games and timings are
+unaffected.
+
+Enable with the MATCHENGINE_PROFILE=1 environment variable or profiler.enable(). Each
+simulate_game then carries an EngineProfile (wall time + call count per phase) that is
+reported as result["meta"]["engine_profile"] and folded into process-wide totals
+(totals() / reset_totals()); sim.league_sim adds the v2 adapter time and aggregates
+per advance_league_until run.
+
+Phases
+------
+- possession_setup: per-possession prep (on-court/energy sync, ctx, team style, inbound, lineup context)
+- priors:           offense action probs + outcome priors (incl. role fit / quality turnover adjustment)
+- resolve:          resolve.resolve_outcome (includes participants)
+- participants:     participant selection inside resolve_outcome
+- rotation:         sim_rotation._perform_rotation
+- fatigue:          sim_fatigue._apply_fatigue_loss / _apply_break_recovery
+- replay_token:     core.make_replay_token
+- v2_adapter:       matchengine_v2_adapter.adapt_matchengine_result_to_v2 (league_sim only)
+
+Nested phases are also counted in their parent, so phase times do not sum to the game time.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Mapping, Optional
+
+PHASES = (
+    "possession_setup",
+    "priors",
+    "resolve",
+    "participants",
+    "rotation",
+    "fatigue",
+    "replay_token",
+    "v2_adapter",
+)
+
+_ENABLED = os.environ.get("MATCHENGINE_PROFILE", "").strip().lower() in ("1", "true", "yes", "on")
+
+_TOTALS_LOCK = threading.Lock()
+
+
+class EngineProfile:
+    """Accumulated wall time (seconds) and call counts per phase."""
+
+    __slots__ = ("sec", "calls", "games", "game_sec")
+
+    def __init__(self) -> None:
+        self.sec: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.games = 0
+        self.game_sec = 0.0
+
+    def add(self, phase: str, dt: float, calls: int = 1) -> None:
+        self.sec[phase] = self.sec.get(phase, 0.0) + dt
+        self.calls[phase] = self.calls.get(phase, 0) + calls
+
+    def merge(self, other: "EngineProfile") -> None:
+        for phase, dt in other.sec.items():
+            self.add(phase, dt, other.calls.get(phase, 0))
+        self.games += other.games
+        self.game_sec += other.game_sec
+
+    def merge_dict(self, data: Mapping[str, Any]) -> None:
+        """Merge a to_dict() payload (e.g. raw_result["meta"]["engine_profile"])."""
+        for phase, row in (data.get("phases") or {}).items():
+            self.add(phase, float(row.get("sec", 0.0)), int(row.get("calls", 0)))
+        self.games += int(data.get("games", 0))
+        self.game_sec += float(data.get("game_sec", 0.0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        phases = {}
+        for phase in PHASES + tuple(p for p in self.sec if p not in PHASES):
+            if phase not in self.sec:
+                continue
+            sec = self.sec[phase]
+            calls = self.calls.get(phase, 0)
+            phases[phase] = {
+                "sec": round(sec, 6),
+                "calls": calls,
+                "avg_us": round(sec / calls * 1e6, 2) if calls else 0.0,
+                "share": round(sec / self.game_sec, 4) if self.game_sec > 0 else None,
+            }
+        return {"games": self.games, "game_sec": round(self.game_sec, 6), "phases": phases}
+
+
+_TOTALS = EngineProfile()
+_RECENT_RUNS: Deque[Dict[str, Any]] = deque(maxlen=20)
+
+
+def enable(flag: bool = True) -> None:
+    global _ENABLED
+    _ENABLED = bool(flag)
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def new_profile() -> Optional[EngineProfile]:
+    """Per-game profile, or None when profiling is disabled (call sites check for None)."""
+    return EngineProfile() if _ENABLED else None
+
+
+def record(profile: EngineProfile) -> None:
+    """Fold a finished profile into the process-wide totals."""
+    with _TOTALS_LOCK:
+        _TOTALS.merge(profile)
+
+
+def record_run(label: str, profile: EngineProfile, **info: Any) -> Dict[str, Any]:
+    """Keep the aggregate of one batch run (e.g. an advance_league_until call) in recent_runs."""
+    entry = {"label": label, "ts": time.time(), **info, **profile.to_dict()}
+    with _TOTALS_LOCK:
+        _RECENT_RUNS.append(entry)
+    return entry
+
+
+def totals() -> Dict[str, Any]:
+    with _TOTALS_LOCK:
+        out = _TOTALS.to_dict()
+        out["recent_runs"] = list(_RECENT_RUNS)
+    out["enabled"] = _ENABLED
+    return out
+
+
+def reset_totals() -> None:
+    global _TOTALS
+    with _TOTALS_LOCK:
+        _TOTALS = EngineProfile()
+        _RECENT_RUNS.clear()
+
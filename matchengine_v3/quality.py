@@ -19,7 +19,7 @@ Generated on: 2025-12-25
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 # --------------------------------------------------------------------------------------
 # Tunables (start small; adjust after calibration)
@@ -217,6 +217,34 @@ def dot_profile(player: Any, profile: Mapping[str, float], get_stat: Callable[[A
         return DEFAULT_NEUTRAL_STAT
     return num / den
 
+def _role_def_index(
+    scheme_c: str,
+    role_weights: Mapping[str, float],
+    role_players: Mapping[str, Any],
+    get_stat: Callable[[Any, str, float], float],
+) -> Tuple[float, Dict[str, float]]:
+    """Scheme+outcome-group defense index (0..100-ish) and the per-role scores behind it."""
+    role_scores: Dict[str, float] = {}
+    def_index = DEFAULT_NEUTRAL_STAT
+    if role_weights:
+        num = 0.0
+        den = 0.0
+        for role, w in role_weights.items():
+            if w <= 0:
+                continue
+            prof = get_role_stat_profile(scheme_c, role)
+            p = role_players.get(role)
+            if prof is None or p is None:
+                # If the engine hasn't assigned this role/player yet, skip it.
+                continue
+            rs = dot_profile(p, prof, get_stat)
+            role_scores[role] = rs
+            num += w * rs
+            den += w
+        if den > 0:
+            def_index = num / den
+    return def_index, role_scores
+
 
 # --------------------------------------------------------------------------------------
 # Public API
@@ -282,25 +310,7 @@ def compute_quality_score(
     gid = get_outcome_group(outcome)
 
     # Build a scheme+outcome specific defense index (0..100-ish).
-    role_scores: Dict[str, float] = {}
-    def_index = DEFAULT_NEUTRAL_STAT
-    if role_weights:
-        num = 0.0
-        den = 0.0
-        for role, w in role_weights.items():
-            if w <= 0:
-                continue
-            prof = get_role_stat_profile(scheme_c, role)
-            p = role_players.get(role)
-            if prof is None or p is None:
-                # If the engine hasn't assigned this role/player yet, skip it.
-                continue
-            rs = dot_profile(p, prof, get_stat)
-            role_scores[role] = rs
-            num += w * rs
-            den += w
-        if den > 0:
-            def_index = num / den
+    def_index, role_scores = _role_def_index(scheme_c, role_weights, role_players, get_stat)
 
     # Player defense higher => tougher contest => lower score (offense perspective).
     stat_delta = -config.k_stat * (def_index - DEFAULT_NEUTRAL_STAT) / 10.0
@@ -324,6 +334,128 @@ def compute_quality_score(
         )
     return score
 
+# --------------------------------------------------------------------------------------
+# Dense score tables (per defensive lineup)
+# --------------------------------------------------------------------------------------
+# compute_quality_score(scheme, base_action, outcome) only depends on the role assignment
+# (and the players' fatigue through get_stat), so for a fixed defensive lineup it can be
+# tabulated once. The label part is static per scheme; the stat part is shared by every
+# outcome of an outcome group, so a table costs one role-index pass per group.
+
+QUALITY_BASE_ACTIONS: Tuple[str, ...] = tuple(
+    sorted({ba for by_action in SCHEME_BASE_OUTCOME_LABELS.values() for ba in by_action})
+)
+QUALITY_OUTCOMES: Tuple[str, ...] = tuple(
+    sorted(
+        set(OUTCOME_TO_GROUP)
+        | {oc for by_action in SCHEME_BASE_OUTCOME_LABELS.values() for labels in by_action.values() for oc in labels}
+    )
+)
+QUALITY_GROUPS: Tuple[str, ...] = tuple(sorted({get_outcome_group(oc) for oc in QUALITY_OUTCOMES}))
+
+BASE_ACTION_INDEX: Dict[str, int] = {ba: i for i, ba in enumerate(QUALITY_BASE_ACTIONS)}
+OUTCOME_INDEX: Dict[str, int] = {oc: i for i, oc in enumerate(QUALITY_OUTCOMES)}
+
+# Unknown base actions have no labels (all neutral): they share one extra row.
+_NEUTRAL_ROW = len(QUALITY_BASE_ACTIONS)
+_N_OUTCOMES = len(QUALITY_OUTCOMES)
+_OUTCOME_GROUP_IDX: Tuple[int, ...] = tuple(QUALITY_GROUPS.index(get_outcome_group(oc)) for oc in QUALITY_OUTCOMES)
+_OUTCOME_IS_RESET: Tuple[bool, ...] = tuple(outcome_kind(oc) == "reset" for oc in QUALITY_OUTCOMES)
+
+_BASE_SCORE_CACHE: Dict[str, Tuple[float, ...]] = {}
+
+
+def _base_score_row_major(scheme_c: str) -> Tuple[float, ...]:
+    """Label scores for every (base action, outcome) of a canonical scheme, flattened row-major."""
+    table = _BASE_SCORE_CACHE.get(scheme_c)
+    if table is None:
+        rows = QUALITY_BASE_ACTIONS + ("",)
+        table = tuple(
+            float(LABEL_SCORE.get(get_base_quality_label(scheme_c, ba, oc), 0))
+            for ba in rows
+            for oc in QUALITY_OUTCOMES
+        )
+        _BASE_SCORE_CACHE[scheme_c] = table
+    return table
+
+
+class QualityTable:
+    """compute_quality_score results for one scheme + defensive role assignment.
+
+    Scores live in a flat (base action x outcome) list; entries are filled per outcome group on
+    first read (or all at once with fill()), after which a read is a single list index.
+    Values are identical to compute_quality_score with the same arguments.
+    """
+
+    __slots__ = ("scheme", "role_players", "config", "get_stat", "_base", "_group_delta", "_scores")
+
+    def __init__(
+        self,
+        scheme: str,
+        role_players: Mapping[str, Any],
+        *,
+        config: QualityConfig = QualityConfig(),
+        get_stat: Callable[[Any, str, float], float] = default_get_stat,
+    ) -> None:
+        self.scheme = canonical_scheme(scheme)
+        self.role_players = role_players
+        self.config = config
+        self.get_stat = get_stat
+        self._base = _base_score_row_major(self.scheme)
+        self._group_delta: List[Optional[float]] = [None] * len(QUALITY_GROUPS)
+        self._scores: List[Optional[float]] = [None] * len(self._base)
+
+    def _fill_entry(self, k: int) -> float:
+        oi = k % _N_OUTCOMES
+        if _OUTCOME_IS_RESET[oi]:
+            score = 0.0
+        else:
+            gi = _OUTCOME_GROUP_IDX[oi]
+            stat_delta = self._group_delta[gi]
+            if stat_delta is None:
+                role_weights = get_scheme_role_weights(self.scheme, QUALITY_OUTCOMES[oi])
+                def_index, _ = _role_def_index(self.scheme, role_weights, self.role_players, self.get_stat)
+                stat_delta = -self.config.k_stat * (def_index - DEFAULT_NEUTRAL_STAT) / 10.0
+                self._group_delta[gi] = stat_delta
+            score = clamp(self._base[k] + stat_delta, self.config.clamp_min, self.config.clamp_max)
+        self._scores[k] = score
+        return score
+
+    def fill(self) -> "QualityTable":
+        """Precompute every (base action, outcome) entry."""
+        for k, v in enumerate(self._scores):
+            if v is None:
+                self._fill_entry(k)
+        return self
+
+    def score(self, base_action: str, outcome: str) -> float:
+        oi = OUTCOME_INDEX.get(outcome)
+        if oi is None:
+            # Outcome unknown to quality_data (e.g. RESET_*): no table slot, use the direct path.
+            return float(
+                compute_quality_score(
+                    self.scheme, base_action, outcome, self.role_players, config=self.config, get_stat=self.get_stat
+                )
+            )
+        k = BASE_ACTION_INDEX.get(base_action, _NEUTRAL_ROW) * _N_OUTCOMES + oi
+        v = self._scores[k]
+        if v is None:
+            return self._fill_entry(k)
+        return v
+
+    def detail(self, base_action: str, outcome: str) -> QualityDetail:
+        """Debug path: full QualityDetail (recomputed, not read from the table)."""
+        return compute_quality_score(  # type: ignore[return-value]
+            self.scheme,
+            base_action,
+            outcome,
+            self.role_players,
+            config=self.config,
+            get_stat=self.get_stat,
+            return_detail=True,
+        )
+
+
 def score_to_logit_delta(
     outcome: str,
     score: float,
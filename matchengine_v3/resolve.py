@@ -3,6 +3,7 @@ from __future__ import annotations
 import random
 import math
 from collections.abc import Mapping
+from time import perf_counter
 from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
 
 from .builders import get_action_base
@@ -39,7 +40,7 @@ def _pick_default_actor(offense: TeamState) -> Player:
     return choose_default_actor(offense)
 
 from . import quality
-from .def_role_players import get_or_build_def_role_players, engine_get_stat
+from .def_role_players import get_or_build_def_role_players, engine_get_stat, get_quality_score
 
 def _knob_mult(game_cfg: "GameConfig", key: str, default: float = 1.0) -> float:
     knobs = game_cfg.knobs if isinstance(game_cfg.knobs, Mapping) else {}
@@ -276,12 +277,16 @@ def resolve_outcome(
     style = ctx.get("shot_diet_style")
 
     base_action = get_action_base(action, game_cfg)
-    def_snap = team_def_snapshot(defense)
+    lineup_ctx = ctx.get("lineup_ctx")
+    def_snap = lineup_ctx.def_snapshot if lineup_ctx is not None else team_def_snapshot(defense)
     prof = OUTCOME_PROFILES.get(outcome)
     if not prof:
         return "RESET", {"outcome": outcome}
 
     # choose participants
+    eprof = ctx.get("engine_profile")
+    if eprof is not None:
+        t_part = perf_counter()
     if is_shot(outcome):
         if outcome in ("SHOT_3_CS",):
             actor = choose_shooter_for_three(rng, offense, style=style)
@@ -307,6 +312,8 @@ def resolve_outcome(
             actor = choose_finisher_rim(rng, offense, dunk_bias=False, style=style, base_action=base_action)
     else:
         actor = _pick_default_actor(offense)
+    if eprof is not None:
+        eprof.add("participants", perf_counter() - t_part)
 
     variance_mult = _team_variance_mult(offense, game_cfg) * float(ctx.get("variance_mult", 1.0))
 
@@ -355,13 +362,7 @@ def resolve_outcome(
                 )
                 q_score = float(q_detail.score)
             else:
-                q_score = float(quality.compute_quality_score(
-                    scheme=scheme,
-                    base_action=base_action,
-                    outcome=outcome,
-                    role_players=role_players,
-                    get_stat=engine_get_stat,
-                ))
+                q_score = get_quality_score(ctx, scheme, base_action, outcome, role_players)
         except Exception as e:
             _record_exception("quality_compute_shot", e)
             q_score = 0.0
@@ -527,15 +528,7 @@ def resolve_outcome(
                 )
                 q_score = float(q_detail.score)
             else:
-                q_score = float(
-                    quality.compute_quality_score(
-                        scheme=scheme,
-                        base_action=base_action,
-                        outcome=outcome,
-                        role_players=role_players,
-                        get_stat=engine_get_stat,
-                    )
-                )
+                q_score = get_quality_score(ctx, scheme, base_action, outcome, role_players)
         except Exception as e:
             _record_exception("quality_compute_pass", e)
             q_score = 0.0
@@ -736,13 +729,7 @@ def resolve_outcome(
                     )
                     q_score = float(q_detail.score)
                 else:
-                    q_score = float(quality.compute_quality_score(
-                        scheme=scheme,
-                        base_action=base_action,
-                        outcome=outcome,
-                        role_players=role_players,
-                        get_stat=engine_get_stat,
-                    ))
+                    q_score = get_quality_score(ctx, scheme, base_action, outcome, role_players)
             except Exception as e:
                 _record_exception("quality_compute_foul_draw", e)
                 q_score = 0.0
@@ -0,0 +1,1665 @@
+from __future__ import annotations
+
+"""Lockstep batched Monte Carlo engine (structure-of-arrays).
+
+`simulate_games_batch(home, away, n, seed)` plays N independent replicas of ONE matchup
+side by side. Instead of N GameState/TeamState objects, replica state lives in NumPy
+arrays: clocks/shot clocks (N,), scores/team fouls (N, 2), energy/minutes/personal
+fouls/on-court masks (N, 2, R). Every loop iteration advances every live replica by
+one step of the possession state machine (start -> action steps -> end), so the Python
+overhead is paid per *step*, not per game.
+
+Two stages:
+
+1) Compile (Python, once per call). The scalar engine's own builders are evaluated
+   against the tip-off lineups and flattened into dense tables:
+   - offense action distribution per (pos_start context, clutch)
+     (dist_tables + shot_diet + transition weights)
+   - outcome priors per action (+ role fit, quality-driven TO pressure) and role logit deltas
+   - per (action, outcome): participant policy, quality logit delta, pass TO/reset/carry odds
+   - per (outcome, player): raw offensive profile score (fatigue is applied at run time)
+
+2) Run (NumPy). Mirrors sim_game / sim_possession / resolve: setup + inbound, action
+   time costs with tempo, shot clock violations, shots (logit model with noise, fatigue,
+   pass carry), passes, turnovers, reach/shooting fouls with bonus, and-ones and free
+   throws, ORB/DRB, fatigue drain/recovery (incl. period breaks), minutes, auto rotation
+   (targets/rest budget/group bonus/Initiator_Primary), clutch/garbage context,
+   overtime with jumpball. Per-replica team style is drawn exactly like
+   sim_possession.ensure_team_style.
+
+Frozen at tip-off (the scalar engine recomputes these per possession): shot_diet style,
+defensive role assignment and quality scores, the team defensive snapshot and role-fit
+grades. They depend on the on-court matchup, so bench-heavy stretches drift slightly
+from the scalar engine; team-level rates (pace, ORtg, TOV%, 3PAr, FTr, ORB%, shot mix)
+follow the same era targets (see era.ERA_TARGETS and BatchGameResult.summary()).
+The defensive action draw is skipped (it only feeds DefActionCounts).
+
+Results are reproducible for a given (seed, n) but are not draw-for-draw identical to
+`simulate_game`.
+"""
+
+import copy
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import quality, shot_diet
+from .builders import get_action_base
+from .core import clamp, dot_profile, sigmoid
+from .def_role_players import engine_get_stat, get_or_build_def_role_players
+from .defense import team_def_snapshot
+from .dist_tables import PossessionDistTables
+from .era import DEFAULT_PROB_MODEL, get_mvp_rules
+from .era_registry import get_compiled_era
+from .models import TeamState
+from .participants import (
+    _ASSIST_ROLE_PRIORITY,
+    _CREATOR_ROLE_PRIORITY,
+    _DEFAULT_ACTOR_ROLE_PRIORITY,
+    _DEFAULT_PASSER_PRIORITY,
+    _DUNK_ROLE_MULT,
+    _FINISH_ROLE_BASE,
+    _FINISH_ROLE_PNR,
+    _MULT_MAX,
+    _MULT_MIN,
+    _POST_FALLBACK_ROLES,
+    _SHORTROLL_PASSER_PRIORITY,
+    ROLE_CONNECTOR,
+    ROLE_INITIATOR_PRIMARY,
+    ROLE_INITIATOR_SECONDARY,
+    ROLE_POST_HUB,
+    ROLE_RIM_ATTACKER,
+    _pid_role_mult,
+    _shot_diet_info,
+)
+from .prob import _shot_kind_from_outcome, _team_variance_mult, logistic_sensitivity, logit_noise_std
+from .profiles import CORNER3_PROB_BY_ACTION_BASE, OUTCOME_PROFILES
+from .resolve import CONTACT_PENALTY_MULT, FOUL_DRAW_CONTACT_BUCKET, _knob_mult, outcome_points, shot_zone_from_outcome
+from .role_fit import apply_role_fit_to_priors_and_tags
+from .sim_fatigue import _fatigue_archetype_for_pid, _fatigue_loss_for_role
+from .sim_fatigue import _get_offense_role_by_pid as _fatigue_role_by_pid
+from .sim_game import _enforce_initiator_primary_start, _get_offense_role_by_pid, _validate_team_and_player_ids
+from .sim_possession import apply_quality_to_turnover_priors
+from .sim_rotation import ROLE_TO_GROUPS, _coerce_pid_list, _fallback_groups_from_pos, _init_targets
+from .validation import ValidationConfig, ValidationReport, validate_and_sanitize_team
+
+
+# -------------------------
+# Layout constants
+# -------------------------
+
+HOME_IDX = 0
+AWAY_IDX = 1
+
+# pos_start / action-table context codes
+CTX_KEYS: Tuple[str, ...] = ("start_q", "after_score", "after_drb", "after_tov", "after_tov_dead", "after_foul")
+_C_START_Q, _C_AFTER_SCORE, _C_AFTER_DRB, _C_AFTER_TOV, _C_AFTER_TOV_DEAD, _C_AFTER_FOUL = range(len(CTX_KEYS))
+_SETUP_KEYS = ("setup_start_q", "setup_after_score", "setup_after_drb", "setup_after_tov", "setup_after_tov", "possession_setup")
+
+# replica phases
+_PH_START, _PH_STEP, _PH_DONE = 0, 1, 2
+
+# outcome kinds
+_K_RESET, _K_SHOT, _K_PASS, _K_TO, _K_FOUL_REACH, _K_FOUL_DRAW = range(6)
+
+# team-style columns (action side / outcome side); see sim_possession.apply_team_style_*
+_SA_NONE, _SA_TRANS, _SA_THREE, _SA_RIM, _SA_PNR = range(5)
+_SO_NONE, _SO_TOV, _SO_FTR, _SO_THREE, _SO_RIM = range(5)
+
+# shot zones (TeamState.shot_zones)
+_Z_NONE, _Z_RIM, _Z_MID, _Z_THREE = range(4)
+
+# logit kinds (prob.logistic_sensitivity / logit_noise_std)
+_LOGIT_KINDS: Tuple[str, ...] = ("shot_3", "shot_mid", "shot_post", "shot_rim", "pass", "rebound")
+_LK = {k: i for i, k in enumerate(_LOGIT_KINDS)}
+
+# ctx variance codes: normal / clutch / garbage (sim_game)
+_VAR_MULTS = (1.0, 0.80, 1.25)
+
+# resolve.py PASS quality defaults (ctx never overrides them in simulate_game)
+_PASS_Q_TO, _PASS_Q_RESET, _PASS_Q_NEG, _PASS_Q_POS = -1.5, -0.7, -0.2, 0.2
+_PASS_S_TO, _PASS_S_RESET, _PASS_S_CARRY = 6.0, 6.0, 5.0
+
+# resolve.py FOUL_DRAW "would-be shot" mix: (first key, P(first), second key)
+_FOUL_DRAW_SHOTS: Dict[str, Tuple[str, float, str]] = {
+    "FOUL_DRAW_JUMPER": ("SHOT_3_OD", 0.08, "SHOT_MID_PU"),
+    "FOUL_DRAW_POST": ("SHOT_POST", 0.55, "SHOT_RIM_CONTACT"),
+    "FOUL_DRAW_RIM": ("SHOT_RIM_CONTACT", 0.40, "SHOT_RIM_LAYUP"),
+}
+
+TEAM_STAT_KEYS: Tuple[str, ...] = (
+    "PTS", "FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "TOV", "ORB", "DRB", "AST", "PF",
+    "Possessions", "RimFGA", "MidFGA", "ThreeFGA", "Corner3A",
+)
+PLAYER_STAT_KEYS: Tuple[str, ...] = ("PTS", "FGM", "FGA", "3PM", "3PA", "FTM", "FTA", "TOV", "ORB", "DRB", "AST", "PF")
+_TK = {k: i for i, k in enumerate(TEAM_STAT_KEYS)}
+_PK = {k: i for i, k in enumerate(PLAYER_STAT_KEYS)}
+_ZONE_TEAM_KEY = {_Z_RIM: _TK["RimFGA"], _Z_MID: _TK["MidFGA"], _Z_THREE: _TK["ThreeFGA"]}
+
+
+# -------------------------
+# Result
+# -------------------------
+
+@dataclass
+class BatchGameResult:
+    """Per-replica box totals of one matchup (index 0 = home, 1 = away)."""
+    n: int
+    seed: Optional[int]
+    era: str
+    home_team_id: str
+    away_team_id: str
+    pids: Tuple[Tuple[str, ...], Tuple[str, ...]]
+    team_stats: Dict[str, np.ndarray]                          # key -> (n, 2)
+    player_stats: Dict[str, Tuple[np.ndarray, np.ndarray]]     # key -> ((n, R_home), (n, R_away)); MIN in minutes
+    overtime_periods: np.ndarray                               # (n,)
+    validation: Dict[str, Any]
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.team_stats["PTS"]
+
+    def margins(self) -> np.ndarray:
+        """Home minus away points per replica."""
+        pts = self.team_stats["PTS"]
+        return pts[:, HOME_IDX] - pts[:, AWAY_IDX]
+
+    def home_win_prob(self) -> float:
+        return float(np.mean(self.margins() > 0)) if self.n else 0.0
+
+    def rates(self) -> Dict[str, np.ndarray]:
+        """Per-replica, per-team rate stats keyed like era.ERA_TARGETS (arrays of shape (n, 2))."""
+        ts = self.team_stats
+        f = lambda k: ts[k].astype(float)  # noqa: E731
+        poss = np.maximum(f("Possessions"), 1.0)
+        fga = np.maximum(f("FGA"), 1.0)
+        minutes = 48.0 + 5.0 * self.overtime_periods.astype(float)
+        zones = np.maximum(f("RimFGA") + f("MidFGA") + f("ThreeFGA"), 1.0)
+        orb_chances = np.maximum(f("ORB") + f("DRB")[:, ::-1], 1.0)
+        return {
+            "pace": poss * (48.0 / minutes)[:, None],
+            "ortg": 100.0 * f("PTS") / poss,
+            "tov_pct": f("TOV") / poss,
+            "three_rate": f("3PA") / fga,
+            "ftr": f("FTA") / fga,
+            "orb_pct": f("ORB") / orb_chances,
+            "shot_share_rim": f("RimFGA") / zones,
+            "shot_share_mid": f("MidFGA") / zones,
+            "shot_share_three": f("ThreeFGA") / zones,
+            "corner3_share": f("Corner3A") / np.maximum(f("3PA"), 1.0),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Matchup summary + league-style rate means/stds (pooled over both teams)."""
+        if not self.n:
+            return {"n": 0, "home_team_id": self.home_team_id, "away_team_id": self.away_team_id, "rates": {}}
+        margins = self.margins()
+        rates = {k: {"mean": float(np.mean(v)), "std": float(np.std(v))} for k, v in self.rates().items()}
+        pts = self.team_stats["PTS"]
+        return {
+            "n": int(self.n),
+            "home_team_id": self.home_team_id,
+            "away_team_id": self.away_team_id,
+            "home_win_prob": self.home_win_prob(),
+            "avg_score": {self.home_team_id: float(np.mean(pts[:, HOME_IDX])), self.away_team_id: float(np.mean(pts[:, AWAY_IDX]))},
+            "margin_mean": float(np.mean(margins)) if self.n else 0.0,
+            "margin_std": float(np.std(margins)) if self.n else 0.0,
+            "overtime_rate": float(np.mean(self.overtime_periods > 0)) if self.n else 0.0,
+            "rates": rates,
+        }
+
+
+# -------------------------
+# Compile: participant policies
+# -------------------------
+#
+# A policy reproduces one participants.choose_* function over a boolean on-court mask:
+# roster indices are listed in priority order and split into tiers. At run time the first
+# tier that has an on-court player is used, its first `cap` on-court entries are kept, and
+# one is drawn with weight * fatigue_factor ** power (cap=1 -> deterministic pick).
+
+@dataclass
+class _Policy:
+    order: List[int]
+    tiers: List[int]
+    tier_caps: Tuple[int, int]
+    weights: List[float]
+    power: float
+
+
+def _stat(team: TeamState, i: int, key: str) -> float:
+    return float(team.lineup[i].get(key, fatigue_sensitive=False))
+
+
+def _priority_order(team: TeamState, roles: Sequence[str], key_fn) -> List[int]:
+    """Role holders (in role priority) first, then everyone else by key_fn descending."""
+    idx_by_pid = {p.pid: i for i, p in enumerate(team.lineup)}
+    head: List[int] = []
+    for r in roles:
+        i = idx_by_pid.get(team.roles.get(r)) if team.roles.get(r) else None
+        if i is not None and i not in head:
+            head.append(i)
+    rest = sorted((i for i in range(len(team.lineup)) if i not in head), key=lambda i: -key_fn(i))
+    return head + rest
+
+
+class _PolicyBank:
+    """Per-team registry of participant policies (deduplicated by spec key)."""
+
+    def __init__(self, team: TeamState, style: Any) -> None:
+        self.team = team
+        self.info = _shot_diet_info(style)
+        self.policies: List[_Policy] = []
+        self._by_key: Dict[Tuple[Any, ...], int] = {}
+
+    def _add(self, key: Tuple[Any, ...], build) -> int:
+        idx = self._by_key.get(key)
+        if idx is None:
+            idx = len(self.policies)
+            self.policies.append(build())
+            self._by_key[key] = idx
+        return idx
+
+    def _weights(self, key: str, power: float, mult=None) -> List[float]:
+        t = self.team
+        return [
+            (max(_stat(t, i, key), 1.0) ** power) * (float(mult(i)) if mult else 1.0)
+            for i in range(len(t.lineup))
+        ]
+
+    def _single_tier(self, order: List[int], cap: int, weights: List[float], power: float) -> _Policy:
+        return _Policy(order=order, tiers=[0] * len(order), tier_caps=(cap, cap), weights=weights, power=power)
+
+    def _pid(self, i: int) -> str:
+        return self.team.lineup[i].pid
+
+    # ---- shooters / creators / finishers ----
+    def cs_shooter(self, key: str, power: float) -> int:
+        def build() -> _Policy:
+            ip = (self.info.get("primary_pid"), self.info.get("secondary_pid"))
+            order = _priority_order(self.team, (), lambda i: _stat(self.team, i, key))
+            w = self._weights(key, power, lambda i: 0.85 if self._pid(i) in ip else 1.10)
+            return self._single_tier(order, 3, w, power)
+        return self._add(("cs", key, power), build)
+
+    def creator(self, key: str) -> int:
+        def build() -> _Policy:
+            order = _priority_order(self.team, _CREATOR_ROLE_PRIORITY, lambda i: _stat(self.team, i, key))
+            info = self.info
+
+            def mult(i: int) -> float:
+                pid = self._pid(i)
+                if pid == info.get("primary_pid"):
+                    return float(info.get("w_primary", 1.0))
+                if pid == info.get("secondary_pid"):
+                    return float(info.get("w_secondary", 1.0))
+                return 1.0
+            return self._single_tier(order, 3, self._weights(key, 1.20, mult), 1.20)
+        return self._add(("creator", key), build)
+
+    def finisher(self, dunk: bool, pnr: bool) -> int:
+        def build() -> _Policy:
+            key = "FIN_DUNK" if dunk else "FIN_RIM"
+            roles = _FINISH_ROLE_PNR if pnr else _FINISH_ROLE_BASE
+            order = _priority_order(self.team, roles, lambda i: _stat(self.team, i, key))
+            info = self.info
+
+            def mult(i: int) -> float:
+                pid = self._pid(i)
+                m = 1.0
+                if pnr:
+                    if pid == info.get("screener1_pid"):
+                        m *= 1.25
+                    elif pid == info.get("screener2_pid"):
+                        m *= 1.10
+                if dunk:
+                    m *= _pid_role_mult(self.team, pid, _DUNK_ROLE_MULT)
+                return clamp(m, _MULT_MIN, _MULT_MAX)
+            return self._single_tier(order, 4, self._weights(key, 1.15, mult), 1.15)
+        return self._add(("finisher", dunk, pnr), build)
+
+    def post_target(self) -> int:
+        def build() -> _Policy:
+            t = self.team
+            order = _priority_order(
+                t, (ROLE_POST_HUB,) + tuple(_POST_FALLBACK_ROLES),
+                lambda i: _stat(t, i, "POST_CONTROL") * 1e6 + _stat(t, i, "POST_SCORE") * 1e3 + _stat(t, i, "REB"),
+            )
+            return self._single_tier(order, 1, [1.0] * len(t.lineup), 0.0)
+        return self._add(("post",), build)
+
+    # ---- passers / actors ----
+    def _deterministic(self, key: Tuple[Any, ...], roles: Sequence[str], key_fn) -> int:
+        def build() -> _Policy:
+            order = _priority_order(self.team, roles, key_fn)
+            return self._single_tier(order, 1, [1.0] * len(self.team.lineup), 0.0)
+        return self._add(key, build)
+
+    def passer(self, base_action: str, outcome: str) -> int:
+        t = self.team
+        if outcome == "PASS_SHORTROLL":
+            return self._deterministic(
+                ("passer", "shortroll"), _SHORTROLL_PASSER_PRIORITY,
+                lambda i: _stat(t, i, "SHORTROLL_PLAY") * 1e3 + _stat(t, i, "PASS_CREATE"),
+            )
+        if base_action == "PostUp":
+            return self._deterministic(
+                ("passer", "post"), (ROLE_POST_HUB,),
+                lambda i: _stat(t, i, "POST_CONTROL") * 1e3 + _stat(t, i, "PASS_CREATE"),
+            )
+        fallback = self._drive_passer() if base_action == "Drive" else self.default_passer()
+        if outcome not in ("PASS_KICKOUT", "PASS_EXTRA", "PASS_SKIP"):
+            return fallback
+
+        def build() -> _Policy:
+            info = self.info
+            inits = [
+                i for i, p in enumerate(t.lineup)
+                if p.pid in (info.get("primary_pid"), info.get("secondary_pid"))
+            ]
+            fb = self.policies[fallback]
+            order = inits + [i for i in fb.order if i not in inits]
+            tiers = [0] * len(inits) + [1] * (len(order) - len(inits))
+
+            def mult(i: int) -> float:
+                pid = self._pid(i)
+                if pid == info.get("primary_pid"):
+                    return float(info.get("w_primary", 1.0))
+                if pid == info.get("secondary_pid"):
+                    return float(info.get("w_secondary", 1.0))
+                return 1.0
+            # tier 1 falls back to the Drive/default chooser (weights only matter when cap > 1)
+            w = [wi * mult(i) if i in inits else fb.weights[i] for i, wi in enumerate(self._weights("PASS_CREATE", 1.10))]
+            return _Policy(order=order, tiers=tiers, tier_caps=(2, fb.tier_caps[0]), weights=w, power=1.10)
+        return self._add(("passer", "kick", base_action == "Drive"), build)
+
+    def _drive_passer(self) -> int:
+        t = self.team
+
+        def build() -> _Policy:
+            order = _priority_order(
+                t, (ROLE_RIM_ATTACKER, ROLE_INITIATOR_PRIMARY, ROLE_INITIATOR_SECONDARY, ROLE_CONNECTOR),
+                lambda i: _stat(t, i, "PASS_CREATE"),
+            )
+            return self._single_tier(order, 2, self._weights("PASS_CREATE", 1.10), 1.10)
+        return self._add(("passer", "drive"), build)
+
+    def default_passer(self) -> int:
+        t = self.team
+        return self._deterministic(("passer", "default"), _DEFAULT_PASSER_PRIORITY, lambda i: _stat(t, i, "PASS_CREATE"))
+
+    def default_actor(self) -> int:
+        t = self.team
+        return self._deterministic(("actor",), _DEFAULT_ACTOR_ROLE_PRIORITY, lambda i: _stat(t, i, "PASS_CREATE"))
+
+    def inbounder(self) -> int:
+        t = self.team
+        return self._deterministic(("inbound",), (), lambda i: _stat(t, i, "PASS_SAFE"))
+
+    def rebounder(self, offensive: bool) -> int:
+        t = self.team
+        key, power = ("REB_OR", 1.15) if offensive else ("REB_DR", 1.10)
+
+        def build() -> _Policy:
+            order = _priority_order(t, (), lambda i: _stat(t, i, key) + 0.20 * _stat(t, i, "PHYSICAL"))
+            return self._single_tier(order, 3, self._weights(key, power), power)
+        return self._add(("reb", offensive), build)
+
+    def for_outcome(self, outcome: str, base_action: str) -> int:
+        """Mirror of resolve.resolve_outcome participant selection."""
+        if outcome.startswith("SHOT_"):
+            if outcome == "SHOT_3_CS":
+                return self.cs_shooter("SHOT_3_CS", 1.35)
+            if outcome == "SHOT_MID_CS":
+                return self.cs_shooter("SHOT_MID_CS", 1.25)
+            if outcome in ("SHOT_3_OD", "SHOT_MID_PU"):
+                return self.creator("SHOT_3_OD" if outcome == "SHOT_3_OD" else "SHOT_MID_PU")
+            if outcome == "SHOT_POST":
+                return self.post_target()
+            return self.finisher(outcome == "SHOT_RIM_DUNK", base_action == "PnR")
+        if outcome.startswith("PASS_"):
+            return self.passer(base_action, outcome)
+        if outcome.startswith("FOUL_"):
+            if outcome == "FOUL_DRAW_POST":
+                return self.post_target()
+            if outcome == "FOUL_DRAW_JUMPER":
+                return self.creator("SHOT_3_OD")
+            return self.finisher(False, base_action == "PnR")
+        return self.default_actor()
+
+
+# -------------------------
+# Compile: matchup tables
+# -------------------------
+
+def _fresh_team(team: TeamState) -> TeamState:
+    """Private copy with empty box/debug state so compile + validation never touch the caller's team."""
+    lineup = copy.deepcopy(team.lineup)
+    for p in lineup:
+        p.energy = 1.0
+    return TeamState(
+        name=team.name,
+        lineup=lineup,
+        roles=dict(team.roles or {}),
+        tactics=copy.deepcopy(team.tactics),
+        rotation_target_sec_by_pid=dict(getattr(team, "rotation_target_sec_by_pid", {}) or {}),
+        rotation_offense_role_by_pid=dict(getattr(team, "rotation_offense_role_by_pid", {}) or {}),
+        rotation_lock_pids=list(getattr(team, "rotation_lock_pids", []) or []),
+    )
+
+
+def _action_style_col(base: str) -> int:
+    if base == "TransitionEarly":
+        return _SA_TRANS
+    if base in ("Kickout", "ExtraPass", "SpotUp"):
+        return _SA_THREE
+    if base in ("Drive", "Cut"):
+        return _SA_RIM
+    if base in ("PnR", "DHO"):
+        return _SA_PNR
+    return _SA_NONE
+
+
+def _outcome_style_col(o: str) -> int:
+    if o.startswith("TO_"):
+        return _SO_TOV
+    if o.startswith("FOUL_DRAW_") or o == "FOUL_REACH_TRAP":
+        return _SO_FTR
+    if o.startswith("SHOT_3_"):
+        return _SO_THREE
+    if o.startswith("SHOT_RIM_"):
+        return _SO_RIM
+    return _SO_NONE
+
+
+def _outcome_kind(o: str) -> int:
+    if o not in OUTCOME_PROFILES:
+        return _K_RESET
+    if o.startswith("SHOT_"):
+        return _K_SHOT
+    if o.startswith("PASS_"):
+        return _K_PASS
+    if o.startswith("TO_"):
+        return _K_TO
+    if o == "FOUL_REACH_TRAP":
+        return _K_FOUL_REACH
+    if o.startswith("FOUL_"):
+        return _K_FOUL_DRAW
+    return _K_RESET
+
+
+def _zone_code(o: str) -> int:
+    z = shot_zone_from_outcome(o)
+    return {"rim": _Z_RIM, "mid": _Z_MID, "3": _Z_THREE}.get(z or "", _Z_NONE)
+
+
+def _shot_base_logit(game_cfg, shot_key: str) -> float:
+    pm = game_cfg.prob_model if isinstance(game_cfg.prob_model, Mapping) else DEFAULT_PROB_MODEL
+    shot_base = game_cfg.shot_base if isinstance(game_cfg.shot_base, Mapping) else {}
+    base_p = float(shot_base.get(shot_key, 0.45))
+    kind = _shot_kind_from_outcome(shot_key)
+    if kind == "shot_rim":
+        base_p *= _knob_mult(game_cfg, "shot_base_rim_mult", 1.0)
+    elif kind == "shot_mid":
+        base_p *= _knob_mult(game_cfg, "shot_base_mid_mult", 1.0)
+    else:
+        base_p *= _knob_mult(game_cfg, "shot_base_3_mult", 1.0)
+    return _logit(clamp(base_p, float(pm.get("base_p_min", 0.02)), float(pm.get("base_p_max", 0.98))))
+
+
+def _logit(p: float) -> float:
+    return math.log(p / (1.0 - p))
+
+
+def _contact_mult(pm: Mapping[str, Any], shot_key: str) -> float:
+    bucket = FOUL_DRAW_CONTACT_BUCKET.get(shot_key, "normal")
+    return float(pm.get(f"foul_contact_pmake_mult_{bucket}", CONTACT_PENALTY_MULT.get(bucket, 1.0)))
+
+
+def _quality_score(scheme: str, base_action: str, outcome: str, role_players: Mapping[str, Any]) -> float:
+    try:
+        return float(quality.compute_quality_score(
+            scheme=scheme,
+            base_action=base_action,
+            outcome=outcome,
+            role_players=role_players,
+            get_stat=engine_get_stat,
+        ))
+    except Exception:
+        return 0.0
+
+
+def _assist_probs(outcome: str, base_action: str) -> Tuple[float, float, float]:
+    """P(assisted | made) for pass_chain == 0 / == 1 / >= 2 (resolve.resolve_outcome)."""
+    if "_CS" in outcome:
+        return (1.0, 1.0, 1.0)
+    if outcome in ("SHOT_RIM_LAYUP", "SHOT_RIM_DUNK", "SHOT_RIM_CONTACT"):
+        if base_action in ("Cut", "PnR", "DHO"):
+            p0 = 0.90
+        elif base_action in ("Kickout", "ExtraPass", "Drive"):
+            p0 = 0.70
+        else:
+            p0 = 0.0
+        return (p0, 1.0, 1.0)
+    if outcome == "SHOT_TOUCH_FLOATER":
+        if base_action in ("Cut", "PnR", "DHO"):
+            p0 = 0.55
+        elif base_action in ("Kickout", "ExtraPass"):
+            p0 = 0.40
+        elif base_action == "Drive":
+            p0 = 0.18
+        else:
+            p0 = 0.0
+        return (p0, p0, 1.0)
+    if outcome == "SHOT_3_OD":
+        p2 = 0.28 if base_action in ("PnR", "DHO", "Kickout", "ExtraPass") else 0.0
+        return (0.0, 0.0, p2)
+    return (0.0, 0.0, 0.0)
+
+
+def _groups(team: TeamState, pid: str, role_by_pid: Mapping[str, str]) -> Tuple[str, ...]:
+    rn = role_by_pid.get(pid, "")
+    if rn in ROLE_TO_GROUPS:
+        return ROLE_TO_GROUPS[rn]
+    p = team.find_player(pid)
+    return _fallback_groups_from_pos(getattr(p, "pos", "F") if p is not None else "F")
+
+
+class _MatchupTables:
+    """Dense NumPy tables for one (home, away) matchup; index 0 = home, 1 = away everywhere."""
+
+    def __init__(self, teams: Tuple[TeamState, TeamState], game_cfg, rules: Dict[str, Any]) -> None:
+        self.game_cfg = game_cfg
+        self.rules = rules
+        pm = game_cfg.prob_model if isinstance(game_cfg.prob_model, Mapping) else DEFAULT_PROB_MODEL
+        self.pm = pm
+        R = max(len(t.lineup) for t in teams)
+        self.R = R
+        self.n_players = tuple(len(t.lineup) for t in teams)
+        self.pids = tuple(tuple(p.pid for p in t.lineup) for t in teams)
+
+        # ---- tip-off lineups + rotation targets ----
+        self.targets = np.zeros((2, R), dtype=np.float64)
+        self.start_on = np.zeros((2, R), dtype=bool)
+        self.valid = np.zeros((2, R), dtype=bool)
+        for s, t in enumerate(teams):
+            tg = _init_targets(t, rules)
+            start = _enforce_initiator_primary_start(t, [p.pid for p in t.lineup[:5]], tg, rules)
+            t.set_on_court(start)
+            idx = {p.pid: i for i, p in enumerate(t.lineup)}
+            self.valid[s, : len(t.lineup)] = True
+            for pid in t.on_court_pids:
+                self.start_on[s, idx[pid]] = True
+            for i, p in enumerate(t.lineup):
+                self.targets[s, i] = float(tg.get(p.pid, 0))
+
+        styles = [
+            shot_diet.compute_shot_diet_style(teams[s], teams[1 - s], game_state=None, ctx=None) for s in (0, 1)
+        ]
+        # shot_diet writes fallback initiators back into team.roles, but only on a style-cache
+        # miss; apply the same write-back here so compiled tables never depend on cache state.
+        for s, st in enumerate(styles):
+            on_court = set(teams[s].on_court_pids)
+            roles = teams[s].roles
+            ip, sp = st.initiator.primary_pid, st.initiator.secondary_pid
+            if roles.get("Initiator_Primary") not in on_court:
+                roles["Initiator_Primary"] = ip
+            if (roles.get("Initiator_Secondary") not in on_court or roles.get("Initiator_Secondary") == ip) and sp != ip:
+                roles["Initiator_Secondary"] = sp
+        self.banks = [_PolicyBank(teams[s], styles[s]) for s in (0, 1)]
+
+        # ---- offense action tables: first pass collects the action universe ----
+        tables = [PossessionDistTables(teams[s].tactics, teams[1 - s].tactics, game_cfg) for s in (0, 1)]
+        base_ctx = [
+            {"shot_diet_style": styles[s], "tactic_name": getattr(teams[s].tactics, "offense_scheme", None)}
+            for s in (0, 1)
+        ]
+        raw_off: List[List[List[Dict[str, float]]]] = []
+        for s in (0, 1):
+            per_ctx = []
+            for ck in CTX_KEYS:
+                per_clutch = []
+                for clutch in (False, True):
+                    ctx = dict(base_ctx[s])
+                    ctx.update({
+                        "is_clutch": clutch,
+                        "pos_start": ck,
+                        "dead_ball_inbound": ck in ("start_q", "after_score", "after_tov_dead", "after_foul"),
+                    })
+                    probs = tables[s].offense_action_probs(ctx)
+                    per_clutch.append(self._contextual_action_weights(probs, ctx))
+                per_ctx.append(per_clutch)
+            raw_off.append(per_ctx)
+
+        actions: List[str] = []
+        for s in (0, 1):
+            for per_clutch in raw_off[s]:
+                for probs in per_clutch:
+                    for a in probs:
+                        if a not in actions:
+                            actions.append(a)
+        for a in ("SpotUp", "ExtraPass", "Kickout", "Drive"):  # forced follow-ups (ORB / pass chains)
+            if a not in actions:
+                actions.append(a)
+        self.actions = tuple(actions)
+        A = len(actions)
+        self.a_index = {a: i for i, a in enumerate(actions)}
+        self.a_base = tuple(get_action_base(a, game_cfg) for a in actions)
+        time_costs = rules.get("time_costs", {}) or {}
+        self.a_cost = np.array([float(time_costs.get(b, 0.0)) for b in self.a_base])
+        self.a_style = np.array([_action_style_col(b) for b in self.a_base], dtype=np.int64)
+        self.a_corner3 = np.array([
+            float(CORNER3_PROB_BY_ACTION_BASE.get(b, CORNER3_PROB_BY_ACTION_BASE.get("default", 0.12)))
+            for b in self.a_base
+        ])
+
+        self.off_tbl = np.zeros((2, len(CTX_KEYS), 2, A))
+        for s in (0, 1):
+            for c, per_clutch in enumerate(raw_off[s]):
+                for k, probs in enumerate(per_clutch):
+                    for a, w in probs.items():
+                        self.off_tbl[s, c, k, self.a_index[a]] = float(w)
+
+        # ---- outcome priors per action (second pass) ----
+        fe = rules.get("fatigue_effects", {}) or {}
+        self.role_delta = np.zeros((2, A))
+        raw_pri: List[List[Dict[str, float]]] = [[], []]
+        q_ctx: List[Dict[str, Any]] = [{}, {}]
+        for s in (0, 1):
+            off, de = teams[s], teams[1 - s]
+            for ai, a in enumerate(actions):
+                base = self.a_base[ai]
+                tags: Dict[str, Any] = {
+                    "in_transition": base == "TransitionEarly",
+                    "is_side_pnr": a == "SideAnglePnR",
+                    "avg_fatigue_off": 1.0,
+                    "fatigue_bad_mult_max": float(fe.get("bad_mult_max", 1.12)),
+                    "fatigue_bad_critical": float(fe.get("bad_critical", 0.25)),
+                    "fatigue_bad_bonus": float(fe.get("bad_bonus", 0.08)),
+                    "fatigue_bad_cap": float(fe.get("bad_cap", 1.20)),
+                }
+                pri = tables[s].outcome_priors(a, tags, ctx=base_ctx[s])
+                pri = apply_role_fit_to_priors_and_tags(pri, base, off, tags, game_cfg=game_cfg)
+                pri = apply_quality_to_turnover_priors(pri, base, off, de, tags, q_ctx[s])
+                self.role_delta[s, ai] = float(tags.get("role_logit_delta", 0.0))
+                raw_pri[s].append(pri)
+
+        outcomes: List[str] = []
+        for s in (0, 1):
+            for pri in raw_pri[s]:
+                for o in pri:
+                    if o not in outcomes:
+                        outcomes.append(o)
+        self.outcomes = tuple(outcomes)
+        O = len(outcomes)
+        self.prior = np.zeros((2, A, O))
+        for s in (0, 1):
+            for ai, pri in enumerate(raw_pri[s]):
+                for o, w in pri.items():
+                    self.prior[s, ai, outcomes.index(o)] = float(w)
+
+        self.o_kind = np.array([_outcome_kind(o) for o in outcomes], dtype=np.int64)
+        self.o_style = np.array([_outcome_style_col(o) for o in outcomes], dtype=np.int64)
+        self.o_bad = np.array([o.startswith("TO_") or o.startswith("RESET_") for o in outcomes])
+        self.o_pts = np.array([outcome_points(o) for o in outcomes], dtype=np.int64)
+        self.o_zone = np.array([_zone_code(o) for o in outcomes], dtype=np.int64)
+        self.o_lk = np.array([
+            _LK[_shot_kind_from_outcome(o)] if o.startswith("SHOT_") else _LK["pass"] for o in outcomes
+        ], dtype=np.int64)
+        pass_base = game_cfg.pass_base_success if isinstance(game_cfg.pass_base_success, Mapping) else {}
+        base_p_lo, base_p_hi = float(pm.get("base_p_min", 0.02)), float(pm.get("base_p_max", 0.98))
+        self.o_base_logit = np.zeros(O)
+        for oi, o in enumerate(outcomes):
+            if o.startswith("SHOT_"):
+                self.o_base_logit[oi] = _shot_base_logit(game_cfg, o)
+            elif o.startswith("PASS_"):
+                bs = float(pass_base.get(o, 0.90)) * _knob_mult(game_cfg, "pass_base_success_mult", 1.0)
+                self.o_base_logit[oi] = _logit(clamp(bs, base_p_lo, base_p_hi))
+
+        # foul-draw "would-be shot" tables: [O, 2] (first key, second key)
+        self.fd_p1 = np.zeros(O)
+        self.fd_logit = np.zeros((O, 2))
+        self.fd_lk = np.zeros((O, 2), dtype=np.int64)
+        self.fd_pts = np.full((O, 2), 2, dtype=np.int64)
+        self.fd_mult = np.ones((O, 2))
+        self.fd_zone = np.zeros((O, 2), dtype=np.int64)
+        self.fd_is3od = np.zeros((O, 2), dtype=bool)
+        for oi, o in enumerate(outcomes):
+            spec = _FOUL_DRAW_SHOTS.get(o)
+            if spec is None:
+                continue
+            k1, p1, k2 = spec
+            self.fd_p1[oi] = p1
+            for j, key in enumerate((k1, k2)):
+                self.fd_logit[oi, j] = _shot_base_logit(game_cfg, key)
+                self.fd_lk[oi, j] = _LK[_shot_kind_from_outcome(key)]
+                self.fd_pts[oi, j] = 3 if key == "SHOT_3_OD" else 2
+                self.fd_mult[oi, j] = _contact_mult(pm, key)
+                self.fd_zone[oi, j] = _zone_code(key)
+                self.fd_is3od[oi, j] = key == "SHOT_3_OD"
+
+        # ---- per (offense side, action, outcome): participants / quality / pass buckets / assists ----
+        self.policy = np.zeros((2, A, O), dtype=np.int64)
+        self.q_delta = np.zeros((2, A, O))
+        self.p_to = np.zeros((2, A, O))
+        self.p_reset = np.zeros((2, A, O))
+        self.p_carry_neg = np.zeros((2, A, O))
+        self.p_carry_pos = np.zeros((2, A, O))
+        self.carry_val = np.zeros((2, A, O))
+        self.ast_p = np.zeros((A, O, 3))
+        self.off_raw = np.zeros((2, O, R))
+        self.def_raw = np.zeros((2, O))
+        carry_clamp = float(quality.apply_pass_carry(1e9, next_outcome="*"))
+        self.carry_clamp = carry_clamp
+        for s in (0, 1):
+            off, de = teams[s], teams[1 - s]
+            scheme = str(getattr(de.tactics, "defense_scheme", ""))
+            role_players = get_or_build_def_role_players(q_ctx[s], de, scheme=scheme)
+            snap = team_def_snapshot(de)
+            for oi, o in enumerate(outcomes):
+                prof = OUTCOME_PROFILES.get(o)
+                if prof:
+                    for i, p in enumerate(off.lineup):
+                        vals = {k: p.get(k, fatigue_sensitive=False) for k in prof["offense"].keys()}
+                        self.off_raw[s, oi, i] = dot_profile(vals, prof["offense"])
+                    self.def_raw[s, oi] = dot_profile({k: float(snap.get(k, 50.0)) for k in prof["defense"].keys()}, prof["defense"])
+            q_cache: Dict[Tuple[str, str], float] = {}
+            for ai, a in enumerate(actions):
+                base = self.a_base[ai]
+                for oi, o in enumerate(outcomes):
+                    self.policy[s, ai, oi] = self.banks[s].for_outcome(o, base)
+                    kind = self.o_kind[oi]
+                    if kind not in (_K_SHOT, _K_PASS, _K_FOUL_DRAW):
+                        continue
+                    qk = (base, o)
+                    if qk not in q_cache:
+                        q_cache[qk] = _quality_score(scheme, base, o, role_players)
+                    q = q_cache[qk]
+                    if kind == _K_PASS:
+                        self.p_to[s, ai, oi] = sigmoid(_PASS_S_TO * (_PASS_Q_TO - q))
+                        self.p_reset[s, ai, oi] = sigmoid(_PASS_S_RESET * (_PASS_Q_RESET - q))
+                        w_neg = math.exp(clamp(_PASS_S_CARRY * (_PASS_Q_NEG - q), -12.0, 12.0))
+                        w_pos = math.exp(clamp(_PASS_S_CARRY * (q - _PASS_Q_POS), -12.0, 12.0))
+                        denom = w_neg + 1.0 + w_pos
+                        self.p_carry_neg[s, ai, oi] = w_neg / denom
+                        self.p_carry_pos[s, ai, oi] = w_pos / denom
+                        self.carry_val[s, ai, oi] = float(quality.score_to_logit_delta(o, q))
+                    else:
+                        self.q_delta[s, ai, oi] = float(quality.score_to_logit_delta(o, q))
+        for ai in range(A):
+            for oi, o in enumerate(outcomes):
+                self.ast_p[ai, oi] = _assist_probs(o, self.a_base[ai])
+
+        # ---- team-level static arrays ----
+        self.def_mix = float(quality.mix_def_score_for_shot(1.0) - quality.mix_def_score_for_shot(0.0))
+        self.def_mix_neutral = float(quality.mix_def_score_for_shot(0.0))
+        self.team_var = np.array([_team_variance_mult(t, game_cfg) for t in teams])
+        self.sens = np.array([logistic_sensitivity(game_cfg, k) for k in _LOGIT_KINDS])
+        self.noise_std = np.array([
+            [[logit_noise_std(game_cfg, k, self.team_var[s] * vm) for k in _LOGIT_KINDS] for vm in _VAR_MULTS]
+            for s in (0, 1)
+        ])
+        self.prob_lo = float(pm.get("prob_min", 0.03))
+        self.prob_hi = float(pm.get("prob_max", 0.97))
+        self.contact_lo = float(pm.get("foul_contact_pmake_min", 0.01))
+        self.contact_hi = float(pm.get("foul_contact_pmake_max", 0.99))
+        self.ft_base = float(pm.get("ft_base", 0.45))
+        self.ft_range = float(pm.get("ft_range", 0.47))
+        self.ft_lo = float(pm.get("ft_min", 0.40))
+        self.ft_hi = float(pm.get("ft_max", 0.95))
+        orb_base = float(pm.get("orb_base", 0.26)) * _knob_mult(game_cfg, "orb_base_mult", 1.0)
+        self.orb_base_logit = _logit(clamp(orb_base, base_p_lo, base_p_hi))
+        self.orb_mult = np.array([float(t.tactics.context.get("ORB_MULT", 1.0)) for t in teams])
+        self.drb_mult = np.array([float(t.tactics.context.get("DRB_MULT", 1.0)) for t in teams])
+
+        def stat_matrix(key: str) -> np.ndarray:
+            out = np.zeros((2, R))
+            for s, t in enumerate(teams):
+                for i, p in enumerate(t.lineup):
+                    out[s, i] = p.get(key, fatigue_sensitive=False)
+            return out
+
+        self.reb_or = stat_matrix("REB_OR")
+        self.reb_dr = stat_matrix("REB_DR")
+        self.def_steal = stat_matrix("DEF_STEAL")
+        self.pass_safe = stat_matrix("PASS_SAFE")
+        self.shot_ft = stat_matrix("SHOT_FT")
+        self.jumpball = self.reb_dr + 0.6 * stat_matrix("PHYSICAL")
+
+        # ---- fatigue (sim_fatigue): per-second drain on offense / defense, bench + break recovery ----
+        ref_sec = float(rules.get("fatigue_time_ref_sec", 10.0))
+        fl = rules.get("fatigue_loss", {}) or {}
+        cap_cfg = rules.get("fatigue_capacity", {}) or {}
+        drain_lo = float(cap_cfg.get("drain_mult_low_cap", 1.15))
+        drain_hi = float(cap_cfg.get("drain_mult_high_cap", 0.85))
+        rec_lo = float(cap_cfg.get("rec_mult_low_cap", 0.90))
+        rec_hi = float(cap_cfg.get("rec_mult_high_cap", 1.10))
+        bench_per_sec = float((rules.get("fatigue_recovery", {}) or {}).get("bench_per_sec", 0.0022))
+        br = rules.get("break_recovery", {}) or {}
+        self.loss_per_sec = np.zeros((2, 2, R))   # [team, 0=on offense / 1=on defense, player]
+        self.bench_rec_per_sec = np.zeros((2, R))
+        self.break_on_per_sec = np.zeros((2, R))
+        self.break_bench_per_sec = np.zeros((2, R))
+        for s, t in enumerate(teams):
+            role_by_pid = _fatigue_role_by_pid(t)
+            ctx = t.tactics.context or {}
+            trans = bool(ctx.get("TRANSITION_EMPHASIS", False))
+            heavy_pnr = (
+                bool(ctx.get("HEAVY_PNR", False)) or "PnR" in t.tactics.offense_scheme,
+                bool(ctx.get("HEAVY_PNR", False)) or "PnR" in t.tactics.defense_scheme,
+            )
+            for i, p in enumerate(t.lineup):
+                c01 = clamp(float(p.derived.get("FAT_CAPACITY", 50.0)) / 100.0, 0.0, 1.0)
+                role = _fatigue_archetype_for_pid(t, p.pid, role_by_pid)
+                for side in (0, 1):
+                    loss = _fatigue_loss_for_role(role, rules)
+                    if trans:
+                        loss += float(fl.get("transition_emphasis", 0.001))
+                    if heavy_pnr[side] and role in ("handler", "big"):
+                        loss += float(fl.get("heavy_pnr", 0.001))
+                    self.loss_per_sec[s, side, i] = loss / ref_sec * (drain_lo + (drain_hi - drain_lo) * c01)
+                rec_mult = rec_lo + (rec_hi - rec_lo) * c01
+                self.bench_rec_per_sec[s, i] = bench_per_sec * rec_mult
+                self.break_on_per_sec[s, i] = float(br.get("on_court_per_sec", 0.0010)) * rec_mult
+                self.break_bench_per_sec[s, i] = float(br.get("bench_per_sec", 0.0016)) * rec_mult
+
+        # ---- rotation (sim_rotation._perform_rotation) ----
+        reg_total = max(1, int(rules.get("quarters", 4)) * int(float(rules.get("quarter_length", 720))))
+        self.locked = np.zeros((2, R), dtype=bool)
+        self.initiator = np.zeros((2, R), dtype=bool)
+        self.group_bonus = np.zeros((2, R, R))
+        for s, t in enumerate(teams):
+            ctx = t.tactics.context or {}
+            role_by_pid = _get_offense_role_by_pid(t)
+            locks = set(_coerce_pid_list(getattr(t, "rotation_lock_pids", None)))
+            if not locks:
+                locks = set(_coerce_pid_list(ctx.get("ROTATION_LOCK_PIDS") or ctx.get("LOCK_PIDS")))
+            groups = [set(_groups(t, p.pid, role_by_pid)) for p in t.lineup]
+            for i, p in enumerate(t.lineup):
+                self.locked[s, i] = p.pid in locks or self.targets[s, i] >= reg_total
+                self.initiator[s, i] = role_by_pid.get(p.pid) == "Initiator_Primary"
+                for j in range(len(t.lineup)):
+                    go, gi = groups[i], groups[j]
+                    if go and gi:
+                        self.group_bonus[s, i, j] = 2.0 if go == gi else 1.0 if go & gi else 0.0
+
+        # ---- fixed participant policies per team ----
+        self.pol_actor = np.array([b.default_actor() for b in self.banks])
+        self.pol_inbound = np.array([b.inbounder() for b in self.banks])
+        self.pol_orb = np.array([b.rebounder(True) for b in self.banks])
+        self.pol_drb = np.array([b.rebounder(False) for b in self.banks])
+        self.assist_order = np.zeros((2, R), dtype=np.int64)
+        for s, t in enumerate(teams):
+            order = _priority_order(t, _ASSIST_ROLE_PRIORITY, lambda i, t=t: _stat(t, i, "PASS_CREATE"))
+            self.assist_order[s] = order + list(range(len(order), R))
+
+        # ---- flatten policy banks: [team, policy, ...] padded to R ----
+        P = max(len(b.policies) for b in self.banks)
+        self.pol_order = np.zeros((2, P, R), dtype=np.int64)
+        self.pol_tier = np.zeros((2, P, R), dtype=np.int64)
+        self.pol_tcap = np.ones((2, P, 2), dtype=np.int64)
+        self.pol_w = np.zeros((2, P, R))
+        self.pol_pow = np.zeros((2, P))
+        for s, b in enumerate(self.banks):
+            for pi, pol in enumerate(b.policies):
+                n_real = len(pol.order)
+                self.pol_order[s, pi] = pol.order + list(range(n_real, R))
+                self.pol_tier[s, pi] = pol.tiers + [1] * (R - n_real)
+                self.pol_tcap[s, pi] = pol.tier_caps
+                self.pol_w[s, pi, :n_real] = pol.weights
+                self.pol_pow[s, pi] = pol.power
+
+        self.team_style_fixed: List[Optional[Dict[str, float]]] = []
+        for t in teams:
+            st = (t.tactics.context or {}).get("TEAM_STYLE")
+            self.team_style_fixed.append(dict(st) if isinstance(st, dict) else None)
+
+    def _contextual_action_weights(self, probs: Dict[str, float], ctx: Mapping[str, Any]) -> Dict[str, float]:
+        """Same transition bias as simulate_possession._apply_contextual_action_weights."""
+        if not probs or bool(ctx.get("dead_ball_inbound", False)):
+            return dict(probs)
+        pstart = str(ctx.get("pos_start", ""))
+        if pstart not in ("after_drb", "after_tov"):
+            return dict(probs)
+        mult_tbl = self.rules.get("transition_weight_mult", {}) or {}
+        mult = float(mult_tbl.get(pstart, mult_tbl.get("default", 1.0)))
+        if mult <= 1.0:
+            return dict(probs)
+        out = {
+            k: float(v) * mult if get_action_base(k, self.game_cfg) == "TransitionEarly" else float(v)
+            for k, v in probs.items()
+        }
+        s = sum(out.values())
+        return {k: v / s for k, v in out.items()} if s > 0 else dict(probs)
+
+
+# -------------------------
+# Run: lockstep state machine
+# -------------------------
+
+def _choice(gen: np.random.Generator, w: np.ndarray) -> np.ndarray:
+    """Row-wise weighted choice (first column whose cumulative weight exceeds u * total)."""
+    cum = np.cumsum(w, axis=1)
+    u = gen.random(w.shape[0]) * cum[:, -1]
+    idx = (cum <= u[:, None]).sum(axis=1)
+    return np.minimum(idx, w.shape[1] - 1)
+
+
+def _fatigue_factor(e: np.ndarray) -> np.ndarray:
+    """models.Player.get energy curve: 1.0 at full energy, 0.82 when exhausted."""
+    return 1.0 - (1.0 - np.clip(e, 0.0, 1.0)) ** 1.35 * 0.18
+
+
+class _BatchRun:
+    def __init__(self, tbl: _MatchupTables, n: int, gen: np.random.Generator) -> None:
+        self.t = tbl
+        self.n = n
+        self.gen = gen
+        rules = tbl.rules
+        R = tbl.R
+        self.rules = rules
+        self.quarters = int(rules.get("quarters", 4))
+        self.quarter_len = float(rules.get("quarter_length", 720))
+        self.ot_len = float(rules.get("overtime_length", 300))
+        self.shot_clock_full = float(rules.get("shot_clock", 24))
+        self.orb_reset = float(rules.get("orb_reset", self.shot_clock_full))
+        self.foul_reset = float(rules.get("foul_reset", 14))
+        self.ft_orb_mult = float(rules.get("ft_orb_mult", 0.75))
+        self.foul_out = int(rules.get("foul_out", 6))
+        self.bonus = int(rules.get("bonus_threshold", 5))
+        self.ot_bonus = int(rules.get("overtime_bonus_threshold", self.bonus))
+        tc = rules.get("time_costs", {}) or {}
+        self.setup_cost = np.array([float(tc.get(k, tc.get("possession_setup", 0.0))) for k in _SETUP_KEYS])
+        self.cost_kick = float(tc.get("Kickout", 0.0))
+        self.cost_extra = float(tc.get("ExtraPass", 0.0))
+        self.cost_reset = float(tc.get("Reset", 0.0))
+        self.cost_foul_stop = float(tc.get("FoulStop", 0.0))
+        ib = rules.get("inbound", {}) or {}
+        self.ib = (
+            float(ib.get("tov_base", 0.010)), float(ib.get("tov_min", 0.003)), float(ib.get("tov_max", 0.060)),
+            float(ib.get("def_scale", 0.00035)), float(ib.get("off_scale", 0.00030)),
+        )
+        fe = rules.get("fatigue_effects", {}) or {}
+        self.fat_logit_max = float(fe.get("logit_delta_max", -0.25))
+        self.def_mult_min = float(fe.get("def_mult_min", 0.90))
+        self.bad_mult_max = float(fe.get("bad_mult_max", 1.12))
+        self.bad_critical = float(fe.get("bad_critical", 0.25))
+        self.bad_bonus = float(fe.get("bad_bonus", 0.08))
+        self.bad_cap = float(fe.get("bad_cap", 1.20))
+        self.break_between = float(rules.get("break_sec_between_periods", 0.0))
+        self.break_before_ot = float(rules.get("break_sec_before_ot", self.break_between))
+        self.ot_mode = str(rules.get("ot_start_possession_mode", "jumpball")).lower().strip()
+        self.jb_scale = max(float((rules.get("ot_jumpball", {}) or {}).get("scale", 12.0)), 1e-6)
+        self.reg_total = max(1, self.quarters * int(self.quarter_len))
+
+        # ---- replica state ----
+        self.phase = np.full(n, _PH_START, dtype=np.int64)
+        self.quarter = np.zeros(n, dtype=np.int64)
+        self.clock = np.zeros(n)
+        self.shot_clock = np.zeros(n)
+        self.offense = np.zeros(n, dtype=np.int64)
+        self.pos_start = np.full(n, _C_START_Q, dtype=np.int64)
+        self.ctx_code = np.zeros(n, dtype=np.int64)
+        self.team_fouls = np.zeros((n, 2), dtype=np.int64)
+        self.overtime = np.zeros(n, dtype=np.int64)
+        self.pf = np.zeros((n, 2, R), dtype=np.int64)
+        self.energy = np.where(tbl.valid[None, :, :], 1.0, 0.0).repeat(n, axis=0)
+        self.minutes = np.zeros((n, 2, R), dtype=np.int64)
+        self.on = np.repeat(tbl.start_on[None, :, :], n, axis=0)
+        self.ts = np.zeros((n, 2, len(TEAM_STAT_KEYS)), dtype=np.int64)
+        self.ps = np.zeros((n, 2, R, len(PLAYER_STAT_KEYS)), dtype=np.int64)
+
+        # per-possession context
+        self.start_clock = np.zeros(n)
+        self.tempo = np.ones(n)          # garbage tempo x team style tempo (action costs)
+        self.dead_tempo = np.ones(n)     # garbage tempo only (dead-ball setup cost)
+        self.var_code = np.zeros(n, dtype=np.int64)
+        self.clutch = np.zeros(n, dtype=np.int64)
+        self.garbage = np.zeros(n, dtype=bool)
+        self.avg_fat_off = np.ones(n)
+        self.def_mult = np.ones(n)
+        self.bonus_thr = np.full(n, self.bonus, dtype=np.int64)
+        self.action = np.zeros(n, dtype=np.int64)
+        self.pass_chain = np.zeros(n, dtype=np.int64)
+        self.carry = np.zeros(n)
+
+        self._draw_team_styles()
+
+    # ---- setup ----
+    def _draw_team_styles(self) -> None:
+        """Per-replica sim_possession.ensure_team_style (or the team's persisted TEAM_STYLE)."""
+        cfg = self.rules.get("team_style", {}) or {}
+        spec = (
+            ("tempo_mult", float(cfg.get("tempo_std", 0.032)), 0.92, 1.08),
+            ("three_bias", float(cfg.get("three_std", 0.12)), 0.70, 1.35),
+            ("rim_bias", float(cfg.get("rim_std", 0.10)), 0.75, 1.30),
+            ("tov_bias", float(cfg.get("tov_std", 0.14)), 0.70, 1.40),
+            ("ftr_bias", float(cfg.get("ftr_std", 0.18)), 0.60, 1.50),
+        )
+        vals = np.zeros((self.n, 2, len(spec)))
+        for s in (0, 1):
+            fixed = self.t.team_style_fixed[s]
+            for j, (key, std, lo, hi) in enumerate(spec):
+                if fixed is not None:
+                    vals[:, s, j] = float(fixed.get(key, 1.0))
+                else:
+                    vals[:, s, j] = np.clip(self.gen.normal(1.0, std, self.n), lo, hi)
+        tempo, three, rim, tov, ftr = (vals[:, :, j] for j in range(len(spec)))
+        self.style_tempo = tempo
+        self.style_action = np.stack([np.ones_like(tempo), tempo ** 0.85, three, rim, 0.55 * three + 0.45 * rim], axis=-1)
+        self.style_outcome = np.stack([np.ones_like(tempo), tov, ftr, three, rim], axis=-1)
+
+    # ---- helpers ----
+    def _pick(self, r: np.ndarray, side: np.ndarray, pol: np.ndarray) -> np.ndarray:
+        """Vectorized participant choice for rows r (team `side`, policy index `pol`)."""
+        t = self.t
+        order = t.pol_order[side, pol]                                   # (M, R)
+        tier = t.pol_tier[side, pol]
+        on = np.take_along_axis(self.on[r, side], order, axis=1)
+        first = np.where(on, tier, 99).min(axis=1)
+        in_tier = on & (tier == first[:, None])
+        cap = t.pol_tcap[side, pol, np.minimum(first, 1)]
+        sel = in_tier & (np.cumsum(in_tier, axis=1) <= cap[:, None])
+        w = np.take_along_axis(t.pol_w[side, pol], order, axis=1)
+        fat = np.take_along_axis(_fatigue_factor(self.energy[r, side]), order, axis=1)
+        w = np.where(sel, w * fat ** t.pol_pow[side, pol][:, None], 0.0)
+        # degenerate weights (e.g. all zero) -> first selected candidate
+        w = np.where(w.sum(axis=1, keepdims=True) > 0, w, sel.astype(float))
+        j = _choice(self.gen, w)
+        return order[np.arange(len(r)), j]
+
+    def _tadd(self, r: np.ndarray, side: np.ndarray, key: str, v: Any = 1) -> None:
+        self.ts[r, side, _TK[key]] += v
+
+    def _padd(self, r: np.ndarray, side: np.ndarray, pidx: np.ndarray, key: str, v: Any = 1) -> None:
+        self.ps[r, side, pidx, _PK[key]] += v
+
+    def _on_mean(self, r: np.ndarray, side: np.ndarray, vals: np.ndarray) -> np.ndarray:
+        on = self.on[r, side]
+        return (vals * on).sum(axis=1) / np.maximum(on.sum(axis=1), 1)
+
+    def _sample_action(self, r: np.ndarray) -> None:
+        o = self.offense[r]
+        w = self.t.off_tbl[o, self.ctx_code[r], self.clutch[r]] * self.style_action[r, o][:, self.t.a_style]
+        self.action[r] = _choice(self.gen, w)
+
+    def _turnover(self, r: np.ndarray, pidx: np.ndarray, next_code: int) -> None:
+        o = self.offense[r]
+        self._tadd(r, o, "TOV")
+        self._padd(r, o, pidx, "TOV")
+        self._finish(r, next_code)
+
+    def _shot_clock_turnover(self, r: np.ndarray) -> None:
+        o = self.offense[r]
+        self._turnover(r, self._pick(r, o, self.t.pol_actor[o]), _C_AFTER_TOV_DEAD)
+
+    def _apply_cost(self, r: np.ndarray, cost: np.ndarray) -> np.ndarray:
+        """Live-ball time cost; resolves shot clock violations / period ends. Returns rows still alive."""
+        adj = cost * self.tempo[r]
+        self.shot_clock[r] -= adj
+        self.clock[r] = np.maximum(self.clock[r] - adj, 0.0)
+        viol = self.shot_clock[r] <= 0
+        if viol.any():
+            self._shot_clock_turnover(r[viol])
+        pend = ~viol & (self.clock[r] <= 0)
+        if pend.any():
+            self._finish(r[pend], None, period_end=True)
+        return r[~viol & ~pend]
+
+    def _inbound_turnover(self, r: np.ndarray) -> np.ndarray:
+        """sim_clock.simulate_inbound; returns mask of rows that turned it over (already finished)."""
+        o = self.offense[r]
+        d = 1 - o
+        tov_base, tov_min, tov_max, def_scale, off_scale = self.ib
+        e_off = _fatigue_factor(self.energy[r, o])
+        safe = np.where(self.on[r, o], self.t.pass_safe[o] * e_off, -np.inf)
+        inbounder = safe.argmax(axis=1)
+        off_safe = safe[np.arange(len(r)), inbounder]
+        def_steal = self._on_mean(r, d, self.t.def_steal[d] * _fatigue_factor(self.energy[r, d]))
+        p = np.clip(tov_base + def_scale * (def_steal - 50.0) - off_scale * (off_safe - 50.0), tov_min, tov_max)
+        hit = self.gen.random(len(r)) < p
+        if hit.any():
+            self._turnover(r[hit], inbounder[hit], _C_AFTER_TOV)
+        return hit
+
+    # ---- periods ----
+    def _begin_period(self, r: np.ndarray) -> None:
+        self.quarter[r] += 1
+        q = self.quarter[r]
+        reg = q <= self.quarters
+        self.clock[r] = np.where(reg, self.quarter_len, self.ot_len)
+        self.team_fouls[r] = 0
+        self.offense[r] = np.where(q % 2 == 1, HOME_IDX, AWAY_IDX)
+        ot = r[~reg]
+        if len(ot):
+            if self.ot_mode == "random":
+                p_home = np.full(len(ot), 0.5)
+            else:
+                jb = self.t.jumpball
+                s_home = np.where(self.on[ot, HOME_IDX], jb[HOME_IDX], -np.inf).max(axis=1)
+                s_away = np.where(self.on[ot, AWAY_IDX], jb[AWAY_IDX], -np.inf).max(axis=1)
+                p_home = 1.0 / (1.0 + np.exp(-(s_home - s_away) / self.jb_scale))
+            self.offense[ot] = np.where(self.gen.random(len(ot)) < p_home, HOME_IDX, AWAY_IDX)
+        self.pos_start[r] = _C_START_Q
+        self.phase[r] = _PH_START
+
+    def _break_recovery(self, r: np.ndarray, break_sec: float) -> None:
+        if break_sec <= 0 or not len(r):
+            return
+        t = self.t
+        on = self.on[r]
+        rec = np.where(on, t.break_on_per_sec[None], t.break_bench_per_sec[None]) * break_sec
+        self.energy[r] = np.clip(self.energy[r] + rec * t.valid[None], 0.0, 1.0)
+
+    def _end_period(self, r: np.ndarray) -> None:
+        q = self.quarter[r]
+        more_reg = q < self.quarters
+        self._break_recovery(r[more_reg], self.break_between)
+        pts = self.ts[r, :, _TK["PTS"]]
+        tied = ~more_reg & (pts[:, 0] == pts[:, 1])
+        self._break_recovery(r[tied], self.break_before_ot)
+        self.overtime[r[tied]] += 1
+        done = ~more_reg & ~tied
+        self.phase[r[done]] = _PH_DONE
+        self._begin_period(r[more_reg | tied])
+
+    # ---- possessions ----
+    def _start(self, r: np.ndarray) -> None:
+        t = self.t
+        o = self.offense[r]
+        d = 1 - o
+        self.shot_clock[r] = self.shot_clock_full
+        self.start_clock[r] = self.clock[r]
+
+        pts = self.ts[r, :, _TK["PTS"]]
+        diff = np.abs(pts[:, 0] - pts[:, 1])
+        q = self.quarter[r]
+        clutch = (q >= self.quarters) & (self.clock[r] <= 120) & (diff <= 8)
+        garbage = (q == self.quarters) & (self.clock[r] <= 360) & (diff >= 20)
+        self.clutch[r] = clutch
+        self.garbage[r] = garbage
+        self.var_code[r] = np.where(clutch, 1, np.where(garbage, 2, 0))
+        self.dead_tempo[r] = np.where(garbage, 1.0 / 1.08, 1.0)
+        self.tempo[r] = self.dead_tempo[r] * self.style_tempo[r, o]
+        self.avg_fat_off[r] = self._on_mean(r, o, self.energy[r, o])
+        self.def_mult[r] = self.def_mult_min + 0.10 * self._on_mean(r, d, self.energy[r, d])
+        self.bonus_thr[r] = np.where(q > self.quarters, self.ot_bonus, self.bonus)
+        self.ctx_code[r] = self.pos_start[r]
+        self.pass_chain[r] = 0
+        self.carry[r] = 0.0
+
+        # dead-ball setup: game clock only
+        self.clock[r] = np.maximum(self.clock[r] - self.setup_cost[self.pos_start[r]] * self.dead_tempo[r], 0.0)
+        expired = self.clock[r] <= 0
+        if expired.any():
+            self._finish(r[expired], None, period_end=True, drain=False)
+        r = r[~expired]
+        if not len(r):
+            return
+
+        self._tadd(r, self.offense[r], "Possessions")
+        dead = np.isin(self.pos_start[r], (_C_START_Q, _C_AFTER_SCORE, _C_AFTER_TOV_DEAD))
+        if dead.any():
+            lost = self._inbound_turnover(r[dead])
+            keep = np.ones(len(r), dtype=bool)
+            keep[np.nonzero(dead)[0][lost]] = False
+            r = r[keep]
+        if len(r):
+            self._sample_action(r)
+            self.phase[r] = _PH_STEP
+
+    def _step(self, r: np.ndarray) -> None:
+        t = self.t
+        r = self._apply_cost(r, t.a_cost[self.action[r]])
+        if not len(r):
+            return
+        o = self.offense[r]
+        a = self.action[r]
+
+        # outcome priors x team style x fatigue (TO_/RESET_ weights)
+        f = self.avg_fat_off[r]
+        bad = 1.0 + (1.0 - f) * (self.bad_mult_max - 1.0)
+        bad = np.clip(np.where(f < self.bad_critical, bad + self.bad_bonus, bad), 1.0, self.bad_cap)
+        w = t.prior[o, a] * self.style_outcome[r, o][:, t.o_style]
+        w = np.where(t.o_bad[None, :], w * bad[:, None], w)
+        oc = _choice(self.gen, w)
+
+        kind = t.o_kind[oc]
+        for k, fn in (
+            (_K_SHOT, self._resolve_shot),
+            (_K_PASS, self._resolve_pass),
+            (_K_TO, self._resolve_to),
+            (_K_FOUL_REACH, self._resolve_foul),
+            (_K_FOUL_DRAW, self._resolve_foul),
+            (_K_RESET, self._resolve_reset),
+        ):
+            m = kind == k
+            if m.any():
+                fn(r[m], oc[m])
+
+    def _actor_logit(self, r: np.ndarray, oc: np.ndarray, actor: np.ndarray, lk: np.ndarray, mix: bool) -> np.ndarray:
+        """logit(base) excluded: sensitivity * (off - def) + role/quality/carry deltas + noise + fatigue."""
+        t = self.t
+        o = self.offense[r]
+        a = self.action[r]
+        e = self.energy[r, o, actor]
+        off_score = t.off_raw[o, oc, actor] * _fatigue_factor(e)
+        def_score = t.def_raw[o, oc] * self.def_mult[r]
+        if mix:
+            def_score = t.def_mix_neutral + def_score * t.def_mix
+        noise = self.gen.standard_normal(len(r)) * t.noise_std[o, self.var_code[r], lk]
+        return (
+            (off_score - def_score) * t.sens[lk]
+            + t.role_delta[o, a] + self.carry[r] + noise
+        ), (1.0 - e) * self.fat_logit_max
+
+    def _record_fga(self, r: np.ndarray, o: np.ndarray, actor: np.ndarray, pts: np.ndarray, zone: np.ndarray) -> None:
+        self._tadd(r, o, "FGA")
+        self._padd(r, o, actor, "FGA")
+        three = pts == 3
+        if three.any():
+            r3, o3 = r[three], o[three]
+            self._tadd(r3, o3, "3PA")
+            self._padd(r3, o3, actor[three], "3PA")
+            corner = self.gen.random(len(r3)) < self.t.a_corner3[self.action[r3]]
+            self._tadd(r3[corner], o3[corner], "Corner3A")
+        for z, tk in _ZONE_TEAM_KEY.items():
+            m = zone == z
+            if m.any():
+                self.ts[r[m], o[m], tk] += 1
+
+    def _record_make(self, r: np.ndarray, o: np.ndarray, actor: np.ndarray, pts: np.ndarray) -> None:
+        self._tadd(r, o, "FGM")
+        self._padd(r, o, actor, "FGM")
+        self._tadd(r, o, "PTS", pts)
+        self._padd(r, o, actor, "PTS", pts)
+        three = pts == 3
+        if three.any():
+            self._tadd(r[three], o[three], "3PM")
+            self._padd(r[three], o[three], actor[three], "3PM")
+
+    def _credit_assist(self, r: np.ndarray, shooter: np.ndarray) -> None:
+        o = self.offense[r]
+        order = self.t.assist_order[o]
+        on = np.take_along_axis(self.on[r, o], order, axis=1) & (order != shooter[:, None])
+        ok = on.any(axis=1)
+        if not ok.any():
+            return
+        r, o, order, on = r[ok], o[ok], order[ok], on[ok]
+        assister = order[np.arange(len(r)), on.argmax(axis=1)]
+        self._tadd(r, o, "AST")
+        self._padd(r, o, assister, "AST")
+
+    def _resolve_shot(self, r: np.ndarray, oc: np.ndarray) -> None:
+        t = self.t
+        o = self.offense[r]
+        a = self.action[r]
+        actor = self._pick(r, o, t.policy[o, a, oc])
+        lk = t.o_lk[oc]
+        x, fat = self._actor_logit(r, oc, actor, lk, mix=True)
+        self.carry[r] = 0.0
+        p = np.clip(1.0 / (1.0 + np.exp(-(t.o_base_logit[oc] + x + t.q_delta[o, a, oc] + fat))), t.prob_lo, t.prob_hi)
+        pts = t.o_pts[oc]
+        self._record_fga(r, o, actor, pts, t.o_zone[oc])
+        made = self.gen.random(len(r)) < p
+        if made.any():
+            rm, am = r[made], actor[made]
+            self._record_make(rm, o[made], am, pts[made])
+            pc = np.minimum(self.pass_chain[rm], 2)
+            ast = self.gen.random(len(rm)) < t.ast_p[a[made], oc[made], pc]
+            if ast.any():
+                self._credit_assist(rm[ast], am[ast])
+            self._finish(rm, _C_AFTER_SCORE)
+        if (~made).any():
+            self._rebound(r[~made], ft=False)
+
+    def _resolve_pass(self, r: np.ndarray, oc: np.ndarray) -> None:
+        t = self.t
+        o = self.offense[r]
+        a = self.action[r]
+        actor = self._pick(r, o, t.policy[o, a, oc])
+        x, _ = self._actor_logit(r, oc, actor, t.o_lk[oc], mix=False)
+        self.carry[r] = 0.0
+        p_ok = np.clip(1.0 / (1.0 + np.exp(-(t.o_base_logit[oc] + x))), t.prob_lo, t.prob_hi)
+        u = self.gen.random((len(r), 4))
+        to = u[:, 0] < t.p_to[o, a, oc]
+        reset = ~to & (u[:, 1] < t.p_reset[o, a, oc])
+        ok = ~to & ~reset & (u[:, 2] < p_ok)
+        fail = ~to & ~reset & ~ok
+        if to.any():
+            self._turnover(r[to], actor[to], _C_AFTER_TOV)
+        if (reset | fail).any():
+            self._resolve_reset(r[reset | fail], oc[reset | fail])
+        if not ok.any():
+            return
+        r, o, a, oc, u3 = r[ok], o[ok], a[ok], oc[ok], u[ok, 3]
+        p_neg, p_pos = t.p_carry_neg[o, a, oc], t.p_carry_pos[o, a, oc]
+        carry_out = np.where(u3 < p_neg + p_pos, t.carry_val[o, a, oc], 0.0)
+        self.carry[r] = np.clip(self.carry[r] + carry_out, -t.carry_clamp, t.carry_clamp)
+        self.pass_chain[r] += 1
+
+        name = np.array(t.outcomes, dtype=object)[oc]
+        kick = np.isin(name, ("PASS_KICKOUT", "PASS_SKIP"))
+        extra = name == "PASS_EXTRA"
+        cost = np.where(kick, self.cost_kick, np.where(extra, self.cost_extra, 0.0))
+        timed = cost > 0
+        alive = np.ones(len(r), dtype=bool)
+        if timed.any():
+            keep = self._apply_cost(r[timed], cost[timed])
+            alive[timed] = np.isin(r[timed], keep)
+        r, name, kick, extra = r[alive], name[alive], kick[alive], extra[alive]
+        if not len(r):
+            return
+        u = self.gen.random(len(r))
+        ai = t.a_index
+        nxt = np.full(len(r), -1, dtype=np.int64)
+        spot = kick | extra
+        nxt[spot] = np.where(u[spot] < 0.72, ai["SpotUp"], ai["ExtraPass"])
+        sr = name == "PASS_SHORTROLL"
+        nxt[sr] = np.where(u[sr] < 0.40, ai["Drive"], ai["Kickout"])
+        rest = nxt < 0
+        if rest.any():
+            self._sample_action(r[rest])
+            nxt[rest] = self.action[r[rest]]
+        nxt[self.pass_chain[r] >= 3] = ai["SpotUp"]
+        self.action[r] = nxt
+
+    def _resolve_to(self, r: np.ndarray, oc: np.ndarray) -> None:
+        o = self.offense[r]
+        self._turnover(r, self._pick(r, o, self.t.pol_actor[o]), _C_AFTER_TOV)
+
+    def _resolve_reset(self, r: np.ndarray, oc: np.ndarray) -> None:
+        if self.cost_reset > 0:
+            r = self._apply_cost(r, np.full(len(r), self.cost_reset))
+        if len(r):
+            self._sample_action(r)
+            self.pass_chain[r] = 0
+
+    def _resolve_foul(self, r: np.ndarray, oc: np.ndarray) -> None:
+        t = self.t
+        o = self.offense[r]
+        d = 1 - o
+        a = self.action[r]
+        M = len(r)
+        actor = self._pick(r, o, t.policy[o, a, oc])
+
+        # fouler: uniform among on-court defenders not yet fouled out
+        on_d = self.on[r, d]
+        elig = on_d & (self.pf[r, d] < self.foul_out)
+        elig = np.where(elig.any(axis=1, keepdims=True), elig, on_d)
+        fouler = _choice(self.gen, elig.astype(float))
+        self.pf[r, d, fouler] += 1
+        self._padd(r, d, fouler, "PF")
+        self._tadd(r, d, "PF")
+        self.team_fouls[r, d] += 1
+        fouled_out = self.pf[r, d, fouler] >= self.foul_out
+        self.energy[r[fouled_out], d[fouled_out], fouler[fouled_out]] = 0.0
+        in_bonus = self.team_fouls[r, d] >= self.bonus_thr[r]
+
+        reach = t.o_kind[oc] == _K_FOUL_REACH
+        no_shots = reach & ~in_bonus
+        if no_shots.any():
+            self._foul_no_shots(r[no_shots])
+
+        draw = ~reach
+        nfts = np.full(M, 2, dtype=np.int64)
+        if draw.any():
+            rd, od, ad, ocd, act = r[draw], o[draw], a[draw], oc[draw], actor[draw]
+            j = np.where(self.gen.random(len(rd)) < t.fd_p1[ocd], 0, 1)
+            lk = t.fd_lk[ocd, j]
+            x, fat = self._actor_logit(rd, ocd, act, lk, mix=False)
+            self.carry[rd] = 0.0
+            p = np.clip(1.0 / (1.0 + np.exp(-(t.fd_logit[ocd, j] + x + t.q_delta[od, ad, ocd] + fat))), t.prob_lo, t.prob_hi)
+            mult = t.fd_mult[ocd, j]
+            p = np.where(mult != 1.0, np.clip(p * mult, t.contact_lo, t.contact_hi), p)
+            made = self.gen.random(len(rd)) < p
+            pts = t.fd_pts[ocd, j]
+            if made.any():
+                rm, om, am = rd[made], od[made], act[made]
+                self._record_fga(rm, om, am, pts[made], t.fd_zone[ocd, j][made])
+                self._record_make(rm, om, am, pts[made])
+                ast = (~t.fd_is3od[ocd, j][made]) & (self.pass_chain[rm] > 0)
+                if ast.any():
+                    self._credit_assist(rm[ast], am[ast])
+            nfts[draw] = np.where(made, 1, np.where(pts == 3, 3, 2))
+
+        ft = ~no_shots
+        if ft.any():
+            self._free_throws(r[ft], actor[ft], nfts[ft])
+
+    def _foul_no_shots(self, r: np.ndarray) -> None:
+        if self.cost_foul_stop > 0:
+            self.clock[r] = np.maximum(self.clock[r] - self.cost_foul_stop * self.tempo[r], 0.0)
+            pend = self.clock[r] <= 0
+            if pend.any():
+                self._finish(r[pend], None, period_end=True)
+            r = r[~pend]
+        if not len(r):
+            return
+        self.shot_clock[r] = np.maximum(self.shot_clock[r], self.foul_reset)
+        lost = self._inbound_turnover(r)
+        r = r[~lost]
+        if len(r):
+            self.ctx_code[r] = _C_AFTER_FOUL
+            self._sample_action(r)
+            self.pass_chain[r] = 0
+
+    def _free_throws(self, r: np.ndarray, shooter: np.ndarray, nfts: np.ndarray) -> None:
+        t = self.t
+        o = self.offense[r]
+        e = self.energy[r, o, shooter]
+        p = np.clip(t.ft_base + (t.shot_ft[o, shooter] * _fatigue_factor(e) / 100.0) * t.ft_range, t.ft_lo, t.ft_hi)
+        hit = self.gen.random((len(r), 3)) < p[:, None]
+        taken = np.arange(3)[None, :] < nfts[:, None]
+        made = (hit & taken).sum(axis=1)
+        last_made = hit[np.arange(len(r)), nfts - 1]
+        self._tadd(r, o, "FTA", nfts)
+        self._padd(r, o, shooter, "FTA", nfts)
+        self._tadd(r, o, "FTM", made)
+        self._padd(r, o, shooter, "FTM", made)
+        self._tadd(r, o, "PTS", made)
+        self._padd(r, o, shooter, "PTS", made)
+        if last_made.any():
+            self._finish(r[last_made], _C_AFTER_SCORE)
+        if (~last_made).any():
+            self._rebound(r[~last_made], ft=True)
+
+    def _rebound(self, r: np.ndarray, ft: bool) -> None:
+        t = self.t
+        o = self.offense[r]
+        d = 1 - o
+        off_orb = self._on_mean(r, o, t.reb_or[o] * _fatigue_factor(self.energy[r, o])) * t.orb_mult[o]
+        if ft:
+            off_orb = off_orb * self.ft_orb_mult
+        def_drb = self._on_mean(r, d, t.reb_dr[d] * _fatigue_factor(self.energy[r, d])) * t.drb_mult[d]
+        z = t.orb_base_logit + (off_orb - def_drb) * t.sens[_LK["rebound"]]
+        p = np.clip(1.0 / (1.0 + np.exp(-z)), t.prob_lo, t.prob_hi)
+        u = self.gen.random((len(r), 2))
+        orb = u[:, 0] < p
+        if orb.any():
+            ro, oo = r[orb], o[orb]
+            rb = self._pick(ro, oo, t.pol_orb[oo])
+            self._tadd(ro, oo, "ORB")
+            self._padd(ro, oo, rb, "ORB")
+            self.shot_clock[ro] = self.foul_reset if ft else self.orb_reset
+            u2 = u[orb, 1]
+            ai = t.a_index
+            self.action[ro] = np.where(u2 < 0.45, ai["Kickout"], np.where(u2 < 0.60, ai["ExtraPass"], ai["Drive"]))
+            self.pass_chain[ro] = 0
+        if (~orb).any():
+            rd, dd = r[~orb], d[~orb]
+            rb = self._pick(rd, dd, t.pol_drb[dd])
+            self._tadd(rd, dd, "DRB")
+            self._padd(rd, dd, rb, "DRB")
+            self._finish(rd, _C_AFTER_DRB)
+
+    def _finish(self, r: np.ndarray, next_code: Optional[int], period_end: bool = False, drain: bool = True) -> None:
+        """End-of-possession bookkeeping (sim_game loop body after simulate_possession)."""
+        if not len(r):
+            return
+        t = self.t
+        elapsed = np.maximum(self.start_clock[r] - self.clock[r], 0.0)
+        on = self.on[r]
+        self.minutes[r] += on * elapsed.astype(np.int64)[:, None, None]
+        if drain:
+            o = self.offense[r]
+            # team s drains with its offense (0) or defense (1) rate depending on who had the ball
+            side_role = np.stack([(o != HOME_IDX).astype(np.int64), (o != AWAY_IDX).astype(np.int64)], axis=1)
+            loss = t.loss_per_sec[np.arange(2)[None, :], side_role]          # (M, 2, R)
+            delta = np.where(on, -loss, t.bench_rec_per_sec[None] * t.valid[None]) * elapsed[:, None, None]
+            self.energy[r] = np.clip(self.energy[r] + delta, 0.0, 1.0)
+            for s in (HOME_IDX, AWAY_IDX):
+                self._rotate(r, s)
+
+        ended = np.full(len(r), bool(period_end)) | (self.clock[r] <= 0)
+        cont = r[~ended]
+        if len(cont):
+            self.offense[cont] = 1 - self.offense[cont]
+            self.pos_start[cont] = next_code if next_code is not None else _C_AFTER_TOV
+            self.phase[cont] = _PH_START
+        over = r[ended]
+        if len(over):
+            self.clock[over] = 0.0
+            self._end_period(over)
+
+    def _rotate(self, r: np.ndarray, s: int) -> None:
+        """Vectorized sim_rotation._perform_rotation for team `s` (up to 2 swaps)."""
+        t = self.t
+        M = len(r)
+        on = self.on[r, s].copy()
+        valid = t.valid[s][None, :]
+        fouled = self.pf[r, s] >= self.foul_out
+        bench = valid & ~on & ~fouled
+        if not bench.any():
+            return
+        e = self.energy[r, s]
+        mins = self.minutes[r, s].astype(float)
+        tgt = t.targets[s][None, :]
+        d = tgt - mins
+        q = self.quarter[r]
+        clock_i = self.clock[r].astype(np.int64)
+        remaining = np.where(q <= self.quarters, clock_i + np.maximum(0, self.quarters - q) * int(self.quarter_len), clock_i)
+        rb = mins + remaining[:, None] - tgt
+        g = self.garbage[r][:, None]
+        locked = t.locked[s][None, :]
+
+        out = np.maximum(-d, 0) / 60.0 + rb / 120.0 + (1.0 - e) * 1.5 + np.where(g, tgt / 60.0 * 0.05, 0.0)
+        out = np.where(rb <= 0, -1e6, out)
+        out = np.where(locked, -1e9, out)
+        out = np.where(fouled, 1e9, out)
+        ins = np.maximum(d, 0) / 60.0 + 0.6 * e + (-np.minimum(0, d) / 120.0) - np.where(g, tgt / 60.0 * 0.05, 0.0)
+
+        removable = on & (out >= -1e5)
+        order = np.argsort(np.where(removable, -out, np.inf), axis=1, kind="stable")
+        init = t.initiator[s][None, :]
+        enforce = bool(t.initiator[s].any())
+        rows = np.arange(M)
+        swaps = np.zeros(M, dtype=np.int64)
+        changed = False
+        for k in range(5):
+            cand = order[:, k]
+            ok = removable[rows, cand] & (swaps < 2) & bench.any(axis=1)
+            if not ok.any():
+                continue
+            score = ins + t.group_bonus[s][cand]
+            allowed = bench.copy()
+            if enforce:
+                cur = (on & init).sum(axis=1)
+                new = cur[:, None] - init[0, cand][:, None] + init
+                bench_has_init = (bench & init).any(axis=1)
+                allowed &= ~(new > 1) & ~((new < 1) & bench_has_init[:, None])
+            score = np.where(allowed, score, -np.inf)
+            best = score.argmax(axis=1)
+            ok &= np.isfinite(score[rows, best])
+            if not ok.any():
+                continue
+            ro, co, bo = rows[ok], cand[ok], best[ok]
+            on[ro, co] = False
+            on[ro, bo] = True
+            bench[ro, bo] = False
+            swaps[ok] += 1
+            changed = True
+        if changed:
+            self.on[r, s] = on
+
+    # ---- driver ----
+    def run(self, max_iter: int = 200_000) -> None:
+        self._begin_period(np.arange(self.n))
+        for _ in range(max_iter):
+            live = self.phase != _PH_DONE
+            if not live.any():
+                return
+            r = np.nonzero(self.phase == _PH_START)[0]
+            if len(r):
+                self._start(r)
+            r = np.nonzero(self.phase == _PH_STEP)[0]
+            if len(r):
+                self._step(r)
+        raise RuntimeError("simulate_games_batch: replicas did not finish (step limit reached)")
+
+
+# -------------------------
+# Public API
+# -------------------------
+
+def simulate_games_batch(
+    home: TeamState,
+    away: TeamState,
+    n: int,
+    seed: Optional[int] = None,
+    era: str = "default",
+    strict_validation: bool = True,
+    validation: Optional[ValidationConfig] = None,
+) -> BatchGameResult:
+    """Simulate `n` independent replicas of home vs away in lockstep (see module docstring).
+
+    Inputs are validated/sanitized exactly like `simulate_game`, but on private copies:
+    the caller's TeamState objects are never mutated.
+    """
+    n = int(n)
+    if n < 0:
+        raise ValueError(f"simulate_games_batch: n must be >= 0 (got {n})")
+
+    report = ValidationReport()
+    compiled_era = get_compiled_era(era)
+    for w in compiled_era.warnings:
+        report.warn(f"era[{era}]: {w}")
+    for e in compiled_era.errors:
+        report.error(f"era[{era}]: {e}")
+    game_cfg = compiled_era.game_cfg
+    cfg = validation if validation is not None else compiled_era.validation_config(strict=strict_validation)
+
+    teams = (_fresh_team(home), _fresh_team(away))
+    for t in teams:
+        validate_and_sanitize_team(t, cfg, report, label=f"team[{t.name}]", game_cfg=game_cfg, allowed=compiled_era.allowed)
+    if cfg.strict and report.errors:
+        head = "\n".join(report.errors[:6])
+        more = f"\n... (+{len(report.errors)-6} more)" if len(report.errors) > 6 else ""
+        raise ValueError(f"MatchEngine input validation failed:\n{head}{more}")
+    home_team_id, away_team_id = _validate_team_and_player_ids(teams[0], teams[1], strict_player_ids=True)
+
+    tbl = _MatchupTables(teams, game_cfg, get_mvp_rules())
+    run = _BatchRun(tbl, n, np.random.default_rng(seed))
+    if n:
+        run.run()
+
+    team_stats = {k: run.ts[:, :, i].copy() for k, i in _TK.items()}
+    player_stats: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    for k, i in _PK.items():
+        player_stats[k] = tuple(run.ps[:, s, : tbl.n_players[s], i].copy() for s in (0, 1))  # type: ignore[assignment]
+    player_stats["MIN"] = tuple(run.minutes[:, s, : tbl.n_players[s]] / 60.0 for s in (0, 1))  # type: ignore[assignment]
+
+    return BatchGameResult(
+        n=n,
+        seed=seed,
+        era=str(era),
+        home_team_id=home_team_id,
+        away_team_id=away_team_id,
+        pids=tbl.pids,  # type: ignore[arg-type]
+        team_stats=team_stats,
+        player_stats=player_stats,
+        overtime_periods=run.overtime.copy(),
+        validation=report.to_dict(),
+    )
@@ -7,6 +7,7 @@ NOTE: Split from sim.py on 2025-12-27.
 
 import random
 import math
+from time import perf_counter
 from typing import Any, Dict, Optional, List, Tuple
 
 # SSOT schema (IDs must be canonical across roster -> engine -> adapter -> state)
@@ -19,14 +20,17 @@ from .validation import (
     ValidationReport,
     validate_and_sanitize_team,
 )
-from .game_config import build_game_config
-from .era import get_mvp_rules, load_era_config
+from .era import get_mvp_rules
+from .era_registry import get_compiled_era
 
 from .sim_clock import apply_dead_ball_cost
 from .sim_fatigue import _apply_break_recovery, _apply_fatigue_loss
 from .sim_rotation import _get_on_court, _init_targets, _perform_rotation, _set_on_court, _update_minutes
 from .team_keys import AWAY, HOME, team_key
 from .sim_possession import simulate_possession
+from .dist_tables import PossessionDistTables
+from .lineup_context import DEFAULT_LINEUP_ENERGY_BUCKET, LineupContextCache
+from . import profiler
 
 # -------------------------
 # ID normalization / validation (interface contract)
@@ -293,27 +297,25 @@ def simulate_game(
     - validates required derived keys (error by default; can 'fill' via ValidationConfig)
     """
     report = ValidationReport()
-    cfg = validation if validation is not None else ValidationConfig(strict=strict_validation)
-
-    # 0-1: load era tuning parameters (priors/base%/scheme multipliers/prob model)
-    era_cfg, era_warnings, era_errors = load_era_config(era)
-    for w in era_warnings:
+    # Opt-in phase timings (see profiler); None when disabled.
+    prof = profiler.new_profile()
+    t_game = perf_counter()
+
+    # 0-1: era tuning parameters (priors/base%/scheme multipliers/prob model).
+    # Compiled once per era source and shared process-wide (see era_registry).
+    compiled_era = get_compiled_era(era)
+    for w in compiled_era.warnings:
         report.warn(f"era[{era}]: {w}")
-    for e in era_errors:
+    for e in compiled_era.errors:
         report.error(f"era[{era}]: {e}")
 
-    game_cfg = build_game_config(era_cfg)
+    game_cfg = compiled_era.game_cfg
 
     # If caller did not pass a custom ValidationConfig, adopt knob clamp bounds from era.
-    if validation is None:
-        k = game_cfg.knobs
-        if isinstance(k.get("mult_lo"), (int, float)):
-            cfg.mult_lo = float(k["mult_lo"])
-        if isinstance(k.get("mult_hi"), (int, float)):
-            cfg.mult_hi = float(k["mult_hi"])
+    cfg = validation if validation is not None else compiled_era.validation_config(strict=strict_validation)
 
-    validate_and_sanitize_team(home, cfg, report, label=f"team[{home.name}]", game_cfg=game_cfg)
-    validate_and_sanitize_team(away, cfg, report, label=f"team[{away.name}]", game_cfg=game_cfg)
+    validate_and_sanitize_team(home, cfg, report, label=f"team[{home.name}]", game_cfg=game_cfg, allowed=compiled_era.allowed)
+    validate_and_sanitize_team(away, cfg, report, label=f"team[{away.name}]", game_cfg=game_cfg, allowed=compiled_era.allowed)
 
     if cfg.strict and report.errors:
         # Raise with a compact, actionable message (full list is also in report)
@@ -361,6 +363,18 @@ def simulate_game(
     home.set_on_court(start_home)
     away.set_on_court(start_away)
 
+    # Tactics are sanitized above and fixed for the rest of the game: compile the
+    # action/outcome distribution tables once per offense side.
+    dist_sampler = str(rules.get("dist_sampler", "cdf"))
+    dist_tables = {
+        HOME: PossessionDistTables(home.tactics, away.tactics, game_cfg, sampler=dist_sampler),
+        AWAY: PossessionDistTables(away.tactics, home.tactics, game_cfg, sampler=dist_sampler),
+    }
+    # On-court aggregates (shot_diet style/multipliers, defensive roles, def snapshot) per lineup.
+    lineup_contexts = LineupContextCache(
+        float(rules.get("lineup_energy_bucket", DEFAULT_LINEUP_ENERGY_BUCKET))
+    )
+
     regulation_quarters = int(rules.get("quarters", 4))
     overtime_length = float(rules.get("overtime_length", 300))
     total_possessions = 0
@@ -392,6 +406,8 @@ def simulate_game(
             game_state.shot_clock_sec = float(rules.get("shot_clock", 24))
 
             start_clock = game_state.clock_sec
+            if prof is not None:
+                t_setup = perf_counter()
 
             off_on_court = _get_on_court(game_state, offense, home)
             def_on_court = _get_on_court(game_state, defense, home)
@@ -453,6 +469,9 @@ def simulate_game(
                 "bonus_threshold": bonus_threshold,
                 "pos_start": pos_start,
                 "dead_ball_inbound": pos_start in ("start_q", "after_score", "after_tov_dead"),
+                "dist_tables": dist_tables[off_key],
+                "lineup_contexts": lineup_contexts,
+                "engine_profile": prof,
             }
 
             # Setup time: dead-ball only (game clock runs; shot clock should start at full)
@@ -477,6 +496,8 @@ def simulate_game(
 
             # full shot clock starts after setup
             game_state.shot_clock_sec = float(rules.get("shot_clock", 24))
+            if prof is not None:
+                prof.add("possession_setup", perf_counter() - t_setup)
             pos_res = simulate_possession(rng, offense, defense, game_state, rules, ctx, game_cfg=game_cfg)
             pos_errors = ctx.get("errors") if isinstance(ctx, dict) else None
             if isinstance(pos_errors, list) and pos_errors:
@@ -504,8 +525,12 @@ def simulate_game(
                 "transition_emphasis": bool(defense.tactics.context.get("TRANSITION_EMPHASIS", False)),
                 "heavy_pnr": bool(defense.tactics.context.get("HEAVY_PNR", False)) or "PnR" in defense.tactics.defense_scheme,
             }
+            if prof is not None:
+                t_fat = perf_counter()
             _apply_fatigue_loss(offense, off_on_court, game_state, rules, intensity_off, elapsed, home)
             _apply_fatigue_loss(defense, def_on_court, game_state, rules, intensity_def, elapsed, home)
+            if prof is not None:
+                prof.add("fatigue", perf_counter() - t_fat, 2)
 
             pts_scored = int(pos_res.get("points_scored", 0))
             had_orb = bool(pos_res.get("had_orb", False))
@@ -534,8 +559,12 @@ def simulate_game(
                         f"({type(exc).__name__}: {exc})"
                     )
 
+            if prof is not None:
+                t_rot = perf_counter()
             _perform_rotation(rng, offense, home, game_state, rules, is_garbage)
             _perform_rotation(rng, defense, home, game_state, rules, is_garbage)
+            if prof is not None:
+                prof.add("rotation", perf_counter() - t_rot, 2)
 
             total_possessions += 1
             game_state.score_home = home.pts
@@ -549,15 +578,23 @@ def simulate_game(
             offense, defense = defense, offense
             pos_start = str(pos_res.get("pos_start_next", "after_tov"))
 
+        if prof is not None:
+            t_tok = perf_counter()
         replay_token = make_replay_token(rng, home, away, era=era)
+        if prof is not None:
+            prof.add("replay_token", perf_counter() - t_tok)
 
     def _apply_period_break(break_sec: float) -> None:
         if break_sec <= 0:
             return
         onA = _get_on_court(game_state, home, home)
         onB = _get_on_court(game_state, away, home)
+        if prof is not None:
+            t_fat = perf_counter()
         _apply_break_recovery(home, onA, game_state, rules, break_sec, home)
         _apply_break_recovery(away, onB, game_state, rules, break_sec, home)
+        if prof is not None:
+            prof.add("fatigue", perf_counter() - t_fat, 2)
 
     break_between = float(rules.get("break_sec_between_periods", 0.0))
     break_before_ot = float(rules.get("break_sec_before_ot", break_between))
@@ -583,7 +620,7 @@ def simulate_game(
         if home.pts == away.pts:
             _apply_period_break(break_before_ot)
 
-    return {
+    result = {
         "meta": {
             "engine_version": ENGINE_VERSION,
             "home_team_id": home_team_id,
@@ -595,6 +632,7 @@ def simulate_game(
             "validation": report.to_dict(),
             "internal_debug": {
                 "errors": list(debug_errors),
+                "lineup_context": lineup_contexts.stats(),
                     "role_fit": {
                     "role_counts": {home_team_id: home.role_fit_role_counts, away_team_id: away.role_fit_role_counts},
                     "grade_counts": {home_team_id: home.role_fit_grade_counts, away_team_id: away.role_fit_grade_counts},
@@ -617,3 +655,9 @@ def simulate_game(
             "side_map": {"home": home_team_id, "away": away_team_id},
         }
     }
+    if prof is not None:
+        prof.games = 1
+        prof.game_sec = perf_counter() - t_game
+        profiler.record(prof)
+        result["meta"]["engine_profile"] = prof.to_dict()
+    return result
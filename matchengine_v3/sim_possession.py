@@ -8,6 +8,7 @@ NOTE: Split from sim.py on 2025-12-27.
 import random
 import math
 import warnings
+from time import perf_counter
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from .builders import (
@@ -18,7 +19,7 @@ from .builders import (
 )
 from . import shot_diet
 from . import quality
-from .def_role_players import get_or_build_def_role_players, engine_get_stat
+from .def_role_players import get_or_build_def_role_players, engine_get_stat, get_quality_score
 from .core import weighted_choice, clamp
 from .models import GameState, TeamState
 from .resolve import (
@@ -71,15 +72,18 @@ def apply_quality_to_turnover_priors(
     role_players = get_or_build_def_role_players(ctx, defense, scheme=scheme)
 
     debug_q = bool(ctx.get("debug_quality", False))
-    q_res = quality.compute_quality_score(
-        scheme=str(scheme),
-        base_action=str(base_action),
-        outcome="TO_HANDLE_LOSS",
-        role_players=role_players,
-        get_stat=engine_get_stat,
-        return_detail=debug_q,
-    )
-    q_score = float(q_res.score) if (debug_q and hasattr(q_res, "score")) else float(q_res)
+    if debug_q:
+        q_res = quality.compute_quality_score(
+            scheme=str(scheme),
+            base_action=str(base_action),
+            outcome="TO_HANDLE_LOSS",
+            role_players=role_players,
+            get_stat=engine_get_stat,
+            return_detail=True,
+        )
+        q_score = float(q_res.score) if hasattr(q_res, "score") else float(q_res)
+    else:
+        q_score = get_quality_score(ctx, str(scheme), str(base_action), "TO_HANDLE_LOSS", role_players)
 
     pressure = -q_score
 
@@ -235,6 +239,10 @@ def simulate_possession(
         except Exception:
             return
 
+    prof = ctx.get("engine_profile")
+    if prof is not None:
+        t_setup = perf_counter()
+
     tempo_mult = float(ctx.get("tempo_mult", 1.0))
     time_costs = rules.get("time_costs", {})
     had_orb = False
@@ -254,6 +262,8 @@ def simulate_possession(
     if pos_start in dead_ball_starts:
         # dead-ball inbound attempt
         if simulate_inbound(rng, offense, defense, rules):
+            if prof is not None:
+                prof.add("possession_setup", perf_counter() - t_setup, 0)
             return {
                 "end_reason": "TURNOVER",
                 "pos_start_next": "after_tov",
@@ -263,8 +273,14 @@ def simulate_possession(
                 "first_fga_shotclock_sec": ctx.get("first_fga_shotclock_sec"),
             }
 
-    # shot_diet wiring
-    style = shot_diet.compute_shot_diet_style(offense, defense, game_state=game_state, ctx=ctx)
+    # shot_diet wiring (+ lineup-scoped aggregates when simulate_game provides the cache)
+    lineup_contexts = ctx.get("lineup_contexts")
+    if lineup_contexts is not None:
+        lineup_ctx = lineup_contexts.get(offense, defense, game_state=game_state, ctx=ctx)
+        style = lineup_ctx.shot_diet_style
+        ctx["lineup_ctx"] = lineup_ctx
+    else:
+        style = shot_diet.compute_shot_diet_style(offense, defense, game_state=game_state, ctx=ctx)
     tactic_name = None
     try:
         tactic_name = offense.tactics.offense_scheme
@@ -306,15 +322,40 @@ def simulate_possession(
             out[k] /= s
         return out
 
-    off_probs = build_offense_action_probs(offense.tactics, defense.tactics, ctx=ctx, game_cfg=game_cfg)
-    off_probs = _apply_contextual_action_weights(off_probs)
-    off_probs = apply_team_style_to_action_probs(off_probs, team_style, game_cfg)
-    def_probs = build_defense_action_probs(defense.tactics, game_cfg=game_cfg)
+    # Precompiled per-game distribution tables (see dist_tables); fall back to the builders
+    # when the caller did not provide them (e.g. direct simulate_possession use).
+    dist_tables = ctx.get("dist_tables")
+
+    def _choose(weights: Dict[str, float]) -> str:
+        if dist_tables is not None:
+            return dist_tables.sample(rng, weights)
+        return weighted_choice(rng, weights)
+
+    def _build_off_probs() -> Dict[str, float]:
+        if prof is not None:
+            t_pri = perf_counter()
+        if dist_tables is not None:
+            probs = dist_tables.offense_action_probs(ctx)
+        else:
+            probs = build_offense_action_probs(offense.tactics, defense.tactics, ctx=ctx, game_cfg=game_cfg)
+        probs = _apply_contextual_action_weights(probs)
+        probs = apply_team_style_to_action_probs(probs, team_style, game_cfg)
+        if prof is not None:
+            prof.add("priors", perf_counter() - t_pri)
+        return probs
+
+    if prof is not None:
+        # counted as a call by simulate_game's half of the setup
+        prof.add("possession_setup", perf_counter() - t_setup, 0)
+    off_probs = _build_off_probs()
 
-    action = weighted_choice(rng, off_probs)
+    action = _choose(off_probs)
     offense.off_action_counts[action] = offense.off_action_counts.get(action, 0) + 1
 
-    def_action = weighted_choice(rng, def_probs)
+    if dist_tables is not None:
+        def_action = dist_tables.sample_defense_action(rng)
+    else:
+        def_action = weighted_choice(rng, build_defense_action_probs(defense.tactics, game_cfg=game_cfg))
     defense.def_action_counts[def_action] = defense.def_action_counts.get(def_action, 0) + 1
 
     tags = {
@@ -415,11 +456,19 @@ def simulate_possession(
                 }
 
         # shot_diet: pass ctx so outcome multipliers can apply
-        pri = build_outcome_priors(action, offense.tactics, defense.tactics, tags, ctx=ctx, game_cfg=game_cfg)
+        if prof is not None:
+            t_pri = perf_counter()
+        if dist_tables is not None:
+            pri = dist_tables.outcome_priors(action, tags, ctx=ctx)
+        else:
+            pri = build_outcome_priors(action, offense.tactics, defense.tactics, tags, ctx=ctx, game_cfg=game_cfg)
         pri = apply_team_style_to_outcome_priors(pri, team_style)
         pri = apply_role_fit_to_priors_and_tags(pri, get_action_base(action, game_cfg), offense, tags, game_cfg=game_cfg)
         pri = apply_quality_to_turnover_priors(pri, get_action_base(action, game_cfg), offense, defense, tags, ctx)
-        outcome = weighted_choice(rng, pri)
+        if prof is not None:
+            t_res = perf_counter()
+            prof.add("priors", t_res - t_pri)
+        outcome = _choose(pri)
 
         term, payload = resolve_outcome(
             rng,
@@ -434,6 +483,8 @@ def simulate_possession(
             game_state=game_state,
             game_cfg=game_cfg,
         )
+        if prof is not None:
+            prof.add("resolve", perf_counter() - t_res)
 
         if term == "SCORE":
             return {
@@ -491,10 +542,8 @@ def simulate_possession(
             ctx = dict(ctx)
             ctx["pos_start"] = "after_foul"
             ctx["dead_ball_inbound"] = True
-            off_probs = build_offense_action_probs(offense.tactics, defense.tactics, ctx=ctx, game_cfg=game_cfg)
-            off_probs = _apply_contextual_action_weights(off_probs)
-            off_probs = apply_team_style_to_action_probs(off_probs, team_style, game_cfg)
-            action = weighted_choice(rng, off_probs)
+            off_probs = _build_off_probs()
+            action = _choose(off_probs)
             offense.off_action_counts[action] = offense.off_action_counts.get(action, 0) + 1
             _refresh_action_tags(action, tags)
             pass_chain = 0
@@ -609,10 +658,8 @@ def simulate_possession(
                         "pos_start": pos_start,
                         "first_fga_shotclock_sec": ctx.get("first_fga_shotclock_sec"),
                     }
-            off_probs = build_offense_action_probs(offense.tactics, defense.tactics, ctx=ctx, game_cfg=game_cfg)
-            off_probs = _apply_contextual_action_weights(off_probs)
-            off_probs = apply_team_style_to_action_probs(off_probs, team_style, game_cfg)
-            action = weighted_choice(rng, off_probs)
+            off_probs = _build_off_probs()
+            action = _choose(off_probs)
             offense.off_action_counts[action] = offense.off_action_counts.get(action, 0) + 1
             _refresh_action_tags(action, tags)
             pass_chain = 0
@@ -655,7 +702,7 @@ def simulate_possession(
             elif outcome == "PASS_SHORTROLL":
                 action = "Drive" if rng.random() < 0.40 else "Kickout"
             else:
-                action = weighted_choice(rng, off_probs)
+                action = _choose(off_probs)
 
             if pass_chain >= 3:
                 action = "SpotUp"
@@ -230,10 +230,12 @@ def sanitize_tactics_config(
     report: ValidationReport,
     label: str,
     game_cfg: "GameConfig",
+    allowed: Optional[AllowedSets] = None,
 ) -> None:
     """Mutates tactics in-place: clamps all UI knobs and ignores unknown keys."""
 
-    allowed = build_allowed_sets(game_cfg)
+    if allowed is None:
+        allowed = build_allowed_sets(game_cfg)
 
     if tac.offense_scheme not in allowed.offense_schemes:
         msg = f"{label}.offense_scheme: unknown scheme '{tac.offense_scheme}'"
@@ -414,6 +416,7 @@ def validate_and_sanitize_team(
     report: ValidationReport,
     label: str,
     game_cfg: Optional["GameConfig"] = None,
+    allowed: Optional[AllowedSets] = None,
 ) -> None:
     if game_cfg is None:
         report.error(f"{label}: game_cfg missing for validation")
@@ -458,4 +461,4 @@ def validate_and_sanitize_team(
     if team.tactics is None:
         report.error(f"{label}: tactics missing")
         return
-    sanitize_tactics_config(team.tactics, cfg, report, f"{label}.tactics", game_cfg=game_cfg)
+    sanitize_tactics_config(team.tactics, cfg, report, f"{label}.tactics", game_cfg=game_cfg, allowed=allowed)
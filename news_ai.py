@@ -11,13 +11,14 @@ import google.generativeai as genai
 from league_repo import LeagueRepo
 
 from state import (
-    export_workflow_state,
     get_db_path,
     get_cached_playoff_news_snapshot,
     get_cached_weekly_news_snapshot,
     get_current_date,
+    get_games_between,
     get_league_context_snapshot,
     get_postseason_snapshot,
+    get_window_stat_table,
     set_cached_playoff_news_snapshot,
     set_cached_weekly_news_snapshot,
 )
@@ -154,23 +155,17 @@ def _as_date(value: Any) -> Optional[date]:
 def build_week_summary_context() -> str:
     current_date = _get_current_date()
     week_start = current_date - timedelta(days=6)
-    snapshot = export_workflow_state()
 
     lines: List[str] = []
     lines.append(f"Current league date: {current_date.isoformat()}")
     lines.append(f"Coverage window: {week_start.isoformat()} ~ {current_date.isoformat()}")
 
-    games = []
-    for g in snapshot.get("games", []):
-        try:
-            g_date = date.fromisoformat(g.get("date"))
-        except (TypeError, ValueError):
-            _warn_limited("GAME_DATE_PARSE_FAILED", f"date={g.get('date')!r}", limit=3)
-            continue
-        if week_start <= g_date <= current_date:
-            games.append(g)
-
-    games_sorted = sorted(games, key=lambda x: x.get("date"))
+    # Week window from the stats index (per-player prefix sums), no full rescan. The index returns
+    # games in ingest order, so sort by date for the prompt.
+    games_sorted = sorted(
+        get_games_between(week_start.isoformat(), current_date.isoformat()),
+        key=lambda g: str(g.get("date") or ""),
+    )
     lines.append("\n[Games]")
     if not games_sorted:
         lines.append("No games played in this window.")
@@ -181,6 +176,24 @@ def build_week_summary_context() -> str:
                 f"{g.get('away_team_id')} {g.get('away_score')}"
             )
 
+    week_table = get_window_stat_table(
+        stats=["PTS", "REB", "AST"],
+        per="game",
+        date_from=week_start.isoformat(),
+        date_to=current_date.isoformat(),
+        sort_by="PTS",
+        limit=5,
+    )
+    lines.append("\n[Top Performers This Week]")
+    if not week_table["rows"]:
+        lines.append("No player stats in this window.")
+    else:
+        for r in week_table["rows"]:
+            lines.append(
+                f"{r.get('name')} ({r.get('team_id')}): {r['PTS']:.1f} PTS, {r['REB']:.1f} REB, "
+                f"{r['AST']:.1f} AST over {r['games']} games"
+            )
+
     transactions: List[Dict[str, Any]] = []
     # Transactions are stored in SQLite (SSOT). The workflow snapshot excludes them by default.
     tx_rows: List[Dict[str, Any]] = []
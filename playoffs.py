@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import random
 from contextlib import contextmanager
@@ -12,12 +13,13 @@ from config import TEAM_TO_CONF_DIV
 from league_repo import LeagueRepo
 from matchengine_v2_adapter import adapt_matchengine_result_to_v2, build_context_from_team_ids
 from matchengine_v3.sim_game import simulate_game
-from sim.roster_adapter import build_team_state_from_db
+from sim import checkpoints
+from sim.roster_adapter import get_team_state
 from state import (
-    export_full_state_snapshot,
     get_cached_playoff_news_snapshot,
     get_cached_stats_snapshot,
     get_db_path,
+    get_league_context_snapshot,
     get_postseason_snapshot,
     ingest_game_result,
     postseason_reset,
@@ -27,6 +29,7 @@ from state import (
     postseason_set_my_team_id,
     postseason_set_play_in,
     postseason_set_playoffs,
+    project,
     set_cached_playoff_news_snapshot,
     set_cached_stats_snapshot,
     set_current_date,
@@ -37,6 +40,22 @@ logger = logging.getLogger(__name__)
 
 HomePattern = [True, True, False, False, True, False, True]
 
+# None = unseeded engine RNG (default). See set_game_seed().
+_GAME_SEED: Optional[int] = None
+
+
+def set_game_seed(seed: Optional[int]) -> None:
+    """Seed postseason games: each game's engine RNG is derived from (seed, home, away, date)."""
+    global _GAME_SEED
+    _GAME_SEED = int(seed) if seed is not None else None
+
+
+def _game_rng(home_team_id: str, away_team_id: str, game_date: str) -> random.Random:
+    if _GAME_SEED is None:
+        return random.Random()
+    h = hashlib.sha1(f"{_GAME_SEED}|{home_team_id}|{away_team_id}|{game_date}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(h[:8], "little"))
+
 
 def _is_number(value: Any) -> bool:
     try:
@@ -79,10 +98,10 @@ def _repo_ctx() -> LeagueRepo:
     db_path = get_db_path()
     with LeagueRepo(db_path) as repo:
         try:
-            repo.init_db()
+            repo.ensure_initialized()
         except Exception as exc:
             logger.exception(
-                "[DB_INIT_FAILED] playoffs._repo_ctx repo.init_db() failed (db_path=%s)",
+                "[DB_INIT_FAILED] playoffs._repo_ctx repo.ensure_initialized() failed (db_path=%s)",
                 db_path,
             )
             raise
@@ -106,12 +125,11 @@ def _safe_date_fromisoformat(date_str: Optional[str]) -> Optional[date]:
 
 
 def _regular_season_end_date() -> date:
-    league = export_full_state_snapshot().get("league", {})
-    master_schedule = league.get("master_schedule") or {}
-    by_date = master_schedule.get("by_date") or {}
+    league = get_league_context_snapshot()
+    schedule_dates = project(lambda v: list(v["league"]["master_schedule"]["by_date"].keys()))
 
     latest: Optional[date] = None
-    for ds in by_date.keys():
+    for ds in schedule_dates:
         parsed = _safe_date_fromisoformat(ds)
         if parsed and (latest is None or parsed > latest):
             latest = parsed
@@ -276,7 +294,7 @@ def _simulate_postseason_game(
 
     set_current_date(game_date)
 
-    league = export_full_state_snapshot().get("league", {})
+    league = get_league_context_snapshot()
     game_id = f"playoffs_{home_team_id}_{away_team_id}_{uuid4().hex[:8]}"
     context = build_context_from_team_ids(
         game_id=game_id,
@@ -287,10 +305,10 @@ def _simulate_postseason_game(
         phase="playoffs",
     )
 
-    rng = random.Random()
+    rng = _game_rng(home_team_id, away_team_id, game_date)
     with _repo_ctx() as repo:
-        home_team = build_team_state_from_db(repo=repo, team_id=home_team_id)
-        away_team = build_team_state_from_db(repo=repo, team_id=away_team_id)
+        home_team = get_team_state(repo=repo, team_id=home_team_id)
+        away_team = get_team_state(repo=repo, team_id=away_team_id)
 
     raw_result = simulate_game(rng, home_team, away_team)
     v2_result = adapt_matchengine_result_to_v2(
@@ -837,7 +855,12 @@ def advance_my_team_one_game() -> Dict[str, Any]:
     return get_postseason_snapshot()
 
 
-def auto_advance_current_round() -> Dict[str, Any]:
+def auto_advance_current_round(checkpoint: bool = False) -> Dict[str, Any]:
+    """Play out every series of the current round.
+
+    checkpoint=True stores the bracket after each finished series and writes a sim.checkpoints
+    snapshot, so sim.checkpoints.resume_postseason can finish the round after a crash.
+    """
     postseason = _ensure_postseason_state()
     playoffs = deepcopy(postseason.get("playoffs"))
     if not playoffs:
@@ -848,11 +871,19 @@ def auto_advance_current_round() -> Dict[str, Any]:
     for series in _round_series(bracket, round_name):
         if not series:
             continue
+        if _is_series_finished(series):
+            continue
         while not _is_series_finished(series):
             _simulate_one_series_game(series)
+        if checkpoint:
+            # Ingested games and the bracket must agree inside the snapshot.
+            postseason_set_playoffs(playoffs)
+            checkpoints.write_checkpoint(checkpoints.KIND_POSTSEASON, {"round": round_name})
 
     postseason_set_playoffs(playoffs)
     _advance_round_if_ready()
+    if checkpoint:
+        checkpoints.write_checkpoint(checkpoints.KIND_POSTSEASON, {"round": round_name}, completed=True)
     return get_postseason_snapshot()
 
 
@@ -975,4 +1006,5 @@ __all__ = [
     "play_my_team_play_in_game",
     "advance_my_team_one_game",
     "auto_advance_current_round",
+    "set_game_seed",
 ]
@@ -7,7 +7,6 @@ from typing import Any, Dict
 import google.generativeai as genai
 
 import state
-from stats_util import compute_league_leaders
 from team_utils import get_conference_standings, get_team_detail
 from config import ALL_TEAM_IDS
 
@@ -241,8 +240,14 @@ def build_season_context(user_team_id: str) -> Dict[str, Any]:
 
     standings = get_conference_standings()
     team_detail = get_team_detail(user_team_id)
-    workflow_state = state.export_workflow_state()
-    leaders = compute_league_leaders(workflow_state.get("player_stats") or {})
+    leaders = state.get_league_leaders()
+    team_player_stats = state.get_player_stat_table(
+        stats=["MIN", "PTS", "REB", "AST", "STL", "BLK", "TOV", "3PM"],
+        per="game",
+        team_id=user_team_id,
+        sort_by="PTS",
+        advanced=True,
+    )["rows"]
 
     conference_key = None
     conf_entry: Dict[str, Any] | None = None
@@ -308,7 +313,8 @@ def build_season_context(user_team_id: str) -> Dict[str, Any]:
         "team_detail": team_detail,
         "team_context": team_context,
         "league_leaders": leaders,
-        "all_games": state.export_workflow_state().get("games", []),
+        "team_player_stats": team_player_stats,
+        "all_games": state.get_ingested_games(),
     }
     return ctx
 
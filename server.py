@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from typing import Any, Dict, Optional, List
 
 import google.generativeai as genai
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
@@ -15,7 +17,12 @@ from config import BASE_DIR, ALL_TEAM_IDS
 from league_repo import LeagueRepo
 from schema import normalize_team_id
 import state
-from sim.league_sim import simulate_single_game, advance_league_until
+from sim.league_sim import simulate_single_game
+from sim.forecast import DEFAULT_FORECAST_REPLICAS, forecast_matchup, shutdown_forecast_pool
+from sim import checkpoints as sim_checkpoints
+from sim import jobs as sim_jobs
+from sim.projection import DEFAULT_MATCHUP_REPLICAS, DEFAULT_PROJECTION_SIMS, project_season
+from matchengine_v3 import profiler as engine_profiler
 from playoffs import (
     auto_advance_current_round,
     advance_my_team_one_game,
@@ -25,7 +32,6 @@ from playoffs import (
     reset_postseason_state,
 )
 from news_ai import refresh_playoff_news, refresh_weekly_news
-from stats_util import compute_league_leaders, compute_playoff_league_leaders
 from team_utils import get_conference_standings, get_team_cards, get_team_detail
 from season_report_ai import generate_season_report
 from trades.errors import TradeError
@@ -53,7 +59,19 @@ def _startup_init_state() -> None:
         raise RuntimeError("LEAGUE_DB_PATH is required (no default db_path).")
     state.set_db_path(db_path)
 
-    state.startup_init_state()
+    if state.state_journal_enabled():
+        # Restores the last session's state from the journal (if any) before the bootstraps.
+        state.open_state_journal()
+    else:
+        state.startup_init_state()
+
+
+@app.on_event("shutdown")
+def _shutdown_background_services() -> None:
+    # 백그라운드 잡(풀/state 사용) -> forecast 풀 -> state journal 순으로 정리.
+    sim_jobs.shutdown_jobs()
+    shutdown_forecast_pool()
+    state.close_state_journal()
 
 app.add_middleware(
     CORSMiddleware,
@@ -88,6 +106,16 @@ class SimGameRequest(BaseModel):
     game_date: Optional[str] = None  # 인게임 날짜 (YYYY-MM-DD)
 
 
+class ForecastMatchupRequest(BaseModel):
+    home_team_id: str
+    away_team_id: str
+    replicas: int = DEFAULT_FORECAST_REPLICAS
+    seed: Optional[int] = None
+    home_tactics: Optional[Dict[str, Any]] = None
+    away_tactics: Optional[Dict[str, Any]] = None
+    margin_bin_width: int = 5
+
+
 class ChatMainRequest(BaseModel):
     apiKey: str
     userInput: str = Field(..., alias="userMessage")
@@ -103,6 +131,19 @@ class ChatMainRequest(BaseModel):
 class AdvanceLeagueRequest(BaseModel):
     target_date: str  # YYYY-MM-DD, 이 날짜까지 리그를 자동 진행
     user_team_id: Optional[str] = None
+    parallel: bool = False  # 같은 날짜 경기들을 프로세스 풀에서 병렬 시뮬레이션
+    workers: Optional[int] = None  # None이면 FORECAST_WORKERS / cpu 수 기준
+    seed: Optional[int] = None
+    checkpoint_every: Optional[int] = None  # N일마다 체크포인트 저장 (None이면 저장 안 함)
+
+
+class ResumeAdvanceRequest(BaseModel):
+    allow_db_drift: bool = False  # 체크포인트 이후 DB가 바뀌었어도 강제로 복원
+
+
+class EngineProfileToggleRequest(BaseModel):
+    enabled: Optional[bool] = None  # None이면 현재 상태 유지
+    reset: bool = False
 
 
 class PostseasonSetupRequest(BaseModel):
@@ -114,6 +155,10 @@ class EmptyRequest(BaseModel):
     pass
 
 
+class AutoAdvanceRoundRequest(BaseModel):
+    checkpoint: bool = True  # 시리즈가 끝날 때마다 체크포인트 저장
+
+
 class WeeklyNewsRequest(BaseModel):
     apiKey: str
 
@@ -189,20 +234,77 @@ async def api_simulate_game(req: SimGameRequest):
         raise HTTPException(status_code=404, detail=str(e))
 
 
-# -------------------------------------------------------------------------
-# 리그 자동 진행 API (다른 팀 경기 일괄 시뮬레이션)
-# -------------------------------------------------------------------------
-@app.post("/api/advance-league")
-async def api_advance_league(req: AdvanceLeagueRequest):
-    """target_date까지 (유저 팀 경기를 제외한) 리그 전체 경기를 자동 시뮬레이션."""
+@app.post("/api/forecast/matchup")
+async def api_forecast_matchup(req: ForecastMatchupRequest):
+    """home/away 매치업을 K번 시뮬레이션해 승률·점수차 분포·선수 스탯 분위수를 반환 (리그 상태 변경 없음)."""
     try:
-        simulated = advance_league_until(
-            target_date_str=req.target_date,
-            user_team_id=req.user_team_id,
+        return await run_in_threadpool(
+            forecast_matchup,
+            req.home_team_id,
+            req.away_team_id,
+            replicas=req.replicas,
+            seed=req.seed,
+            home_tactics=req.home_tactics,
+            away_tactics=req.away_tactics,
+            margin_bin_width=req.margin_bin_width,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+
+@app.get("/api/projection/playoff-odds")
+async def api_projection_playoff_odds(
+    sims: int = DEFAULT_PROJECTION_SIMS,
+    seed: int = 0,
+    matchup_replicas: int = DEFAULT_MATCHUP_REPLICAS,
+):
+    """남은 정규시즌을 N번 시뮬레이션한 팀별 승수 분포·시드/플레이인/플레이오프 확률 (state turn 기준 캐시)."""
+    try:
+        return await run_in_threadpool(
+            project_season,
+            sims=sims,
+            seed=seed,
+            matchup_replicas=matchup_replicas,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# -------------------------------------------------------------------------
+# 리그 자동 진행 API (다른 팀 경기 일괄 시뮬레이션)
+# -------------------------------------------------------------------------
+def _advance_job_params(req: AdvanceLeagueRequest) -> Dict[str, Any]:
+    return {
+        "target_date_str": req.target_date,
+        "user_team_id": req.user_team_id,
+        "seed": req.seed,
+        "parallel": req.parallel,
+        "workers": req.workers,
+        "checkpoint_every": req.checkpoint_every,
+    }
+
+
+def _get_job_or_404(job_id: str) -> sim_jobs.SimJob:
+    job = sim_jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"job not found: {job_id}")
+    return job
+
+
+@app.post("/api/advance-league")
+async def api_advance_league(req: AdvanceLeagueRequest):
+    """target_date까지 (유저 팀 경기를 제외한) 리그 전체 경기를 자동 시뮬레이션.
+
+    기존 클라이언트용 동기 응답. 실제 작업은 잡 큐에서 돌고, 여기서는 완료만 기다린다 (이벤트 루프 비차단).
+    """
+    job = sim_jobs.submit_advance_job(**_advance_job_params(req))
+    await run_in_threadpool(job.wait)
+    if job.status == sim_jobs.JOB_FAILED:
+        if isinstance(job.exception, ValueError):
+            raise HTTPException(status_code=400, detail=job.error)
+        raise job.exception
+
+    simulated = job.result or []
     return {
         "target_date": req.target_date,
         "simulated_count": len(simulated),
@@ -210,31 +312,291 @@ async def api_advance_league(req: AdvanceLeagueRequest):
     }
 
 
+@app.post("/api/advance-league/jobs")
+async def api_advance_league_job_submit(req: AdvanceLeagueRequest):
+    """리그 자동 진행을 백그라운드 잡으로 등록하고 job_id를 즉시 반환."""
+    job = sim_jobs.submit_advance_job(**_advance_job_params(req))
+    return job.snapshot()
+
+
+@app.post("/api/advance-league/resume")
+async def api_advance_league_resume(req: ResumeAdvanceRequest):
+    """마지막 체크포인트에서 리그 자동 진행을 이어서 실행하는 잡 등록 (완료된 날짜는 재시뮬레이션하지 않음)."""
+    job = sim_jobs.submit_resume_job(allow_db_drift=req.allow_db_drift)
+    return job.snapshot()
+
+
+@app.get("/api/checkpoints")
+async def api_checkpoints():
+    """리그 진행/포스트시즌 체크포인트 메타데이터 (상태 스냅샷 제외)."""
+    return {
+        kind: await run_in_threadpool(sim_checkpoints.describe_checkpoint, kind)
+        for kind in (sim_checkpoints.KIND_ADVANCE, sim_checkpoints.KIND_POSTSEASON)
+    }
+
+
+@app.get("/api/advance-league/jobs")
+async def api_advance_league_job_list():
+    return {"jobs": sim_jobs.list_jobs()}
+
+
+@app.get("/api/advance-league/jobs/{job_id}")
+async def api_advance_league_job_status(job_id: str, include_games: bool = True):
+    """잡 상태/진행률. 완료(또는 취소)되면 경기 요약 목록 포함 (박스스코어는 /api/games/{game_id}/box-score)."""
+    return _get_job_or_404(job_id).snapshot(include_result=include_games)
+
+
+@app.post("/api/advance-league/jobs/{job_id}/cancel")
+async def api_advance_league_job_cancel(job_id: str):
+    """취소 요청. 진행 중인 날짜는 끝까지 시뮬레이션하고 다음 날짜부터 멈춘다."""
+    _get_job_or_404(job_id)
+    return sim_jobs.cancel_job(job_id).snapshot()
+
+
+@app.get("/api/advance-league/jobs/{job_id}/events")
+async def api_advance_league_job_events(job_id: str, poll_interval: float = 0.5):
+    """진행률 SSE 스트림 (event: progress / done). 잡이 끝나면 스트림도 종료."""
+    job = _get_job_or_404(job_id)
+    interval = min(max(float(poll_interval), 0.1), 5.0)
+
+    async def _stream():
+        last_version = -1
+        idle = 0.0
+        while True:
+            snap = job.snapshot()
+            finished = snap["status"] in sim_jobs.FINISHED_STATUSES
+            if snap["version"] != last_version:
+                last_version = snap["version"]
+                idle = 0.0
+                event = "done" if finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(snap, ensure_ascii=False)}\n\n"
+            elif idle >= 15.0:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            if finished:
+                return
+            await asyncio.sleep(interval)
+            idle += interval
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/games/{game_id}/box-score")
+async def api_game_box_score(game_id: str):
+    """ingest된 경기의 GameResultV2 (박스스코어 포함)."""
+    result = await run_in_threadpool(state.get_game_result, game_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"game not found: {game_id}")
+    return result
+
+
 # -------------------------------------------------------------------------
 # 리그 리더 / 스탠딩 / 팀 API
 # -------------------------------------------------------------------------
 
 
 @app.get("/api/stats/leaders")
-async def api_stats_leaders():
+async def api_stats_leaders(
+    stats: Optional[str] = None,
+    mode: str = "per_game",
+    limit: int = 5,
+    min_games: Optional[int] = None,
+):
     # The frontend expects a flat object with an uppercase stat key (e.g., PTS)
     # under `data.leaders`. Some previous iterations of the API wrapped this
     # structure under stats.leaderboards with lowercase keys, which caused the
     # UI to break. Normalize here so the client always receives
     # `{ leaders: { PTS: [...], AST: [...], ... }, updated_at: <iso date> }`.
-    workflow_state = state.export_workflow_state()
-    leaders = compute_league_leaders(workflow_state.get("player_stats") or {})
-    current_date = state.get_current_date()
-    return {"leaders": leaders, "updated_at": current_date}
+    return _leaders_response("regular", stats, mode, limit, min_games)
 
 
 @app.get("/api/stats/playoffs/leaders")
-async def api_playoff_stats_leaders():
-    workflow_state = state.export_workflow_state()
-    playoff_stats = (workflow_state.get("phase_results") or {}).get("playoffs", {}).get("player_stats") or {}
-    leaders = compute_playoff_league_leaders(playoff_stats)
-    current_date = state.get_current_date()
-    return {"leaders": leaders, "updated_at": current_date}
+async def api_playoff_stats_leaders(
+    stats: Optional[str] = None,
+    mode: str = "per_game",
+    limit: int = 5,
+    min_games: Optional[int] = None,
+):
+    return _leaders_response("playoffs", stats, mode, limit, min_games)
+
+
+@app.get("/api/stats/leaders/categories")
+async def api_stats_leader_categories(phase: str = "regular"):
+    """리더 조회에 쓸 수 있는 스탯 키 (선수 누적 스탯 키 + 슈팅 퍼센티지)."""
+    try:
+        return {"phase": phase, "stats": state.get_leader_categories(phase), "modes": ["per_game", "totals", "per36"]}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _leaders_response(phase: str, stats: Optional[str], mode: str, limit: int, min_games: Optional[int]) -> Dict[str, Any]:
+    """stats: 콤마 구분 스탯 키 (기본 PTS,AST,REB,3PM). mode: per_game | totals | per36."""
+    stat_list = [x.strip() for x in stats.split(",") if x.strip()] if stats else None
+    try:
+        leaders = state.get_league_leaders(
+            phase,
+            stats=stat_list,
+            mode=mode,
+            limit=max(1, min(int(limit), 100)),
+            min_games=min_games,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"leaders": leaders, "updated_at": state.get_current_date()}
+
+
+@app.get("/api/stats/players")
+async def api_stats_players(
+    phase: str = "regular",
+    stats: Optional[str] = None,
+    per: str = "game",
+    team_id: Optional[str] = None,
+    player_ids: Optional[str] = None,
+    min_games: int = 0,
+    sort_by: Optional[str] = None,
+    order: str = "desc",
+    offset: int = 0,
+    limit: int = 50,
+    advanced: bool = False,
+    percentiles: bool = False,
+):
+    """선수 스탯 테이블 (컬럼형 인덱스). per: total | game | 36 | 100, stats/player_ids: 콤마 구분."""
+    stat_list = [x.strip() for x in stats.split(",") if x.strip()] if stats else None
+    pid_list = [x.strip() for x in player_ids.split(",") if x.strip()] if player_ids else None
+    try:
+        table = await run_in_threadpool(
+            state.get_player_stat_table,
+            phase,
+            stats=stat_list,
+            per=per,
+            team_id=team_id.upper() if team_id else None,
+            player_ids=pid_list,
+            min_games=max(0, int(min_games)),
+            sort_by=sort_by,
+            descending=order != "asc",
+            offset=max(0, int(offset)),
+            limit=max(1, min(int(limit), 500)),
+            advanced=advanced,
+            percentiles=percentiles,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"phase": phase, **table, "updated_at": state.get_current_date()}
+
+
+@app.get("/api/stats/splits/{kind}/{entity_id}")
+async def api_stat_splits(
+    kind: str,
+    entity_id: str,
+    phase: str = "regular",
+    last_n: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    per: str = "game",
+    by_opponent: bool = False,
+):
+    """선수/팀(kind=player|team) 기간 split: 최근 N경기, 날짜 범위, 홈/원정, 상대팀별. per: total | game | 36."""
+    if kind == "team":
+        entity_id = entity_id.upper()
+    try:
+        return await run_in_threadpool(
+            state.get_stat_splits,
+            kind,
+            entity_id,
+            phase,
+            last_n=max(0, int(last_n)) if last_n is not None else None,
+            date_from=date_from,
+            date_to=date_to,
+            per=per,
+            by_opponent=by_opponent,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/stats/window")
+async def api_stats_window(
+    phase: str = "regular",
+    stats: Optional[str] = None,
+    per: str = "game",
+    last_n: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    team_id: Optional[str] = None,
+    min_games: int = 1,
+    sort_by: Optional[str] = None,
+    order: str = "desc",
+    limit: int = 50,
+):
+    """기간 선수 스탯 테이블 (예: 이번 주, 각 선수 최근 10경기)."""
+    stat_list = [x.strip() for x in stats.split(",") if x.strip()] if stats else None
+    try:
+        table = await run_in_threadpool(
+            state.get_window_stat_table,
+            phase,
+            stats=stat_list,
+            per=per,
+            last_n=max(0, int(last_n)) if last_n is not None else None,
+            date_from=date_from,
+            date_to=date_to,
+            team_id=team_id.upper() if team_id else None,
+            min_games=max(1, int(min_games)),
+            sort_by=sort_by,
+            descending=order != "asc",
+            limit=max(1, min(int(limit), 500)),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"phase": phase, **table, "updated_at": state.get_current_date()}
+
+
+@app.get("/api/player-game-log/{player_id}")
+async def api_player_game_log(
+    player_id: str,
+    season_id: Optional[str] = None,
+    phase: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+    order: str = "desc",
+):
+    """선수 경기 로그 (지난 시즌 포함, season_id/phase로 필터). 페이지: offset/limit(최대 500)."""
+    page = await run_in_threadpool(
+        state.get_player_game_log,
+        player_id,
+        season_id=season_id,
+        phase=phase,
+        offset=max(0, int(offset)),
+        limit=max(1, min(int(limit), 500)),
+        newest_first=order != "asc",
+    )
+    return {"player_id": player_id, "offset": max(0, int(offset)), **page}
+
+
+@app.get("/api/team-game-log/{team_id}")
+async def api_team_game_log(
+    team_id: str,
+    season_id: Optional[str] = None,
+    phase: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+    order: str = "desc",
+):
+    """팀 경기 로그 (상대/홈 여부/득실점, 지난 시즌 포함)."""
+    tid = team_id.upper()
+    page = await run_in_threadpool(
+        state.get_team_game_log,
+        tid,
+        season_id=season_id,
+        phase=phase,
+        offset=max(0, int(offset)),
+        limit=max(1, min(int(limit), 500)),
+        newest_first=order != "asc",
+    )
+    return {"team_id": tid, "offset": max(0, int(offset)), **page}
 
 
 @app.get("/api/standings")
@@ -300,13 +662,28 @@ async def api_playoffs_advance_my_team_game(req: EmptyRequest):
 
 
 @app.post("/api/postseason/playoffs/auto-advance-round")
-async def api_playoffs_auto_advance_round(req: EmptyRequest):
+async def api_playoffs_auto_advance_round(req: AutoAdvanceRoundRequest):
     try:
-        return auto_advance_current_round()
+        return auto_advance_current_round(checkpoint=req.checkpoint)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/api/postseason/playoffs/resume-round")
+async def api_playoffs_resume_round(req: ResumeAdvanceRequest):
+    """마지막 포스트시즌 체크포인트를 복원하고 그 라운드를 마저 진행.
+
+    라운드 시뮬레이션은 잡 큐에서 돌고(다른 진행 잡과 직렬화), 여기서는 완료만 기다린다 (이벤트 루프 비차단).
+    """
+    job = sim_jobs.submit_resume_postseason_job(allow_db_drift=req.allow_db_drift)
+    await run_in_threadpool(job.wait)
+    if job.status == sim_jobs.JOB_FAILED:
+        if isinstance(job.exception, ValueError):
+            raise HTTPException(status_code=400, detail=job.error)
+        raise job.exception
+    return job.result
+
+
 # -------------------------------------------------------------------------
 # 주간 뉴스 (LLM 요약)
 # -------------------------------------------------------------------------
@@ -566,14 +943,7 @@ async def team_schedule(team_id: str):
 
     # 마스터 스케줄이 없다면 생성
     state.initialize_master_schedule_if_needed()
-    league = state.export_full_state_snapshot().get("league", {})
-    master_schedule = league.get("master_schedule", {})
-    games = master_schedule.get("games") or []
-
-    team_games: List[Dict[str, Any]] = [
-        g for g in games
-        if g.get("home_team_id") == team_id or g.get("away_team_id") == team_id
-    ]
+    team_games = state.get_team_schedule_games(team_id)
     team_games.sort(key=lambda g: (g.get("date"), g.get("game_id")))
 
     formatted_games: List[Dict[str, Any]] = []
@@ -662,5 +1032,35 @@ async def debug_schedule_summary():
     return state.get_schedule_summary()
 
 
+@app.get("/api/debug/state-lock")
+async def debug_state_lock(reset: bool = False):
+    """전역 상태 reader-writer lock 경합 통계 (읽기/쓰기 획득 수, 대기 횟수/시간, 쓰기 점유 시간)."""
+    return state.get_state_lock_stats(reset=reset)
+
+
+@app.get("/api/debug/state-journal")
+async def debug_state_journal():
+    """상태 journal 통계 (seq, 레코드/바이트 수, fsync 횟수, snapshot 크기/소요 시간). journal이 꺼져 있으면 null."""
+    return {"journal": state.get_state_journal_stats()}
+
+
+@app.get("/api/debug/result-store")
+async def debug_result_store():
+    """경기 결과 저장소 통계 (저장 경기 수, LRU 적중, 원본/압축 바이트)."""
+    return await run_in_threadpool(state.get_result_store_stats)
+
+
+@app.get("/api/debug/engine-profile")
+async def debug_engine_profile():
+    """매치엔진 단계별 누적 시간/호출 수 (MATCHENGINE_PROFILE=1 또는 토글로 활성화)."""
+    return engine_profiler.totals()
 
 
+@app.post("/api/debug/engine-profile")
+async def debug_engine_profile_toggle(req: EngineProfileToggleRequest):
+    """엔진 프로파일러 켜기/끄기 및 누적값 초기화."""
+    if req.enabled is not None:
+        engine_profiler.enable(req.enabled)
+    if req.reset:
+        engine_profiler.reset_totals()
+    return engine_profiler.totals()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+"""Checkpoints for long simulations (season advances, postseason rounds).
+
+A checkpoint is the full game state (export_full_state_snapshot, taken under the state
+lock, so always between two ingests) plus the DB position at that moment
+(LeagueRepo.get_db_position) and the parameters needed to continue the run. One file per
+kind ("advance_league", "postseason") is kept, replaced atomically on every write.
+
+Resuming restores the snapshot only when the in-memory state is behind it (i.e. after a
+restart), and refuses to when the DB has moved since the checkpoint (roster moves or
+logged transactions), because state and DB would then disagree. Completed days are never
+re-simulated: advance_league_until continues from the restored current_date.
+"""
+
+import gzip
+import json
+import logging
+import os
+import time
+from threading import Event
+from typing import Any, Callable, Dict, List, Optional
+
+from league_repo import LeagueRepo
+import state
+
+logger = logging.getLogger(__name__)
+
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_EVERY_DAYS = 7
+KIND_ADVANCE = "advance_league"
+KIND_POSTSEASON = "postseason"
+
+
+def checkpoint_dir(db_path: Optional[str] = None) -> str:
+    """SIM_CHECKPOINT_DIR if set, else '<db file>.checkpoints' next to the league DB."""
+    env = os.environ.get("SIM_CHECKPOINT_DIR")
+    if env:
+        return env
+    return f"{db_path or state.get_db_path()}.checkpoints"
+
+
+def _checkpoint_path(kind: str, db_path: Optional[str] = None) -> str:
+    return os.path.join(checkpoint_dir(db_path), f"{kind}.ckpt.json.gz")
+
+
+def _db_position(db_path: str) -> Dict[str, Any]:
+    with LeagueRepo(db_path) as repo:
+        return repo.get_db_position()
+
+
+def write_checkpoint(kind: str, params: Dict[str, Any], *, completed: bool = False) -> str:
+    """Snapshot state + DB position for `kind` and atomically replace its checkpoint file."""
+    db_path = state.get_db_path()
+    snapshot = state.export_full_state_snapshot()
+    payload = {
+        "version": CHECKPOINT_VERSION,
+        "kind": kind,
+        "params": dict(params),
+        "completed": bool(completed),
+        "created_at": time.time(),
+        "current_date": (snapshot.get("league") or {}).get("current_date"),
+        "turn": int(snapshot.get("turn", 0) or 0),
+        "db_position": _db_position(db_path),
+        "state": snapshot,
+    }
+    path = _checkpoint_path(kind, db_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=3) as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    logger.info("[CHECKPOINT] %s at %s (turn %d) -> %s", kind, payload["current_date"], payload["turn"], path)
+    return path
+
+
+def load_checkpoint(kind: str) -> Optional[Dict[str, Any]]:
+    path = _checkpoint_path(kind)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    if payload.get("version") != CHECKPOINT_VERSION or payload.get("kind") != kind:
+        raise ValueError(f"unsupported checkpoint file: {path}")
+    return payload
+
+
+def describe_checkpoint(kind: str) -> Optional[Dict[str, Any]]:
+    """Checkpoint metadata without the state snapshot (for status endpoints)."""
+    payload = load_checkpoint(kind)
+    if payload is None:
+        return None
+    payload.pop("state", None)
+    return payload
+
+
+def restore_checkpoint(payload: Dict[str, Any], *, allow_db_drift: bool = False) -> bool:
+    """Bring the in-memory state up to the checkpoint; returns True if the snapshot was restored.
+
+    A state that is already at or past the checkpoint (same season, turn >= checkpoint turn) is
+    left alone, so resuming in a process that never crashed does not roll anything back.
+    """
+    snapshot = payload["state"]
+    current_turn = int(state.read_path("turn") or 0)
+    same_season = snapshot.get("active_season_id") == state.get_active_season_id()
+    if same_season and current_turn >= int(payload.get("turn", 0) or 0):
+        return False
+
+    position = _db_position(state.get_db_path())
+    if position != payload.get("db_position") and not allow_db_drift:
+        raise ValueError(
+            "league DB changed since the checkpoint (roster moves or transactions); "
+            "restoring it would desync state and DB"
+        )
+    state.restore_full_state_snapshot(snapshot)
+    logger.info("[CHECKPOINT] restored %s at %s (turn %s)", payload.get("kind"), payload.get("current_date"), payload.get("turn"))
+    return True
+
+
+def resume_advance(
+    *,
+    allow_db_drift: bool = False,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    cancel_event: Optional[Event] = None,
+) -> List[Dict[str, Any]]:
+    """Continue the last checkpointed advance_league_until run up to its original target date."""
+    from sim.league_sim import advance_league_until
+
+    payload = load_checkpoint(KIND_ADVANCE)
+    if payload is None:
+        raise ValueError("no advance_league checkpoint to resume")
+    restore_checkpoint(payload, allow_db_drift=allow_db_drift)
+    if payload.get("completed"):
+        return []
+    return advance_league_until(progress=progress, cancel_event=cancel_event, **payload["params"])
+
+
+def resume_postseason(*, allow_db_drift: bool = False) -> Dict[str, Any]:
+    """Restore the last postseason checkpoint and finish the round it was taken in."""
+    from playoffs import auto_advance_current_round
+
+    payload = load_checkpoint(KIND_POSTSEASON)
+    if payload is None:
+        raise ValueError("no postseason checkpoint to resume")
+    restore_checkpoint(payload, allow_db_drift=allow_db_drift)
+    if payload.get("completed"):
+        return state.get_postseason_snapshot()
+    return auto_advance_current_round(checkpoint=True)
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+"""Matchup forecasts: K seeded simulate_game replicas on a process pool.
+
+Nothing here touches league state: replicas are simulated from rosters read out of
+the league DB and the results are only aggregated (win probability, margin histogram,
+per-player stat percentiles), never ingested. The same pool also runs the games of
+sim.league_sim's parallel advance (_run_scheduled_game); the parent ingests those.
+
+Workers are long-lived. Each one imports matchengine_v3 and warms the era registry in
+its initializer, and keeps the TeamStates it builds with build_team_state_from_db,
+keyed by (team_id, tactics, roster token). The roster token is the team's
+LeagueRepo.get_roster_version (db_uid + version, bumped by every roster move), read by
+the parent per request, so trades/roster edits invalidate worker caches without any
+cross-process signalling.
+"""
+
+import copy
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from league_repo import LeagueRepo
+from schema import normalize_team_id
+
+logger = logging.getLogger(__name__)
+
+
+MAX_FORECAST_REPLICAS = 5000
+DEFAULT_FORECAST_REPLICAS = 200
+FORECAST_PLAYER_STATS: Tuple[str, ...] = ("MIN", "PTS", "REB", "AST", "3PM", "TOV", "PF")
+FORECAST_PERCENTILES: Tuple[int, ...] = (10, 25, 50, 75, 90)
+DEFAULT_MARGIN_BIN_WIDTH = 5
+
+# tasks per worker per forecast (smaller chunks = better load balance, more IPC)
+_CHUNKS_PER_WORKER = 4
+
+
+# -------------------------------------------------------------------------
+# Worker side
+# -------------------------------------------------------------------------
+_WORKER_DB_PATH: Optional[str] = None
+_WORKER_TEAMS: "OrderedDict[Tuple[str, str, str], Any]" = OrderedDict()
+_WORKER_TEAMS_MAX = 64
+
+
+def _init_worker(db_path: str) -> None:
+    """ProcessPoolExecutor initializer: import the engine and compile the default era once."""
+    global _WORKER_DB_PATH
+    _WORKER_DB_PATH = db_path
+    from matchengine_v3.era_registry import get_compiled_era
+    import matchengine_v3.sim_game  # noqa: F401
+
+    get_compiled_era("default")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _worker_team_state(team_id: str, tactics_key: str, roster_token: str) -> Any:
+    from sim.roster_adapter import build_team_state_from_db
+
+    key = (team_id, tactics_key, roster_token)
+    team = _WORKER_TEAMS.get(key)
+    if team is not None:
+        _WORKER_TEAMS.move_to_end(key)
+        return team
+    tactics = json.loads(tactics_key) if tactics_key else None
+    with LeagueRepo(_WORKER_DB_PATH) as repo:
+        team = build_team_state_from_db(repo=repo, team_id=team_id, tactics=tactics)
+    _WORKER_TEAMS[key] = team
+    while len(_WORKER_TEAMS) > _WORKER_TEAMS_MAX:
+        _WORKER_TEAMS.popitem(last=False)
+    return team
+
+
+def _run_chunk(
+    home_key: Tuple[str, str, str],
+    away_key: Tuple[str, str, str],
+    seeds: Sequence[int],
+) -> List[Dict[str, Any]]:
+    """Simulate one chunk of replicas and return compact per-replica rows."""
+    from matchengine_v3.shot_diet import clear_style_cache
+    from matchengine_v3.sim_game import simulate_game
+
+    home_base = _worker_team_state(*home_key)
+    away_base = _worker_team_state(*away_key)
+    home_id, away_id = home_base.name, away_base.name
+
+    rows: List[Dict[str, Any]] = []
+    for seed in seeds:
+        # shot_diet's style cache outlives a game and would make replica i depend on what ran before it.
+        clear_style_cache()
+        # simulate_game mutates TeamState (box score, energy, on-court); keep the cached copy pristine.
+        raw = simulate_game(random.Random(seed), copy.deepcopy(home_base), copy.deepcopy(away_base))
+        teams = raw.get("teams") or {}
+        players: Dict[str, Dict[str, Any]] = {}
+        for tid in (home_id, away_id):
+            for pid, box in ((teams.get(tid) or {}).get("PlayerBox") or {}).items():
+                players[pid] = {
+                    "team_id": tid,
+                    "name": box.get("Name", ""),
+                    "stats": [float(box.get(k, 0) or 0) for k in FORECAST_PLAYER_STATS],
+                }
+        rows.append(
+            {
+                "seed": seed,
+                "home_pts": int((teams.get(home_id) or {}).get("PTS", 0)),
+                "away_pts": int((teams.get(away_id) or {}).get("PTS", 0)),
+                "overtime_periods": int((raw.get("meta") or {}).get("overtime_periods", 0) or 0),
+                "players": players,
+            }
+        )
+    return rows
+
+
+def _run_scheduled_game(
+    home_key: Tuple[str, str, str],
+    away_key: Tuple[str, str, str],
+    rng_seed: int,
+    context: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """One seeded league game for sim.league_sim's parallel advance -> (v2 result, engine profile).
+
+    Only simulates and adapts; the parent ingests the result into league state.
+    """
+    from matchengine_v2_adapter import adapt_matchengine_result_to_v2
+    from matchengine_v3.shot_diet import clear_style_cache
+    from matchengine_v3.sim_game import simulate_game
+
+    clear_style_cache()
+    raw = simulate_game(
+        random.Random(rng_seed),
+        copy.deepcopy(_worker_team_state(*home_key)),
+        copy.deepcopy(_worker_team_state(*away_key)),
+    )
+    v2_result = adapt_matchengine_result_to_v2(raw_result=raw, context=context, engine_name="matchengine_v3")
+    return v2_result, (raw.get("meta") or {}).get("engine_profile")
+
+
+# -------------------------------------------------------------------------
+# Pool management (parent side)
+# -------------------------------------------------------------------------
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_DB_PATH: Optional[str] = None
+_POOL_SIZE = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _default_workers() -> int:
+    env = os.environ.get("FORECAST_WORKERS")
+    if env:
+        try:
+            return max(1, int(env))
+        except ValueError:
+            logger.warning("[FORECAST] invalid FORECAST_WORKERS=%r; using cpu count", env)
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def get_forecast_pool(db_path: str, workers: Optional[int] = None) -> Tuple[ProcessPoolExecutor, int]:
+    """Return (shared pool, fan-out) for one request; the pool is created + warmed on first use.
+
+    The pool is sized once from FORECAST_WORKERS / cpu count and shared by forecasts,
+    projections and parallel advances, so it is never resized or torn down on a request
+    path: `workers` only caps how many tasks this request keeps in flight (see
+    submit_bounded). Workers are bound to db_path: a request for another DB shuts the
+    pool down (waiting for in-flight tasks) and starts a new one for it.
+    """
+    global _POOL, _POOL_DB_PATH, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is not None and _POOL_DB_PATH != str(db_path):
+            logger.info("[FORECAST] league DB changed (%s -> %s); restarting pool", _POOL_DB_PATH, db_path)
+            _POOL.shutdown(wait=True)
+            _POOL, _POOL_DB_PATH, _POOL_SIZE = None, None, 0
+        if _POOL is None:
+            n = _default_workers()
+            # spawn: identical behaviour on Windows/Linux and no inherited sqlite handles.
+            pool = ProcessPoolExecutor(
+                max_workers=n,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(db_path),),
+            )
+            # Pre-warm every worker so the first forecast does not pay interpreter/engine startup.
+            for f in [pool.submit(_ping) for _ in range(n)]:
+                f.result()
+            _POOL, _POOL_DB_PATH, _POOL_SIZE = pool, str(db_path), n
+        pool, size = _POOL, _POOL_SIZE
+    fan_out = max(1, min(int(workers), size)) if workers else size
+    return pool, fan_out
+
+
+def submit_bounded(pool: ProcessPoolExecutor, fn: Any, calls: Sequence[Tuple[Any, ...]], limit: int) -> List[Any]:
+    """fn(*args) for every args in calls on pool, at most `limit` in flight; results in call order."""
+    results: List[Any] = [None] * len(calls)
+    pending: Dict[Any, int] = {}
+    it = iter(enumerate(calls))
+    for i, args in it:
+        pending[pool.submit(fn, *args)] = i
+        if len(pending) >= max(1, int(limit)):
+            break
+    while pending:
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for f in done:
+            results[pending.pop(f)] = f.result()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending[pool.submit(fn, *nxt[1])] = nxt[0]
+    return results
+
+
+def shutdown_forecast_pool() -> None:
+    """Stop the shared pool (server shutdown)."""
+    global _POOL, _POOL_DB_PATH, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=True)
+        _POOL, _POOL_DB_PATH, _POOL_SIZE = None, None, 0
+
+
+# -------------------------------------------------------------------------
+# Aggregation
+# -------------------------------------------------------------------------
+def _tactics_key(tactics: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(tactics, sort_keys=True, ensure_ascii=False, default=str) if tactics else ""
+
+
+def _roster_token(repo: LeagueRepo, team_id: str) -> str:
+    """Worker cache token: the team's (db_uid, roster version), bumped by every roster move."""
+    db_uid, version = repo.get_roster_version(team_id)
+    return f"{db_uid}:{version}"
+
+
+def _margin_histogram(margins: np.ndarray, bin_width: int) -> Dict[str, Any]:
+    bw = max(1, int(bin_width))
+    lo = int(math.floor(margins.min() / bw) * bw)
+    hi = int(math.floor(margins.max() / bw) * bw + bw)
+    edges = np.arange(lo, hi + 1, bw)
+    counts, _ = np.histogram(margins, bins=edges)
+    total = max(len(margins), 1)
+    return {
+        "bin_width": bw,
+        "bins": [
+            {"lo": int(edges[i]), "hi": int(edges[i + 1]), "count": int(c), "pct": float(c) / total}
+            for i, c in enumerate(counts)
+        ],
+    }
+
+
+def _player_percentiles(rows: List[Dict[str, Any]], team_ids: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+    by_pid: Dict[str, Dict[str, Any]] = {}
+    n = len(rows)
+    for i, row in enumerate(rows):
+        for pid, rec in row["players"].items():
+            entry = by_pid.get(pid)
+            if entry is None:
+                entry = {"team_id": rec["team_id"], "name": rec["name"], "values": np.zeros((n, len(FORECAST_PLAYER_STATS)))}
+                by_pid[pid] = entry
+            entry["values"][i] = rec["stats"]
+
+    out: Dict[str, List[Dict[str, Any]]] = {tid: [] for tid in team_ids}
+    for pid, entry in by_pid.items():
+        vals = entry["values"]
+        pct = np.percentile(vals, FORECAST_PERCENTILES, axis=0)
+        out.setdefault(entry["team_id"], []).append(
+            {
+                "player_id": pid,
+                "name": entry["name"],
+                "mean": {k: round(float(vals[:, j].mean()), 2) for j, k in enumerate(FORECAST_PLAYER_STATS)},
+                "percentiles": {
+                    k: {f"p{p}": round(float(pct[pi, j]), 2) for pi, p in enumerate(FORECAST_PERCENTILES)}
+                    for j, k in enumerate(FORECAST_PLAYER_STATS)
+                },
+            }
+        )
+    for lst in out.values():
+        lst.sort(key=lambda x: -x["mean"]["MIN"])
+    return out
+
+
+# -------------------------------------------------------------------------
+# Public API
+# -------------------------------------------------------------------------
+def forecast_matchup(
+    home_team_id: str,
+    away_team_id: str,
+    *,
+    replicas: int = DEFAULT_FORECAST_REPLICAS,
+    seed: Optional[int] = None,
+    home_tactics: Optional[Dict[str, Any]] = None,
+    away_tactics: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    margin_bin_width: int = DEFAULT_MARGIN_BIN_WIDTH,
+    db_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Forecast home vs away from `replicas` seeded simulate_game runs (read-only; nothing is ingested).
+
+    Replica i uses random.Random(seed + i), so a (seed, replicas) pair always covers the same games
+    regardless of how they are split across workers.
+    """
+    home_id = str(normalize_team_id(home_team_id, allow_fa=False, strict=True))
+    away_id = str(normalize_team_id(away_team_id, allow_fa=False, strict=True))
+    if home_id == away_id:
+        raise ValueError("home_team_id and away_team_id must differ")
+    k = int(replicas)
+    if k < 1 or k > MAX_FORECAST_REPLICAS:
+        raise ValueError(f"replicas must be in [1, {MAX_FORECAST_REPLICAS}] (got {k})")
+    base_seed = int(seed) if seed is not None else random.SystemRandom().randrange(1 << 31)
+
+    if db_path is None:
+        import state
+
+        db_path = state.get_db_path()
+    with LeagueRepo(db_path) as repo:
+        home_key = (home_id, _tactics_key(home_tactics), _roster_token(repo, home_id))
+        away_key = (away_id, _tactics_key(away_tactics), _roster_token(repo, away_id))
+
+    t0 = time.perf_counter()
+    pool, n_workers = get_forecast_pool(db_path, workers)
+    seeds = [base_seed + i for i in range(k)]
+    n_chunks = max(1, min(k, n_workers * _CHUNKS_PER_WORKER))
+    chunks = [seeds[i::n_chunks] for i in range(n_chunks)]
+    chunk_rows = submit_bounded(pool, _run_chunk, [(home_key, away_key, c) for c in chunks], n_workers)
+    rows = [row for part in chunk_rows for row in part]
+    rows.sort(key=lambda r: r["seed"])
+    elapsed = time.perf_counter() - t0
+
+    home_pts = np.array([r["home_pts"] for r in rows], dtype=float)
+    away_pts = np.array([r["away_pts"] for r in rows], dtype=float)
+    margins = home_pts - away_pts
+    ot = np.array([r["overtime_periods"] for r in rows])
+
+    return {
+        "home_team_id": home_id,
+        "away_team_id": away_id,
+        "replicas": k,
+        "seed": base_seed,
+        "home_win_prob": float(np.mean(margins > 0)),
+        "away_win_prob": float(np.mean(margins < 0)),
+        "avg_score": {home_id: round(float(home_pts.mean()), 2), away_id: round(float(away_pts.mean()), 2)},
+        "margin": {
+            "mean": round(float(margins.mean()), 2),
+            "std": round(float(margins.std()), 2),
+            "percentiles": {f"p{p}": float(v) for p, v in zip(FORECAST_PERCENTILES, np.percentile(margins, FORECAST_PERCENTILES))},
+            "histogram": _margin_histogram(margins, margin_bin_width),
+        },
+        "overtime_rate": float(np.mean(ot > 0)),
+        "players": _player_percentiles(rows, (home_id, away_id)),
+        "workers": n_workers,
+        "elapsed_sec": round(elapsed, 3),
+    }
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+"""Background job queue for long league advances (advance_league_until).
+
+POST /api/advance-league/jobs only enqueues; a single worker thread runs the jobs one at a
+time, so the event loop stays free and league-state writes are never interleaved between
+two advances. Each job keeps a progress dict (day, games done/total, ETA) plus a version
+counter that the SSE endpoint polls, and a cancel Event that advance_league_until checks at
+day boundaries (a cancelled job keeps every day it finished).
+
+Results are the compact game objects returned by ingest_game_result; box scores live in the
+result store and are fetched per game (state.get_game_result).
+
+Three kinds of job exist: "advance" (advance_league_until(**params)), "resume"
+(sim.checkpoints.resume_advance(**params), i.e. continue the last checkpointed advance) and
+"resume_postseason" (sim.checkpoints.resume_postseason(**params): finish the checkpointed
+playoff round; no progress, cancel only while queued, result is the postseason snapshot).
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+
+KIND_ADVANCE = "advance"
+KIND_RESUME = "resume"
+KIND_RESUME_POSTSEASON = "resume_postseason"
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+FINISHED_STATUSES = frozenset({JOB_DONE, JOB_CANCELLED, JOB_FAILED})
+
+# finished jobs kept for status/result lookups (oldest dropped first)
+_JOBS_MAX = 32
+
+
+class SimJob:
+    """One queued advance_league_until call and its progress/result."""
+
+    def __init__(self, kind: str, params: Dict[str, Any]) -> None:
+        self.job_id = uuid4().hex
+        self.kind = kind
+        self.params = dict(params)
+        self.status = JOB_QUEUED
+        self.progress: Dict[str, Any] = {}
+        self.result: Any = None  # game list (advance/resume) or postseason snapshot
+        self.error: Optional[str] = None
+        self.exception: Optional[BaseException] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.version = 0
+        self.cancel_event = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+
+    def _update(self, **fields: Any) -> None:
+        with self._lock:
+            for k, v in fields.items():
+                setattr(self, k, v)
+            self.version += 1
+        if self.status in FINISHED_STATUSES:
+            self._done.set()
+
+    def _on_progress(self, p: Dict[str, Any]) -> None:
+        p = dict(p)
+        elapsed = time.time() - (self.started_at or time.time())
+        done, total = int(p.get("games_done") or 0), int(p.get("games_total") or 0)
+        p["elapsed_sec"] = round(elapsed, 2)
+        p["eta_sec"] = round(elapsed * (total - done) / done, 2) if done and total >= done else None
+        self._update(progress=p)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def snapshot(self, include_result: bool = False) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {
+                "job_id": self.job_id,
+                "kind": self.kind,
+                "status": self.status,
+                "params": dict(self.params),
+                "progress": dict(self.progress),
+                "cancel_requested": self.cancel_event.is_set(),
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "version": self.version,
+            }
+            if isinstance(self.result, list):
+                out["simulated_count"] = len(self.result)
+                if include_result:
+                    out["simulated_games"] = list(self.result)
+        return out
+
+
+_JOBS: "OrderedDict[str, SimJob]" = OrderedDict()
+_JOBS_LOCK = threading.Lock()
+_QUEUE: "queue.Queue[Optional[SimJob]]" = queue.Queue()
+_WORKER: Optional[threading.Thread] = None
+
+
+def _run_job(job: SimJob) -> None:
+    from sim.checkpoints import resume_advance, resume_postseason
+    from sim.league_sim import advance_league_until
+
+    if job.cancel_event.is_set():
+        job._update(status=JOB_CANCELLED, finished_at=time.time())
+        return
+    job._update(status=JOB_RUNNING, started_at=time.time())
+    try:
+        if job.kind == KIND_RESUME_POSTSEASON:
+            games = resume_postseason(**job.params)
+        else:
+            run = resume_advance if job.kind == KIND_RESUME else advance_league_until
+            games = run(
+                progress=job._on_progress,
+                cancel_event=job.cancel_event,
+                **job.params,
+            )
+    except Exception as exc:
+        logger.exception("[SIM_JOB] job %s failed", job.job_id)
+        job._update(status=JOB_FAILED, error=str(exc), exception=exc, finished_at=time.time())
+        return
+    status = JOB_CANCELLED if job.cancel_event.is_set() else JOB_DONE
+    job._update(status=status, result=games, finished_at=time.time())
+
+
+def _worker_loop() -> None:
+    while True:
+        job = _QUEUE.get()
+        if job is None:
+            return
+        _run_job(job)
+
+
+def _ensure_worker() -> None:
+    global _WORKER
+    if _WORKER is None or not _WORKER.is_alive():
+        _WORKER = threading.Thread(target=_worker_loop, name="sim-jobs", daemon=True)
+        _WORKER.start()
+
+
+def _submit(job: SimJob) -> SimJob:
+    with _JOBS_LOCK:
+        _JOBS[job.job_id] = job
+        finished = [jid for jid, j in _JOBS.items() if j.status in FINISHED_STATUSES]
+        for jid in finished[: max(0, len(_JOBS) - _JOBS_MAX)]:
+            del _JOBS[jid]
+        _ensure_worker()
+    _QUEUE.put(job)
+    return job
+
+
+def submit_advance_job(**params: Any) -> SimJob:
+    """Queue advance_league_until(**params) and return the job immediately."""
+    return _submit(SimJob(KIND_ADVANCE, params))
+
+
+def submit_resume_job(**params: Any) -> SimJob:
+    """Queue sim.checkpoints.resume_advance(**params) and return the job immediately."""
+    return _submit(SimJob(KIND_RESUME, params))
+
+
+def submit_resume_postseason_job(**params: Any) -> SimJob:
+    """Queue sim.checkpoints.resume_postseason(**params) and return the job immediately."""
+    return _submit(SimJob(KIND_RESUME_POSTSEASON, params))
+
+
+def get_job(job_id: str) -> Optional[SimJob]:
+    with _JOBS_LOCK:
+        return _JOBS.get(job_id)
+
+
+def list_jobs() -> List[Dict[str, Any]]:
+    with _JOBS_LOCK:
+        jobs = list(_JOBS.values())
+    return [j.snapshot() for j in jobs]
+
+
+def cancel_job(job_id: str) -> Optional[SimJob]:
+    """Request cancellation; a running job stops before its next day."""
+    job = get_job(job_id)
+    if job is not None and job.status not in FINISHED_STATUSES:
+        job.cancel_event.set()
+        job._update()
+    return job
+
+
+def shutdown_jobs() -> None:
+    """Cancel queued/running jobs and stop the worker thread (server shutdown)."""
+    global _WORKER
+    with _JOBS_LOCK:
+        for job in _JOBS.values():
+            if job.status not in FINISHED_STATUSES:
+                job.cancel_event.set()
+        worker = _WORKER
+        _WORKER = None
+    if worker is not None and worker.is_alive():
+        _QUEUE.put(None)
+        worker.join(timeout=30)
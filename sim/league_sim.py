@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 import random
 from contextlib import contextmanager
 from datetime import date, timedelta
-from typing import Any, Dict, List, Optional
+from threading import Event
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from league_repo import LeagueRepo
@@ -13,29 +16,41 @@ from matchengine_v2_adapter import (
     build_context_from_master_schedule_entry,
     build_context_from_team_ids,
 )
+from matchengine_v3 import profiler
+from matchengine_v3.shot_diet import clear_style_cache
 from matchengine_v3.sim_game import simulate_game
+from sim import checkpoints
 from state import (
-    export_full_state_snapshot,
     get_db_path,
     get_league_context_snapshot,
+    get_master_schedule_games,
     ingest_game_result,
+    ingest_game_results,
     initialize_master_schedule_if_needed,
+    read_paths,
     set_current_date,
 )
 from trades_ai import _run_ai_gm_tick_if_needed
-from sim.roster_adapter import build_team_state_from_db
+from sim.forecast import _roster_token, _run_scheduled_game, _tactics_key, get_forecast_pool, submit_bounded
+from sim.roster_adapter import get_team_state
 
 logger = logging.getLogger(__name__)
 
+def _game_seed(base_seed: int, game_id: str) -> int:
+    """Per-game engine seed keyed by game_id, so a seeded run does not depend on game order."""
+    h = hashlib.sha1(f"{base_seed}|{game_id}".encode("utf-8")).digest()
+    return int.from_bytes(h[:8], "little")
+
+
 @contextmanager
 def _repo_ctx() -> LeagueRepo:
     db_path = get_db_path()
     with LeagueRepo(db_path) as repo:
         try:
-            repo.init_db()
+            repo.ensure_initialized()
         except Exception as exc:
             logger.exception(
-                "[DB_INIT_FAILED] sim.league_sim._repo_ctx repo.init_db() failed (db_path=%s): %s",
+                "[DB_INIT_FAILED] sim.league_sim._repo_ctx repo.ensure_initialized() failed (db_path=%s): %s",
                 db_path,
                 str(exc),
             )
@@ -43,38 +58,126 @@ def _repo_ctx() -> LeagueRepo:
         yield repo
 
 
-def _run_match(
+def _simulate_match(
     *,
     home_team_id: str,
     away_team_id: str,
-    game_date: str,
     home_tactics: Optional[Dict[str, Any]] = None,
     away_tactics: Optional[Dict[str, Any]] = None,
     context: Dict[str, Any],
+    run_profile: Optional[profiler.EngineProfile] = None,
+    rng_seed: Optional[int] = None,
 ) -> Dict[str, Any]:
-    rng = random.Random()
+    """Simulate one game and return its GameResultV2 (not ingested)."""
+    rng = random.Random(rng_seed)
     with _repo_ctx() as repo:
-        home = build_team_state_from_db(repo=repo, team_id=home_team_id, tactics=home_tactics)
-        away = build_team_state_from_db(repo=repo, team_id=away_team_id, tactics=away_tactics)
+        home = get_team_state(repo=repo, team_id=home_team_id, tactics=home_tactics)
+        away = get_team_state(repo=repo, team_id=away_team_id, tactics=away_tactics)
 
+    if rng_seed is not None:
+        # Seeded games must not depend on what ran before them (same rule as the pool workers).
+        clear_style_cache()
     raw_result = simulate_game(rng, home, away)
+    t_adapt = perf_counter()
     v2_result = adapt_matchengine_result_to_v2(
         raw_result=raw_result,
         context=context,
         engine_name="matchengine_v3",
     )
-    return ingest_game_result(game_result=v2_result, game_date=game_date)
+    game_profile = raw_result["meta"].get("engine_profile")
+    if game_profile is not None:
+        adapter_profile = profiler.EngineProfile()
+        adapter_profile.add("v2_adapter", perf_counter() - t_adapt)
+        profiler.record(adapter_profile)
+        if run_profile is not None:
+            run_profile.merge_dict(game_profile)
+            run_profile.merge(adapter_profile)
+    return v2_result
+
+
+def _run_match(*, game_date: str, **kwargs: Any) -> Dict[str, Any]:
+    return ingest_game_result(game_result=_simulate_match(**kwargs), game_date=game_date)
+
+
+# -------------------------------------------------------------------------
+# Day-parallel advance
+# -------------------------------------------------------------------------
+def _run_day_parallel(
+    matchups: List[Dict[str, Any]],
+    game_date: str,
+    *,
+    workers: Optional[int] = None,
+    run_profile: Optional[profiler.EngineProfile] = None,
+) -> List[Dict[str, Any]]:
+    """Simulate one day's games on the forecast pool, then ingest them as one batch in schedule order.
+
+    Games on one day are independent (rosters only change between advance calls), so only
+    the ingest has to stay on this thread. Worker TeamStates are keyed by roster token, so
+    trades/signings since the last call are picked up without any signalling.
+    """
+    db_path = get_db_path()
+    team_ids = {m["home_team_id"] for m in matchups} | {m["away_team_id"] for m in matchups}
+    with _repo_ctx() as repo:
+        tokens = {tid: _roster_token(repo, tid) for tid in team_ids}
+
+    pool, fan_out = get_forecast_pool(db_path, workers)
+    no_tactics = _tactics_key(None)
+    outputs = submit_bounded(
+        pool,
+        _run_scheduled_game,
+        [
+            (
+                (m["home_team_id"], no_tactics, tokens[m["home_team_id"]]),
+                (m["away_team_id"], no_tactics, tokens[m["away_team_id"]]),
+                m["rng_seed"],
+                m["context"],
+            )
+            for m in matchups
+        ],
+        fan_out,
+    )
+    v2_results: List[Dict[str, Any]] = []
+    for v2_result, game_profile in outputs:
+        if run_profile is not None and game_profile is not None:
+            run_profile.merge_dict(game_profile)
+        v2_results.append(v2_result)
+    return ingest_game_results(v2_results, game_date=game_date)
 
 
 def advance_league_until(
     target_date_str: str,
     user_team_id: Optional[str] = None,
+    seed: Optional[int] = None,
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    cancel_event: Optional[Event] = None,
+    checkpoint_every: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
+    """Simulate every unplayed scheduled game up to target_date.
+
+    seed=None keeps the unseeded engine RNG; with a seed every game is simulated with
+    random.Random(_game_seed(seed, game_id)), which makes a run reproducible (benchmarks).
+
+    Each simulated day is ingested as one batch (ingest_game_results, in schedule order):
+    one state commit per day. parallel=True simulates each day's games on the shared
+    forecast process pool (see _run_day_parallel) before that batch ingest. Without an
+    explicit seed a random base seed is drawn (and logged) so per-game seeds exist.
+
+    progress (if given) is called after every simulated day with
+    {date, days_done, days_total, games_done, games_total}. cancel_event is checked at day
+    boundaries only: once set, no further day is started and current_date is moved to the
+    last completed day instead of target_date (see sim.jobs).
+
+    checkpoint_every=N writes a sim.checkpoints snapshot after every N simulated days, on
+    cancel and at the end, so sim.checkpoints.resume_advance can continue after a crash.
+    """
     initialize_master_schedule_if_needed()
-    league_full = export_full_state_snapshot().get("league", {})
-    master_schedule = league_full.get("master_schedule", {})
-    by_date: Dict[str, List[str]] = master_schedule.get("by_date") or {}
-    games: List[Dict[str, Any]] = master_schedule.get("games") or []
+    ms = read_paths("league.master_schedule.by_date", "league.master_schedule.by_id")
+    by_date: Dict[str, List[str]] = ms["league.master_schedule.by_date"] or {}
+    by_id: Dict[str, Dict[str, Any]] = ms["league.master_schedule.by_id"] or {
+        g.get("game_id"): g for g in get_master_schedule_games() if g.get("game_id")
+    }
 
     try:
         target_date = date.fromisoformat(target_date_str)
@@ -100,47 +203,120 @@ def advance_league_until(
 
     simulated_game_objs: List[Dict[str, Any]] = []
     user_team_upper = user_team_id.upper() if user_team_id else None
+    run_profile = profiler.new_profile()
+
+    if parallel and seed is None:
+        # Parallel results must not depend on which worker ran a game: always derive per-game seeds.
+        seed = random.SystemRandom().randrange(1 << 31)
+        logger.info("[ADVANCE] parallel advance to %s with base seed %d", target_date_str, seed)
+
+    def _pending(day_str: str) -> List[Tuple[str, Dict[str, Any]]]:
+        out: List[Tuple[str, Dict[str, Any]]] = []
+        for gid in by_date.get(day_str, []):
+            g = by_id.get(gid)
+            if not g or g.get("status") == "final":
+                continue
+            if user_team_upper and user_team_upper in (
+                str(g["home_team_id"]).upper(),
+                str(g["away_team_id"]).upper(),
+            ):
+                continue
+            out.append((gid, g))
+        return out
 
+    ckpt_params = {
+        "target_date_str": target_date_str,
+        "user_team_id": user_team_id,
+        "seed": seed,
+        "parallel": parallel,
+        "workers": workers,
+        "checkpoint_every": checkpoint_every,
+    }
+
+    days_total = 0
+    games_total = 0
+    if progress is not None:
+        day = current_date + timedelta(days=1)
+        while day <= target_date:
+            n = len(_pending(day.isoformat()))
+            if n:
+                days_total += 1
+                games_total += n
+            day += timedelta(days=1)
+    days_done = 0
+
+    last_done = current_date
+    cancelled = False
     day = current_date + timedelta(days=1)
     while day <= target_date:
+        if cancel_event is not None and cancel_event.is_set():
+            cancelled = True
+            break
         day_str = day.isoformat()
-        game_ids = by_date.get(day_str, [])
-        if not game_ids:
+        pending = _pending(day_str)
+        if not pending:
+            last_done = day
             day += timedelta(days=1)
             continue
 
-        for gid in game_ids:
-            g = next((x for x in games if x.get("game_id") == gid), None)
-            if not g:
-                continue
-            if g.get("status") == "final":
-                continue
-
+        matchups: List[Dict[str, Any]] = []
+        for gid, g in pending:
             home_id = str(g["home_team_id"]).upper()
             away_id = str(g["away_team_id"]).upper()
 
-            if user_team_upper and (home_id == user_team_upper or away_id == user_team_upper):
-                continue
-
             context = build_context_from_master_schedule_entry(
                 entry=g,
                 league_state=league_context,
                 date_override=day_str,
                 phase=str(g.get("phase") or "regular"),
             )
-
-            game_obj = _run_match(
-                home_team_id=home_id,
-                away_team_id=away_id,
-                game_date=day_str,
-                context=context,
+            matchups.append(
+                {
+                    "home_team_id": home_id,
+                    "away_team_id": away_id,
+                    "context": context,
+                    "rng_seed": _game_seed(seed, gid) if seed is not None else None,
+                }
             )
-            simulated_game_objs.append(game_obj)
 
+        # One state commit per day: the day's results are ingested as a single batch.
+        if parallel and len(matchups) > 1:
+            simulated_game_objs.extend(_run_day_parallel(matchups, day_str, workers=workers, run_profile=run_profile))
+        else:
+            day_results = [_simulate_match(run_profile=run_profile, **m) for m in matchups]
+            simulated_game_objs.extend(ingest_game_results(day_results, game_date=day_str))
+
+        last_done = day
+        days_done += 1
+        if progress is not None:
+            progress(
+                {
+                    "date": day_str,
+                    "days_done": days_done,
+                    "days_total": days_total,
+                    "games_done": len(simulated_game_objs),
+                    "games_total": games_total,
+                }
+            )
+        if checkpoint_every and days_done % int(checkpoint_every) == 0:
+            # current_date marks the last completed day, so a resumed run starts after it.
+            set_current_date(day_str)
+            checkpoints.write_checkpoint(checkpoints.KIND_ADVANCE, ckpt_params)
         day += timedelta(days=1)
 
-    set_current_date(target_date_str)
-    _run_ai_gm_tick_if_needed(target_date)
+    if cancelled:
+        logger.info("[ADVANCE] cancelled at %s (target %s)", last_done.isoformat(), target_date_str)
+        if last_done > current_date:
+            set_current_date(last_done.isoformat())
+            _run_ai_gm_tick_if_needed(last_done)
+    else:
+        set_current_date(target_date_str)
+        _run_ai_gm_tick_if_needed(target_date)
+    if checkpoint_every:
+        checkpoints.write_checkpoint(checkpoints.KIND_ADVANCE, ckpt_params, completed=not cancelled)
+    if run_profile is not None:
+        entry = profiler.record_run("advance_league_until", run_profile, target_date=target_date_str)
+        logger.info("[ENGINE_PROFILE] advance_league_until(%s): %s", target_date_str, entry)
     return simulated_game_objs
 
 
@@ -0,0 +1,350 @@
+from __future__ import annotations
+
+"""Season projection: playoff odds from N simulations of the remaining regular season.
+
+Read-only with respect to league state. Final games in league.master_schedule form the
+base standings; every simulation layers its own results on top of that base as NumPy
+arrays (wins / losses / point differential / head-to-head / conference record), so the
+state snapshot is never copied or mutated per simulation.
+
+Game outcomes come from matchengine_v3. Each unique (home, away) pairing left on the
+schedule is simulated `matchup_replicas` times with the lockstep batch engine
+(matchengine_v3.sim_batch) on the shared forecast process pool, and the resulting margin
+samples are cached per (pairing, tactics, roster tokens). Season simulations then draw each
+remaining game's margin from its pairing's samples, which keeps N in the thousands cheap
+and lets day-to-day projections reuse every pairing whose rosters did not change.
+
+Standings are ranked per conference with tiebreaks: win count, then head-to-head record
+among the tied teams, conference record, point differential, and finally a random draw.
+Play-in games (7v8, 9v10, loser/winner final) are resolved with log5 on simulated
+season win percentage.
+
+Results are cached by (season, state turn, parameters, roster tokens).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import TEAM_TO_CONF_DIV
+from league_repo import LeagueRepo
+from sim.forecast import _roster_token, _tactics_key, _worker_team_state, get_forecast_pool, submit_bounded
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PROJECTION_SIMS = 2000
+MAX_PROJECTION_SIMS = 20000
+DEFAULT_MATCHUP_REPLICAS = 48
+AUTO_BID_SEEDS = 6
+PLAY_IN_SEEDS = (7, 8, 9, 10)
+WIN_PERCENTILES: Tuple[int, ...] = (10, 50, 90)
+
+TeamKey = Tuple[str, str, str]  # (team_id, tactics_key, roster_token); see sim.forecast
+
+_MATCHUP_CACHE: "OrderedDict[Tuple[TeamKey, TeamKey, int], np.ndarray]" = OrderedDict()
+_MATCHUP_CACHE_MAX = 4096
+_RESULT_CACHE: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_RESULT_CACHE_MAX = 8
+# Both LRUs are shared by concurrent projection requests (endpoint runs in a threadpool).
+# Held only around cache reads/writes, never while matchups are simulated.
+_CACHE_LOCK = threading.Lock()
+
+
+# -------------------------------------------------------------------------
+# Worker side
+# -------------------------------------------------------------------------
+def _simulate_matchup(home_key: TeamKey, away_key: TeamKey, n: int, seed: int) -> np.ndarray:
+    """Runs in a forecast pool worker: (n,) home-minus-away margins for one pairing."""
+    from matchengine_v3.sim_batch import simulate_games_batch
+
+    res = simulate_games_batch(_worker_team_state(*home_key), _worker_team_state(*away_key), n, seed=seed)
+    return res.margins().astype(np.int16)
+
+
+# -------------------------------------------------------------------------
+# Standings overlay
+# -------------------------------------------------------------------------
+class _SeasonOverlay:
+    """Base standings from final games + per-simulation arrays for the remaining games."""
+
+    def __init__(self, team_ids: Sequence[str], games: Sequence[Dict[str, Any]]) -> None:
+        self.team_ids = list(team_ids)
+        self.idx = {tid: i for i, tid in enumerate(self.team_ids)}
+        T = len(self.team_ids)
+        self.conf = np.array([
+            str((TEAM_TO_CONF_DIV.get(tid) or {}).get("conference") or "").lower() for tid in self.team_ids
+        ])
+        self.wins = np.zeros(T, dtype=np.int64)
+        self.losses = np.zeros(T, dtype=np.int64)
+        self.pdiff = np.zeros(T, dtype=np.int64)
+        self.h2h = np.zeros((T, T), dtype=np.int64)          # h2h[i, j] = wins of i over j
+        self.conf_wins = np.zeros(T, dtype=np.int64)
+        self.conf_games = np.zeros(T, dtype=np.int64)
+        self.remaining: List[Tuple[int, int]] = []
+
+        for g in games:
+            if str(g.get("phase") or "regular") != "regular":
+                continue
+            h = self.idx.get(str(g.get("home_team_id") or "").upper())
+            a = self.idx.get(str(g.get("away_team_id") or "").upper())
+            if h is None or a is None:
+                continue
+            if g.get("status") != "final":
+                self.remaining.append((h, a))
+                continue
+            hs, as_ = g.get("home_score"), g.get("away_score")
+            if hs is None or as_ is None or hs == as_:
+                continue
+            self._add_result(h, a, int(hs) - int(as_))
+
+    def _add_result(self, h: int, a: int, margin: int) -> None:
+        w, l = (h, a) if margin > 0 else (a, h)
+        self.wins[w] += 1
+        self.losses[l] += 1
+        self.pdiff[h] += margin
+        self.pdiff[a] -= margin
+        self.h2h[w, l] += 1
+        if self.conf[h] and self.conf[h] == self.conf[a]:
+            self.conf_wins[w] += 1
+            self.conf_games[h] += 1
+            self.conf_games[a] += 1
+
+    def simulate(self, margins: np.ndarray) -> Dict[str, np.ndarray]:
+        """Overlay (G, S) remaining-game margins on the base standings -> per-sim arrays."""
+        S = margins.shape[1] if margins.ndim == 2 else 0
+        T = len(self.team_ids)
+        wins = np.repeat(self.wins[None, :], S, axis=0)
+        pdiff = np.repeat(self.pdiff[None, :], S, axis=0)
+        h2h = np.repeat(self.h2h[None, :, :], S, axis=0)
+        conf_wins = np.repeat(self.conf_wins[None, :], S, axis=0)
+        conf_games = self.conf_games.copy()
+        for g, (h, a) in enumerate(self.remaining):
+            m = margins[g]
+            hw = m > 0
+            wins[:, h] += hw
+            wins[:, a] += ~hw
+            pdiff[:, h] += m
+            pdiff[:, a] -= m
+            h2h[:, h, a] += hw
+            h2h[:, a, h] += ~hw
+            if self.conf[h] and self.conf[h] == self.conf[a]:
+                conf_wins[:, h] += hw
+                conf_wins[:, a] += ~hw
+                conf_games[h] += 1
+                conf_games[a] += 1
+        games = self.wins + self.losses + np.bincount(
+            np.array([x for pair in self.remaining for x in pair], dtype=np.int64), minlength=T
+        )
+        return {"wins": wins, "pdiff": pdiff, "h2h": h2h, "conf_wins": conf_wins, "conf_games": conf_games, "games": games}
+
+
+def _rank_conference(
+    members: np.ndarray,
+    wins: np.ndarray,
+    pdiff: np.ndarray,
+    h2h: np.ndarray,
+    conf_wins: np.ndarray,
+    conf_games: np.ndarray,
+    tie_noise: np.ndarray,
+) -> List[int]:
+    """Order one simulation's conference members (team indices) best-first."""
+    order = sorted(members.tolist(), key=lambda i: -wins[i])
+    out: List[int] = []
+    k = 0
+    while k < len(order):
+        j = k
+        while j + 1 < len(order) and wins[order[j + 1]] == wins[order[k]]:
+            j += 1
+        group = order[k: j + 1]
+        if len(group) > 1:
+            g = np.array(group)
+            sub = h2h[np.ix_(g, g)]
+            h2h_w = sub.sum(axis=1)
+            h2h_n = h2h_w + sub.sum(axis=0)
+            h2h_pct = np.where(h2h_n > 0, h2h_w / np.maximum(h2h_n, 1), 0.5)
+            conf_pct = np.where(conf_games[g] > 0, conf_wins[g] / np.maximum(conf_games[g], 1), 0.5)
+            keys = sorted(
+                range(len(group)),
+                key=lambda x: (-h2h_pct[x], -conf_pct[x], -pdiff[group[x]], tie_noise[group[x]]),
+            )
+            group = [group[x] for x in keys]
+        out.extend(group)
+        k = j + 1
+    return out
+
+
+def _log5(pa: float, pb: float) -> float:
+    pa = min(max(pa, 0.05), 0.95)
+    pb = min(max(pb, 0.05), 0.95)
+    return (pa - pa * pb) / (pa + pb - 2.0 * pa * pb)
+
+
+def _play_in(seeds: Sequence[int], win_pct: np.ndarray, u: np.ndarray) -> Tuple[int, int]:
+    """seeds = team indices ranked 7..10; returns (7th seed, 8th seed) team indices."""
+    s7, s8, s9, s10 = seeds
+    w78, l78 = (s7, s8) if u[0] < _log5(win_pct[s7], win_pct[s8]) else (s8, s7)
+    w910 = s9 if u[1] < _log5(win_pct[s9], win_pct[s10]) else s10
+    w_final = l78 if u[2] < _log5(win_pct[l78], win_pct[w910]) else w910
+    return w78, w_final
+
+
+# -------------------------------------------------------------------------
+# Public API
+# -------------------------------------------------------------------------
+def _matchup_seed(base_seed: int, home_key: TeamKey, away_key: TeamKey) -> int:
+    h = hashlib.sha1(f"{base_seed}|{home_key}|{away_key}".encode("utf-8")).digest()
+    return int.from_bytes(h[:4], "little")
+
+
+def project_season(
+    *,
+    sims: int = DEFAULT_PROJECTION_SIMS,
+    seed: int = 0,
+    matchup_replicas: int = DEFAULT_MATCHUP_REPLICAS,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """Playoff odds for every team from `sims` simulations of the unplayed regular season."""
+    import state
+
+    sims = int(sims)
+    if sims < 1 or sims > MAX_PROJECTION_SIMS:
+        raise ValueError(f"sims must be in [1, {MAX_PROJECTION_SIMS}] (got {sims})")
+    matchup_replicas = max(1, int(matchup_replicas))
+    t0 = time.perf_counter()
+
+    state.initialize_master_schedule_if_needed()
+    snapshot = state.read_paths("league.master_schedule.games", "turn", "active_season_id")
+    games: List[Dict[str, Any]] = snapshot["league.master_schedule.games"] or []
+    turn = int(snapshot["turn"] or 0)
+    season_id = snapshot["active_season_id"]
+
+    team_ids = sorted(
+        {str(g.get(k) or "").upper() for g in games for k in ("home_team_id", "away_team_id")} - {""}
+    )
+    overlay = _SeasonOverlay(team_ids, games)
+
+    db_path = state.get_db_path()
+    with LeagueRepo(db_path) as repo:
+        keys: Dict[int, TeamKey] = {
+            i: (tid, _tactics_key(None), _roster_token(repo, tid)) for i, tid in enumerate(team_ids)
+        }
+
+    cache_key = (season_id, turn, sims, int(seed), matchup_replicas, tuple(k[2] for k in keys.values()))
+    if use_cache:
+        with _CACHE_LOCK:
+            hit = _RESULT_CACHE.get(cache_key)
+            if hit is not None:
+                _RESULT_CACHE.move_to_end(cache_key)
+                return dict(hit, cached=True)
+
+    # ---- matchup margin samples (engine) ----
+    pairs = sorted(set(overlay.remaining))
+    samples: Dict[Tuple[int, int], np.ndarray] = {}
+    missing: List[Tuple[int, int]] = []
+    with _CACHE_LOCK:
+        for h, a in pairs:
+            ck = (keys[h], keys[a], matchup_replicas)
+            margins = _MATCHUP_CACHE.get(ck)
+            if margins is None:
+                missing.append((h, a))
+            else:
+                _MATCHUP_CACHE.move_to_end(ck)
+                samples[(h, a)] = margins
+    n_workers = 0
+    if missing:
+        pool, n_workers = get_forecast_pool(db_path, workers)
+        outputs = submit_bounded(
+            pool,
+            _simulate_matchup,
+            [(keys[h], keys[a], matchup_replicas, _matchup_seed(int(seed), keys[h], keys[a])) for h, a in missing],
+            n_workers,
+        )
+        with _CACHE_LOCK:
+            for (h, a), margins in zip(missing, outputs):
+                _MATCHUP_CACHE[(keys[h], keys[a], matchup_replicas)] = margins
+                samples[(h, a)] = margins
+            while len(_MATCHUP_CACHE) > _MATCHUP_CACHE_MAX:
+                _MATCHUP_CACHE.popitem(last=False)
+
+    # ---- season simulations ----
+    gen = np.random.default_rng(int(seed))
+    margins = np.zeros((len(overlay.remaining), sims), dtype=np.int64)
+    for g, pair in enumerate(overlay.remaining):
+        s = samples[pair]
+        margins[g] = s[gen.integers(0, len(s), size=sims)]
+    sim = overlay.simulate(margins)
+    wins = sim["wins"]
+    win_pct = wins / np.maximum(sim["games"], 1)[None, :]
+
+    T = len(team_ids)
+    max_rank = max([int((overlay.conf == c).sum()) for c in set(overlay.conf.tolist())] or [0])
+    rank_counts = np.zeros((T, max_rank + 1), dtype=np.int64)
+    playoff_counts = np.zeros(T, dtype=np.int64)
+    tie_noise = gen.random((sims, T))
+    confs = sorted(c for c in set(overlay.conf.tolist()) if c)
+    play_in_u = gen.random((sims, max(len(confs), 1), 3))
+    for s in range(sims):
+        for ci, c in enumerate(confs):
+            members = np.nonzero(overlay.conf == c)[0]
+            ranked = _rank_conference(
+                members, wins[s], sim["pdiff"][s], sim["h2h"][s], sim["conf_wins"][s], sim["conf_games"], tie_noise[s]
+            )
+            for r, ti in enumerate(ranked, start=1):
+                rank_counts[ti, r] += 1
+            playoff_counts[ranked[:AUTO_BID_SEEDS]] += 1
+            if len(ranked) >= PLAY_IN_SEEDS[-1]:
+                w7, w8 = _play_in(ranked[AUTO_BID_SEEDS: PLAY_IN_SEEDS[-1]], win_pct[s], play_in_u[s, ci])
+                playoff_counts[[w7, w8]] += 1
+
+    # ---- summary ----
+    teams_out: Dict[str, Any] = {}
+    remaining_by_team = np.bincount(
+        np.array([x for pair in overlay.remaining for x in pair], dtype=np.int64), minlength=T
+    )
+    for i, tid in enumerate(team_ids):
+        w = wins[:, i]
+        ranks = rank_counts[i] / sims
+        values, counts = np.unique(w, return_counts=True)
+        teams_out[tid] = {
+            "team_id": tid,
+            "conference": str(overlay.conf[i]),
+            "current": {"wins": int(overlay.wins[i]), "losses": int(overlay.losses[i])},
+            "remaining_games": int(remaining_by_team[i]),
+            "wins": {
+                "mean": round(float(w.mean()), 2),
+                **{f"p{p}": float(v) for p, v in zip(WIN_PERCENTILES, np.percentile(w, WIN_PERCENTILES))},
+                "distribution": {int(v): float(c) / sims for v, c in zip(values, counts)},
+            },
+            "rank_probs": {r: float(ranks[r]) for r in range(1, max_rank + 1) if ranks[r] > 0},
+            "top6_prob": float(ranks[1: AUTO_BID_SEEDS + 1].sum()),
+            "play_in_prob": float(ranks[PLAY_IN_SEEDS[0]: PLAY_IN_SEEDS[-1] + 1].sum()),
+            "playoff_prob": float(playoff_counts[i]) / sims,
+            "lottery_prob": float(ranks[PLAY_IN_SEEDS[-1] + 1:].sum()),
+        }
+
+    result = {
+        "season_id": season_id,
+        "turn": turn,
+        "sims": sims,
+        "seed": int(seed),
+        "matchup_replicas": matchup_replicas,
+        "remaining_games": len(overlay.remaining),
+        "unique_matchups": len(pairs),
+        "simulated_matchups": len(missing),
+        "workers": n_workers,
+        "elapsed_sec": round(time.perf_counter() - t0, 3),
+        "teams": teams_out,
+        "cached": False,
+    }
+    with _CACHE_LOCK:
+        _RESULT_CACHE[cache_key] = result
+        while len(_RESULT_CACHE) > _RESULT_CACHE_MAX:
+            _RESULT_CACHE.popitem(last=False)
+    return result
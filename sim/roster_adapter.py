@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import replace
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from derived_formulas import compute_derived
 from league_repo import LeagueRepo
@@ -375,3 +378,66 @@ def build_team_state_from_db(
         )
 
     return team_state
+
+
+# -------------------------
+# TeamState template cache
+# -------------------------
+# (db_path, team_id, tactics json) -> ((db_uid, roster version), pristine TeamState)
+_TEAM_STATE_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[Tuple[str, int], TeamState]]" = OrderedDict()
+_TEAM_STATE_CACHE_MAX = 128
+_TEAM_STATE_LOCK = threading.Lock()
+_TEAM_STATE_STATS = {"hits": 0, "misses": 0}
+
+
+def get_team_state(
+    *,
+    repo: LeagueRepo,
+    team_id: str,
+    tactics: Optional[Dict[str, Any]] = None,
+) -> TeamState:
+    """build_team_state_from_db served from a cached template: returns a fresh deep copy.
+
+    Templates are keyed by (team, tactics) and validated against LeagueRepo.get_roster_version,
+    which every roster move bumps (LeagueRepo.trade_player, LeagueService roster moves,
+    imports), so a team is rebuilt only when its roster actually changed. The copy is the
+    caller's to mutate (simulate_game does).
+    """
+    tid = str(team_id).upper()
+    key = (
+        str(repo.db_path),
+        tid,
+        json.dumps(tactics, sort_keys=True, ensure_ascii=False, default=str) if tactics else "",
+    )
+    version = repo.get_roster_version(tid)
+    template: Optional[TeamState] = None
+    with _TEAM_STATE_LOCK:
+        entry = _TEAM_STATE_CACHE.get(key)
+        if entry is not None and entry[0] == version:
+            _TEAM_STATE_CACHE.move_to_end(key)
+            _TEAM_STATE_STATS["hits"] += 1
+            template = entry[1]
+
+    if template is None:
+        # Built outside the lock; a concurrent roster move only bumps the version further,
+        # so the worst case is one extra rebuild.
+        template = build_team_state_from_db(repo=repo, team_id=tid, tactics=tactics)
+        with _TEAM_STATE_LOCK:
+            _TEAM_STATE_STATS["misses"] += 1
+            _TEAM_STATE_CACHE[key] = (version, template)
+            while len(_TEAM_STATE_CACHE) > _TEAM_STATE_CACHE_MAX:
+                _TEAM_STATE_CACHE.popitem(last=False)
+
+    return copy.deepcopy(template)
+
+
+def clear_team_state_cache() -> None:
+    with _TEAM_STATE_LOCK:
+        _TEAM_STATE_CACHE.clear()
+        _TEAM_STATE_STATS["hits"] = 0
+        _TEAM_STATE_STATS["misses"] = 0
+
+
+def team_state_cache_stats() -> Dict[str, Any]:
+    with _TEAM_STATE_LOCK:
+        return {**_TEAM_STATE_STATS, "entries": len(_TEAM_STATE_CACHE)}
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import logging
+import os
+import time
 from collections.abc import Mapping, Sequence
 from copy import deepcopy
 from datetime import date
@@ -16,7 +19,22 @@ from state_modules.state_constants import (
     _DEFAULT_TRADE_MEMORY,
     _META_PLAYER_KEYS,
 )
-from state_modules.state_store import read_state, reset_state_for_dev as _reset_state_for_dev, snapshot_state, transaction
+from state_modules.state_journal import StateJournal
+from state_modules.state_result_store import get_result_store as _get_result_store, is_result_ref as _is_result_ref
+from state_modules.state_store import (
+    apply_journal_set as _apply_journal_set,
+    attach_journal as _attach_journal,
+    copy_paths as _copy_paths,
+    detach_journal as _detach_journal,
+    journal_stats as _journal_stats,
+    lock_stats as _lock_stats,
+    read_state,
+    replace_state as _replace_state,
+    reset_lock_stats as _reset_lock_stats,
+    reset_state_for_dev as _reset_state_for_dev,
+    snapshot_state,
+    transaction,
+)
 
 __all__ = [
     "DEFAULT_TRADE_RULES",
@@ -29,6 +47,31 @@ __all__ = [
     "validate_state",
     "export_workflow_state",
     "export_full_state_snapshot",
+    "restore_full_state_snapshot",
+    "read_paths",
+    "read_path",
+    "project",
+    "get_master_schedule_games",
+    "get_master_schedule_by_date",
+    "get_schedule_games_on",
+    "get_team_schedule_games",
+    "get_standings_inputs",
+    "get_ingested_games",
+    "get_player_stats",
+    "get_team_stats",
+    "get_league_leaders",
+    "get_leader_categories",
+    "get_player_stat_table",
+    "get_stat_splits",
+    "get_window_stat_table",
+    "get_games_between",
+    "get_last_gm_tick_date",
+    "get_state_lock_stats",
+    "state_journal_enabled",
+    "state_journal_dir",
+    "open_state_journal",
+    "close_state_journal",
+    "get_state_journal_stats",
     "get_current_date",
     "get_current_date_as_date",
     "set_current_date",
@@ -43,6 +86,12 @@ __all__ = [
     "get_active_season_id",
     "set_active_season_id",
     "ingest_game_result",
+    "ingest_game_results",
+    "get_game_result",
+    "get_game_results",
+    "get_player_game_log",
+    "get_team_game_log",
+    "get_result_store_stats",
     "get_postseason_snapshot",
     "postseason_set_field",
     "postseason_set_play_in",
@@ -81,10 +130,16 @@ __all__ = [
 
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
 
-def _mutate_state(reason: str, fn: Callable[[dict], T]) -> T:
-    """All state mutations must go through this helper."""
-    with transaction(reason) as state:
+def _mutate_state(reason: str, fn: Callable[[dict], T], journal_args: Optional[dict] = None) -> T:
+    """All state mutations must go through this helper.
+
+    journal_args: the public function's arguments when calling `reason`(**journal_args) again
+    reproduces the mutation (see _JOURNAL_OPS); the journal then stores just those.
+    """
+    with transaction(reason, journal_args=journal_args) as state:
         return fn(state)
 
 
@@ -379,6 +434,7 @@ def startup_init_state() -> None:
         state_bootstrap.ensure_cap_model_populated_if_needed(state)
         state_bootstrap.validate_repo_integrity_once_startup(state)
         state_migrations.ensure_ingest_turn_backfilled_once_startup(state)
+        state_migrations.externalize_inline_game_results(state, _result_store())
 
     _mutate_state("startup_init_state", _impl)
 
@@ -395,82 +451,262 @@ def ingest_game_result(
     game_result: dict,
     game_date: str | None = None,
 ) -> dict:
+    return ingest_game_results([game_result], game_date=game_date)[0]
+
+
+def ingest_game_results(
+    game_results: Sequence[dict],
+    game_date: str | None = None,
+) -> list[dict]:
+    """Ingest a batch of GameResultV2 in one state transaction (e.g. one sim day).
+
+    Every result is validated and its season checked against the active season (read lock)
+    before anything is written, so a rejected batch has no side effects; the season is checked
+    again under the write lock before the box scores go to the result store (one write) and
+    the state is mutated. Turns are assigned in batch order, player rows are accumulated once
+    per phase container, and the derived caches are invalidated once. game_date (optional)
+    overrides game.date for every result.
+    """
+    return _ingest_game_results(list(game_results), game_date, None)
+
+
+def _replay_ingest_game_results(
+    game_ids: Sequence[str],
+    result_refs: Sequence[dict],
+    game_date: str | None = None,
+) -> list[dict]:
+    """Journal replay of ingest_game_results: the box scores are read back from the result store
+    (the journal records only game ids and state refs)."""
+    found = _result_store().get_many(game_ids, cache=False)
+    missing = [gid for gid in game_ids if gid not in found]
+    if missing:
+        raise ValueError(f"state journal: result store has no box score for {missing[:5]}")
+    return _ingest_game_results([found[gid] for gid in game_ids], game_date, list(result_refs))
+
+
+def _ingest_game_results(
+    game_results: list[dict],
+    game_date: str | None,
+    stored_refs: Optional[list[dict]],
+) -> list[dict]:
+    # stored_refs: the results are already in the result store with these refs (journal replay).
+    from state_modules import state_columnar
+    from state_modules import state_leaders
     from state_modules import state_results
     from state_modules import state_schedule
 
-    state_results.validate_v2_game_result(game_result)
-
-    def _impl(state: dict) -> dict:
+    if not game_results:
+        return []
+    seen_ids: set[str] = set()
+    for game_result in game_results:
+        state_results.validate_v2_game_result(game_result)
         game = game_result["game"]
-        season_id = str(game["season_id"])
-        _require_active_season_id_matches(state, season_id)
-
-        phase = str(game["phase"])
-        if phase == "regular":
-            container = state
-        elif phase in {"preseason", "play_in", "playoffs"}:
-            container = state["phase_results"][phase]
-        else:
+        if str(game["phase"]) not in {"regular", "preseason", "play_in", "playoffs"}:
             raise ValueError("invalid phase")
-
-        home_id = str(game["home_team_id"])
-        away_id = str(game["away_team_id"])
-        final = game_result["final"]
-        game_date_str = str(game_date) if game_date else str(game["date"])
         game_id = str(game["game_id"])
-        home_score = int(final[home_id])
-        away_score = int(final[away_id])
-
-        # Compute next turn early, but only apply after fail-fast checks above.
-        next_turn = int(state.get("turn", 0) or 0) + 1
-        state["turn"] = next_turn
-
-        game_obj = {
-            "game_id": game_id,
-            "date": game_date_str,
-            "home_team_id": home_id,
-            "away_team_id": away_id,
-            "home_score": home_score,
-            "away_score": away_score,
-            "status": "final",
-            "is_overtime": int(game.get("overtime_periods", 0) or 0) > 0,
-            "phase": phase,
-            "season_id": season_id,
-            "schema_version": "2.0",
-            "ingest_turn": int(next_turn),
-        }
-
-        container["games"].append(game_obj)
-        container["game_results"][game_id] = game_result
-
-        teams = game_result["teams"]
-        season_player_stats = container["player_stats"]
-        season_team_stats = container["team_stats"]
-        for tid in (home_id, away_id):
-            team_game = teams[tid]
-            state_results._accumulate_team_game_result(tid, team_game, season_team_stats)
-            rows = team_game.get("players") or []
-            if not isinstance(rows, list):
-                raise ValueError(f"GameResultV2 invalid: teams.{tid}.players must be list")
-            state_results._accumulate_player_rows(rows, season_player_stats)
+        if game_id in seen_ids:
+            raise ValueError(f"duplicate game_id in ingest batch: {game_id}")
+        seen_ids.add(game_id)
+        # The stats index (state_columnar) keys games by date; reject unparsable dates up front.
+        try:
+            date.fromisoformat(str(game_date or game["date"])[:10])
+        except ValueError:
+            raise ValueError(f"invalid game date: {game_date or game['date']!r}")
+
+    def _check_seasons(v: Mapping[str, Any]) -> None:
+        for game_result in game_results:
+            _require_active_season_id_matches(v, str(game_result["game"]["season_id"]))
+
+    _read_state(_check_seasons)
+    # Box scores go to the result store and state keeps small refs. Encoding runs here, outside
+    # the state lock; the rows are written only once every check below has passed.
+    store = _result_store()
+    prepared = store.prepare_many(game_results, game_date=game_date) if stored_refs is None else None
+    result_refs = prepared.refs if prepared is not None else stored_refs
+
+    def _impl(state: dict) -> list[dict]:
+        # Again under the write lock: the season may have switched since the read above.
+        _check_seasons(state)
+        # Checks passed, nothing mutated yet: a rejected batch never reaches the store.
+        if prepared is not None:
+            store.commit_prepared(prepared)
+        else:
+            # Replay: the box scores are stored, but a restore may have pruned their game logs.
+            store.write_game_logs(game_results, game_date=game_date)
 
+        turn = int(state.get("turn", 0) or 0)
         ms = state["league"]["master_schedule"]
-        state_schedule.mark_master_schedule_game_final(
-            ms,
-            game_id=game_id,
-            game_date_str=game_date_str,
-            home_id=home_id,
-            away_id=away_id,
-            home_score=home_score,
-            away_score=away_score,
+        game_objs: list[dict] = []
+        # phase -> player rows of the whole batch, accumulated once per container
+        batch_rows: dict[str, list] = {}
+        for game_result, result_ref in zip(game_results, result_refs):
+            game = game_result["game"]
+            phase = str(game["phase"])
+            container = state if phase == "regular" else state["phase_results"][phase]
+
+            home_id = str(game["home_team_id"])
+            away_id = str(game["away_team_id"])
+            final = game_result["final"]
+            game_date_str = str(game_date) if game_date else str(game["date"])
+            game_id = str(game["game_id"])
+            home_score = int(final[home_id])
+            away_score = int(final[away_id])
+
+            turn += 1
+            game_obj = {
+                "game_id": game_id,
+                "date": game_date_str,
+                "home_team_id": home_id,
+                "away_team_id": away_id,
+                "home_score": home_score,
+                "away_score": away_score,
+                "status": "final",
+                "is_overtime": int(game.get("overtime_periods", 0) or 0) > 0,
+                "phase": phase,
+                "season_id": str(game["season_id"]),
+                "schema_version": "2.0",
+                "ingest_turn": int(turn),
+            }
+
+            container["games"].append(game_obj)
+            container["game_results"][game_id] = result_ref
+
+            teams = game_result["teams"]
+            rows_out = batch_rows.setdefault(phase, [])
+            for tid in (home_id, away_id):
+                team_game = teams[tid]
+                state_results._accumulate_team_game_result(tid, team_game, container["team_stats"])
+                rows = team_game.get("players") or []
+                if not isinstance(rows, list):
+                    raise ValueError(f"GameResultV2 invalid: teams.{tid}.players must be list")
+                rows_out.extend(rows)
+
+            state_schedule.mark_master_schedule_game_final(
+                ms,
+                game_id=game_id,
+                game_date_str=game_date_str,
+                home_id=home_id,
+                away_id=away_id,
+                home_score=home_score,
+                away_score=away_score,
+            )
+            game_objs.append(game_obj)
+
+        for phase, rows in batch_rows.items():
+            container = state if phase == "regular" else state["phase_results"][phase]
+            state_results._accumulate_player_rows(rows, container["player_stats"])
+        turn_before = int(state.get("turn", 0) or 0)
+        state["turn"] = turn
+        state_leaders.note_ingest(
+            state,
+            {phase: {str(r["PlayerID"]) for r in rows} for phase, rows in batch_rows.items()},
+            turn_before,
+            turn,
         )
+        state_columnar.note_ingest(state, list(zip(game_results, game_objs)), turn_before, turn)
 
         state["cached_views"]["_meta"]["scores"]["built_from_turn"] = -1
         state["cached_views"]["_meta"]["schedule"]["built_from_turn_by_team"] = {}
         state["cached_views"]["stats"]["leaders"] = None
-        return game_obj
+        return game_objs
+
+    # Journaled as ids + refs: the box scores are already durable in the result store.
+    return _mutate_state(
+        "ingest_game_results",
+        _impl,
+        {
+            "game_ids": [str(gr["game"]["game_id"]) for gr in game_results],
+            "result_refs": result_refs,
+            "game_date": game_date,
+        },
+    )
+
+
+def _result_store():
+    return _get_result_store(get_db_path())
 
-    return _mutate_state("ingest_game_result", _impl)
+
+def get_game_results(game_ids: Sequence[str]) -> dict:
+    """{game_id: GameResultV2} for the ingested games among game_ids (active season, any phase).
+
+    Box scores live in the result store (state_result_store); only the lookup of their refs
+    takes the state lock.
+    """
+
+    def _impl(v: Mapping[str, Any]) -> dict:
+        containers = [v["game_results"]] + [c.get("game_results") or {} for c in v["phase_results"].values()]
+        found = {}
+        for gid in game_ids:
+            gid = str(gid)
+            for results in containers:
+                if gid in results:
+                    found[gid] = _to_plain(results[gid])
+                    break
+        return found
+
+    found = _read_state(_impl)
+    refs = [gid for gid, value in found.items() if _is_result_ref(value)]
+    if refs:
+        stored = _result_store().get_many(refs)
+        for gid in refs:
+            found[gid] = deepcopy(stored[gid]) if gid in stored else None
+    return {gid: value for gid, value in found.items() if value is not None}
+
+
+def get_game_result(game_id: str) -> Optional[dict]:
+    """Stored GameResultV2 (box score) for game_id, from the regular season or any phase; None if unknown."""
+    return get_game_results([game_id]).get(str(game_id))
+
+
+def get_player_game_log(
+    player_id: str,
+    *,
+    season_id: Optional[str] = None,
+    phase: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+    newest_first: bool = True,
+) -> dict:
+    """One page of a player's game log, across every stored season (incl. season_history) unless season_id.
+
+    Rows of games the state no longer holds (checkpoint restore, dev reset) are pruned at restore/reset.
+
+    {"total", "rows": [{game_id, season_id, phase, date, team_id, opponent_id, is_home, stats}]};
+    served from the result store's game log index, without touching the state lock.
+    """
+    return _result_store().player_game_log(
+        str(player_id),
+        season_id=season_id,
+        phase=phase,
+        offset=offset,
+        limit=limit,
+        newest_first=newest_first,
+    )
+
+
+def get_team_game_log(
+    team_id: str,
+    *,
+    season_id: Optional[str] = None,
+    phase: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+    newest_first: bool = True,
+) -> dict:
+    """One page of a team's game log (game ids, opponents, scores); see get_player_game_log."""
+    return _result_store().team_game_log(
+        str(team_id),
+        season_id=season_id,
+        phase=phase,
+        offset=offset,
+        limit=limit,
+        newest_first=newest_first,
+    )
+
+
+def get_result_store_stats() -> dict:
+    """Result store counters (puts/gets, LRU hits, raw vs compressed bytes)."""
+    return _result_store().stats()
 
 
 def validate_v2_game_result(game_result: dict) -> None:
@@ -493,35 +729,35 @@ def postseason_set_field(field) -> None:
     def _impl(state: dict) -> None:
         state["postseason"]["field"] = deepcopy(field)
 
-    _mutate_state("postseason_set_field", _impl)
+    _mutate_state("postseason_set_field", _impl, {"field": field})
 
 
 def postseason_set_play_in(state) -> None:
     def _impl(gs: dict) -> None:
         gs["postseason"]["play_in"] = deepcopy(state)
 
-    _mutate_state("postseason_set_play_in", _impl)
+    _mutate_state("postseason_set_play_in", _impl, {"state": state})
 
 
 def postseason_set_playoffs(state) -> None:
     def _impl(gs: dict) -> None:
         gs["postseason"]["playoffs"] = deepcopy(state)
 
-    _mutate_state("postseason_set_playoffs", _impl)
+    _mutate_state("postseason_set_playoffs", _impl, {"state": state})
 
 
 def postseason_set_champion(team_id) -> None:
     def _impl(gs: dict) -> None:
         gs["postseason"]["champion"] = team_id
 
-    _mutate_state("postseason_set_champion", _impl)
+    _mutate_state("postseason_set_champion", _impl, {"team_id": team_id})
 
 
 def postseason_set_my_team_id(team_id) -> None:
     def _impl(gs: dict) -> None:
         gs["postseason"]["my_team_id"] = team_id
 
-    _mutate_state("postseason_set_my_team_id", _impl)
+    _mutate_state("postseason_set_my_team_id", _impl, {"team_id": team_id})
 
 
 def postseason_set_dates(play_in_start, play_in_end, playoffs_start) -> None:
@@ -530,7 +766,11 @@ def postseason_set_dates(play_in_start, play_in_end, playoffs_start) -> None:
         gs["postseason"]["play_in_end_date"] = play_in_end
         gs["postseason"]["playoffs_start_date"] = playoffs_start
 
-    _mutate_state("postseason_set_dates", _impl)
+    _mutate_state(
+        "postseason_set_dates",
+        _impl,
+        {"play_in_start": play_in_start, "play_in_end": play_in_end, "playoffs_start": playoffs_start},
+    )
 
 
 def postseason_reset() -> None:
@@ -546,7 +786,7 @@ def postseason_reset() -> None:
             "playoffs_start_date": None,
         }
 
-    _mutate_state("postseason_reset", _impl)
+    _mutate_state("postseason_reset", _impl, {})
 
 
 def get_cached_stats_snapshot() -> dict:
@@ -557,7 +797,7 @@ def set_cached_stats_snapshot(stats_cache: dict) -> None:
     def _impl(state: dict) -> None:
         state["cached_views"]["stats"] = deepcopy(stats_cache)
 
-    _mutate_state("set_cached_stats_snapshot", _impl)
+    _mutate_state("set_cached_stats_snapshot", _impl, {"stats_cache": stats_cache})
 
 
 def get_cached_weekly_news_snapshot() -> dict:
@@ -568,7 +808,7 @@ def set_cached_weekly_news_snapshot(cache: dict) -> None:
     def _impl(state: dict) -> None:
         state["cached_views"]["weekly_news"] = deepcopy(cache)
 
-    _mutate_state("set_cached_weekly_news_snapshot", _impl)
+    _mutate_state("set_cached_weekly_news_snapshot", _impl, {"cache": cache})
 
 
 def get_cached_playoff_news_snapshot() -> dict:
@@ -579,7 +819,7 @@ def set_cached_playoff_news_snapshot(cache: dict) -> None:
     def _impl(state: dict) -> None:
         state["cached_views"]["playoff_news"] = deepcopy(cache)
 
-    _mutate_state("set_cached_playoff_news_snapshot", _impl)
+    _mutate_state("set_cached_playoff_news_snapshot", _impl, {"cache": cache})
 
 
 def export_trade_context_snapshot() -> dict:
@@ -752,8 +992,30 @@ def teams_set(value: dict) -> None:
     _mutate_state("teams_set", _impl)
 
 
+def _ingested_game_ids(v: Mapping[str, Any]) -> list:
+    """game_ids with a stored result in state: active season (every phase) + season_history."""
+    containers = [v["game_results"]] + [c.get("game_results") or {} for c in v["phase_results"].values()]
+    for record in (v.get("season_history") or {}).values():
+        containers.append((record.get("regular") or {}).get("game_results") or {})
+        containers.extend(c.get("game_results") or {} for c in (record.get("phase_results") or {}).values())
+    return [str(gid) for results in containers for gid in results]
+
+
+def _prune_game_logs(store) -> None:
+    """Drop the store's game log rows for games the current state never ingested (restore/reset).
+
+    Runs under the state read lock so no ingest can write rows between collecting the ids and the delete.
+    """
+    pruned = _read_state(lambda v: store.prune_game_logs(_ingested_game_ids(v)))
+    if pruned:
+        logger.info("[RESULT_STORE] pruned game logs of %d games not in state", pruned)
+
+
 def reset_state_for_dev() -> None:
+    db_path = _read_state(lambda v: (v.get("league") or {}).get("db_path"))
     _reset_state_for_dev()
+    if db_path:
+        _prune_game_logs(_get_result_store(db_path))
 
 
 # ---- Remaining read APIs rewritten to avoid global dict exposure ----
@@ -772,6 +1034,7 @@ def export_workflow_state(
         "gm_profiles",
     ),
 ) -> dict:
+    """State snapshot without the DB-owned keys. Subtrees are shared frozen copies (writes raise TypeError)."""
     snapshot = snapshot_state()
     for key in exclude_keys:
         snapshot.pop(key, None)
@@ -779,9 +1042,373 @@ def export_workflow_state(
 
 
 def export_full_state_snapshot() -> dict:
+    """Full state snapshot (see state_store.snapshot_state). Subtrees are shared frozen copies."""
     return snapshot_state()
 
 
+def restore_full_state_snapshot(snapshot: dict) -> None:
+    """Replace the whole state with a snapshot from export_full_state_snapshot (sim checkpoints).
+
+    league.db_path must match the current one: a checkpoint never switches databases.
+    """
+    current_db = get_db_path()
+    snap_db = str(((snapshot or {}).get("league") or {}).get("db_path") or "")
+    if snap_db != current_db:
+        raise ValueError(f"snapshot db_path '{snap_db}' does not match current db_path '{current_db}'")
+    _replace_state(snapshot)
+    # Game logs of games ingested after the snapshot would outlive it otherwise.
+    _prune_game_logs(_result_store())
+
+
+# -------------------------------------------------------------------------
+# Write-ahead journal (restart recovery)
+# -------------------------------------------------------------------------
+def _journal_ops() -> dict:
+    """Facade functions journaled by arguments (_mutate_state journal_args), by op name."""
+    return {
+        "ingest_game_results": _replay_ingest_game_results,
+        "postseason_set_field": postseason_set_field,
+        "postseason_set_play_in": postseason_set_play_in,
+        "postseason_set_playoffs": postseason_set_playoffs,
+        "postseason_set_champion": postseason_set_champion,
+        "postseason_set_my_team_id": postseason_set_my_team_id,
+        "postseason_set_dates": postseason_set_dates,
+        "postseason_reset": postseason_reset,
+        "set_cached_stats_snapshot": set_cached_stats_snapshot,
+        "set_cached_weekly_news_snapshot": set_cached_weekly_news_snapshot,
+        "set_cached_playoff_news_snapshot": set_cached_playoff_news_snapshot,
+        "set_current_date": set_current_date,
+        "set_last_gm_tick_date": set_last_gm_tick_date,
+    }
+
+
+def state_journal_enabled() -> bool:
+    """STATE_JOURNAL=1/on/true enables the journal (off by default)."""
+    return os.environ.get("STATE_JOURNAL", "").strip().lower() in ("1", "on", "true", "yes")
+
+
+def state_journal_dir(db_path: Optional[str] = None) -> str:
+    """STATE_JOURNAL_DIR if set, else '<db file>.journal' next to the league DB."""
+    env = os.environ.get("STATE_JOURNAL_DIR")
+    if env:
+        return env
+    return f"{db_path or get_db_path()}.journal"
+
+
+def open_state_journal(directory: Optional[str] = None) -> dict:
+    """Server startup with the journal: restore state (latest snapshot + journal tail), run
+    startup_init_state on it, then journal every commit on top of a fresh base snapshot.
+
+    Call after set_db_path, instead of startup_init_state. A journal for another db_path is
+    refused (restore_full_state_snapshot).
+    """
+    journal = StateJournal.from_env(directory or state_journal_dir())
+    t0 = time.perf_counter()
+    snapshot, records = journal.recover()
+    info = {"directory": journal.directory, "restored": False, "replayed": 0}
+    if snapshot is not None:
+        restore_full_state_snapshot(snapshot)
+        ops = _journal_ops()
+        for rec in records:
+            if "op" in rec:
+                fn = ops.get(rec["op"])
+                if fn is None:
+                    raise ValueError(f"state journal: unknown op '{rec['op']}' at seq {rec['seq']}")
+                fn(**rec["args"])
+            else:
+                _apply_journal_set(rec.get("set") or {}, rec.get("del") or [])
+        info.update(restored=True, replayed=len(records))
+    elif records:
+        logger.warning("[STATE_JOURNAL] %d journal records without a base snapshot ignored", len(records))
+    info["recover_sec"] = round(time.perf_counter() - t0, 3)
+    startup_init_state()
+    _attach_journal(journal)
+    if info["restored"]:
+        logger.info("[STATE_JOURNAL] restored state from %s", info)
+    return info
+
+
+def close_state_journal() -> None:
+    _detach_journal()
+
+
+def get_state_journal_stats() -> Optional[dict]:
+    return _journal_stats()
+
+
+def get_state_lock_stats(reset: bool = False) -> dict:
+    """Reader-writer lock contention counters for the global state (debug endpoint)."""
+    stats = _lock_stats()
+    if reset:
+        _reset_lock_stats()
+    return stats
+
+
+# -------------------------------------------------------------------------
+# Path-projected reads (copy only what the caller needs)
+# -------------------------------------------------------------------------
+def _split_path(path: str | Sequence[str]) -> tuple[str, ...]:
+    if isinstance(path, str):
+        return tuple(p for p in path.split(".") if p)
+    return tuple(str(p) for p in path)
+
+
+def read_paths(*paths: str | Sequence[str], default: Any = None) -> dict:
+    """Plain copies of just the requested paths, read together under one lock: {path: value}.
+
+    Paths are dotted strings ('league.master_schedule.by_date', 'phase_results.playoffs.player_stats')
+    or key sequences; list indexes are digits. Missing paths map to `default`.
+    """
+    values = _copy_paths([_split_path(p) for p in paths], default)
+    return {(p if isinstance(p, str) else ".".join(map(str, p))): v for p, v in zip(paths, values)}
+
+
+def read_path(path: str | Sequence[str], default: Any = None) -> Any:
+    """Plain copy of the value at one path (see read_paths)."""
+    return _copy_paths([_split_path(path)], default)[0]
+
+
+def project(fn: Callable[[Mapping[str, Any]], T]) -> T:
+    """Run fn over a read-only view of the live state under the lock; fn must return plain data.
+
+    For derived reads that need only a few fields out of a large subtree (nothing is copied
+    beyond what fn builds).
+    """
+    return _read_state(fn)
+
+
+def _phase_container_path(phase: str, key: str) -> tuple[str, ...]:
+    if phase == "regular":
+        return (key,)
+    if phase not in _ALLOWED_PHASES:
+        raise ValueError(f"invalid phase: {phase}")
+    return ("phase_results", phase, key)
+
+
+def get_master_schedule_games() -> list:
+    return read_path("league.master_schedule.games", default=[]) or []
+
+
+def get_master_schedule_by_date() -> dict:
+    return read_path("league.master_schedule.by_date", default={}) or {}
+
+
+def _schedule_entries(v: Mapping[str, Any], game_ids: Any) -> list:
+    by_id = v["league"]["master_schedule"]["by_id"]
+    return [_to_plain(by_id[gid]) for gid in game_ids or [] if gid in by_id]
+
+
+def get_schedule_games_on(date_str: str) -> list:
+    """Master schedule entries scheduled on date_str (schedule order)."""
+    return _read_state(
+        lambda v: _schedule_entries(v, v["league"]["master_schedule"]["by_date"].get(str(date_str)))
+    )
+
+
+def get_team_schedule_games(team_id: str) -> list:
+    """Master schedule entries involving team_id, via the by_team index."""
+    return _read_state(
+        lambda v: _schedule_entries(v, v["league"]["master_schedule"]["by_team"].get(str(team_id).upper()))
+    )
+
+
+def get_standings_inputs() -> list:
+    """(home_team_id, away_team_id, home_score, away_score) of every final master schedule game."""
+
+    def _impl(v: Mapping[str, Any]) -> list:
+        out = []
+        for g in v["league"]["master_schedule"]["games"]:
+            if g.get("status") != "final":
+                continue
+            out.append(
+                (
+                    str(g.get("home_team_id") or ""),
+                    str(g.get("away_team_id") or ""),
+                    g.get("home_score"),
+                    g.get("away_score"),
+                )
+            )
+        return out
+
+    return _read_state(_impl)
+
+
+def get_ingested_games(phase: str = "regular") -> list:
+    """Compact game objects ingested so far in `phase` (see ingest_game_result)."""
+    return read_path(_phase_container_path(phase, "games"), default=[]) or []
+
+
+def get_player_stats(phase: str = "regular") -> dict:
+    return read_path(_phase_container_path(phase, "player_stats"), default={}) or {}
+
+
+def get_team_stats(phase: str = "regular") -> dict:
+    return read_path(_phase_container_path(phase, "team_stats"), default={}) or {}
+
+
+def get_league_leaders(
+    phase: str = "regular",
+    *,
+    stats: Optional[Sequence[str]] = None,
+    mode: str = "per_game",
+    limit: int = 5,
+    min_games: Optional[int] = None,
+) -> dict:
+    """{stat: top `limit` qualified player rows} from the incremental leader index (state_leaders).
+
+    stats defaults to stats_util.TRACKED_STATS; any player totals key or pct category
+    (FG_PCT, 3P_PCT, FT_PCT, TS_PCT) works. mode: per_game | totals | per36 (ignored for pct).
+    """
+    from state_modules import state_leaders
+    from stats_util import TRACKED_STATS
+
+    return _read_state(
+        lambda v: state_leaders.leaders(
+            v,
+            phase=phase,
+            stats=list(stats or TRACKED_STATS),
+            mode=mode,
+            limit=int(limit),
+            min_games=min_games,
+        )
+    )
+
+
+def get_leader_categories(phase: str = "regular") -> list:
+    from state_modules import state_leaders
+
+    return _read_state(lambda v: state_leaders.categories(v, phase))
+
+
+def _with_columns(phase: str, fn):
+    from state_modules import state_columnar
+
+    store = _result_store()
+    return state_columnar.with_phase(_read_state, phase, lambda ids: store.get_many(ids, cache=False), fn)
+
+
+def get_player_stat_table(
+    phase: str = "regular",
+    *,
+    stats: Optional[Sequence[str]] = None,
+    per: str = "game",
+    team_id: Optional[str] = None,
+    player_ids: Optional[Sequence[str]] = None,
+    min_games: int = 0,
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    advanced: bool = False,
+    percentiles: bool = False,
+) -> dict:
+    """Player stat rows from the columnar stats index (state_columnar), vectorized.
+
+    per: total | game | 36 | 100 (per 100 on-floor team possessions). stats defaults to every
+    stat key in the phase. advanced adds TS_PCT / EFG_PCT / USG_PCT; percentiles adds each
+    row's percentile rank (0-100] among the filtered players.
+    {"per", "stats", "total": filtered count, "rows": [{player_id, name, team_id, games, <stat>...}]}
+    """
+    from state_modules import state_columnar
+
+    return _with_columns(
+        phase,
+        lambda cols: state_columnar.stat_table(
+            cols,
+            stats=stats,
+            per=per,
+            team_id=team_id,
+            player_ids=player_ids,
+            min_games=int(min_games),
+            sort_by=sort_by,
+            descending=descending,
+            offset=int(offset),
+            limit=limit,
+            advanced=advanced,
+            percentiles=percentiles,
+        ),
+    )
+
+
+def get_stat_splits(
+    kind: str,
+    entity_id: str,
+    phase: str = "regular",
+    *,
+    last_n: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    per: str = "game",
+    by_opponent: bool = False,
+) -> dict:
+    """Overall / home / away (+ per-opponent) stats of a player or team (kind) over a window.
+
+    The window is the last `last_n` games and/or date_from..date_to (inclusive ISO dates);
+    both are answered from prefix sums (state_splits). per: total | game | 36.
+    """
+    from state_modules import state_splits
+
+    return _with_columns(
+        phase,
+        lambda cols: state_splits.splits(
+            cols,
+            kind,
+            str(entity_id),
+            last_n=last_n,
+            date_from=date_from,
+            date_to=date_to,
+            per=per,
+            by_opponent=by_opponent,
+        ),
+    )
+
+
+def get_window_stat_table(
+    phase: str = "regular",
+    *,
+    stats: Optional[Sequence[str]] = None,
+    per: str = "game",
+    last_n: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    team_id: Optional[str] = None,
+    min_games: int = 1,
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    limit: Optional[int] = None,
+) -> dict:
+    """Player rows over a window (e.g. the last week, or each player's last 10 games); see get_stat_splits."""
+    from state_modules import state_splits
+
+    return _with_columns(
+        phase,
+        lambda cols: state_splits.window_table(
+            cols,
+            stats=stats,
+            per=per,
+            last_n=last_n,
+            date_from=date_from,
+            date_to=date_to,
+            team_id=team_id,
+            min_games=int(min_games),
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit,
+        ),
+    )
+
+
+def get_games_between(date_from: Optional[str], date_to: Optional[str], phase: str = "regular") -> list:
+    """Compact ingested game objects of `phase` dated date_from..date_to (inclusive), in ingest order."""
+    from state_modules import state_splits
+
+    return _with_columns(phase, lambda cols: state_splits.games_between(cols, date_from, date_to))
+
+
+def get_last_gm_tick_date() -> str | None:
+    return _read_state(lambda v: v["league"].get("last_gm_tick_date"))
+
+
 def get_current_date() -> str | None:
     return _read_state(lambda v: v["league"]["current_date"])
 
@@ -810,7 +1437,7 @@ def set_current_date(date_str: str | None) -> None:
     def _impl(state: dict) -> None:
         state["league"]["current_date"] = date_str
 
-    _mutate_state("set_current_date", _impl)
+    _mutate_state("set_current_date", _impl, {"date_str": date_str})
 
 
 def get_db_path() -> str:
@@ -840,7 +1467,7 @@ def set_last_gm_tick_date(date_str: str | None) -> None:
     def _impl(state: dict) -> None:
         state["league"]["last_gm_tick_date"] = date_str
 
-    _mutate_state("set_last_gm_tick_date", _impl)
+    _mutate_state("set_last_gm_tick_date", _impl, {"date_str": date_str})
 
 
 def get_league_context_snapshot() -> dict:
@@ -0,0 +1,452 @@
+from __future__ import annotations
+
+"""
+state_columnar.py
+
+선수 스탯 컬럼형(NumPy) 인덱스 (phase별).
+
+- 선수 x 스탯 float64 누적 행렬(totals) + 선수별 경기 수 + 팀 컨텍스트 누적(선수가 뛴 경기의 팀 FGA/FTA/TOV/MIN/
+  포제션, usage/pace 보정용).
+- 경기별 선수 행 로그(append-only 배열): player / team / 상대 / phase 내 경기 순번 / 날짜(ordinal) / 홈 여부 /
+  스탯 벡터.
+- 선수/팀별 누적합 로그(state_splits.PrefixLog): 최근 N경기/날짜 범위/홈·원정 split을 O(1)로 조회.
+- ingest_game_results 트랜잭션 안에서 배치 단위로 추가된다(note_ingest). 스탯 키가 새로 나오면 컬럼이 늘어난다.
+- 조회(table / percentiles / 고급 지표: TS%, eFG%, USG%, per-36, per-100 포제션)는 모두 벡터 연산.
+- state의 player_stats dict는 그대로 저장/journal/snapshot의 SSOT이고, 이 인덱스는 프로세스 메모리에만 있다.
+  (시즌, turn, player_stats dict id)가 어긋나면 다음 조회 때 result store의 box score로 다시 만든다
+  (box score 읽기/빌드는 state 락 밖에서, 설치만 read 락 안에서).
+"""
+
+import threading
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .state_constants import _META_PLAYER_KEYS
+from .state_splits import TEAM_EXTRA_KEYS, PrefixLog
+from .state_utils import _index_sync_key, _is_number, _phase_containers
+
+PER_TOTAL = "total"
+PER_GAME = "game"
+PER_36 = "36"
+PER_100 = "100"
+PERS = (PER_TOTAL, PER_GAME, PER_36, PER_100)
+
+# team context summed over the games each player played (usage / pace adjustment)
+CTX_KEYS = ("TM_FGA", "TM_FTA", "TM_TOV", "TM_MIN", "TM_POSS")
+ADVANCED_KEYS = ("TS_PCT", "EFG_PCT", "USG_PCT")
+
+_ROW_CAP_MIN = 1024
+
+
+def _grow_rows(arr: np.ndarray, cap: int) -> np.ndarray:
+    out = np.zeros((cap,) + arr.shape[1:], dtype=arr.dtype)
+    out[: arr.shape[0]] = arr
+    return out
+
+
+def _div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den with 0 where den == 0 (broadcasting)."""
+    num, den = np.broadcast_arrays(np.asarray(num, dtype=np.float64), np.asarray(den, dtype=np.float64))
+    return np.divide(num, den, out=np.zeros(num.shape), where=den != 0)
+
+
+class PhaseColumns:
+    """Columnar season stats of one phase container."""
+
+    def __init__(self) -> None:
+        self.stat_keys: List[str] = []
+        self.stat_index: Dict[str, int] = {}
+        self.player_ids: List[str] = []
+        self.player_index: Dict[str, int] = {}
+        self.names: List[Any] = []
+        self.player_team: List[str] = []  # latest team per player
+        self.team_ids: List[str] = []
+        self.team_index: Dict[str, int] = {}
+        self.games = np.zeros(0, dtype=np.int64)
+        self.totals = np.zeros((0, 0))
+        self.ctx = np.zeros((0, len(CTX_KEYS)))
+        # per-game player row log
+        self.n_rows = 0
+        self.row_player = np.zeros(0, dtype=np.int32)
+        self.row_team = np.zeros(0, dtype=np.int32)
+        self.row_opp = np.zeros(0, dtype=np.int32)
+        self.row_game = np.zeros(0, dtype=np.int32)
+        self.row_date = np.zeros(0, dtype=np.int32)
+        self.row_home = np.zeros(0, dtype=bool)
+        self.row_stats = np.zeros((0, 0))
+        self.row_ctx = np.zeros((0, len(CTX_KEYS)))
+        self.game_ids: List[str] = []
+        self.game_dates: List[str] = []
+        self.game_date_ords: List[int] = []
+        self.game_dates_sorted = True
+        self.game_meta: List[Dict[str, Any]] = []  # compact game objects, by game seq
+        # prefix sums for window/split queries (state_splits), by player / team idx
+        self.player_prefix: List[PrefixLog] = []
+        self.team_prefix: List[PrefixLog] = []
+
+    # ---- growth ----
+    def _ensure_stats(self, keys: Iterable[str]) -> None:
+        new = [k for k in keys if k not in self.stat_index]
+        if not new:
+            return
+        for k in new:
+            self.stat_index[k] = len(self.stat_keys)
+            self.stat_keys.append(k)
+        extra = len(new)
+        self.totals = np.hstack([self.totals, np.zeros((self.totals.shape[0], extra))])
+        self.row_stats = np.hstack([self.row_stats, np.zeros((self.row_stats.shape[0], extra))])
+
+    def _player(self, pid: str, name: Any, team_id: str) -> int:
+        idx = self.player_index.get(pid)
+        if idx is None:
+            idx = self.player_index[pid] = len(self.player_ids)
+            self.player_ids.append(pid)
+            self.names.append(name)
+            self.player_team.append(team_id)
+            self.player_prefix.append(PrefixLog(len(self.stat_keys), len(CTX_KEYS)))
+            if idx >= self.games.shape[0]:
+                cap = max(64, 2 * self.games.shape[0])
+                self.games = _grow_rows(self.games, cap)
+                self.totals = _grow_rows(self.totals, cap)
+                self.ctx = _grow_rows(self.ctx, cap)
+        else:
+            if name is not None:
+                self.names[idx] = name
+            self.player_team[idx] = team_id
+        return idx
+
+    def _team(self, team_id: str) -> int:
+        idx = self.team_index.get(team_id)
+        if idx is None:
+            idx = self.team_index[team_id] = len(self.team_ids)
+            self.team_ids.append(team_id)
+            self.team_prefix.append(PrefixLog(len(self.stat_keys), len(TEAM_EXTRA_KEYS)))
+        return idx
+
+    def _reserve_rows(self, n: int) -> None:
+        need = self.n_rows + n
+        if need <= self.row_player.shape[0]:
+            return
+        cap = max(need, 2 * self.row_player.shape[0], _ROW_CAP_MIN)
+        for name in ("row_player", "row_team", "row_opp", "row_game", "row_date", "row_home", "row_stats", "row_ctx"):
+            setattr(self, name, _grow_rows(getattr(self, name), cap))
+
+    # ---- ingest ----
+    def append_game(self, game_result: Mapping[str, Any], game_obj: Mapping[str, Any]) -> None:
+        """Add one ingested game (GameResultV2 + its compact state game object)."""
+        game = game_result["game"]
+        home_id = str(game["home_team_id"])
+        away_id = str(game["away_team_id"])
+        final = game_result.get("final") or {}
+        game_idx = len(self.game_ids)
+        game_date = str(game_obj["date"])
+        date_ord = date.fromisoformat(game_date[:10]).toordinal()
+        self.game_ids.append(str(game["game_id"]))
+        self.game_dates.append(game_date)
+        if self.game_date_ords and date_ord < self.game_date_ords[-1]:
+            self.game_dates_sorted = False
+        self.game_date_ords.append(date_ord)
+        self.game_meta.append(
+            {
+                k: game_obj.get(k)
+                for k in ("game_id", "date", "phase", "home_team_id", "away_team_id", "home_score", "away_score", "is_overtime")
+            }
+        )
+
+        for tid, opp_id, is_home in ((home_id, away_id, True), (away_id, home_id, False)):
+            team_game = game_result["teams"][tid]
+            team_idx, opp_idx = self._team(tid), self._team(opp_id)
+            rows = [r for r in (team_game.get("players") or []) if isinstance(r, Mapping)]
+            keys = {k for r in rows for k, v in r.items() if k not in _META_PLAYER_KEYS and _is_number(v)}
+            self._ensure_stats(sorted(keys))
+            block = np.zeros((len(rows), len(self.stat_keys)))
+            pidx = np.empty(len(rows), dtype=np.int32)
+            for i, r in enumerate(rows):
+                pidx[i] = self._player(str(r["PlayerID"]), r.get("Name"), str(r.get("TeamID") or tid))
+                for k, v in r.items():
+                    j = self.stat_index.get(k)
+                    if j is not None and _is_number(v):
+                        block[i, j] = float(v)
+
+            team_sum = block.sum(axis=0)
+            poss = (team_game.get("totals") or {}).get("Possessions")
+            if not _is_number(poss):
+                poss = game.get("possessions_per_team")
+            poss = float(poss) if _is_number(poss) else 0.0
+            ctx_row = np.array(
+                [team_sum[self.stat_index[k]] if k in self.stat_index else 0.0 for k in ("FGA", "FTA", "TOV", "MIN")]
+                + [poss]
+            )
+            pts, opp_pts = float(final.get(tid, 0) or 0), float(final.get(opp_id, 0) or 0)
+            self.team_prefix[team_idx].append(
+                team_sum,
+                np.array([float(pts > opp_pts), float(pts < opp_pts), opp_pts, poss]),
+                date_ord,
+                game_idx,
+                is_home,
+                opp_idx,
+            )
+            if not rows:
+                continue
+
+            np.add.at(self.totals, pidx, block)
+            np.add.at(self.games, pidx, 1)
+            np.add.at(self.ctx, pidx, np.broadcast_to(ctx_row, (len(rows), len(CTX_KEYS))))
+            for i, p in enumerate(pidx):
+                self.player_prefix[p].append(block[i], ctx_row, date_ord, game_idx, is_home, opp_idx)
+
+            self._reserve_rows(len(rows))
+            sl = slice(self.n_rows, self.n_rows + len(rows))
+            self.row_player[sl] = pidx
+            self.row_team[sl] = team_idx
+            self.row_opp[sl] = opp_idx
+            self.row_game[sl] = game_idx
+            self.row_date[sl] = date_ord
+            self.row_home[sl] = is_home
+            self.row_stats[sl] = block
+            self.row_ctx[sl] = ctx_row
+            self.n_rows += len(rows)
+
+    # ---- vectorized queries ----
+    @property
+    def n_players(self) -> int:
+        return len(self.player_ids)
+
+    def _cols(self, stats: Sequence[str]) -> np.ndarray:
+        n = self.n_players
+        out = np.zeros((n, len(stats)))
+        for j, stat in enumerate(stats):
+            i = self.stat_index.get(stat)
+            if i is not None:
+                out[:, j] = self.totals[:n, i]
+        return out
+
+    def _stat(self, stat: str) -> np.ndarray:
+        return self._cols([stat])[:, 0]
+
+    def values(self, stats: Sequence[str], per: str = PER_GAME) -> np.ndarray:
+        """(n_players, len(stats)) totals scaled per game / 36 minutes / 100 possessions."""
+        if per not in PERS:
+            raise ValueError(f"invalid per: {per!r} (expected one of {PERS})")
+        totals = self._cols(stats)
+        n = self.n_players
+        if per == PER_TOTAL:
+            return totals
+        if per == PER_GAME:
+            return _div(totals, self.games[:n, None])
+        minutes = self._stat("MIN")
+        if per == PER_36:
+            return _div(totals * 36.0, minutes[:, None])
+        return _div(totals * 100.0, self.on_floor_possessions()[:, None])
+
+    def on_floor_possessions(self) -> np.ndarray:
+        """Team possessions while each player was on the floor (team poss * MIN / (team MIN / 5))."""
+        n = self.n_players
+        ctx = self.ctx[:n]
+        tm_poss, tm_min = ctx[:, CTX_KEYS.index("TM_POSS")], ctx[:, CTX_KEYS.index("TM_MIN")]
+        return _div(tm_poss * self._stat("MIN") * 5.0, tm_min)
+
+    def advanced(self) -> Dict[str, np.ndarray]:
+        """TS%, eFG%, USG% per player (usage against team totals of the games he played)."""
+        n = self.n_players
+        pts, fga, fgm, fg3m, fta, tov, minutes = (self._stat(k) for k in ("PTS", "FGA", "FGM", "3PM", "FTA", "TOV", "MIN"))
+        ctx = self.ctx[:n]
+        tm = {k: ctx[:, i] for i, k in enumerate(CTX_KEYS)}
+        usage_num = (fga + 0.44 * fta + tov) * (tm["TM_MIN"] / 5.0)
+        usage_den = minutes * (tm["TM_FGA"] + 0.44 * tm["TM_FTA"] + tm["TM_TOV"])
+        return {
+            "TS_PCT": _div(pts, 2.0 * (fga + 0.44 * fta)),
+            "EFG_PCT": _div(fgm + 0.5 * fg3m, fga),
+            "USG_PCT": 100.0 * _div(usage_num, usage_den),
+        }
+
+    def mask(
+        self,
+        *,
+        team_id: Optional[str] = None,
+        player_ids: Optional[Iterable[str]] = None,
+        min_games: int = 0,
+    ) -> np.ndarray:
+        n = self.n_players
+        m = self.games[:n] >= max(int(min_games), 1)
+        if team_id is not None:
+            m &= np.array([t == team_id for t in self.player_team], dtype=bool)
+        if player_ids is not None:
+            sel = np.zeros(n, dtype=bool)
+            idx = [self.player_index[p] for p in player_ids if p in self.player_index]
+            sel[idx] = True
+            m &= sel
+        return m
+
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """Percent of values <= each value (0-100], column-wise for a 2-D array."""
+    if values.shape[0] == 0:
+        return values.copy()
+    s = np.sort(values, axis=0)
+    out = np.empty_like(values, dtype=np.float64)
+    for j in range(values.shape[1]):
+        out[:, j] = np.searchsorted(s[:, j], values[:, j], side="right") * 100.0 / values.shape[0]
+    return out
+
+
+class ColumnarIndex:
+    def __init__(self, sync_key: tuple) -> None:
+        self.sync_key = sync_key
+        self.phases: Dict[str, PhaseColumns] = {}
+
+
+_INDEX: Optional[ColumnarIndex] = None
+_INDEX_LOCK = threading.RLock()
+
+
+def note_ingest(
+    state: Mapping[str, Any],
+    batch: Sequence[Tuple[Mapping[str, Any], Mapping[str, Any]]],
+    turn_before: int,
+    turn_after: int,
+) -> None:
+    """Append an ingested batch [(game_result, game_obj)] (called inside the ingest transaction).
+
+    Only an index in sync before the ingest is extended; any other is dropped and rebuilt on
+    the next query.
+    """
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            return
+        if _INDEX.sync_key != _index_sync_key(state, turn_before):
+            _INDEX = None
+            return
+        for game_result, game_obj in batch:
+            cols = _INDEX.phases.get(str(game_obj["phase"]))
+            if cols is not None:
+                cols.append_game(game_result, game_obj)
+        _INDEX.sync_key = _index_sync_key(state, turn_after)
+
+
+def _build_phase(games: Sequence[Mapping[str, Any]], fetch_results: Callable[[List[str]], Dict[str, Any]]) -> PhaseColumns:
+    cols = PhaseColumns()
+    games = sorted(games, key=lambda g: int(g.get("ingest_turn") or 0))
+    results = fetch_results([str(g["game_id"]) for g in games])
+    for g in games:
+        result = results.get(str(g["game_id"]))
+        if result is not None:
+            cols.append_game(result, g)
+    return cols
+
+
+_BUILD_ATTEMPTS = 3
+
+
+def with_phase(
+    read: Callable[[Callable[[Mapping[str, Any]], Any]], Any],
+    phase: str,
+    fetch_results: Callable[[List[str]], Dict[str, Any]],
+    fn: Callable[[PhaseColumns], Any],
+) -> Any:
+    """Run fn on the (in-sync) columns of `phase`, building them from stored box scores if needed.
+
+    read(f) runs f(state) under the state read lock; fetch_results(game_ids) -> {game_id: GameResultV2}.
+    A rebuild copies the phase's game list under the lock, then fetches/decodes the box scores and
+    builds the columns with no lock held, and installs them only if the sync key has not moved
+    meanwhile (ingest, restore, season switch). After _BUILD_ATTEMPTS lost races the last build
+    runs under the read lock.
+    """
+    miss = object()
+
+    def _lookup(state: Mapping[str, Any]) -> Any:
+        container = _phase_containers(state).get(phase)
+        if container is None:
+            raise ValueError(f"invalid phase: {phase!r}")
+        key = _index_sync_key(state, int(state.get("turn", 0) or 0))
+        with _INDEX_LOCK:
+            cols = _INDEX.phases.get(phase) if _INDEX is not None and _INDEX.sync_key == key else None
+        if cols is not None:
+            return fn(cols)
+        return miss, key, [dict(g) for g in container.get("games") or []]
+
+    def _install(state: Mapping[str, Any], key: tuple, cols: PhaseColumns) -> Any:
+        global _INDEX
+        if _index_sync_key(state, int(state.get("turn", 0) or 0)) != key:
+            return miss
+        with _INDEX_LOCK:
+            if _INDEX is None or _INDEX.sync_key != key:
+                _INDEX = ColumnarIndex(key)
+            cols = _INDEX.phases.setdefault(phase, cols)
+        return fn(cols)
+
+    for _ in range(_BUILD_ATTEMPTS):
+        out = read(_lookup)
+        if not (isinstance(out, tuple) and out and out[0] is miss):
+            return out
+        _, key, games = out
+        cols = _build_phase(games, fetch_results)
+        out = read(lambda state: _install(state, key, cols))
+        if out is not miss:
+            return out
+
+    def _locked(state: Mapping[str, Any]) -> Any:
+        out = _lookup(state)
+        if not (isinstance(out, tuple) and out and out[0] is miss):
+            return out
+        _, key, games = out
+        return _install(state, key, _build_phase(games, fetch_results))
+
+    return read(_locked)
+
+
+def stat_table(
+    cols: PhaseColumns,
+    *,
+    stats: Optional[Sequence[str]] = None,
+    per: str = PER_GAME,
+    team_id: Optional[str] = None,
+    player_ids: Optional[Iterable[str]] = None,
+    min_games: int = 0,
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    advanced: bool = False,
+    percentiles: bool = False,
+) -> Dict[str, Any]:
+    """Filtered/sorted player rows. Percentiles rank within the filtered players."""
+    stats = list(stats) if stats else [k for k in cols.stat_keys]
+    vals = cols.values(stats, per)
+    keys = list(stats)
+    if advanced:
+        adv = cols.advanced()
+        vals = np.hstack([vals, np.column_stack([adv[k] for k in ADVANCED_KEYS])]) if cols.n_players else np.zeros((0, len(keys) + len(ADVANCED_KEYS)))
+        keys += list(ADVANCED_KEYS)
+
+    sel = np.flatnonzero(cols.mask(team_id=team_id, player_ids=player_ids, min_games=min_games))
+    sub = vals[sel]
+    if sort_by is not None:
+        if sort_by == "games":
+            order_key = cols.games[sel].astype(np.float64)
+        elif sort_by in keys:
+            order_key = sub[:, keys.index(sort_by)]
+        else:
+            raise ValueError(f"unknown sort_by: {sort_by!r}")
+        order = np.argsort(-order_key if descending else order_key, kind="stable")
+        sel, sub = sel[order], sub[order]
+    pct = percentile_ranks(sub) if percentiles else None
+
+    end = None if limit is None else offset + int(limit)
+    rows: List[Dict[str, Any]] = []
+    for r in range(len(sel))[offset:end]:
+        i = int(sel[r])
+        row: Dict[str, Any] = {
+            "player_id": cols.player_ids[i],
+            "name": cols.names[i],
+            "team_id": cols.player_team[i],
+            "games": int(cols.games[i]),
+        }
+        row.update({k: float(v) for k, v in zip(keys, sub[r])})
+        if pct is not None:
+            row["percentiles"] = {k: float(v) for k, v in zip(keys, pct[r])}
+        rows.append(row)
+    return {"per": per, "stats": keys, "total": int(len(sel)), "rows": rows}
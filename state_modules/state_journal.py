@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+"""
+state_journal.py
+
+전역 상태 write-ahead journal (재시작 복구용).
+
+- 커밋된 트랜잭션마다 journal에 한 줄(JSON, crc32 접두)을 append 한다.
+  - 논리 레코드: {"seq", "op", "args"} — ingest_game_results / set_current_date 처럼 인자만으로
+    재실행 가능한 facade 호출 (state.py가 op 이름 -> 함수로 replay). ingest는 박스스코어 대신
+    game_id + result store ref만 기록한다 (박스스코어는 result store에 이미 커밋됨).
+  - 물리 레코드: {"seq", "set", "del"} — 그 외 트랜잭션은 쓴 top-level 키의 값을 통째로 기록.
+- 주기적으로 전체 상태 snapshot(snapshot-<seq>.json.gz)을 쓰고 journal segment(journal-<seq>.log)를
+  새로 연다. snapshot 기록은 백그라운드 스레드에서 하며, 성공한 뒤에만 이전 snapshot/segment를 지운다.
+- compaction 조건: journal 바이트 >= max(min_bytes, ratio * 마지막 snapshot 바이트).
+  따라서 snapshot으로 인한 추가 쓰기는 journal 쓰기의 1/ratio 이하 (write amplification 상한).
+- 복구: 읽을 수 있는 가장 최신 snapshot + 그 이후 seq의 레코드(연속된 것까지, 잘린 마지막 줄은 무시).
+- fsync 정책 (STATE_JOURNAL_FSYNC):
+  - "always": 커밋마다 fsync.
+  - "interval" (기본): 매 커밋 flush(프로세스 크래시는 손실 없음), fsync는 STATE_JOURNAL_FSYNC_SEC 간격.
+  - "off": flush만 (fsync는 OS에 맡김).
+"""
+
+import glob
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+JOURNAL_VERSION = 1
+FSYNC_ALWAYS = "always"
+FSYNC_INTERVAL = "interval"
+FSYNC_OFF = "off"
+_FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_OFF)
+
+_SNAPSHOT_RE = re.compile(r"snapshot-(\d+)\.json\.gz$")
+_SEGMENT_RE = re.compile(r"journal-(\d+)\.log$")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    body = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x " % zlib.crc32(body) + body + b"\n"
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse one journal line; None for a torn/corrupt line."""
+    if len(line) < 10 or not line.endswith(b"\n") or line[8:9] != b" ":
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StateJournal:
+    """Append-only journal + snapshots for one state directory. Not thread-safe: the caller
+    (state_store) only touches it under the state write lock."""
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        fsync: str = FSYNC_INTERVAL,
+        fsync_interval_sec: float = 1.0,
+        compact_ratio: float = 1.0,
+        compact_min_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        if fsync not in _FSYNC_POLICIES:
+            raise ValueError(f"invalid journal fsync policy: {fsync!r} (expected one of {_FSYNC_POLICIES})")
+        self.directory = directory
+        self.fsync = fsync
+        self.fsync_interval_sec = float(fsync_interval_sec)
+        self.compact_ratio = max(float(compact_ratio), 0.01)
+        self.compact_min_bytes = int(compact_min_bytes)
+        self._seq = 0
+        self._segment = None
+        self._segment_bytes = 0
+        self._snapshot_bytes = 0
+        self._last_fsync = time.monotonic()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-journal")
+        self._pending: Optional[Future] = None
+        self._stats: Dict[str, Any] = {
+            "records": 0,
+            "op_records": 0,
+            "set_records": 0,
+            "bytes": 0,
+            "fsyncs": 0,
+            "snapshots": 0,
+            "snapshot_sec": 0.0,
+            "last_snapshot_seq": None,
+        }
+
+    @classmethod
+    def from_env(cls, directory: str) -> "StateJournal":
+        return cls(
+            directory,
+            fsync=os.environ.get("STATE_JOURNAL_FSYNC", FSYNC_INTERVAL).strip().lower() or FSYNC_INTERVAL,
+            fsync_interval_sec=_env_float("STATE_JOURNAL_FSYNC_SEC", 1.0),
+            compact_ratio=_env_float("STATE_JOURNAL_COMPACT_RATIO", 1.0),
+            compact_min_bytes=int(_env_float("STATE_JOURNAL_COMPACT_MIN_MB", 16.0) * 1024 * 1024),
+        )
+
+    # ---- files ----
+    def _files(self, pattern: re.Pattern) -> List[Tuple[int, str]]:
+        out = []
+        for path in glob.glob(os.path.join(self.directory, "*")):
+            m = pattern.search(os.path.basename(path))
+            if m:
+                out.append((int(m.group(1)), path))
+        return sorted(out)
+
+    def _snapshot_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"snapshot-{seq:012d}.json.gz")
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"journal-{seq:012d}.log")
+
+    # ---- recovery ----
+    def recover(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(latest readable snapshot state or None, records after it in seq order)."""
+        state: Optional[Dict[str, Any]] = None
+        base_seq = -1
+        for seq, path in reversed(self._files(_SNAPSHOT_RE)):
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    payload = json.load(f)
+                if payload.get("version") != JOURNAL_VERSION or int(payload.get("seq", -1)) != seq:
+                    raise ValueError("unexpected snapshot header")
+            except (OSError, EOFError, ValueError) as exc:
+                logger.warning("[STATE_JOURNAL] skipping unreadable snapshot %s: %s", path, exc)
+                continue
+            state, base_seq = payload["state"], seq
+            self._snapshot_bytes = os.path.getsize(path)
+            break
+
+        records = list(self._read_records(base_seq))
+        self._seq = records[-1]["seq"] if records else max(base_seq, 0)
+        return state, records
+
+    def _read_records(self, after_seq: int) -> Iterator[Dict[str, Any]]:
+        last = after_seq
+        for _, path in self._files(_SEGMENT_RE):
+            with open(path, "rb") as f:
+                for line in f:
+                    rec = _decode(line)
+                    if rec is None:
+                        logger.warning("[STATE_JOURNAL] torn/corrupt record after seq %d in %s; stopping replay", last, path)
+                        return
+                    seq = int(rec.get("seq", -1))
+                    if seq <= last:
+                        continue
+                    if last >= 0 and seq != last + 1:
+                        logger.warning("[STATE_JOURNAL] gap after seq %d (next %d); stopping replay", last, seq)
+                        return
+                    last = seq
+                    yield rec
+
+    # ---- writing ----
+    def start(self, snapshot: Dict[str, Any]) -> None:
+        """Begin journaling on top of `snapshot` (the state after recovery/startup)."""
+        os.makedirs(self.directory, exist_ok=True)
+        for tmp in glob.glob(os.path.join(self.directory, "*.tmp")):
+            os.remove(tmp)  # snapshot interrupted by a crash
+        self.rebase(snapshot)
+
+    def rebase(self, snapshot: Dict[str, Any]) -> None:
+        """Open a fresh segment at the current seq and write `snapshot` (read-only copy) behind it."""
+        seq = self._seq
+        self._close_segment()
+        self._segment = open(self._segment_path(seq), "ab")
+        self._segment_bytes = 0
+        self._pending = self._writer.submit(self._write_snapshot, seq, snapshot)
+
+    def _write_snapshot(self, seq: int, snapshot: Dict[str, Any]) -> None:
+        t0 = time.perf_counter()
+        path = self._snapshot_path(seq)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=3) as gz, io.TextIOWrapper(gz, encoding="utf-8") as f:
+                    json.dump({"version": JOURNAL_VERSION, "seq": seq, "state": snapshot}, f, ensure_ascii=False, separators=(",", ":"))
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp, path)
+            _fsync_dir(self.directory)
+        except Exception:
+            logger.exception("[STATE_JOURNAL] snapshot at seq %d failed; keeping older snapshot + journal", seq)
+            return
+        self._snapshot_bytes = os.path.getsize(path)
+        for old_seq, old in self._files(_SNAPSHOT_RE) + self._files(_SEGMENT_RE):
+            if old_seq < seq:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+        self._stats["snapshots"] += 1
+        self._stats["snapshot_sec"] += time.perf_counter() - t0
+        self._stats["last_snapshot_seq"] = seq
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._segment is None:
+            raise RuntimeError("state journal is not started")
+        self._seq += 1
+        record["seq"] = self._seq
+        data = _encode(record)
+        self._segment.write(data)
+        self._segment.flush()
+        now = time.monotonic()
+        if self.fsync == FSYNC_ALWAYS or (
+            self.fsync == FSYNC_INTERVAL and now - self._last_fsync >= self.fsync_interval_sec
+        ):
+            os.fsync(self._segment.fileno())
+            self._last_fsync = now
+            self._stats["fsyncs"] += 1
+        self._segment_bytes += len(data)
+        self._stats["records"] += 1
+        self._stats["bytes"] += len(data)
+
+    def append_op(self, op: str, args: Dict[str, Any]) -> None:
+        self._append({"op": op, "args": args})
+        self._stats["op_records"] += 1
+
+    def append_set(self, values: Dict[str, Any], deleted: List[str]) -> None:
+        self._append({"set": values, "del": deleted})
+        self._stats["set_records"] += 1
+
+    def needs_compaction(self) -> bool:
+        if self._pending is not None and not self._pending.done():
+            return False
+        return self._segment_bytes >= max(self.compact_min_bytes, self.compact_ratio * self._snapshot_bytes)
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.flush()
+            if self.fsync != FSYNC_OFF:
+                os.fsync(self._segment.fileno())
+            self._segment.close()
+            self._segment = None
+
+    def close(self) -> None:
+        self._close_segment()
+        self._writer.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        out = dict(self._stats)
+        out.update(
+            directory=self.directory,
+            fsync=self.fsync,
+            seq=self._seq,
+            segment_bytes=self._segment_bytes,
+            snapshot_bytes=self._snapshot_bytes,
+            snapshot_pending=self._pending is not None and not self._pending.done(),
+            snapshot_sec=round(out["snapshot_sec"], 4),
+        )
+        return out
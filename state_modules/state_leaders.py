@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+"""
+state_leaders.py
+
+리그 리더 인덱스 (정규시즌/플레이오프 등 phase별).
+
+- 카테고리: player_stats totals의 모든 수치 스탯 x 모드(per_game / totals / per36) + 슈팅 퍼센티지
+  (FG_PCT, 3P_PCT, FT_PCT, TS_PCT).
+- 카테고리(board)마다 선수를 경기 수별 버킷에 (-값, player_id) 순으로 정렬해 둔다. 처음 조회될 때 한 번
+  만들고, 이후에는 ingest가 남긴 변경 선수 로그(phase별 append-only)만 반영한다 (bisect 삭제/삽입).
+  그래서 카테고리가 늘어도 ingest 비용은 그대로다.
+- 최소 경기 수 조건은 버킷 선택으로 처리한다(기준 이상 버킷만 병합): per_game 조회는
+  O(변경 선수 + G + k log G), G = 서로 다른 경기 수 개수(시즌 길이 이하).
+  최소 경기 = ceil(비율 * 해당 phase 팀 최다 경기 수).
+- per36의 분당 최소 출전 시간, 퍼센티지의 최소 성공 수는 병합 결과를 훑으며 적용한다. 이 두 조건에 걸리는
+  상위 선수가 많으면 그만큼(최악 O(n)) 더 훑는다.
+- 인덱스는 프로세스 메모리에만 있다 (state/snapshot/journal에 들어가지 않음). (시즌, turn, player_stats
+  dict id)가 어긋나면(시즌 전환, 복원, replay 등) 다음 조회 때 다시 만든다.
+"""
+
+import heapq
+import math
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .state_utils import _index_sync_key, _phase_containers
+
+MODE_PER_GAME = "per_game"
+MODE_TOTALS = "totals"
+MODE_PER36 = "per36"
+MODES = (MODE_PER_GAME, MODE_TOTALS, MODE_PER36)
+# row key carrying the board value (next to the stat key itself)
+_VALUE_KEYS = {MODE_PER_GAME: "per_game", MODE_TOTALS: "total", MODE_PER36: "per36"}
+
+# pct category -> (made key, attempts key or None for TS%, qualifier key, qualifier per team game)
+# (NBA thresholds over 82 games: 300 FGM, 82 3PM, 125 FTM)
+PCT_CATEGORIES: Dict[str, Tuple[str, Optional[str], str, float]] = {
+    "FG_PCT": ("FGM", "FGA", "FGM", 300 / 82),
+    "3P_PCT": ("3PM", "3PA", "3PM", 82 / 82),
+    "FT_PCT": ("FTM", "FTA", "FTM", 125 / 82),
+    "TS_PCT": ("PTS", None, "FGM", 300 / 82),
+}
+
+# share of the phase's most team games a player needs for per-game/per-36 boards
+QUALIFY_GAMES_RATIO: Dict[str, float] = {"regular": 0.7}
+# per-36 boards additionally need this many minutes per game
+PER36_MIN_MINUTES_PER_GAME = 12.0
+
+_NON_CATEGORY_KEYS = {"MIN"}
+_LOG_COMPACT_AT = 4096
+
+
+def _num(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _value(entry: Mapping[str, Any], stat: str, mode: str) -> Optional[float]:
+    """Board value for one player_stats entry; None = not ranked on this board."""
+    games = int(entry.get("games", 0) or 0)
+    if games <= 0:
+        return None
+    totals = entry.get("totals") or {}
+    if stat in PCT_CATEGORIES:
+        made_key, att_key, _, _ = PCT_CATEGORIES[stat]
+        if att_key is None:
+            # True shooting: PTS / (2 * (FGA + 0.44 * FTA))
+            denom = 2.0 * (_num(totals.get("FGA")) + 0.44 * _num(totals.get("FTA")))
+            return _num(totals.get("PTS")) / denom if denom > 0 else None
+        att = _num(totals.get(att_key))
+        return _num(totals.get(made_key)) / att if att > 0 else None
+    if stat not in totals:
+        return None
+    total = _num(totals.get(stat))
+    if mode == MODE_TOTALS:
+        return total
+    if mode == MODE_PER36:
+        minutes = _num(totals.get("MIN"))
+        return total * 36.0 / minutes if minutes > 0 else None
+    return total / games
+
+
+class _Board:
+    """One (stat, mode) board: (-value, player_id) lists bucketed by games played.
+
+    Bucketing by games puts the min-games qualifier into the structure: a query merges only
+    the buckets at or above the threshold, so per-game top-k is O(G + k log G) for G distinct
+    games counts (<= season length), however many players the threshold filters out.
+    """
+
+    __slots__ = ("stat", "mode", "buckets", "keys", "cursor")
+
+    def __init__(self, stat: str, mode: str, cursor: int) -> None:
+        self.stat = stat
+        self.mode = mode
+        self.buckets: Dict[int, List[Tuple[float, str]]] = {}
+        self.keys: Dict[str, Tuple[int, Tuple[float, str]]] = {}
+        self.cursor = cursor
+
+    def build(self, player_stats: Mapping[str, Any]) -> None:
+        self.keys = {}
+        self.buckets = {}
+        for pid, entry in player_stats.items():
+            value = _value(entry, self.stat, self.mode)
+            if value is not None:
+                games = int(entry.get("games", 0) or 0)
+                key = (-value, str(pid))
+                self.keys[str(pid)] = (games, key)
+                self.buckets.setdefault(games, []).append(key)
+        for bucket in self.buckets.values():
+            bucket.sort()
+
+    def update(self, pid: str, entry: Optional[Mapping[str, Any]]) -> None:
+        old = self.keys.pop(pid, None)
+        if old is not None:
+            bucket = self.buckets[old[0]]
+            del bucket[bisect_left(bucket, old[1])]
+            if not bucket:
+                del self.buckets[old[0]]
+        value = _value(entry, self.stat, self.mode) if entry is not None else None
+        if value is not None:
+            games = int(entry.get("games", 0) or 0)
+            key = (-value, pid)
+            self.keys[pid] = (games, key)
+            insort(self.buckets.setdefault(games, []), key)
+
+    def iter_from(self, min_games: int) -> Iterator[Tuple[float, str]]:
+        """Entries with games >= min_games, best first."""
+        return heapq.merge(*(b for g, b in self.buckets.items() if g >= min_games))
+
+
+class _PhaseIndex:
+    def __init__(self) -> None:
+        self.boards: Dict[Tuple[str, str], _Board] = {}
+        self.log: List[str] = []  # player ids changed by ingest, in order
+        self.log_base = 0  # absolute position of log[0]
+
+    def catch_up(self, board: _Board, player_stats: Mapping[str, Any]) -> None:
+        end = self.log_base + len(self.log)
+        if board.cursor < end:
+            for pid in set(self.log[board.cursor - self.log_base :]):
+                board.update(pid, player_stats.get(pid))
+            board.cursor = end
+        if len(self.log) > _LOG_COMPACT_AT and self.boards:
+            low = min(b.cursor for b in self.boards.values())
+            if low > self.log_base:
+                del self.log[: low - self.log_base]
+                self.log_base = low
+
+
+class LeaderIndex:
+    def __init__(self, sync_key: tuple) -> None:
+        self.sync_key = sync_key
+        self.phases: Dict[str, _PhaseIndex] = {}
+
+
+_INDEX: Optional[LeaderIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def note_ingest(state: Mapping[str, Any], changed: Mapping[str, Iterable[str]], turn_before: int, turn_after: int) -> None:
+    """Record player ids whose stats an ingest changed (called inside the ingest transaction).
+
+    Only an index that was in sync before the ingest is advanced; any other is dropped and
+    rebuilt on the next query.
+    """
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            return
+        if _INDEX.sync_key != _index_sync_key(state, turn_before):
+            _INDEX = None
+            return
+        for phase, pids in changed.items():
+            ph = _INDEX.phases.get(phase)
+            if ph is not None:
+                ph.log.extend(str(p) for p in pids)
+        _INDEX.sync_key = _index_sync_key(state, turn_after)
+
+
+def _qualifier_games(container: Mapping[str, Any], phase: str, min_games: Optional[int]) -> Tuple[int, int]:
+    """(min games for per-game boards, most games any team played in this phase)."""
+    team_games = 0
+    for entry in (container.get("team_stats") or {}).values():
+        team_games = max(team_games, int(entry.get("games", 0) or 0))
+    if min_games is None:
+        min_games = math.ceil(QUALIFY_GAMES_RATIO.get(phase, 0.0) * team_games)
+    return max(int(min_games), 1), team_games
+
+
+def _qualifies(entry: Mapping[str, Any], stat: str, mode: str, min_games: int, team_games: int) -> bool:
+    games = int(entry.get("games", 0) or 0)
+    if stat in PCT_CATEGORIES:
+        _, _, qual_key, per_team_game = PCT_CATEGORIES[stat]
+        return games >= 1 and _num((entry.get("totals") or {}).get(qual_key)) >= per_team_game * team_games
+    if mode == MODE_TOTALS:
+        return games >= 1
+    if games < min_games:
+        return False
+    if mode == MODE_PER36:
+        return _num((entry.get("totals") or {}).get("MIN")) >= PER36_MIN_MINUTES_PER_GAME * games
+    return True
+
+
+def leaders(
+    state: Mapping[str, Any],
+    *,
+    phase: str = "regular",
+    stats: Iterable[str],
+    mode: str = MODE_PER_GAME,
+    limit: int = 5,
+    min_games: Optional[int] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Top `limit` qualified players per stat (see module docstring for boards/qualifiers).
+
+    Per-game boards: O(changed players + G + k log G). Per-36 and pct boards additionally skip
+    the top entries that miss the minutes / made-shots qualifier (worst case O(n)).
+    """
+    global _INDEX
+    if mode not in MODES:
+        raise ValueError(f"invalid leaders mode: {mode!r} (expected one of {MODES})")
+    container = _phase_containers(state).get(phase)
+    if container is None:
+        raise ValueError(f"invalid phase: {phase!r}")
+    player_stats = container["player_stats"]
+    min_g, team_games = _qualifier_games(container, phase, min_games)
+
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    with _INDEX_LOCK:
+        key = _index_sync_key(state, int(state.get("turn", 0) or 0))
+        if _INDEX is None or _INDEX.sync_key != key:
+            _INDEX = LeaderIndex(key)
+        ph = _INDEX.phases.get(phase)
+        if ph is None:
+            ph = _INDEX.phases[phase] = _PhaseIndex()
+        for stat in stats:
+            board_mode = MODE_PER_GAME if stat in PCT_CATEGORIES else mode
+            value_key = "pct" if stat in PCT_CATEGORIES else _VALUE_KEYS[board_mode]
+            board = ph.boards.get((stat, board_mode))
+            if board is None:
+                board = ph.boards[(stat, board_mode)] = _Board(stat, board_mode, ph.log_base + len(ph.log))
+                board.build(player_stats)
+            else:
+                ph.catch_up(board, player_stats)
+
+            # per-game / per-36 boards start at the min-games bucket; totals and pct at 1 game
+            start = min_g if board_mode != MODE_TOTALS and stat not in PCT_CATEGORIES else 1
+            rows: List[Dict[str, Any]] = []
+            for neg_value, pid in board.iter_from(start):
+                if len(rows) >= limit:
+                    break
+                entry = player_stats.get(pid)
+                if entry is None or not _qualifies(entry, stat, board_mode, min_g, team_games):
+                    continue
+                games = int(entry.get("games", 0) or 0)
+                value = -neg_value
+                rows.append(
+                    {
+                        "player_id": entry.get("player_id"),
+                        "name": entry.get("name"),
+                        "team_id": entry.get("team_id"),
+                        "games": games,
+                        "GP": games,
+                        value_key: value,
+                        stat: value,
+                    }
+                )
+            out[stat] = rows
+    return out
+
+
+def categories(state: Mapping[str, Any], phase: str = "regular") -> List[str]:
+    """Stats that have boards in `phase`: every numeric totals key seen, plus the pct categories."""
+    container = _phase_containers(state).get(phase)
+    if container is None:
+        raise ValueError(f"invalid phase: {phase!r}")
+    seen: set = set()
+    for entry in (container.get("player_stats") or {}).values():
+        seen.update((entry.get("totals") or {}).keys())
+    return sorted(seen - _NON_CATEGORY_KEYS) + list(PCT_CATEGORIES)
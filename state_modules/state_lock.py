@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+"""
+state_lock.py
+
+전역 상태용 reader-writer lock.
+
+- 읽기(read_state / snapshot / copy_paths)는 서로 동시에 진행되고, 쓰기(transaction)만 배타적이다.
+- 쓰기 대기자가 있으면 새 읽기는 기다린다 (writer preference: 시뮬 ingest가 굶지 않도록).
+- 재진입 허용: 쓰기 중인 스레드는 읽기/쓰기를 다시 잡을 수 있고, 읽기 중인 스레드는 읽기를 다시 잡을 수 있다.
+- 읽기 -> 쓰기 승격은 다른 읽기가 모두 빠질 때까지 기다린다. 두 스레드가 동시에 승격하면 교착이므로
+  두 번째 승격은 RuntimeError.
+- 대기 시간/횟수 통계를 stats()로 노출한다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class RWLock:
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._tls = threading.local()
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+        self._upgrader: Optional[int] = None
+        self._own_reads_at_write = 0
+        self._stats: Dict[str, float] = {
+            "read_acquires": 0,
+            "read_waits": 0,
+            "read_wait_sec": 0.0,
+            "read_wait_max_sec": 0.0,
+            "write_acquires": 0,
+            "write_waits": 0,
+            "write_wait_sec": 0.0,
+            "write_wait_max_sec": 0.0,
+            "write_hold_sec": 0.0,
+            "write_hold_max_sec": 0.0,
+            "max_concurrent_readers": 0,
+        }
+        self._write_started = 0.0
+
+    def _read_depth(self) -> int:
+        return getattr(self._tls, "read_depth", 0)
+
+    def _record_wait(self, kind: str, waited: float) -> None:
+        st = self._stats
+        st[f"{kind}_waits"] += 1
+        st[f"{kind}_wait_sec"] += waited
+        if waited > st[f"{kind}_wait_max_sec"]:
+            st[f"{kind}_wait_max_sec"] = waited
+
+    # ---- read ----
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or self._read_depth() > 0:
+                # Re-entrant: never block behind a waiting writer while already holding the lock.
+                pass
+            elif self._writer is not None or self._writers_waiting:
+                t0 = time.perf_counter()
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._record_wait("read", time.perf_counter() - t0)
+            if self._writer != me:
+                self._readers += 1
+                if self._readers > self._stats["max_concurrent_readers"]:
+                    self._stats["max_concurrent_readers"] = self._readers
+            self._stats["read_acquires"] += 1
+        self._tls.read_depth = self._read_depth() + 1
+
+    def release_read(self) -> None:
+        me = threading.get_ident()
+        self._tls.read_depth = self._read_depth() - 1
+        with self._cond:
+            if self._writer != me:
+                self._readers -= 1
+                if self._readers == 0 or self._writers_waiting:
+                    self._cond.notify_all()
+
+    # ---- write ----
+    def acquire_write(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                self._stats["write_acquires"] += 1
+                return
+            own_reads = self._read_depth()
+            if own_reads:
+                if self._upgrader is not None:
+                    raise RuntimeError("state lock: concurrent read->write upgrade would deadlock")
+                self._upgrader = me
+            self._writers_waiting += 1
+            t0 = time.perf_counter()
+            waited = False
+            try:
+                # Our own read holds (upgrade) stay counted in _readers until the write is granted.
+                while self._writer is not None or self._readers > own_reads:
+                    waited = True
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+                if own_reads:
+                    self._upgrader = None
+            if waited:
+                self._record_wait("write", time.perf_counter() - t0)
+            self._readers -= own_reads
+            self._writer = me
+            self._writer_depth = 1
+            self._own_reads_at_write = own_reads
+            self._stats["write_acquires"] += 1
+            self._write_started = time.perf_counter()
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._writer_depth -= 1
+            if self._writer_depth > 0:
+                return
+            held = time.perf_counter() - self._write_started
+            self._stats["write_hold_sec"] += held
+            if held > self._stats["write_hold_max_sec"]:
+                self._stats["write_hold_max_sec"] = held
+            # An upgraded writer goes back to being a reader.
+            self._readers += self._own_reads_at_write
+            self._writer = None
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out: Dict[str, Any] = dict(self._stats)
+            out["active_readers"] = self._readers
+            out["writer_active"] = self._writer is not None
+            out["writers_waiting"] = self._writers_waiting
+        for k in ("read_wait_sec", "read_wait_max_sec", "write_wait_sec", "write_wait_max_sec", "write_hold_sec", "write_hold_max_sec"):
+            out[k] = round(out[k], 6)
+        return out
+
+    def reset_stats(self) -> None:
+        with self._cond:
+            for k in self._stats:
+                self._stats[k] = 0.0 if isinstance(self._stats[k], float) else 0
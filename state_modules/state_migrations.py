@@ -158,3 +158,28 @@ def _ensure_ingest_turn_backfilled(state: dict) -> None:
 def ensure_ingest_turn_backfilled_once_startup(state: dict) -> None:
     """Run ingest_turn backfill once per state instance (startup-only)."""
     _ensure_ingest_turn_backfilled(state)
+
+
+def externalize_inline_game_results(state: dict, store: Any) -> int:
+    """Move full GameResultV2 dicts still held in game_results (older saves/checkpoints) into the
+    result store, leaving refs behind. Returns the number of results moved."""
+    from .state_result_store import is_result_ref
+
+    containers: List[Dict[str, Any]] = [state["game_results"]]
+    for phase in ("preseason", "play_in", "playoffs"):
+        containers.append(state["phase_results"][phase]["game_results"])
+    for record in state["season_history"].values():
+        containers.append(record["regular"].get("game_results") or {})
+        for phase in ("preseason", "play_in", "playoffs"):
+            containers.append(record["phase_results"][phase].get("game_results") or {})
+
+    moved = 0
+    for results in containers:
+        inline = [gid for gid, value in results.items() if not is_result_ref(value)]
+        if not inline:
+            continue
+        refs = store.put_many([results[gid] for gid in inline])
+        for gid, ref in zip(inline, refs):
+            results[gid] = ref
+        moved += len(inline)
+    return moved
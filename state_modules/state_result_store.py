@@ -0,0 +1,479 @@
+from __future__ import annotations
+
+"""
+state_result_store.py
+
+경기별 box score(GameResultV2) 저장소.
+
+- 상태(state)의 game_results에는 작은 참조(result_ref)만 남기고, 원본 결과는 별도 SQLite 파일
+  (STATE_RESULT_STORE_PATH, 기본 '<db file>.results.sqlite')에 zlib 압축 JSON blob으로 저장한다.
+- 최근에 읽거나 쓴 결과는 LRU 캐시(STATE_RESULT_CACHE_SIZE, 기본 256경기)에 보관한다.
+- 저장된 결과는 불변: 같은 game_id를 다시 쓰면(journal replay 등) 그대로 덮어쓴다.
+- 같은 커밋에서 game log 인덱스도 쓴다: player_game_log(선수별 경기 행: 날짜/팀/상대/홈 여부/compact 스탯 JSON),
+  team_game_log(팀별 경기: 득점/실점). 지난 시즌(season_history) 경기도 이 파일에 남아 있으므로 커리어 조회가
+  box score를 풀지 않고 인덱스 범위 조회로 끝난다. 인덱스가 없던 예전 파일은 열 때 한 번 채운다(user_version).
+  state가 체크포인트 복원/dev 리셋으로 되돌아가면 state에 없는 경기의 game log 행을 지운다(prune_game_logs).
+- 캐시/DB에서 돌려주는 dict는 공유 객체이므로 호출자가 수정하면 안 된다 (state.get_game_result가 복사).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .state_constants import _META_PLAYER_KEYS
+from .state_utils import _is_number
+
+RESULT_REF_KIND = "result_store"
+
+# PRAGMA user_version: 1 = game log tables populated
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS game_results (
+    game_id TEXT PRIMARY KEY,
+    season_id TEXT,
+    phase TEXT,
+    game_date TEXT,
+    raw_bytes INTEGER NOT NULL,
+    blob BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_game_log (
+    player_id TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    season_id TEXT,
+    phase TEXT,
+    game_date TEXT,
+    team_id TEXT,
+    opponent_id TEXT,
+    is_home INTEGER NOT NULL,
+    stats TEXT NOT NULL,
+    PRIMARY KEY (player_id, game_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS player_game_log_by_date ON player_game_log (player_id, game_date, game_id);
+CREATE INDEX IF NOT EXISTS player_game_log_by_game ON player_game_log (game_id);
+CREATE TABLE IF NOT EXISTS team_game_log (
+    team_id TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    season_id TEXT,
+    phase TEXT,
+    game_date TEXT,
+    opponent_id TEXT,
+    is_home INTEGER NOT NULL,
+    points INTEGER,
+    opponent_points INTEGER,
+    PRIMARY KEY (team_id, game_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS team_game_log_by_date ON team_game_log (team_id, game_date, game_id);
+CREATE INDEX IF NOT EXISTS team_game_log_by_game ON team_game_log (game_id);
+"""
+
+_LOG_PAGE_MAX = 500
+
+
+def is_result_ref(value: Any) -> bool:
+    return isinstance(value, dict) and value.get("ref") == RESULT_REF_KIND
+
+
+def make_result_ref(game_result: Dict[str, Any], raw_bytes: int, stored_bytes: int) -> Dict[str, Any]:
+    game = game_result.get("game") or {}
+    return {
+        "ref": RESULT_REF_KIND,
+        "season_id": game.get("season_id"),
+        "phase": game.get("phase"),
+        "raw_bytes": int(raw_bytes),
+        "stored_bytes": int(stored_bytes),
+    }
+
+
+def _game_log_rows(
+    game_result: Dict[str, Any],
+    game_date: Optional[str],
+    out: Tuple[List[tuple], List[tuple]],
+) -> None:
+    """Append one game's (player rows, team rows) for the game log tables to out."""
+    game = game_result["game"]
+    gid = str(game["game_id"])
+    season_id, phase = game.get("season_id"), game.get("phase")
+    home_id, away_id = str(game["home_team_id"]), str(game["away_team_id"])
+    final = game_result.get("final") or {}
+    for tid, opp_id, is_home in ((home_id, away_id, 1), (away_id, home_id, 0)):
+        team_game = (game_result.get("teams") or {}).get(tid) or {}
+        pts, opp_pts = final.get(tid), final.get(opp_id)
+        out[1].append((tid, gid, season_id, phase, game_date, opp_id, is_home, pts, opp_pts))
+        for row in team_game.get("players") or []:
+            if not isinstance(row, dict) or row.get("PlayerID") is None:
+                continue
+            stats = {k: v for k, v in row.items() if k not in _META_PLAYER_KEYS and _is_number(v)}
+            out[0].append(
+                (
+                    str(row["PlayerID"]),
+                    gid,
+                    season_id,
+                    phase,
+                    game_date,
+                    str(row.get("TeamID") or tid),
+                    opp_id,
+                    is_home,
+                    json.dumps(stats, separators=(",", ":")),
+                )
+            )
+
+
+class PreparedResults:
+    """Encoded results + game log rows from GameResultStore.prepare_many, not yet written."""
+
+    __slots__ = ("rows", "refs", "encoded", "log_rows")
+
+    def __init__(self) -> None:
+        self.rows: List[tuple] = []
+        self.refs: List[Dict[str, Any]] = []
+        self.encoded: List[Tuple[str, Dict[str, Any]]] = []
+        self.log_rows: Tuple[List[tuple], List[tuple]] = ([], [])
+
+
+class GameResultStore:
+    """SQLite-backed, zlib-compressed GameResultV2 store with an LRU cache (thread-safe)."""
+
+    def __init__(self, path: str, *, cache_size: int = 256, compress_level: int = 6) -> None:
+        self.path = path
+        self.cache_size = max(0, int(cache_size))
+        self.compress_level = int(compress_level)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute("PRAGMA synchronous = NORMAL;")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._stats = {"puts": 0, "gets": 0, "cache_hits": 0, "raw_bytes": 0, "stored_bytes": 0}
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            self._backfill_game_logs()
+
+    # ---- cache ----
+    def _cache_put(self, game_id: str, result: Dict[str, Any]) -> None:
+        if not self.cache_size:
+            return
+        self._cache[game_id] = result
+        self._cache.move_to_end(game_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ---- write ----
+    def _encode(self, game_result: Dict[str, Any]) -> Tuple[bytes, int]:
+        raw = json.dumps(game_result, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(raw, self.compress_level), len(raw)
+
+    def prepare_many(self, game_results: Iterable[Dict[str, Any]], *, game_date: Optional[str] = None) -> "PreparedResults":
+        """Encode results and build their game log rows without touching the database.
+
+        The expensive part of a put (JSON + zlib) can run before the caller's checks and locks;
+        commit_prepared() then writes the rows. game_date (optional) overrides game.date for every
+        result, as in state.ingest_game_results.
+        """
+        prepared = PreparedResults()
+        for result in game_results:
+            blob, raw_bytes = self._encode(result)
+            game = result["game"]
+            gid = str(game["game_id"])
+            gdate = str(game_date) if game_date else game.get("date")
+            prepared.rows.append((gid, game.get("season_id"), game.get("phase"), gdate, raw_bytes, blob))
+            prepared.refs.append(make_result_ref(result, raw_bytes, len(blob)))
+            prepared.encoded.append((gid, result))
+            _game_log_rows(result, gdate, prepared.log_rows)
+        return prepared
+
+    def commit_prepared(self, prepared: "PreparedResults") -> None:
+        """Write prepared results and their game log rows (one SQLite commit)."""
+        rows = prepared.rows
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO game_results (game_id, season_id, phase, game_date, raw_bytes, blob) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._write_game_logs([r[0] for r in rows], prepared.log_rows)
+            for gid, result in prepared.encoded:
+                self._cache_put(gid, result)
+            self._stats["puts"] += len(rows)
+            self._stats["raw_bytes"] += sum(r[4] for r in rows)
+            self._stats["stored_bytes"] += sum(len(r[5]) for r in rows)
+
+    def write_game_logs(self, game_results: Iterable[Dict[str, Any]], *, game_date: Optional[str] = None) -> None:
+        """(Re)write only the game log rows of results already stored (journal replay after a prune)."""
+        log_rows: Tuple[List[tuple], List[tuple]] = ([], [])
+        game_ids = []
+        for result in game_results:
+            game = result["game"]
+            game_ids.append(str(game["game_id"]))
+            _game_log_rows(result, str(game_date) if game_date else game.get("date"), log_rows)
+        with self._lock:
+            with self._conn:
+                self._write_game_logs(game_ids, log_rows)
+
+    def put_many(self, game_results: Iterable[Dict[str, Any]], *, game_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Store results and their game log rows (one SQLite commit); return their state refs, in order."""
+        prepared = self.prepare_many(game_results, game_date=game_date)
+        self.commit_prepared(prepared)
+        return prepared.refs
+
+    def put(self, game_result: Dict[str, Any]) -> Dict[str, Any]:
+        return self.put_many([game_result])[0]
+
+    # ---- read ----
+    def get_many(self, game_ids: Iterable[str], *, cache: bool = True) -> Dict[str, Dict[str, Any]]:
+        """{game_id: result} for the ids found (cache first, then one SQLite query).
+
+        cache=False leaves rows read from SQLite out of the LRU (bulk scans such as index rebuilds).
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            missing = []
+            for gid in dict.fromkeys(str(g) for g in game_ids):
+                self._stats["gets"] += 1
+                hit = self._cache.get(gid)
+                if hit is not None:
+                    self._cache.move_to_end(gid)
+                    self._stats["cache_hits"] += 1
+                    out[gid] = hit
+                else:
+                    missing.append(gid)
+            for i in range(0, len(missing), 500):
+                chunk = missing[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                for gid, blob in self._conn.execute(
+                    f"SELECT game_id, blob FROM game_results WHERE game_id IN ({marks})", chunk
+                ):
+                    result = json.loads(zlib.decompress(blob))
+                    if cache:
+                        self._cache_put(gid, result)
+                    out[gid] = result
+        return out
+
+    def get(self, game_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_many([game_id]).get(str(game_id))
+
+    # ---- game logs ----
+    def _write_game_logs(self, game_ids: List[str], log_rows: Tuple[List[tuple], List[tuple]]) -> None:
+        # A re-put game (journal replay, re-simmed dev game) replaces all of its rows.
+        ids = [(gid,) for gid in game_ids]
+        self._conn.executemany("DELETE FROM player_game_log WHERE game_id = ?", ids)
+        self._conn.executemany("DELETE FROM team_game_log WHERE game_id = ?", ids)
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO player_game_log "
+            "(player_id, game_id, season_id, phase, game_date, team_id, opponent_id, is_home, stats) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            log_rows[0],
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO team_game_log "
+            "(team_id, game_id, season_id, phase, game_date, opponent_id, is_home, points, opponent_points) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            log_rows[1],
+        )
+
+    def _backfill_game_logs(self) -> None:
+        """Build the game log tables from stored box scores (files written before they existed)."""
+        with self._lock:
+            last = ""
+            while True:
+                chunk = self._conn.execute(
+                    "SELECT game_id, game_date, blob FROM game_results WHERE game_id > ? ORDER BY game_id LIMIT 500",
+                    (last,),
+                ).fetchall()
+                if not chunk:
+                    break
+                last = chunk[-1][0]
+                log_rows: Tuple[List[tuple], List[tuple]] = ([], [])
+                for _, gdate, blob in chunk:
+                    _game_log_rows(json.loads(zlib.decompress(blob)), gdate, log_rows)
+                with self._conn:
+                    self._write_game_logs([r[0] for r in chunk], log_rows)
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.commit()
+
+    def prune_game_logs(self, keep_game_ids: Iterable[str]) -> int:
+        """Drop game log rows of every game not in keep_game_ids; returns the number of games dropped.
+
+        For a state that was restored or reset past games this file still logs. Box score blobs
+        stay: they are only reached through state refs, and a re-ingest overwrites them.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_game_ids (game_id TEXT PRIMARY KEY)")
+                self._conn.execute("DELETE FROM temp.keep_game_ids")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO temp.keep_game_ids (game_id) VALUES (?)",
+                    ((str(gid),) for gid in keep_game_ids),
+                )
+                stale = [
+                    (gid,)
+                    for (gid,) in self._conn.execute(
+                        "SELECT game_id FROM team_game_log UNION SELECT game_id FROM player_game_log "
+                        "EXCEPT SELECT game_id FROM temp.keep_game_ids"
+                    )
+                ]
+                self._conn.executemany("DELETE FROM player_game_log WHERE game_id = ?", stale)
+                self._conn.executemany("DELETE FROM team_game_log WHERE game_id = ?", stale)
+                self._conn.execute("DELETE FROM temp.keep_game_ids")
+        return len(stale)
+
+    def _log_page(
+        self,
+        table: str,
+        key_col: str,
+        key: str,
+        columns: str,
+        *,
+        season_id: Optional[str],
+        phase: Optional[str],
+        offset: int,
+        limit: int,
+        newest_first: bool,
+    ) -> Tuple[int, List[tuple]]:
+        where = [f"{key_col} = ?"]
+        args: List[Any] = [key]
+        if season_id is not None:
+            where.append("season_id = ?")
+            args.append(season_id)
+        if phase is not None:
+            where.append("phase = ?")
+            args.append(phase)
+        cond = " AND ".join(where)
+        order = "DESC" if newest_first else "ASC"
+        limit = max(0, min(int(limit), _LOG_PAGE_MAX))
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {cond}", args).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM {table} WHERE {cond} "
+                f"ORDER BY game_date {order}, game_id {order} LIMIT ? OFFSET ?",
+                args + [limit, max(0, int(offset))],
+            ).fetchall()
+        return int(total), rows
+
+    def player_game_log(
+        self,
+        player_id: str,
+        *,
+        season_id: Optional[str] = None,
+        phase: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+        newest_first: bool = True,
+    ) -> Dict[str, Any]:
+        """One page of a player's games (all stored seasons unless season_id), ordered by date."""
+        total, rows = self._log_page(
+            "player_game_log",
+            "player_id",
+            str(player_id),
+            "game_id, season_id, phase, game_date, team_id, opponent_id, is_home, stats",
+            season_id=season_id,
+            phase=phase,
+            offset=offset,
+            limit=limit,
+            newest_first=newest_first,
+        )
+        return {
+            "total": total,
+            "rows": [
+                {
+                    "game_id": gid,
+                    "season_id": sid,
+                    "phase": ph,
+                    "date": gdate,
+                    "team_id": tid,
+                    "opponent_id": opp,
+                    "is_home": bool(home),
+                    "stats": json.loads(stats),
+                }
+                for gid, sid, ph, gdate, tid, opp, home, stats in rows
+            ],
+        }
+
+    def team_game_log(
+        self,
+        team_id: str,
+        *,
+        season_id: Optional[str] = None,
+        phase: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+        newest_first: bool = True,
+    ) -> Dict[str, Any]:
+        """One page of a team's games (all stored seasons unless season_id), ordered by date."""
+        total, rows = self._log_page(
+            "team_game_log",
+            "team_id",
+            str(team_id),
+            "game_id, season_id, phase, game_date, opponent_id, is_home, points, opponent_points",
+            season_id=season_id,
+            phase=phase,
+            offset=offset,
+            limit=limit,
+            newest_first=newest_first,
+        )
+        return {
+            "total": total,
+            "rows": [
+                {
+                    "game_id": gid,
+                    "season_id": sid,
+                    "phase": ph,
+                    "date": gdate,
+                    "opponent_id": opp,
+                    "is_home": bool(home),
+                    "points": pts,
+                    "opponent_points": opp_pts,
+                }
+                for gid, sid, ph, gdate, opp, home, pts, opp_pts in rows
+            ],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = dict(self._stats)
+            out["cached"] = len(self._cache)
+            out["stored_games"] = self._conn.execute("SELECT COUNT(*) FROM game_results").fetchone()[0]
+            out["player_log_rows"] = self._conn.execute("SELECT COUNT(*) FROM player_game_log").fetchone()[0]
+        out["path"] = self.path
+        out["cache_size"] = self.cache_size
+        out["compression_ratio"] = round(out["raw_bytes"] / out["stored_bytes"], 2) if out["stored_bytes"] else None
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_STORES: Dict[str, GameResultStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def result_store_path(db_path: str) -> str:
+    """STATE_RESULT_STORE_PATH if set, else '<db file>.results.sqlite' next to the league DB."""
+    return os.environ.get("STATE_RESULT_STORE_PATH") or f"{db_path}.results.sqlite"
+
+
+def get_result_store(db_path: str) -> GameResultStore:
+    """Process-wide store for the league DB at db_path (opened on first use)."""
+    path = result_store_path(db_path)
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            try:
+                cache_size = int(os.environ.get("STATE_RESULT_CACHE_SIZE", "256"))
+            except ValueError:
+                cache_size = 256
+            store = _STORES[path] = GameResultStore(path, cache_size=cache_size)
+        return store
+
+
+def close_result_stores() -> None:
+    with _STORES_LOCK:
+        for store in _STORES.values():
+            store.close()
+        _STORES.clear()
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+"""
+state_splits.py
+
+기간/구간 split 스탯 (최근 N경기, 날짜 범위, 홈/원정, 상대팀별).
+
+- 선수/팀마다 경기 순서(ingest 순)대로 누적합(prefix sum) 배열을 유지한다: 스탯 누적, 홈 경기만의 누적,
+  보조 컬럼 누적(선수: 팀 컨텍스트 CTX_KEYS, 팀: W/L/실점/포제션), 경기 날짜(ordinal)와 phase 내 경기 순번.
+- 구간 합은 두 누적 행의 차(O(1)); 최근 N경기는 인덱스로, 날짜 범위는 날짜 배열 이분 탐색으로 구간을 찾는다.
+  홈/원정도 홈 누적과의 차로 O(1). 상대팀별 split만 구간 안의 경기를 훑는다(O(구간 경기 수)).
+- 배열은 state_columnar.PhaseColumns가 ingest 때 함께 채운다(같은 sync/재구성 규칙).
+- 한 선수의 경기 날짜가 역순으로 들어온 적이 있으면(정상 시뮬레이션에서는 없음) 날짜 범위는 마스크로 계산한다.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .state_columnar import PhaseColumns
+
+TEAM_EXTRA_KEYS = ("W", "L", "OPP_PTS", "POSS")
+
+SPLIT_PERS = ("total", "game", "36")
+
+_CAP_MIN = 16
+
+
+def _date_ord(value: Optional[str]) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal()
+    except ValueError:
+        raise ValueError(f"invalid date: {value!r} (expected YYYY-MM-DD)")
+
+
+class PrefixLog:
+    """Prefix sums over one player's / team's games, in ingest order (row 0 = zeros)."""
+
+    __slots__ = ("n", "cum", "cum_home", "extra", "home_n", "dates", "game", "opp", "dates_sorted")
+
+    def __init__(self, width: int, extra_width: int) -> None:
+        self.n = 0
+        self.cum = np.zeros((_CAP_MIN + 1, width))
+        self.cum_home = np.zeros((_CAP_MIN + 1, width))
+        self.extra = np.zeros((_CAP_MIN + 1, extra_width))
+        self.home_n = np.zeros(_CAP_MIN + 1, dtype=np.int64)
+        self.dates = np.zeros(_CAP_MIN, dtype=np.int32)
+        self.game = np.zeros(_CAP_MIN, dtype=np.int32)
+        self.opp = np.zeros(_CAP_MIN, dtype=np.int32)
+        self.dates_sorted = True
+
+    def _reserve(self, width: int) -> None:
+        cap = self.dates.shape[0]
+        if self.n >= cap:
+            cap *= 2
+            for name in ("cum", "cum_home", "extra", "home_n"):
+                arr = getattr(self, name)
+                out = np.zeros((cap + 1,) + arr.shape[1:], dtype=arr.dtype)
+                out[: arr.shape[0]] = arr
+                setattr(self, name, out)
+            for name in ("dates", "game", "opp"):
+                arr = getattr(self, name)
+                out = np.zeros(cap, dtype=arr.dtype)
+                out[: arr.shape[0]] = arr
+                setattr(self, name, out)
+        if width > self.cum.shape[1]:
+            # new stat columns: earlier games contributed 0, so their prefixes are 0 too
+            pad = np.zeros((self.cum.shape[0], width - self.cum.shape[1]))
+            self.cum = np.hstack([self.cum, pad])
+            self.cum_home = np.hstack([self.cum_home, pad])
+
+    def append(self, vec: np.ndarray, extra: np.ndarray, date_ord: int, game_idx: int, is_home: bool, opp_idx: int) -> None:
+        self._reserve(vec.shape[0])
+        n = self.n
+        w = vec.shape[0]
+        self.cum[n + 1] = self.cum[n]
+        self.cum[n + 1, :w] += vec
+        self.cum_home[n + 1] = self.cum_home[n]
+        if is_home:
+            self.cum_home[n + 1, :w] += vec
+        self.extra[n + 1] = self.extra[n] + extra
+        self.home_n[n + 1] = self.home_n[n] + int(is_home)
+        if n and date_ord < self.dates[n - 1]:
+            self.dates_sorted = False
+        self.dates[n] = date_ord
+        self.game[n] = game_idx
+        self.opp[n] = opp_idx
+        self.n = n + 1
+
+    # ---- ranges ----
+    def span(
+        self,
+        *,
+        last_n: Optional[int] = None,
+        date_from: Optional[int] = None,
+        date_to: Optional[int] = None,
+    ) -> Tuple[int, int, Optional[np.ndarray]]:
+        """(lo, hi, mask): games [lo, hi) in ingest order; mask (over that range) only for unsorted dates."""
+        lo, hi = 0, self.n
+        mask = None
+        if date_from is not None or date_to is not None:
+            dates = self.dates[: self.n]
+            if self.dates_sorted:
+                if date_from is not None:
+                    lo = int(np.searchsorted(dates, date_from, side="left"))
+                if date_to is not None:
+                    hi = int(np.searchsorted(dates, date_to, side="right"))
+            else:
+                mask = np.ones(self.n, dtype=bool)
+                if date_from is not None:
+                    mask &= dates >= date_from
+                if date_to is not None:
+                    mask &= dates <= date_to
+        if last_n is not None:
+            if mask is None:
+                lo = max(lo, hi - max(int(last_n), 0))
+            else:
+                keep = np.flatnonzero(mask)[-max(int(last_n), 0) :] if last_n > 0 else np.zeros(0, dtype=np.int64)
+                mask = np.zeros(self.n, dtype=bool)
+                mask[keep] = True
+        if mask is not None:
+            mask = mask[lo:hi]
+        return lo, max(lo, hi), mask
+
+    def _rows(self, cum: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        return np.diff(cum[lo : hi + 1], axis=0)
+
+    def sums(self, lo: int, hi: int, mask: Optional[np.ndarray]) -> Dict[str, Any]:
+        """Totals over the span, split into home and away (O(1) without a mask)."""
+        if mask is None:
+            total = self.cum[hi] - self.cum[lo]
+            home = self.cum_home[hi] - self.cum_home[lo]
+            extra = self.extra[hi] - self.extra[lo]
+            games = hi - lo
+            home_games = int(self.home_n[hi] - self.home_n[lo])
+        else:
+            total = self._rows(self.cum, lo, hi)[mask].sum(axis=0)
+            home = self._rows(self.cum_home, lo, hi)[mask].sum(axis=0)
+            extra = self._rows(self.extra, lo, hi)[mask].sum(axis=0)
+            games = int(mask.sum())
+            home_games = int(np.diff(self.home_n[lo : hi + 1])[mask].sum())
+        return {"total": total, "home": home, "extra": extra, "games": games, "home_games": home_games}
+
+    def by_opponent(self, lo: int, hi: int, mask: Optional[np.ndarray]) -> Dict[int, Tuple[int, np.ndarray]]:
+        """{opponent team idx: (games, totals)} over the span (O(games in span))."""
+        rows = self._rows(self.cum, lo, hi)
+        opp = self.opp[lo:hi]
+        if mask is not None:
+            rows, opp = rows[mask], opp[mask]
+        out: Dict[int, Tuple[int, np.ndarray]] = {}
+        for o in np.unique(opp):
+            sel = opp == o
+            out[int(o)] = (int(sel.sum()), rows[sel].sum(axis=0))
+        return out
+
+
+def _scale(stat_keys: Sequence[str], totals: np.ndarray, games: int, per: str) -> Dict[str, float]:
+    width = totals.shape[0]
+    vals = {k: float(totals[i]) if i < width else 0.0 for i, k in enumerate(stat_keys)}
+    if per == "game":
+        return {k: (v / games if games else 0.0) for k, v in vals.items()}
+    if per == "36":
+        minutes = vals.get("MIN", 0.0)
+        return {k: (v * 36.0 / minutes if minutes else 0.0) for k, v in vals.items()}
+    return vals
+
+
+def _entity_log(cols: "PhaseColumns", kind: str, entity_id: str) -> Optional[PrefixLog]:
+    if kind == "player":
+        idx = cols.player_index.get(entity_id)
+        return cols.player_prefix[idx] if idx is not None else None
+    if kind == "team":
+        idx = cols.team_index.get(entity_id)
+        return cols.team_prefix[idx] if idx is not None else None
+    raise ValueError(f"invalid split kind: {kind!r} (expected 'player' or 'team')")
+
+
+def splits(
+    cols: "PhaseColumns",
+    kind: str,
+    entity_id: str,
+    *,
+    last_n: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    per: str = "game",
+    by_opponent: bool = False,
+) -> Dict[str, Any]:
+    """Overall / home / away (and optionally per-opponent) stats of one player or team over a window."""
+    if per not in SPLIT_PERS:
+        raise ValueError(f"invalid per: {per!r} (expected one of {SPLIT_PERS})")
+    log = _entity_log(cols, kind, entity_id)
+    keys = list(cols.stat_keys)
+    out: Dict[str, Any] = {"kind": kind, "id": entity_id, "per": per}
+    if log is None or log.n == 0:
+        out.update({"games": 0, "overall": {}, "home": {}, "away": {}})
+        if by_opponent:
+            out["by_opponent"] = {}
+        return out
+    lo, hi, mask = log.span(last_n=last_n, date_from=_date_ord(date_from), date_to=_date_ord(date_to))
+    s = log.sums(lo, hi, mask)
+    games, home_games = s["games"], s["home_games"]
+    out["games"] = games
+    game_seq = log.game[lo:hi] if mask is None else log.game[lo:hi][mask]
+    out["first_game_id"] = cols.game_ids[int(game_seq[0])] if games else None
+    out["last_game_id"] = cols.game_ids[int(game_seq[-1])] if games else None
+    out["overall"] = _scale(keys, s["total"], games, per)
+    out["home"] = {"games": home_games, **_scale(keys, s["home"], home_games, per)}
+    out["away"] = {"games": games - home_games, **_scale(keys, s["total"] - s["home"], games - home_games, per)}
+    if kind == "team":
+        extra = dict(zip(TEAM_EXTRA_KEYS, (float(x) for x in s["extra"])))
+        out["record"] = {"wins": int(extra["W"]), "losses": int(extra["L"])}
+        out["overall"]["OPP_PTS"] = extra["OPP_PTS"] / games if per == "game" and games else extra["OPP_PTS"]
+    if by_opponent:
+        out["by_opponent"] = {
+            cols.team_ids[o]: {"games": g, **_scale(keys, totals, g, per)}
+            for o, (g, totals) in log.by_opponent(lo, hi, mask).items()
+        }
+    return out
+
+
+def window_table(
+    cols: "PhaseColumns",
+    *,
+    stats: Optional[Sequence[str]] = None,
+    per: str = "game",
+    last_n: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    team_id: Optional[str] = None,
+    min_games: int = 1,
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Every player's stats over the same window (one O(1) prefix lookup per player)."""
+    if per not in SPLIT_PERS:
+        raise ValueError(f"invalid per: {per!r} (expected one of {SPLIT_PERS})")
+    keys = list(stats) if stats else list(cols.stat_keys)
+    if sort_by is not None and sort_by not in keys and sort_by != "games":
+        raise ValueError(f"unknown sort_by: {sort_by!r}")
+    d0, d1 = _date_ord(date_from), _date_ord(date_to)
+    idx = [cols.stat_index.get(k) for k in keys]
+    minutes_i = cols.stat_index.get("MIN")
+    rows: List[Dict[str, Any]] = []
+    for i, pid in enumerate(cols.player_ids):
+        if team_id is not None and cols.player_team[i] != team_id:
+            continue
+        log = cols.player_prefix[i]
+        lo, hi, mask = log.span(last_n=last_n, date_from=d0, date_to=d1)
+        s = log.sums(lo, hi, mask)
+        games = s["games"]
+        if games < max(int(min_games), 1):
+            continue
+        total = s["total"]
+        width = total.shape[0]
+        vals = [float(total[j]) if j is not None and j < width else 0.0 for j in idx]
+        if per == "game":
+            vals = [v / games for v in vals]
+        elif per == "36":
+            minutes = float(total[minutes_i]) if minutes_i is not None and minutes_i < width else 0.0
+            vals = [v * 36.0 / minutes if minutes else 0.0 for v in vals]
+        row = {"player_id": pid, "name": cols.names[i], "team_id": cols.player_team[i], "games": games}
+        row.update(zip(keys, vals))
+        rows.append(row)
+    if sort_by is not None:
+        rows.sort(key=lambda r: r[sort_by], reverse=descending)
+    total_rows = len(rows)
+    if limit is not None:
+        rows = rows[: int(limit)]
+    return {"per": per, "stats": keys, "total": total_rows, "rows": rows}
+
+
+def games_between(cols: "PhaseColumns", date_from: Optional[str], date_to: Optional[str]) -> List[Dict[str, Any]]:
+    """Compact game objects of the phase with date_from <= date <= date_to, in ingest order."""
+    d0, d1 = _date_ord(date_from), _date_ord(date_to)
+    ords = cols.game_date_ords
+    if cols.game_dates_sorted:
+        lo = bisect_left(ords, d0) if d0 is not None else 0
+        hi = bisect_right(ords, d1) if d1 is not None else len(ords)
+        picked: Sequence[int] = range(lo, hi)
+    else:
+        picked = [i for i, d in enumerate(ords) if (d0 is None or d >= d0) and (d1 is None or d <= d1)]
+    return [dict(cols.game_meta[i]) for i in picked]
@@ -1,21 +1,327 @@
 from __future__ import annotations
 
+import os
+import time
 from contextlib import contextmanager
 from copy import deepcopy
-from threading import RLock, local
-from typing import Any, Dict, Iterator, Iterable, Mapping, MutableMapping, MutableSequence, Sequence, TypeVar
+from threading import Lock, local
+from typing import Any, Dict, Iterator, Iterable, Mapping, MutableMapping, MutableSequence, Optional, Sequence, TypeVar
 
 from state_schema import create_default_game_state, validate_game_state
 
+from .state_journal import StateJournal
+from .state_lock import RWLock
+
 # -------------------------------------------------------------------------
 # 전역 상태 저장소 (SSOT) + 트랜잭션 / 읽기 전용 뷰
 # -------------------------------------------------------------------------
-_STATE: Dict[str, Any] = create_default_game_state()
+# A write to league.master_schedule (the dict, its games/by_date lists, or a game entry's
+# season_id) also marks "league.master_schedule", so state_schema repeats the O(season)
+# schedule season scan only then. Result writes on a game entry (status, scores) don't.
+_SCHEDULE_MARK = "league.master_schedule"
+_SUB_MARKS: Dict[str, Dict[str, str]] = {"league": {"master_schedule": _SCHEDULE_MARK}}
+_SCHEDULE_ENTRY_SUBS: Dict[str, str] = {"season_id": _SCHEDULE_MARK}
+
+_ALL = object()
+
+
+def _note_write(marks: tuple, subs: Optional[Dict[str, str]], key: Any = _ALL) -> None:
+    dirty = _STATE._dirty
+    if dirty is None:
+        return
+    dirty.update(marks)
+    if subs:
+        if key is _ALL:
+            dirty.update(subs.values())
+        elif key in subs:
+            dirty.add(subs[key])
+
+
+def _note_insert(container: Any, value: Any) -> None:
+    # Plain dict/list values stored in the state become tracked containers at commit (_track_pending).
+    if isinstance(value, (dict, list)):
+        pending = _STATE._pending
+        if pending is not None:
+            pending.append(container)
+
+
+class _TDict(dict):
+    """dict inside the live state: writes mark its top-level key dirty; reads mark nothing."""
+
+    __slots__ = ("_marks", "_subs")
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        _note_write(self._marks, self._subs, key)
+        _note_insert(self, value)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        _note_write(self._marks, self._subs, key)
+        dict.__delitem__(self, key)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            _note_write(self._marks, self._subs, key)
+            _note_insert(self, default)
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if key in self:
+            _note_write(self._marks, self._subs, key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> Any:
+        _note_write(self._marks, self._subs)
+        return dict.popitem(self)
+
+    def clear(self) -> None:
+        _note_write(self._marks, self._subs)
+        dict.clear(self)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        _note_write(self._marks, self._subs)
+        _note_insert(self, [])
+        dict.update(self, *args, **kwargs)
+
+    def __ior__(self, other: Any) -> "_TDict":
+        self.update(other)
+        return self
+
+    # Copies and pickles are plain dicts (never tracked, never shared with the live state).
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[Any, Any]:
+        out: Dict[Any, Any] = {}
+        memo[id(self)] = out
+        for k, v in dict.items(self):
+            out[k] = deepcopy(v, memo)
+        return out
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        return (dict, (dict(self),))
+
+
+class _TList(list):
+    """list inside the live state: writes mark its top-level key dirty; reads mark nothing."""
+
+    __slots__ = ("_marks",)
+
+    def _write(self, value: Any = None) -> None:
+        _note_write(self._marks, None)
+        _note_insert(self, [] if value is None else value)
+
+    def __setitem__(self, idx: Any, value: Any) -> None:
+        self._write(value)
+        list.__setitem__(self, idx, value)
+
+    def __delitem__(self, idx: Any) -> None:
+        _note_write(self._marks, None)
+        list.__delitem__(self, idx)
+
+    def append(self, value: Any) -> None:
+        self._write(value)
+        list.append(self, value)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        self._write()
+        list.extend(self, values)
+
+    def insert(self, idx: Any, value: Any) -> None:
+        self._write(value)
+        list.insert(self, idx, value)
+
+    def __iadd__(self, values: Iterable[Any]) -> "_TList":
+        self.extend(values)
+        return self
+
+    def __imul__(self, n: Any) -> "_TList":
+        self._write()
+        return list.__imul__(self, n)
+
+    def remove(self, value: Any) -> None:
+        _note_write(self._marks, None)
+        list.remove(self, value)
+
+    def pop(self, *idx: Any) -> Any:
+        _note_write(self._marks, None)
+        return list.pop(self, *idx)
+
+    def clear(self) -> None:
+        _note_write(self._marks, None)
+        list.clear(self)
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        _note_write(self._marks, None)
+        list.sort(self, *args, **kwargs)
+
+    def reverse(self) -> None:
+        _note_write(self._marks, None)
+        list.reverse(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> list:
+        out: list = []
+        memo[id(self)] = out
+        out.extend(deepcopy(v, memo) for v in list.__iter__(self))
+        return out
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        return (list, (list(self),))
+
+
+def _child_marks(parent: Any, key: Any) -> tuple:
+    subs = parent._subs
+    return parent._marks + (subs[key],) if subs and key in subs else parent._marks
+
+
+def _track_item(marks: tuple, value: Any) -> Any:
+    # List items under the schedule carry the schedule mark only through their season_id.
+    if _SCHEDULE_MARK in marks and isinstance(value, dict):
+        return _track(value, tuple(m for m in marks if m != _SCHEDULE_MARK), _SCHEDULE_ENTRY_SUBS)
+    return _track(value, marks)
+
+
+def _track(value: Any, marks: tuple, subs: Optional[Dict[str, str]] = None) -> Any:
+    """value with every nested dict/list turned into a tracked container marking `marks`.
+
+    Containers already tracked under the same marks are returned as they are (identity kept);
+    a tracked container moved under another top-level key is re-tagged in place.
+    """
+    if isinstance(value, _TDict):
+        if value._marks != marks or value._subs != subs:
+            value._marks, value._subs = marks, subs
+            for k, v in list(dict.items(value)):
+                t = _track(v, _child_marks(value, k))
+                if t is not v:
+                    dict.__setitem__(value, k, t)
+        return value
+    if isinstance(value, _TList):
+        if value._marks != marks:
+            value._marks = marks
+            for i, v in enumerate(list(list.__iter__(value))):
+                t = _track_item(marks, v)
+                if t is not v:
+                    list.__setitem__(value, i, t)
+        return value
+    if isinstance(value, dict):
+        out = _TDict()
+        out._marks, out._subs = marks, subs
+        for k, v in value.items():
+            dict.__setitem__(out, k, _track(v, _child_marks(out, k)))
+        return out
+    if isinstance(value, list):
+        out_l = _TList()
+        out_l._marks = marks
+        list.extend(out_l, [_track_item(marks, v) for v in value])
+        return out_l
+    return value
+
+
+class _TrackedState(dict):
+    """
+    The global state dict, recording which top-level keys a transaction wrote.
+
+    Every nested dict/list is a tracked container (_TDict/_TList) that marks its top-level
+    key dirty on a write (setitem, append, pop, ...). Reads, including handing out a child
+    container, mark nothing, so the commit only re-validates/journals what was written.
+    Plain dicts/lists stored during a transaction are converted to tracked containers when
+    it ends (the writer may keep filling them until then). Bulk updates mark "*".
+    """
+
+    __slots__ = ("_dirty", "_pending")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._dirty: set[str] | None = None  # None = not inside a transaction
+        self._pending: list[Any] | None = None  # containers that received dict/list values
+        for key in list(dict.keys(self)):
+            dict.__setitem__(self, key, _track(dict.__getitem__(self, key), (key,), _SUB_MARKS.get(key)))
+
+    def _mark(self, key: Any) -> None:
+        if self._dirty is not None:
+            self._dirty.add(key)
+            subs = _SUB_MARKS.get(key)
+            if subs:
+                self._dirty.update(subs.values())
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._mark(key)
+        if self._pending is not None:
+            self._pending.append(self)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._mark(key)
+        dict.__delitem__(self, key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:  # type: ignore[override]
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key: str, *default: Any) -> Any:  # type: ignore[override]
+        if key in self:
+            self._mark(key)
+        return dict.pop(self, key, *default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[override]
+        self._mark("*")
+        if self._pending is not None:
+            self._pending.append(self)
+        dict.update(self, *args, **kwargs)
+
+    def popitem(self) -> tuple[str, Any]:
+        self._mark("*")
+        return dict.popitem(self)
+
+    def clear(self) -> None:
+        self._mark("*")
+        dict.clear(self)
+
+
+def _track_pending(state: _TrackedState) -> None:
+    """Convert the plain dicts/lists a finished transaction stored into tracked containers."""
+    pending, state._pending = state._pending, None
+    done: set[int] = set()
+    for parent in pending or ():
+        if id(parent) in done:
+            continue
+        done.add(id(parent))
+        if parent is state:
+            for key in list(dict.keys(state)):
+                v = dict.__getitem__(state, key)
+                t = _track(v, (key,), _SUB_MARKS.get(key))
+                if t is not v:
+                    dict.__setitem__(state, key, t)
+        elif isinstance(parent, _TDict):
+            for key, v in list(dict.items(parent)):
+                t = _track(v, _child_marks(parent, key))
+                if t is not v:
+                    dict.__setitem__(parent, key, t)
+        else:
+            for i, v in enumerate(list(list.__iter__(parent))):
+                t = _track_item(parent._marks, v)
+                if t is not v:
+                    list.__setitem__(parent, i, t)
+
+
+def _top_level(dirty: set[str]) -> set[str]:
+    """dirty without the sub-marks (see _SUB_MARKS)."""
+    return {k for k in dirty if "." not in k}
+
+
+_STATE: _TrackedState = _TrackedState(create_default_game_state())
 validate_game_state(_STATE)
 
-_STATE_LOCK = RLock()
+# Readers (read_state / snapshot_state / copy_paths) run concurrently; transactions are exclusive.
+_STATE_LOCK = RWLock()
 _TLS = local()
 
+# Full validation at every commit (debug), and every N-th commit otherwise (0 = never).
+_FULL_VALIDATION = os.environ.get("STATE_VALIDATE_FULL", "").strip().lower() in ("1", "true", "yes", "on")
+try:
+    _FULL_VALIDATION_EVERY = max(0, int(os.environ.get("STATE_FULL_VALIDATE_EVERY", "256")))
+except ValueError:
+    _FULL_VALIDATION_EVERY = 256
+_COMMITS = 0
+
 T = TypeVar("T")
 
 
@@ -143,33 +449,263 @@ class _ROList(Sequence[Any]):
     reverse = _blocked
 
 
+def set_full_validation(enabled: bool) -> None:
+    """Debug switch: validate the whole state at every commit instead of only dirty subtrees."""
+    global _FULL_VALIDATION
+    _FULL_VALIDATION = bool(enabled)
+
+
+# -------------------------------------------------------------------------
+# Copy-on-write snapshots
+# -------------------------------------------------------------------------
+# Each top-level key carries a version, bumped when a transaction touched it ("*" bumps
+# the epoch, i.e. every key). snapshot_state() deep-copies a subtree only when its version
+# moved since the cached copy, so a snapshot costs O(changed subtrees) instead of O(state).
+# game_results values (result-store refs, or full box scores from older saves) are never
+# mutated after ingest, so they are copied once per game and shared by every later copy
+# of their container.
+# The copies are shared between snapshots, so they are frozen (_FrozenDict/_FrozenList:
+# writes raise TypeError, deepcopy gives a plain mutable copy). A cached copy is dropped
+# STATE_SNAPSHOT_CACHE_TTL seconds (default 60) after it was made, so an idle server
+# doesn't keep a second copy of the state alive; 0 disables the cache.
+try:
+    _SNAPSHOT_CACHE_TTL = max(0.0, float(os.environ.get("STATE_SNAPSHOT_CACHE_TTL", "60")))
+except ValueError:
+    _SNAPSHOT_CACHE_TTL = 60.0
+_EPOCH = 0
+_VERSIONS: Dict[str, int] = {}
+# key -> ((epoch, version), copy, monotonic time of the copy)
+_SNAPSHOT_CACHE: Dict[str, tuple[tuple[int, int], Any, float]] = {}
+# id(live game_results container) -> {game_id: (live result, copied result)}
+_RESULT_COPIES: Dict[int, Dict[str, tuple[Any, Any]]] = {}
+# Snapshots run under the shared read lock; this serializes their cache updates.
+_SNAPSHOT_LOCK = Lock()
+
+
+def _bump_versions(dirty: set[str]) -> None:
+    global _EPOCH
+    if "*" in dirty:
+        _EPOCH += 1
+        return
+    for key in _top_level(dirty):
+        _VERSIONS[key] = _VERSIONS.get(key, 0) + 1
+
+
+def _drop_snapshot_cache() -> None:
+    global _EPOCH
+    _EPOCH += 1
+    _SNAPSHOT_CACHE.clear()
+    _RESULT_COPIES.clear()
+
+
+def _evict_snapshot_cache(now: float) -> None:
+    """Drop cached copies older than the TTL (and the box-score copies of their containers)."""
+    expired = [key for key, cached in _SNAPSHOT_CACHE.items() if now - cached[2] >= _SNAPSHOT_CACHE_TTL]
+    for key in expired:
+        del _SNAPSHOT_CACHE[key]
+        for cid in _result_container_ids(key, dict.get(_STATE, key)):
+            _RESULT_COPIES.pop(cid, None)
+
+
+class _FrozenDict(dict):
+    """Snapshot copy of a state dict: shared between snapshots, so writes raise TypeError."""
+
+    __slots__ = ()
+
+    def _blocked(self, *_: Any, **__: Any) -> None:
+        raise TypeError("state snapshot is read-only (deepcopy it before mutating)")
+
+    __setitem__ = _blocked  # type: ignore[assignment]
+    __delitem__ = _blocked  # type: ignore[assignment]
+    __ior__ = _blocked  # type: ignore[assignment]
+    setdefault = _blocked  # type: ignore[assignment]
+    pop = _blocked  # type: ignore[assignment]
+    popitem = _blocked  # type: ignore[assignment]
+    clear = _blocked  # type: ignore[assignment]
+    update = _blocked  # type: ignore[assignment]
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[Any, Any]:
+        out: Dict[Any, Any] = {}
+        memo[id(self)] = out
+        for k, v in dict.items(self):
+            out[k] = deepcopy(v, memo)
+        return out
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        return (dict, (dict(self),))
+
+
+class _FrozenList(list):
+    """Snapshot copy of a state list: shared between snapshots, so writes raise TypeError."""
+
+    __slots__ = ()
+
+    def _blocked(self, *_: Any, **__: Any) -> None:
+        raise TypeError("state snapshot is read-only (deepcopy it before mutating)")
+
+    __setitem__ = _blocked  # type: ignore[assignment]
+    __delitem__ = _blocked  # type: ignore[assignment]
+    __iadd__ = _blocked  # type: ignore[assignment]
+    __imul__ = _blocked  # type: ignore[assignment]
+    append = _blocked
+    extend = _blocked
+    insert = _blocked
+    remove = _blocked
+    pop = _blocked  # type: ignore[assignment]
+    clear = _blocked
+    sort = _blocked  # type: ignore[assignment]
+    reverse = _blocked
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> list:
+        out: list = []
+        memo[id(self)] = out
+        out.extend(deepcopy(v, memo) for v in list.__iter__(self))
+        return out
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        return (list, (list(self),))
+
+
+def _frozen_copy(value: Any) -> Any:
+    """Deep copy of a state subtree with every dict/list frozen."""
+    if isinstance(value, dict):
+        out = _FrozenDict()
+        dict.update(out, [(k, _frozen_copy(v)) for k, v in dict.items(value)])
+        return out
+    if isinstance(value, list):
+        return _FrozenList([_frozen_copy(v) for v in list.__iter__(value)])
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return deepcopy(value)
+
+
+def _copy_game_results(live: Dict[str, Any], seen: set[int]) -> Dict[str, Any]:
+    seen.add(id(live))
+    memo = _RESULT_COPIES.get(id(live))
+    if memo is None:
+        memo = _RESULT_COPIES[id(live)] = {}
+    out = _FrozenDict()
+    for gid, result in live.items():
+        hit = memo.get(gid)
+        if hit is None or hit[0] is not result:
+            hit = memo[gid] = (result, _frozen_copy(result))
+        dict.__setitem__(out, gid, hit[1])
+    if len(memo) > len(out):
+        for gid in [g for g in memo if g not in out]:
+            del memo[gid]
+    return out
+
+
+def _copy_results_container(live: Any, seen: set[int]) -> Any:
+    """deepcopy of a {games, player_stats, team_stats, game_results} container, sharing box scores."""
+    if not isinstance(live, dict) or not isinstance(live.get("game_results"), dict):
+        return _frozen_copy(live)
+    out = _FrozenDict()
+    for k, v in live.items():
+        dict.__setitem__(out, k, _copy_game_results(v, seen) if k == "game_results" else _frozen_copy(v))
+    return out
+
+
+def _copy_subtree(key: str, live: Any, seen: set[int]) -> Any:
+    if key == "game_results" and isinstance(live, dict):
+        return _copy_game_results(live, seen)
+    if key == "phase_results" and isinstance(live, dict):
+        out = _FrozenDict()
+        for phase, c in live.items():
+            dict.__setitem__(out, phase, _copy_results_container(c, seen))
+        return out
+    return _frozen_copy(live)
+
+
+# -------------------------------------------------------------------------
+# Write-ahead journal (see state_journal)
+# -------------------------------------------------------------------------
+_JOURNAL: Optional[StateJournal] = None
+
+
+def _journal_commit(dirty: set[str] | None, op: tuple[str, Dict[str, Any]] | None) -> None:
+    """Record one finished outermost transaction (called under the write lock)."""
+    if _JOURNAL is None:
+        return
+    if op is not None:
+        _JOURNAL.append_op(op[0], op[1])
+    elif dirty is None or "*" in dirty:
+        _JOURNAL.rebase(snapshot_state())
+        return
+    elif dirty:
+        keys = sorted(_top_level(dirty))
+        _JOURNAL.append_set(
+            {k: dict.__getitem__(_STATE, k) for k in keys if k in _STATE},
+            [k for k in keys if k not in _STATE],
+        )
+    if _JOURNAL.needs_compaction():
+        _JOURNAL.rebase(snapshot_state())
+
+
+def _journal_rebase() -> None:
+    if _JOURNAL is not None:
+        _JOURNAL.rebase(snapshot_state())
+
+
+def _commit_validate() -> None:
+    global _COMMITS
+    dirty = _STATE._dirty
+    _STATE._dirty = None
+    _bump_versions(dirty if dirty is not None else {"*"})
+    _evict_snapshot_cache(time.monotonic())
+    _COMMITS += 1
+    if _FULL_VALIDATION or (_FULL_VALIDATION_EVERY and _COMMITS % _FULL_VALIDATION_EVERY == 0):
+        dirty = None
+    validate_game_state(_STATE, dirty=dirty)
+
+
 @contextmanager
-def transaction(reason: str = "") -> Iterator[Dict[str, Any]]:
+def transaction(reason: str = "", journal_args: Dict[str, Any] | None = None) -> Iterator[Dict[str, Any]]:
     """
     Stateful mutation transaction for the global game state.
 
     - Provides the only supported mutable access to the global state.
     - Nested transactions are allowed; validation happens only once at the
       outermost transaction commit.
-    - Validation runs while holding the global lock (fail-fast).
+    - Validation runs while holding the global lock (fail-fast), and only covers the
+      top-level subtrees the transaction wrote (plus a periodic/debug full pass).
     - No rollback: if an exception occurs, the exception propagates and any
       partial mutations remain (same behavior class as the current codebase).
+    - With a journal attached, the commit is journaled as the call `reason(**journal_args)`
+      when journal_args is given on the outermost transaction (the facade function must
+      be replayable from those arguments), otherwise as the touched top-level subtrees.
     """
-    # One lock for both reads & writes to ensure coherent view.
-    with _STATE_LOCK:
+    # Exclusive: readers wait, so they see all of this transaction or none of it.
+    with _STATE_LOCK.write():
         depth = _get_tx_depth()
         _set_tx_depth(depth + 1)
+        op = (reason, journal_args) if depth == 0 and journal_args is not None else None
+        dirty: set[str] | None = None
+        if depth == 0:
+            _STATE._dirty = set()
+            _STATE._pending = []
         try:
             yield _STATE
             # Commit validation only at outermost boundary.
             depth_after = _get_tx_depth() - 1
             _set_tx_depth(depth_after)
             if depth_after == 0:
-                validate_game_state(_STATE)
+                dirty = _STATE._dirty
+                _track_pending(_STATE)
+                _commit_validate()
+                _journal_commit(dirty, op)
         except Exception as e:
             # Ensure depth counter stays consistent even on failure.
             depth_after = _get_tx_depth() - 1
             _set_tx_depth(max(depth_after, 0))
+            if depth_after <= 0:
+                # No rollback: whatever the failed transaction touched may have changed.
+                if _STATE._dirty is not None:
+                    dirty = _STATE._dirty
+                _track_pending(_STATE)
+                _bump_versions(dirty if dirty is not None else {"*"})
+                _STATE._dirty = None
+                _journal_commit(dirty, None)
             # Preserve the original exception context; add reason detail.
             if reason:
                 raise RuntimeError(f"state transaction failed: {reason}") from e
@@ -179,20 +715,148 @@ def transaction(reason: str = "") -> Iterator[Dict[str, Any]]:
 @contextmanager
 def read_state() -> Iterator[Mapping[str, Any]]:
     """
-    Read-only (deep) view of the global state, protected by the global lock.
+    Read-only (deep) view of the global state, under the shared read lock
+    (concurrent with other readers, excluded while a transaction runs).
     Use this for live read access (no deepcopy).
     """
-    with _STATE_LOCK:
+    with _STATE_LOCK.read():
         yield _RODict(_STATE)
 
 
+_MISSING = object()
+
+
+def _resolve_path(root: Any, path: Sequence[str]) -> Any:
+    node = root
+    for part in path:
+        if isinstance(node, dict):
+            node = dict.get(node, part, _MISSING)
+        elif isinstance(node, list) and part.lstrip("-").isdigit() and -len(node) <= int(part) < len(node):
+            node = node[int(part)]
+        else:
+            return _MISSING
+        if node is _MISSING:
+            return _MISSING
+    return node
+
+
+def copy_paths(paths: Sequence[Sequence[str]], default: Any = None) -> list[Any]:
+    """
+    Deep copies of just the values at `paths` (each a sequence of keys / list indexes),
+    read in one pass under the shared read lock. Missing paths yield `default`.
+    """
+    with _STATE_LOCK.read():
+        out = []
+        for path in paths:
+            value = _resolve_path(_STATE, path)
+            out.append(default if value is _MISSING else deepcopy(value))
+        return out
+
+
 def snapshot_state() -> Dict[str, Any]:
     """
-    Deepcopy snapshot of the global state, protected by the global lock.
+    Snapshot of the global state, under the shared read lock.
     Use this for exporting/serializing.
+
+    The top-level dict is a new plain dict on every call, but the subtrees are
+    copy-on-write copies shared with other snapshots of the same version. They are
+    frozen: a write raises TypeError, deepcopy() gives a mutable copy. They serialize
+    (json/pickle) like plain dicts/lists.
     """
-    with _STATE_LOCK:
-        return deepcopy(_STATE)
+    with _STATE_LOCK.read(), _SNAPSHOT_LOCK:
+        now = time.monotonic()
+        _evict_snapshot_cache(now)
+        in_tx = _STATE._dirty
+        seen: set[int] = set()
+        out: Dict[str, Any] = {}
+        for key, live in dict.items(_STATE):
+            version = (_EPOCH, _VERSIONS.get(key, 0))
+            if in_tx is not None and (key in in_tx or "*" in in_tx):
+                # Written by the transaction still open on this thread: not versioned yet.
+                out[key] = _frozen_copy(live)
+                continue
+            cached = _SNAPSHOT_CACHE.get(key)
+            if cached is None or cached[0] != version:
+                cached = (version, _copy_subtree(key, live, seen), now)
+                if _SNAPSHOT_CACHE_TTL > 0:
+                    _SNAPSHOT_CACHE[key] = cached
+            else:
+                seen.update(_result_container_ids(key, live))
+            out[key] = cached[1]
+        if _SNAPSHOT_CACHE_TTL > 0:
+            for cid in [c for c in _RESULT_COPIES if c not in seen]:
+                del _RESULT_COPIES[cid]
+        else:
+            _RESULT_COPIES.clear()
+        return out
+
+
+def _result_container_ids(key: str, live: Any) -> list[int]:
+    if key == "game_results":
+        return [id(live)]
+    if key == "phase_results" and isinstance(live, dict):
+        return [id(c.get("game_results")) for c in live.values() if isinstance(c, dict)]
+    return []
+
+
+def replace_state(new_state: Dict[str, Any]) -> None:
+    """
+    Swap in a whole game state (checkpoint restore). The new state is validated first;
+    disallowed inside an active transaction.
+    """
+    global _STATE
+    candidate = _TrackedState(deepcopy(dict(new_state)))
+    validate_game_state(candidate)
+    with _STATE_LOCK.write():
+        if _get_tx_depth() > 0:
+            raise RuntimeError("replace_state() is not allowed during a state transaction")
+        _STATE = candidate
+        _drop_snapshot_cache()
+        _journal_rebase()
+
+
+def lock_stats() -> Dict[str, Any]:
+    """Contention counters of the state reader-writer lock (acquires, waits, wait/hold times)."""
+    return _STATE_LOCK.stats()
+
+
+def reset_lock_stats() -> None:
+    _STATE_LOCK.reset_stats()
+
+
+def attach_journal(journal: StateJournal) -> None:
+    """Start journaling every commit to `journal`, on top of a snapshot of the current state."""
+    global _JOURNAL
+    with _STATE_LOCK.write():
+        if _get_tx_depth() > 0:
+            raise RuntimeError("attach_journal() is not allowed during a state transaction")
+        if _JOURNAL is not None:
+            raise RuntimeError("a state journal is already attached")
+        journal.start(snapshot_state())
+        _JOURNAL = journal
+
+
+def detach_journal() -> None:
+    """Stop journaling; flushes the segment and waits for a pending snapshot."""
+    global _JOURNAL
+    with _STATE_LOCK.write():
+        journal, _JOURNAL = _JOURNAL, None
+    if journal is not None:
+        journal.close()
+
+
+def journal_stats() -> Dict[str, Any] | None:
+    with _STATE_LOCK.read():
+        return _JOURNAL.stats() if _JOURNAL is not None else None
+
+
+def apply_journal_set(values: Mapping[str, Any], deleted: Sequence[str]) -> None:
+    """Replay a physical journal record (top-level keys replaced/removed)."""
+    with transaction("journal_replay") as state:
+        for key, value in values.items():
+            state[key] = value
+        for key in deleted:
+            state.pop(key, None)
 
 
 def reset_state_for_dev() -> None:
@@ -200,16 +864,27 @@ def reset_state_for_dev() -> None:
     Developer-only state reset. Disallowed inside an active transaction.
     """
     global _STATE
-    with _STATE_LOCK:
+    with _STATE_LOCK.write():
         if _get_tx_depth() > 0:
             raise RuntimeError("reset_state_for_dev() is not allowed during a state transaction")
-        _STATE = create_default_game_state()
+        _STATE = _TrackedState(create_default_game_state())
         validate_game_state(_STATE)
+        _drop_snapshot_cache()
+        _journal_rebase()
 
 
 __all__ = [
     "transaction",
     "read_state",
     "snapshot_state",
+    "copy_paths",
+    "replace_state",
+    "attach_journal",
+    "detach_journal",
+    "journal_stats",
+    "apply_journal_set",
+    "set_full_validation",
+    "lock_stats",
+    "reset_lock_stats",
     "reset_state_for_dev",
 ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Mapping
 
 
 def _is_number(value: Any) -> bool:
@@ -35,3 +35,32 @@ def _merge_counter_dict_sum(dst: Dict[str, Any], src: Dict[str, Any]) -> None:
                 dst[k] = float(dst.get(k, 0.0)) + float(v)
             except (TypeError, ValueError):
                 continue
+
+
+# ---- derived (process-memory) indexes over the state: state_leaders, state_columnar ----
+def _live_get(mapping: Mapping[str, Any], key: str) -> Any:
+    # dict.get on the live state: no dirty-key marking inside the ingest transaction.
+    return dict.get(mapping, key) if isinstance(mapping, dict) else mapping.get(key)
+
+
+def _live_dict(value: Any) -> Any:
+    # Read-only views (state_store._RODict) wrap the live dict in `_d`.
+    return getattr(value, "_d", value)
+
+
+def _phase_containers(state: Mapping[str, Any]) -> Dict[str, Mapping[str, Any]]:
+    """{"regular": state, <phase>: phase_results[phase], ...} (results containers by phase)."""
+    out = {"regular": state}
+    for phase, container in (_live_get(state, "phase_results") or {}).items():
+        out[str(phase)] = container
+    return out
+
+
+def _index_sync_key(state: Mapping[str, Any], turn: int) -> tuple:
+    """Identity of the ingested data a derived index was built from: (season, turn, player_stats dicts).
+
+    Anything other than an ingest that moves it (season switch, restore, dev reset) makes the
+    index rebuild itself on the next query.
+    """
+    ids = tuple(sorted((p, id(_live_dict(_live_get(c, "player_stats")))) for p, c in _phase_containers(state).items()))
+    return (_live_get(state, "active_season_id"), int(turn), ids)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Collection, Dict, Optional
 
 from state_modules.state_constants import DEFAULT_TRADE_RULES, _DEFAULT_TRADE_MARKET, _DEFAULT_TRADE_MEMORY
 
@@ -192,10 +192,21 @@ def _validate_postseason_container(container: dict, label: str) -> None:
             raise ValueError(f"GameState invalid: {label} must not contain results containers")
 
 
-def validate_game_state(state: dict) -> None:
+def validate_game_state(state: dict, dirty: Optional[Collection[str]] = None) -> None:
+    """Validate the game state.
+
+    dirty: top-level keys a transaction wrote (state_store tracks them); only those
+    subtrees are re-validated. None (or a "*" entry) validates everything.
+    "league.master_schedule" in dirty means the schedule itself (not just a game's
+    result fields) was written, which repeats the O(season) season_id scan.
+    """
     if not isinstance(state, dict):
         raise ValueError("GameState invalid: state must be a dict")
-        
+
+    full = dirty is None or "*" in dirty
+
+    def _touched(*keys: str) -> bool:
+        return full or any(k in dirty for k in keys)
 
     _require_exact_keys(state, ALLOWED_TOP_LEVEL_KEYS, "top-level")
 
@@ -230,13 +241,37 @@ def validate_game_state(state: dict) -> None:
     _require_container(state, "trade_memory", dict, "dict")
     migrations = _require_container(state, "_migrations", dict, "dict")
 
-    _require_exact_keys(phase_results, NON_REGULAR_PHASES, "phase_results")
-    for phase_key in NON_REGULAR_PHASES:
-        phase_container = _require_nested_container(phase_results, phase_key, dict, "dict")
-        _validate_phase_results(phase_container, f"phase_results.{phase_key}")
+    if _touched("phase_results"):
+        _require_exact_keys(phase_results, NON_REGULAR_PHASES, "phase_results")
+        for phase_key in NON_REGULAR_PHASES:
+            phase_container = _require_nested_container(phase_results, phase_key, dict, "dict")
+            _validate_phase_results(phase_container, f"phase_results.{phase_key}")
+
+    if _touched("postseason"):
+        _validate_postseason_container(postseason, "postseason")
+
+    if _touched("cached_views"):
+        _validate_cached_views(cached_views)
+
+    if _touched("league"):
+        _validate_league(league)
+
+    if _touched("active_season_id", "league"):
+        master_schedule = league["master_schedule"]
+        _validate_season_ssot(active_season_id, league)
+        # The per-entry season scan is O(season); repeat it only when the active season or
+        # the schedule was written (full validation always repeats it).
+        if _touched("active_season_id", "league.master_schedule"):
+            _validate_schedule_season_ids(active_season_id, master_schedule.get("games") or [])
 
-    _validate_postseason_container(postseason, "postseason")
+    if _touched("season_history"):
+        _validate_season_history(season_history)
 
+    if _touched("_migrations"):
+        _require_exact_keys(migrations, ALLOWED_MIGRATIONS_KEYS, "_migrations")
+
+
+def _validate_cached_views(cached_views: dict) -> None:
     _require_exact_keys(cached_views, ALLOWED_CACHED_VIEWS_KEYS, "cached_views")
     scores = _require_nested_container(cached_views, "scores", dict, "dict")
     _require_exact_keys(scores, ALLOWED_SCORES_VIEW_KEYS, "cached_views.scores")
@@ -281,6 +316,8 @@ def validate_game_state(state: dict) -> None:
     if schedule_season_id is not None and not isinstance(schedule_season_id, str):
         raise ValueError("GameState invalid: cached_views._meta.schedule.season_id must be str or None")
 
+
+def _validate_league(league: dict) -> None:
     _require_exact_keys(league, ALLOWED_LEAGUE_KEYS, "league")
     master_schedule = _require_nested_container(league, "master_schedule", dict, "dict")
     _require_exact_keys(master_schedule, ALLOWED_MASTER_SCHEDULE_KEYS, "league.master_schedule")
@@ -293,7 +330,9 @@ def validate_game_state(state: dict) -> None:
     if not isinstance(master_schedule.get("by_id"), dict):
         raise ValueError("GameState invalid: league.master_schedule.by_id must be dict")
 
-        # -----------------------------
+
+def _validate_season_ssot(active_season_id: Optional[str], league: dict) -> None:
+    # -----------------------------
     # SSOT: active_season_id <-> league.season_year/draft_year 일치 강제
     # -----------------------------
     league_year = league.get("season_year")
@@ -333,24 +372,29 @@ def validate_game_state(state: dict) -> None:
         if int(league_year) != int(active_year):
             raise ValueError("GameState invalid: league.season_year must match active_season_id year")
 
-        # -----------------------------
-        # master_schedule 시즌 일치 강제
-        # - games가 비어있으면(아직 스케줄 생성 전) 검사는 스킵한다.
-        # - games가 존재하면, season_id가 있는 모든 엔트리는 active_season_id와 일치해야 한다.
-        # -----------------------------
-        ms_games = master_schedule.get("games") or []
-        if isinstance(ms_games, list) and ms_games:
-            for i, g in enumerate(ms_games):
-                if not isinstance(g, dict):
-                    continue
-                sid = g.get("season_id")
-                if sid is None:
-                    continue
-                if str(sid) != str(active_season_id):
-                    raise ValueError(
-                        f"GameState invalid: league.master_schedule.games[{i}].season_id must match active_season_id"
-                    )
 
+def _validate_schedule_season_ids(active_season_id: Optional[str], ms_games: Any) -> None:
+    # -----------------------------
+    # master_schedule 시즌 일치 강제
+    # - games가 비어있으면(아직 스케줄 생성 전) 검사는 스킵한다.
+    # - games가 존재하면, season_id가 있는 모든 엔트리는 active_season_id와 일치해야 한다.
+    # -----------------------------
+    if active_season_id is None:
+        return
+    if isinstance(ms_games, list) and ms_games:
+        for i, g in enumerate(ms_games):
+            if not isinstance(g, dict):
+                continue
+            sid = g.get("season_id")
+            if sid is None:
+                continue
+            if str(sid) != str(active_season_id):
+                raise ValueError(
+                    f"GameState invalid: league.master_schedule.games[{i}].season_id must match active_season_id"
+                )
+
+
+def _validate_season_history(season_history: dict) -> None:
     for season_id, record in season_history.items():
         if not isinstance(season_id, str):
             raise ValueError("GameState invalid: season_history keys must be str")
@@ -373,8 +417,6 @@ def validate_game_state(state: dict) -> None:
         if archived_at_date is not None and not isinstance(archived_at_date, str):
             raise ValueError("GameState invalid: season_history.archived_at_date must be str or None")
 
-    _require_exact_keys(migrations, ALLOWED_MIGRATIONS_KEYS, "_migrations")
-
 
 if __name__ == "__main__":
     s = create_default_game_state()
@@ -20,9 +20,10 @@ def _warn_limited(code: str, msg: str, *, limit: int = 5) -> None:
 from derived_formulas import compute_derived
 from state import (
     ensure_cap_model_populated_if_needed,
-    export_full_state_snapshot,
     get_db_path,
     get_league_context_snapshot,
+    get_player_stat_table,
+    get_standings_inputs,
     initialize_master_schedule_if_needed,
     players_get,
     players_set,
@@ -238,9 +239,7 @@ def _compute_cap_space(team_id: str) -> float:
 def _compute_team_records() -> Dict[str, Dict[str, Any]]:
     """Compute W/L and points from master_schedule."""
     initialize_master_schedule_if_needed()
-    league = export_full_state_snapshot().get("league", {})
-    master_schedule = league.get("master_schedule", {})
-    games = master_schedule.get("games") or []
+    finals = get_standings_inputs()
 
     team_ids = _list_active_team_ids()
     records: Dict[str, Dict[str, Any]] = {
@@ -248,13 +247,7 @@ def _compute_team_records() -> Dict[str, Dict[str, Any]]:
         for tid in team_ids
     }
 
-    for g in games:
-        if g.get("status") != "final":
-            continue
-        home_id = str(g.get("home_team_id") or "")
-        away_id = str(g.get("away_team_id") or "")
-        home_score = g.get("home_score")
-        away_score = g.get("away_score")
+    for home_id, away_id, home_score, away_score in finals:
         if home_id not in records or away_id not in records:
             continue
         if home_score is None or away_score is None:
@@ -405,35 +398,35 @@ def get_team_detail(team_id: str) -> Dict[str, Any]:
         "cap_space": _compute_cap_space(tid),
     }
 
-    season_stats = export_workflow_state().get("player_stats", {}) or {}
     roster: List[Dict[str, Any]] = []
     with _repo_ctx() as repo:
         roster_rows = repo.get_team_roster(tid)
-        for row in roster_rows:
-            pid = str(row.get("player_id"))
-            p_stats = season_stats.get(pid, {}) or {}
-            games = int(p_stats.get("games", 0) or 0)
-            totals = p_stats.get("totals", {}) or {}
-            def per_game_val(key: str) -> float:
-                try:
-                    return float(totals.get(key, 0.0)) / games if games else 0.0
-                except (TypeError, ValueError, ZeroDivisionError):
-                    return 0.0
-
-            roster.append(
-                {
-                    "player_id": pid,
-                    "name": row.get("name"),
-                    "pos": row.get("pos"),
-                    "ovr": float(row.get("ovr") or 0.0),
-                    "age": int(row.get("age") or 0),
-                    "salary": float(row.get("salary_amount") or 0.0),
-                    "pts": per_game_val("PTS"),
-                    "ast": per_game_val("AST"),
-                    "reb": per_game_val("REB"),
-                    "three_pm": per_game_val("3PM"),
-                }
-            )
+    # Per-game averages for the whole roster in one vectorized query (columnar stats index).
+    per_game = {
+        r["player_id"]: r
+        for r in get_player_stat_table(
+            stats=["PTS", "AST", "REB", "3PM"],
+            per="game",
+            player_ids=[str(row.get("player_id")) for row in roster_rows],
+        )["rows"]
+    }
+    for row in roster_rows:
+        pid = str(row.get("player_id"))
+        p_stats = per_game.get(pid, {})
+        roster.append(
+            {
+                "player_id": pid,
+                "name": row.get("name"),
+                "pos": row.get("pos"),
+                "ovr": float(row.get("ovr") or 0.0),
+                "age": int(row.get("age") or 0),
+                "salary": float(row.get("salary_amount") or 0.0),
+                "pts": p_stats.get("PTS", 0.0),
+                "ast": p_stats.get("AST", 0.0),
+                "reb": p_stats.get("REB", 0.0),
+                "three_pm": p_stats.get("3PM", 0.0),
+            }
+        )
 
     roster_sorted = sorted(roster, key=lambda r: r.get("ovr", 0), reverse=True)
 
@@ -0,0 +1,67 @@
+"""Synthetic GameResultV2 box scores for state tests (no engine)."""
+
+from __future__ import annotations
+
+import random
+
+import state
+
+
+def box_score(game: dict, season_id: str, rng: random.Random, phase: str = "regular") -> dict:
+    home, away = str(game["home_team_id"]), str(game["away_team_id"])
+    teams, final = {}, {}
+    for tid in (home, away):
+        rows = []
+        for i in range(10):
+            fga, tpa, fta = rng.randint(4, 20), rng.randint(0, 8), rng.randint(0, 8)
+            fgm, tpm, ftm = rng.randint(0, fga), rng.randint(0, tpa), rng.randint(0, fta)
+            rows.append(
+                {
+                    "PlayerID": f"{tid}_P{i}",
+                    "TeamID": tid,
+                    "Name": f"{tid} {i}",
+                    "MIN": rng.randint(8, 40),
+                    "PTS": 2 * fgm + min(tpm, fgm) + ftm,
+                    "REB": rng.randint(0, 12),
+                    "AST": rng.randint(0, 10),
+                    "FGM": fgm,
+                    "FGA": fga,
+                    "3PM": min(tpm, fgm),
+                    "3PA": tpa,
+                    "FTM": ftm,
+                    "FTA": fta,
+                }
+            )
+        final[tid] = sum(r["PTS"] for r in rows)
+        teams[tid] = {"totals": {"PTS": final[tid]}, "players": rows, "breakdowns": {}}
+    if final[home] == final[away]:
+        final[home] += 1
+        teams[home]["totals"]["PTS"] += 1
+    return {
+        "schema_version": "2.0",
+        "game": {
+            "game_id": game["game_id"],
+            "date": game["date"],
+            "season_id": season_id,
+            "phase": phase,
+            "home_team_id": home,
+            "away_team_id": away,
+            "overtime_periods": 0,
+            "possessions_per_team": 100,
+        },
+        "final": final,
+        "teams": teams,
+    }
+
+
+def play_days(days: list, seed: int) -> list:
+    """Ingest a synthetic box score for every game on `days` (one batch per day); returns them."""
+    rng = random.Random(seed)
+    season_id = state.get_active_season_id()
+    played = []
+    for day in days:
+        results = [box_score(g, season_id, rng) for g in state.get_schedule_games_on(day)]
+        state.ingest_game_results(results, game_date=day)
+        state.set_current_date(day)
+        played.extend(results)
+    return played
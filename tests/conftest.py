@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def league(tmp_path, monkeypatch):
+    """A temp league (benchmarks.fixtures.temp_league) with its own result store."""
+    pytest.importorskip("pandas")  # temp_league imports the shipped roster workbook
+    from benchmarks.fixtures import temp_league
+
+    monkeypatch.setenv("STATE_RESULT_STORE_PATH", str(tmp_path / "results.sqlite"))
+    with temp_league() as db_path:
+        yield db_path
@@ -0,0 +1,37 @@
+"""Game logs after a checkpoint restore / dev reset list only the games the state holds."""
+
+from __future__ import annotations
+
+import state
+
+from ._results import play_days as _play_days
+
+
+def test_game_log_after_checkpoint_restore(league):
+    days = sorted(state.get_master_schedule_by_date())[:6]
+    _play_days(days[:3], seed=1)
+    snapshot = state.export_full_state_snapshot()
+    team_id = str(state.get_schedule_games_on(days[3])[0]["home_team_id"])
+    before = state.get_team_game_log(team_id)
+    player_before = state.get_player_game_log(f"{team_id}_P0")
+
+    _play_days(days[3:], seed=2)
+    assert state.get_team_game_log(team_id)["total"] > before["total"]
+
+    state.restore_full_state_snapshot(snapshot)
+    assert state.get_team_game_log(team_id) == before
+    assert state.get_player_game_log(f"{team_id}_P0") == player_before
+    known = set(state.get_game_results([r["game_id"] for r in before["rows"]]))
+    assert {r["game_id"] for r in before["rows"]} == known
+
+
+def test_game_log_after_dev_reset(league):
+    days = sorted(state.get_master_schedule_by_date())[:2]
+    _play_days(days, seed=1)
+    team_id = str(state.get_schedule_games_on(days[0])[0]["home_team_id"])
+    assert state.get_team_game_log(team_id)["total"] > 0
+
+    state.reset_state_for_dev()
+    state.set_db_path(league)
+    assert state.get_team_game_log(team_id)["total"] == 0
+    assert state.get_player_game_log(f"{team_id}_P0")["total"] == 0
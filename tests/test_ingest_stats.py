@@ -0,0 +1,151 @@
+"""Batch ingest atomicity, and the stats indexes (leaders, splits) against a brute-force recompute."""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+import state
+from state_modules import state_leaders
+
+from ._results import box_score, play_days
+
+
+def _state_json() -> str:
+    return json.dumps(state.export_full_state_snapshot(), sort_keys=True)
+
+
+def test_rejected_batch_has_no_side_effects(league):
+    day = sorted(state.get_master_schedule_by_date())[0]
+    games = state.get_schedule_games_on(day)
+    rng = random.Random(5)
+    results = [box_score(g, state.get_active_season_id(), rng) for g in games]
+    results[-1]["game"]["season_id"] = "1999-00"
+    before = _state_json()
+
+    with pytest.raises(ValueError):
+        state.ingest_game_results(results, game_date=day)
+
+    assert _state_json() == before
+    assert state.get_game_results([g["game_id"] for g in games]) == {}
+    assert state.get_team_game_log(str(games[0]["home_team_id"]))["total"] == 0
+
+
+# -------------------------
+# leaders
+# -------------------------
+
+def _brute_leaders(stat: str, mode: str, min_games: int, limit: int) -> list:
+    player_stats = state.get_player_stats()
+    team_games = max(int(t.get("games", 0) or 0) for t in state.get_team_stats().values())
+    ranked = []
+    for pid, entry in player_stats.items():
+        games = int(entry["games"])
+        totals = entry["totals"]
+        if stat in state_leaders.PCT_CATEGORIES:
+            made, att, qual, per_team_game = state_leaders.PCT_CATEGORIES[stat]
+            if not totals.get(att) or totals.get(qual, 0) < per_team_game * team_games:
+                continue
+            value = totals[made] / totals[att]
+        elif mode == "totals":
+            value = totals[stat]
+        elif mode == "per36":
+            if games < min_games or totals["MIN"] < state_leaders.PER36_MIN_MINUTES_PER_GAME * games:
+                continue
+            value = totals[stat] * 36.0 / totals["MIN"]
+        else:
+            if games < min_games:
+                continue
+            value = totals[stat] / games
+        ranked.append((-value, str(pid)))
+    ranked.sort()
+    return [(pid, pytest.approx(-neg)) for neg, pid in ranked[:limit]]
+
+
+def _index_leaders(stat: str, mode: str, min_games: int, limit: int) -> list:
+    rows = state.get_league_leaders(stats=[stat], mode=mode, min_games=min_games, limit=limit)[stat]
+    return [(r["player_id"], r[stat]) for r in rows]
+
+
+@pytest.mark.parametrize(
+    "stat,mode",
+    [("PTS", "per_game"), ("REB", "totals"), ("AST", "per36"), ("FG_PCT", "per_game"), ("3P_PCT", "per_game")],
+)
+def test_leaders_match_brute_force(league, stat, mode):
+    days = sorted(state.get_master_schedule_by_date())[:8]
+    play_days(days[:4], seed=11)
+    # Build the boards, then let ingest update them incrementally.
+    assert _index_leaders(stat, mode, 2, 10) == _brute_leaders(stat, mode, 2, 10)
+    play_days(days[4:], seed=12)
+    for min_games in (1, 3):
+        assert _index_leaders(stat, mode, min_games, 10) == _brute_leaders(stat, mode, min_games, 10)
+
+
+# -------------------------
+# splits
+# -------------------------
+
+def _player_games(played: list, pid: str) -> list:
+    """(date, is_home, opponent, row) of every game `pid` played, in ingest order."""
+    out = []
+    for result in played:
+        game = result["game"]
+        for tid, opp in ((game["home_team_id"], game["away_team_id"]), (game["away_team_id"], game["home_team_id"])):
+            for row in result["teams"][tid]["players"]:
+                if row["PlayerID"] == pid:
+                    out.append((game["date"], tid == game["home_team_id"], opp, row))
+    return out
+
+
+def _sums(games: list, keys: tuple) -> dict:
+    return {k: pytest.approx(float(sum(g[3][k] for g in games))) for k in keys}
+
+
+def test_player_splits_match_brute_force(league):
+    days = sorted(state.get_master_schedule_by_date())[:10]
+    played = play_days(days, seed=21)
+    keys = ("PTS", "REB", "MIN", "FGM")
+    pid = played[-1]["teams"][played[-1]["game"]["home_team_id"]]["players"][0]["PlayerID"]
+    games = _player_games(played, pid)
+    assert len(games) >= 3
+
+    windows = [
+        ({}, games),
+        ({"last_n": 2}, games[-2:]),
+        ({"date_from": days[3], "date_to": days[7]}, [g for g in games if days[3] <= g[0] <= days[7]]),
+    ]
+    for window, expected in windows:
+        out = state.get_stat_splits("player", pid, per="total", by_opponent=True, **window)
+        assert out["games"] == len(expected)
+        assert {k: out["overall"][k] for k in keys} == _sums(expected, keys)
+        home = [g for g in expected if g[1]]
+        away = [g for g in expected if not g[1]]
+        assert out["home"]["games"] == len(home)
+        assert {k: out["home"][k] for k in keys} == _sums(home, keys)
+        assert {k: out["away"][k] for k in keys} == _sums(away, keys)
+        for opp, split in out["by_opponent"].items():
+            vs = [g for g in expected if g[2] == opp]
+            assert split["games"] == len(vs)
+            assert split["PTS"] == pytest.approx(float(sum(g[3]["PTS"] for g in vs)))
+
+
+def test_team_split_record_matches_brute_force(league):
+    days = sorted(state.get_master_schedule_by_date())[:10]
+    played = play_days(days, seed=31)
+    team_id = str(played[0]["game"]["home_team_id"])
+    wins = losses = 0
+    for result in played:
+        game = result["game"]
+        if team_id not in (game["home_team_id"], game["away_team_id"]) or not days[2] <= game["date"] <= days[8]:
+            continue
+        opp = game["away_team_id"] if game["home_team_id"] == team_id else game["home_team_id"]
+        if result["final"][team_id] > result["final"][opp]:
+            wins += 1
+        else:
+            losses += 1
+
+    out = state.get_stat_splits("team", team_id, date_from=days[2], date_to=days[8])
+    assert out["record"] == {"wins": wins, "losses": losses}
+    assert out["games"] == wins + losses
@@ -0,0 +1,82 @@
+"""State journal recovery: replay stops cleanly at a torn or corrupt record."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import state
+from state_modules.state_journal import StateJournal
+
+from ._results import play_days
+
+
+def _segment(directory) -> str:
+    (name,) = [n for n in os.listdir(directory) if n.startswith("journal-")]
+    return os.path.join(directory, name)
+
+
+def _write_journal(directory, n_ops: int) -> None:
+    journal = StateJournal(str(directory), fsync="off")
+    journal.start({"turn": 0})
+    for i in range(1, n_ops + 1):
+        journal.append_op("set_current_date", {"date_str": f"2025-10-{i:02d}"})
+    journal.append_set({"turn": n_ops}, [])
+    journal.close()
+
+
+def test_recover_ignores_truncated_last_record(tmp_path):
+    _write_journal(tmp_path, 3)
+    path = _segment(tmp_path)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-7])  # crash in the middle of the last append
+
+    snapshot, records = StateJournal(str(tmp_path)).recover()
+    assert snapshot == {"turn": 0}
+    assert [r["seq"] for r in records] == [1, 2, 3]
+    assert records[-1]["args"] == {"date_str": "2025-10-03"}
+
+
+def test_recover_stops_at_corrupt_record(tmp_path):
+    _write_journal(tmp_path, 3)
+    path = _segment(tmp_path)
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    lines[1] = lines[1].replace(b"2025-10-02", b"2025-10-09")  # crc no longer matches
+    with open(path, "wb") as f:
+        f.writelines(lines)
+
+    journal = StateJournal(str(tmp_path))
+    _, records = journal.recover()
+    assert [r["seq"] for r in records] == [1]
+    assert journal.stats()["seq"] == 1
+
+
+def test_open_state_journal_replays_up_to_torn_record(league, tmp_path):
+    directory = str(tmp_path / "journal")
+    days = sorted(state.get_master_schedule_by_date())[:3]
+    state.open_state_journal(directory)
+    try:
+        play_days(days[:2], seed=3)
+        expected = json.dumps(state.export_full_state_snapshot(), sort_keys=True)
+        state.set_current_date(days[2])
+    finally:
+        state.close_state_journal()
+    path = _segment(directory)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-5])  # the set_current_date record is torn
+
+    state.reset_state_for_dev()
+    state.set_db_path(league)
+    info = state.open_state_journal(directory)
+    try:
+        assert info["restored"] and info["replayed"] > 0
+        assert json.dumps(state.export_full_state_snapshot(), sort_keys=True) == expected
+        team_id = str(state.get_schedule_games_on(days[0])[0]["home_team_id"])
+        assert state.get_team_game_log(team_id)["total"] >= 1
+    finally:
+        state.close_state_journal()
@@ -0,0 +1,129 @@
+"""Global state store: reader-writer lock, snapshot isolation, write-only dirty tracking."""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+
+import pytest
+
+from state_modules import state_store
+from state_modules.state_lock import RWLock
+
+
+@pytest.fixture
+def fresh_state():
+    state_store.reset_state_for_dev()
+    yield
+    state_store.reset_state_for_dev()
+
+
+def _enter(ctx, name: str, entered: list) -> None:
+    with ctx():
+        entered.append(name)
+
+
+def test_rwlock_writer_excludes_readers_and_writers():
+    lock = RWLock()
+    entered: list = []
+    lock.acquire_write()
+    threads = [
+        threading.Thread(target=_enter, args=(lock.read, "read", entered)),
+        threading.Thread(target=_enter, args=(lock.write, "write", entered)),
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    assert entered == []
+    lock.release_write()
+    for t in threads:
+        t.join(timeout=5)
+    assert sorted(entered) == ["read", "write"]
+
+
+def test_rwlock_writer_waits_for_readers_but_readers_share():
+    lock = RWLock()
+    both_in = threading.Barrier(2, timeout=5)
+    release = threading.Event()
+
+    def _reader() -> None:
+        with lock.read():
+            both_in.wait()  # only passes if the two readers hold the lock at the same time
+            release.wait(5)
+
+    readers = [threading.Thread(target=_reader) for _ in range(2)]
+    for t in readers:
+        t.start()
+    entered: list = []
+    writer = threading.Thread(target=_enter, args=(lock.write, "write", entered))
+    time.sleep(0.1)
+    writer.start()
+    time.sleep(0.2)
+    assert entered == []
+    release.set()
+    for t in readers + [writer]:
+        t.join(timeout=5)
+    assert entered == ["write"]
+    assert lock.stats()["max_concurrent_readers"] == 2
+
+
+def test_snapshot_isolated_from_later_writes(fresh_state):
+    with state_store.transaction("test") as s:
+        s["player_stats"]["p1"] = {"totals": {"PTS": [10, 12]}}
+    before = state_store.snapshot_state()
+    frozen_json = json.dumps(before["player_stats"], sort_keys=True)
+
+    with state_store.transaction("test") as s:
+        s["player_stats"]["p1"]["totals"]["PTS"].append(30)
+        s["player_stats"]["p2"] = {"totals": {"PTS": [7]}}
+    after = state_store.snapshot_state()
+
+    assert json.dumps(before["player_stats"], sort_keys=True) == frozen_json
+    assert after["player_stats"]["p1"]["totals"]["PTS"] == [10, 12, 30]
+    assert "p2" in after["player_stats"]
+    # Unchanged subtrees are shared between snapshots, so they are read-only.
+    assert after["league"] is before["league"]
+    with pytest.raises(TypeError):
+        before["player_stats"]["p1"]["totals"]["PTS"].append(1)
+    with pytest.raises(TypeError):
+        after["league"]["current_date"] = "2030-01-01"
+    mutable = copy.deepcopy(after["player_stats"])
+    mutable["p1"]["totals"]["PTS"].append(1)
+    assert state_store.snapshot_state()["player_stats"]["p1"]["totals"]["PTS"] == [10, 12, 30]
+
+
+def test_only_written_keys_are_dirty(fresh_state, monkeypatch):
+    seen: list = []
+    validate = state_store.validate_game_state
+
+    def _spy(state, dirty=None):
+        seen.append(None if dirty is None else set(dirty))
+        validate(state, dirty=dirty)
+
+    monkeypatch.setattr(state_store, "validate_game_state", _spy)
+    monkeypatch.setattr(state_store, "_FULL_VALIDATION_EVERY", 0)
+
+    with state_store.transaction("read") as s:
+        s.get("league")
+        s["player_stats"].get("p1")
+        list(s.items())
+    assert seen[-1] == set()
+
+    with state_store.transaction("insert") as s:
+        s["teams"]["T1"] = {"roster": ["a"]}
+    assert seen[-1] == {"teams"}
+
+    # A container stored plainly is tracked after the commit.
+    with state_store.transaction("nested") as s:
+        s["teams"]["T1"]["roster"].append("b")
+    assert seen[-1] == {"teams"}
+
+    with state_store.transaction("schedule") as s:
+        s["league"]["master_schedule"]["games"].append({"game_id": "g1", "status": "scheduled"})
+    assert seen[-1] == {"league", "league.master_schedule"}
+
+    with state_store.transaction("result") as s:
+        s["league"]["master_schedule"]["games"][0]["status"] = "final"
+    assert seen[-1] == {"league"}
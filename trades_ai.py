@@ -12,11 +12,11 @@ from league_repo import LeagueRepo
 from schema import normalize_player_id, normalize_team_id
 from state import (
     asset_locks_get,
-    export_full_state_snapshot,
-    export_workflow_state,
     get_current_date_as_date,
     get_db_path,
+    get_last_gm_tick_date,
     get_league_context_snapshot,
+    read_path,
     set_last_gm_tick_date,
 )
 from team_utils import _init_players_and_teams_if_needed, get_team_status_map
@@ -38,7 +38,7 @@ def _run_ai_gm_tick_if_needed(target_date: date) -> None:
         except ValueError:
             return
 
-    last_tick = export_full_state_snapshot().get("league", {}).get("last_gm_tick_date")
+    last_tick = get_last_gm_tick_date()
     if last_tick:
         try:
             last_date = date.fromisoformat(str(last_tick))
@@ -73,7 +73,6 @@ def _attempt_ai_trade(target_date: Optional[date] = None) -> bool:
     from state import initialize_master_schedule_if_needed
 
     initialize_master_schedule_if_needed()
-    league = export_full_state_snapshot().get("league", {})
     db_path = get_db_path()
     repo = LeagueRepo(db_path)
     repo.init_db()
@@ -83,7 +82,7 @@ def _attempt_ai_trade(target_date: Optional[date] = None) -> bool:
         draft_picks = assets_snapshot.get("draft_picks", {}) or {}
     except Exception:
         # Fallback for degraded environments/tests.
-        draft_picks = export_workflow_state(exclude_keys=()).get("draft_picks", {}) or {}
+        draft_picks = read_path("draft_picks") or {}
     asset_locks = asset_locks_get()
 
     team_status = get_team_status_map()
@@ -96,7 +95,7 @@ def _attempt_ai_trade(target_date: Optional[date] = None) -> bool:
     random.shuffle(contenders)
     random.shuffle(rebuilders)
 
-    current_year = league.get("draft_year")
+    current_year = read_path("league.draft_year")
     if not current_year:
         base_year = target_date.year if target_date else get_current_date_as_date().year
         current_year = base_year + 1